@@ -1,10 +1,15 @@
+import copy
 import json
 import logging
 import os
 import shutil
 import base64
 import redis
+import threading
+import time
 
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
 from typing import Generic, Union, Optional, TypeVar
@@ -13,6 +18,7 @@ from urllib.parse import urlparse
 import requests
 from pydantic import BaseModel
 from sqlalchemy import JSON, Column, DateTime, Integer, func
+from sqlalchemy.exc import IntegrityError
 from authlib.integrations.starlette_client import OAuth
 
 
@@ -93,6 +99,7 @@ def save_to_db(data):
             db.add(new_config)
         else:
             existing_config.data = data
+            existing_config.version += 1
             existing_config.updated_at = datetime.now()
             db.add(existing_config)
         db.commit()
@@ -155,6 +162,79 @@ def save_config(config):
     return True
 
 
+# Attempts at applying an update while other workers keep changing the config
+CONFIG_UPDATE_RETRIES = 5
+
+
+class ConfigConflictError(Exception):
+    """The stored config kept changing while an update was being applied."""
+
+
+def set_config_value(config: dict, config_path: str, value):
+    path_parts = config_path.split(".")
+    sub_config = config
+    for key in path_parts[:-1]:
+        if key not in sub_config:
+            sub_config[key] = {}
+        sub_config = sub_config[key]
+    sub_config[path_parts[-1]] = value
+
+
+def update_config_values(values: dict) -> dict:
+    """
+    Apply `values` (config path -> value) to the stored config in one write.
+
+    The row is only written if its version did not change since it was read;
+    otherwise the values are applied again to the newer config, so updates
+    made concurrently on other workers are kept rather than overwritten.
+    """
+    global CONFIG_DATA
+    for _ in range(CONFIG_UPDATE_RETRIES):
+        with get_db() as db:
+            existing_config = db.query(Config).order_by(Config.id.desc()).first()
+            data = copy.deepcopy(
+                existing_config.data if existing_config else DEFAULT_CONFIG
+            )
+            for config_path, value in values.items():
+                set_config_value(data, config_path, value)
+
+            if not existing_config:
+                # A fixed id lets only one of several concurrent first writes insert
+                db.add(Config(id=1, data=data, version=1))
+                try:
+                    db.commit()
+                    updated = 1
+                except IntegrityError:
+                    db.rollback()
+                    updated = 0
+            else:
+                updated = (
+                    db.query(Config)
+                    .filter(
+                        Config.id == existing_config.id,
+                        Config.version == existing_config.version,
+                    )
+                    .update(
+                        {
+                            "data": data,
+                            "version": existing_config.version + 1,
+                            "updated_at": datetime.now(),
+                        },
+                        synchronize_session=False,
+                    )
+                )
+                db.commit()
+
+        if updated:
+            CONFIG_DATA = data
+            return data
+        log.debug("Config changed while saving, retrying on the latest version")
+
+    raise ConfigConflictError(
+        f"Config changed {CONFIG_UPDATE_RETRIES} times while saving {list(values)}"
+    )
+
+
 T = TypeVar("T")
 
 ENABLE_PERSISTENT_CONFIG = (
@@ -210,22 +290,35 @@ class PersistentConfig(Generic[T]):
 
     def save(self):
         log.info(f"Saving '{self.env_name}' to the database")
-        path_parts = self.config_path.split(".")
-        sub_config = CONFIG_DATA
-        for key in path_parts[:-1]:
-            if key not in sub_config:
-                sub_config[key] = {}
-            sub_config = sub_config[key]
-        sub_config[path_parts[-1]] = self.value
-        save_to_db(CONFIG_DATA)
+        update_config_values({self.config_path: self.value})
         self.config_value = self.value
 
 
 class AppConfig:
+    """
+    Config values shared by every worker.
+
+    Reads are served from the local values. With Redis, changes are written
+    to a single hash along with a version counter and announced on a pub/sub
+    channel; a listener thread marks the local values stale, and the next
+    read reloads the hash once. While the listener is disconnected, reads
+    compare the version counter instead.
+
+    Changes made inside `transaction()` are saved together, as one database
+    write and one Redis publish.
+    """
+
     _redis: Union[redis.Redis, redis.cluster.RedisCluster] = None
     _redis_key_prefix: str
 
     _state: dict[str, PersistentConfig]
+    # Keys set in the current transaction, in order
+    _changes: ContextVar[Optional[dict]]
+
+    # Version of the Redis hash the local values reflect
+    _version: Optional[int] = None
+    _stale: bool = True
+    _listening: bool = False
 
     def __init__(
         self,
@@ -245,42 +338,168 @@ class AppConfig:
                     decode_responses=True,
                 ),
             )
+            threading.Thread(
+                target=self._listen, name="config-listener", daemon=True
+            ).start()
 
         super().__setattr__("_state", {})
+        super().__setattr__("_changes", ContextVar(f"config_changes_{id(self)}"))
+
+    @property
+    def _redis_key(self) -> str:
+        return f"{self._redis_key_prefix}:config"
+
+    @property
+    def _redis_channel(self) -> str:
+        return f"{self._redis_key_prefix}:config:updates"
 
     def __setattr__(self, key, value):
-        if isinstance(value, PersistentConfig):
+        if key.startswith("_"):
+            super().__setattr__(key, value)
+        elif isinstance(value, PersistentConfig):
             self._state[key] = value
         else:
-            self._state[key].value = value
-            self._state[key].save()
-
-            if self._redis:
-                redis_key = f"{self._redis_key_prefix}:config:{key}"
-                self._redis.set(redis_key, json.dumps(self._state[key].value))
+            changes = self._changes.get(None)
+            if changes is not None:
+                changes.setdefault(key)
+                self._state[key].value = value
+            else:
+                self._state[key].value = value
+                self._save([key])
 
     def __getattr__(self, key):
         if key not in self._state:
             raise AttributeError(f"Config key '{key}' not found")
 
-        # If Redis is available, check for an updated value
-        if self._redis:
-            redis_key = f"{self._redis_key_prefix}:config:{key}"
-            redis_value = self._redis.get(redis_key)
+        # If Redis is available, pick up values changed by other workers
+        if self._redis and (self._stale or not self._listening):
+            self._sync()
 
-            if redis_value is not None:
-                try:
-                    decoded_value = json.loads(redis_value)
+        return self._state[key].value
+
+    @contextmanager
+    def transaction(self):
+        """
+        Save every change made in the block at once when it exits. Values
+        change locally right away; if the block raises, they are restored and
+        nothing is saved.
+        """
+        if self._changes.get(None) is not None:
+            # Nested transactions are saved by the outermost one
+            yield
+            return
+
+        # Copied, so values changed in place (e.g. with +=) can be restored
+        previous = {key: copy.deepcopy(item.value) for key, item in self._state.items()}
+        changes = {}
+        token = self._changes.set(changes)
+        try:
+            yield
+        except BaseException:
+            self._restore(changes, previous)
+            raise
+        finally:
+            self._changes.reset(token)
+
+        # Keys set to their current value are left alone, so values changed
+        # meanwhile by other workers are not overwritten with stale ones
+        keys = [key for key in changes if self._state[key].value != previous[key]]
+        if keys:
+            try:
+                self._save(keys)
+            except BaseException:
+                self._restore(changes, previous)
+                raise
+
+    def _restore(self, keys, previous: dict):
+        for key in keys:
+            self._state[key].value = previous[key]
+
+        # Updates from other workers to these keys were held back by the
+        # transaction, so the next read reloads them
+        if self._redis:
+            self._version = None
+            self._stale = True
 
-                    # Update the in-memory value if different
-                    if self._state[key].value != decoded_value:
-                        self._state[key].value = decoded_value
-                        log.info(f"Updated {key} from Redis: {decoded_value}")
+    def _save(self, keys: list[str]):
+        log.info(f"Saving {', '.join(keys)} to the database")
+        update_config_values(
+            {self._state[key].config_path: self._state[key].value for key in keys}
+        )
+        for key in keys:
+            self._state[key].config_value = self._state[key].value
 
-                except json.JSONDecodeError:
-                    log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+        if self._redis:
+            self._publish({key: self._state[key].value for key in keys})
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._redis_channel)
+
+                # Updates may have been missed while unsubscribed
+                self._listening = True
+                self._stale = True
+                for message in pubsub.listen():
+                    # Our own writes are already applied locally
+                    if message["type"] == "message" and (
+                        str(message["data"]) != str(self._version)
+                    ):
+                        self._stale = True
+            except Exception as e:
+                log.warning(f"Config update listener disconnected: {e}")
+            finally:
+                self._listening = False
+            time.sleep(1)
+
+    def _sync(self):
+        # Cleared first, so an update announced during the reload is not lost
+        self._stale = False
+        try:
+            if not self._listening:
+                version = self._redis.hget(self._redis_key, "_version")
+                if int(version or 0) == self._version:
+                    return
+            values = self._redis.hgetall(self._redis_key)
+        except redis.exceptions.RedisError as e:
+            log.error(f"Failed to load config from Redis: {e}")
+            self._stale = True
+            return
+
+        version = int(values.pop("_version", 0))
+        # Keys set in the current transaction keep their values until it saves
+        changes = self._changes.get(None) or {}
+        for key, redis_value in values.items():
+            if key not in self._state or key in changes:
+                continue
+
+            try:
+                decoded_value = json.loads(redis_value)
+            except json.JSONDecodeError:
+                log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+                continue
+
+            # Update the in-memory value if different
+            if self._state[key].value != decoded_value:
+                self._state[key].value = decoded_value
+                log.info(f"Updated {key} from Redis: {decoded_value}")
+
+        self._version = version
+
+    def _publish(self, values: dict):
+        pipe = self._redis.pipeline()
+        pipe.hset(
+            self._redis_key,
+            mapping={key: json.dumps(value) for key, value in values.items()},
+        )
+        pipe.hincrby(self._redis_key, "_version", 1)
+        _, version = pipe.execute()
+        self._redis.publish(self._redis_channel, version)
 
-        return self._state[key].value
+        # Skip reloading our own write, unless another worker wrote in between
+        if self._version is not None and version == self._version + 1:
+            self._version = version
 
 
 ####################################
@@ -2128,14 +2347,52 @@ Ensure that the tools are effectively utilized to achieve the highest-quality an
 
 VECTOR_DB = os.environ.get("VECTOR_DB", "chroma")
 
+# Connections kept open by the async vector db clients, and the time in seconds
+# to wait for a free one
+VECTOR_DB_POOL_SIZE = os.environ.get("VECTOR_DB_POOL_SIZE", "10")
+
+try:
+    VECTOR_DB_POOL_SIZE = int(VECTOR_DB_POOL_SIZE)
+except Exception:
+    VECTOR_DB_POOL_SIZE = 10
+
+VECTOR_DB_POOL_TIMEOUT = os.environ.get("VECTOR_DB_POOL_TIMEOUT", "30")
+
+try:
+    VECTOR_DB_POOL_TIMEOUT = float(VECTOR_DB_POOL_TIMEOUT)
+except Exception:
+    VECTOR_DB_POOL_TIMEOUT = 30.0
+
+# Bulk writes of document chunks: items per batch, batches written in parallel,
+# and retries of a failed batch
+VECTOR_DB_BULK_BATCH_SIZE = os.environ.get("VECTOR_DB_BULK_BATCH_SIZE", "500")
+
+try:
+    VECTOR_DB_BULK_BATCH_SIZE = int(VECTOR_DB_BULK_BATCH_SIZE)
+except Exception:
+    VECTOR_DB_BULK_BATCH_SIZE = 500
+
+VECTOR_DB_BULK_CONCURRENCY = os.environ.get("VECTOR_DB_BULK_CONCURRENCY", "4")
+
+try:
+    VECTOR_DB_BULK_CONCURRENCY = int(VECTOR_DB_BULK_CONCURRENCY)
+except Exception:
+    VECTOR_DB_BULK_CONCURRENCY = 4
+
+VECTOR_DB_BULK_RETRIES = os.environ.get("VECTOR_DB_BULK_RETRIES", "3")
+
+try:
+    VECTOR_DB_BULK_RETRIES = int(VECTOR_DB_BULK_RETRIES)
+except Exception:
+    VECTOR_DB_BULK_RETRIES = 3
+
 # Chroma
 CHROMA_DATA_PATH = f"{DATA_DIR}/vector_db"
 
 if VECTOR_DB == "chroma":
-    import chromadb
-
-    CHROMA_TENANT = os.environ.get("CHROMA_TENANT", chromadb.DEFAULT_TENANT)
-    CHROMA_DATABASE = os.environ.get("CHROMA_DATABASE", chromadb.DEFAULT_DATABASE)
+    # chromadb.DEFAULT_TENANT and DEFAULT_DATABASE, without importing chromadb
+    CHROMA_TENANT = os.environ.get("CHROMA_TENANT", "default_tenant")
+    CHROMA_DATABASE = os.environ.get("CHROMA_DATABASE", "default_database")
     CHROMA_HTTP_HOST = os.environ.get("CHROMA_HTTP_HOST", "")
     CHROMA_HTTP_PORT = int(os.environ.get("CHROMA_HTTP_PORT", "8000"))
     CHROMA_CLIENT_AUTH_PROVIDER = os.environ.get("CHROMA_CLIENT_AUTH_PROVIDER", "")
@@ -2776,6 +3033,11 @@ RAG_EMBEDDING_MODEL_AUTO_UPDATE = (
     and os.environ.get("RAG_EMBEDDING_MODEL_AUTO_UPDATE", "True").lower() == "true"
 )
 
+# When set, the SentenceTransformers engine sends texts to this embedding server
+# (python -m open_webui.retrieval.embedding_server) instead of loading the
+# model in every worker
+RAG_EMBEDDING_SERVER_URL = os.environ.get("RAG_EMBEDDING_SERVER_URL", "")
+
 RAG_EMBEDDING_MODEL_TRUST_REMOTE_CODE = (
     os.environ.get("RAG_EMBEDDING_MODEL_TRUST_REMOTE_CODE", "True").lower() == "true"
 )
@@ -2821,6 +3083,11 @@ RAG_RERANKING_MODEL_TRUST_REMOTE_CODE = (
     os.environ.get("RAG_RERANKING_MODEL_TRUST_REMOTE_CODE", "True").lower() == "true"
 )
 
+# Local embedding and reranking models and the vector db client are created on
+# first use; when enabled, they are also created in the background as soon as
+# the server starts
+RAG_MODELS_PRELOAD = os.environ.get("RAG_MODELS_PRELOAD", "True").lower() == "true"
+
 RAG_EXTERNAL_RERANKER_URL = PersistentConfig(
     "RAG_EXTERNAL_RERANKER_URL",
     "rag.external_reranker_url",
@@ -2953,6 +3220,13 @@ else:
 
 WEB_FETCH_FILTER_LIST = list(set(DEFAULT_WEB_FETCH_FILTER_LIST + web_fetch_filter_list))
 
+# Seconds to keep resolved hostnames / verified certificates for URL validation
+web_fetch_dns_cache_ttl = os.getenv("WEB_FETCH_DNS_CACHE_TTL", "300")
+try:
+    WEB_FETCH_DNS_CACHE_TTL = int(web_fetch_dns_cache_ttl)
+except ValueError:
+    WEB_FETCH_DNS_CACHE_TTL = 300
+
 
 YOUTUBE_LOADER_LANGUAGE = PersistentConfig(
     "YOUTUBE_LOADER_LANGUAGE",
@@ -3036,6 +3310,14 @@ WEB_LOADER_CONCURRENT_REQUESTS = PersistentConfig(
     int(os.getenv("WEB_LOADER_CONCURRENT_REQUESTS", "10")),
 )
 
+# Seconds to wait for web search pages before dropping the ones still loading,
+# once at least one page has been loaded (0 waits for every page)
+WEB_LOADER_TIMEOUT = PersistentConfig(
+    "WEB_LOADER_TIMEOUT",
+    "rag.web.loader.timeout",
+    float(os.getenv("WEB_LOADER_TIMEOUT", "0") or 0),
+)
+
 
 ENABLE_WEB_LOADER_SSL_VERIFICATION = PersistentConfig(
     "ENABLE_WEB_LOADER_SSL_VERIFICATION",
@@ -1,20 +1,26 @@
 import asyncio
+import heapq
 import json
 import logging
+import math
+import random
 import time
 import uuid
 import re
+from collections import deque
 from typing import Dict, Optional, List, Set
 from enum import Enum
 
 from starlette.concurrency import run_in_threadpool
-from starlette.responses import StreamingResponse, JSONResponse
 
 from open_webui.models.chats import Chats
 from open_webui.models.users import Users
 from open_webui.utils.chat import generate_chat_completion
+from open_webui.utils.middleware import process_chat_payload, process_chat_response
+from open_webui.utils.models import get_all_models
 from open_webui.socket.main import get_event_emitter, sio
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.socket.utils import RedisLock
+from open_webui.env import REDIS_KEY_PREFIX, SRC_LOG_LEVELS, SYMPOSIUM_LEASE_TIMEOUT
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
@@ -31,9 +37,34 @@ class MockRequest:
     def __init__(self, app):
         self.app = app
         self.state = type('MockState', (), {})()
+        self.cookies = {}
+        self.headers = {}
+
+
+def build_context_window(messages: dict, limit: int) -> deque:
+    """The latest `limit` messages of a chat history, oldest first."""
+    latest = heapq.nlargest(
+        limit,
+        enumerate(messages.values()),
+        key=lambda item: (item[1].get("timestamp", 0), item[0]),
+    )
+    return deque((message for _, message in reversed(latest)), maxlen=limit)
 
 
 class SymposiumManager:
+    """
+    Runs symposium chats, each in a loop that lets the next participant speak.
+
+    Without Redis, every symposium runs on this process and its state is kept
+    in memory. With Redis, the state lives in Redis and each running symposium
+    is owned by one worker through a lease (`RedisLock`) that the worker keeps
+    renewing. Workers claim unowned symposia up to their fair share of the
+    active ones and hand extra ones back when workers join, so symposia spread
+    across workers; symposia of a worker that stops renewing its leases (e.g.
+    on restart) are taken over by the others. Commands for a symposium are
+    published over pub/sub and handled by its owner.
+    """
+
     def __init__(self):
         self.active_symposiums: Dict[str, asyncio.Task] = {}
         self.events: Dict[str, asyncio.Event] = {}
@@ -45,25 +76,96 @@ class SymposiumManager:
         self.speaking_history: Dict[str, List[tuple]] = {}
         # Current speaker for each symposium
         self.current_speakers: Dict[str, Optional[str]] = {}
+        # Rolling windows of the latest messages of running symposia
+        self.contexts: Dict[str, deque] = {}
+        # Chat owners, whose sockets receive the symposium events
+        self.user_ids: Dict[str, str] = {}
         self.app = None
 
+        self.redis = None
+        self.redis_key_prefix = f"{REDIS_KEY_PREFIX}:symposium"
+        self.worker_id = str(uuid.uuid4())
+        # Leases on the symposia running on this worker
+        self.leases: Dict[str, RedisLock] = {}
+        self.schedule_event = asyncio.Event()
+        self.background_tasks: List[asyncio.Task] = []
+
     def init_app(self, app):
         self.app = app
+        self.redis = getattr(app.state, "redis", None)
+
+        if self.redis:
+            self.background_tasks = [
+                asyncio.create_task(self.command_listener()),
+                asyncio.create_task(self.schedule_loop()),
+            ]
+
+    async def shutdown(self):
+        """Stop the symposia running here, handing them over to other workers."""
+        for task in self.background_tasks:
+            task.cancel()
+        self.background_tasks = []
+
+        for chat_id in list(self.active_symposiums):
+            await self.stop_local(chat_id)
+
+        if self.redis:
+            try:
+                await self.redis.hdel(self._workers_key, self.worker_id)
+                await self.send_command({"action": "schedule"})
+            except Exception as e:
+                log.debug(f"Failed to hand over symposia: {e}")
+
+    ####################
+    # State
+    ####################
+
+    def _key(self, chat_id: str, kind: str) -> str:
+        # The hash tag keeps a symposium's keys in the same cluster slot
+        return f"{self.redis_key_prefix}:{{{chat_id}}}:{kind}"
+
+    @property
+    def _active_key(self) -> str:
+        return f"{self.redis_key_prefix}:active"
+
+    @property
+    def _workers_key(self) -> str:
+        return f"{self.redis_key_prefix}:workers"
+
+    @property
+    def _commands_channel(self) -> str:
+        return f"{self.redis_key_prefix}:commands"
+
+    async def emit(self, chat_id: str, event: str, data: dict):
+        """Send a symposium event to the chat owner's sockets only."""
+        user_id = self.user_ids.get(chat_id)
+        if not user_id:
+            chat = await run_in_threadpool(Chats.get_chat_config_by_id, chat_id)
+            if not chat:
+                return
+            user_id = self.user_ids[chat_id] = chat.user_id
+
+        await sio.emit(event, data, room=f"user:{user_id}")
 
-    def get_bot_state(self, chat_id: str, model_id: str) -> BotState:
+    async def get_bot_state(self, chat_id: str, model_id: str) -> BotState:
         """Get the current state of a bot in a symposium."""
-        if chat_id not in self.bot_states:
-            return BotState.ACTIVE
-        return self.bot_states.get(chat_id, {}).get(model_id, BotState.ACTIVE)
+        bot_states = await self.get_all_bot_states(chat_id)
+        return BotState(bot_states.get(model_id, BotState.ACTIVE.value))
 
     async def set_bot_state(self, chat_id: str, model_id: str, state: BotState):
         """Set the state of a bot in a symposium."""
-        if chat_id not in self.bot_states:
-            self.bot_states[chat_id] = {}
-        self.bot_states[chat_id][model_id] = state
+        if self.redis:
+            await self.redis.hset(
+                self._key(chat_id, "bot_states"), model_id, state.value
+            )
+        else:
+            if chat_id not in self.bot_states:
+                self.bot_states[chat_id] = {}
+            self.bot_states[chat_id][model_id] = state
         
         # Emit state change to clients
-        await sio.emit(
+        await self.emit(
+            chat_id,
             "symposium:bot_state",
             {
                 "chat_id": chat_id,
@@ -72,15 +174,36 @@ class SymposiumManager:
             },
         )
 
-    def get_all_bot_states(self, chat_id: str) -> Dict[str, str]:
+    async def get_all_bot_states(self, chat_id: str) -> Dict[str, str]:
         """Get all bot states for a symposium."""
+        if self.redis:
+            return await self.redis.hgetall(self._key(chat_id, "bot_states"))
         if chat_id not in self.bot_states:
             return {}
         return {k: v.value for k, v in self.bot_states.get(chat_id, {}).items()}
 
-    def get_speaking_stats(self, chat_id: str) -> Dict[str, dict]:
+    async def add_speaking_entry(self, chat_id: str, model_id: str, word_count: int):
+        entry = (int(time.time()), model_id, word_count)
+        if self.redis:
+            await self.redis.rpush(
+                self._key(chat_id, "speaking_history"), json.dumps(entry)
+            )
+        else:
+            if chat_id not in self.speaking_history:
+                self.speaking_history[chat_id] = []
+            self.speaking_history[chat_id].append(entry)
+
+    async def get_speaking_stats(self, chat_id: str) -> Dict[str, dict]:
         """Get speaking statistics for each bot in a symposium."""
-        history = self.speaking_history.get(chat_id, [])
+        if self.redis:
+            history = [
+                json.loads(entry)
+                for entry in await self.redis.lrange(
+                    self._key(chat_id, "speaking_history"), 0, -1
+                )
+            ]
+        else:
+            history = self.speaking_history.get(chat_id, [])
         stats: Dict[str, dict] = {}
         
         for timestamp, model_id, word_count in history:
@@ -92,29 +215,119 @@ class SymposiumManager:
         
         return stats
 
+    async def set_current_speaker(self, chat_id: str, model_id: Optional[str]):
+        if self.redis:
+            if model_id:
+                await self.redis.set(self._key(chat_id, "current_speaker"), model_id)
+            else:
+                await self.redis.delete(self._key(chat_id, "current_speaker"))
+        else:
+            self.current_speakers[chat_id] = model_id
+
+    async def get_current_speaker(self, chat_id: str) -> Optional[str]:
+        """Get the current speaker in a symposium."""
+        if self.redis:
+            return await self.redis.get(self._key(chat_id, "current_speaker"))
+        return self.current_speakers.get(chat_id)
+
     async def set_next_speaker(self, chat_id: str, model_id: str):
-        self.overrides[chat_id] = model_id
-        if chat_id in self.events:
-            self.events[chat_id].set()
+        if self.redis:
+            await self.redis.set(self._key(chat_id, "override"), model_id)
+        else:
+            self.overrides[chat_id] = model_id
+        await self.notify_update(chat_id)
+
+    async def pop_next_speaker(self, chat_id: str) -> Optional[str]:
+        if self.redis:
+            key = self._key(chat_id, "override")
+            async with self.redis.pipeline(transaction=True) as pipe:
+                model_id, _ = await pipe.get(key).delete(key).execute()
+            return model_id
+        return self.overrides.pop(chat_id, None)
 
     async def add_whisper(self, chat_id: str, model_id: str, content: str):
+        if self.redis:
+            await self.redis.hset(self._key(chat_id, "whispers"), model_id, content)
+            return
         if chat_id not in self.whispers:
             self.whispers[chat_id] = {}
         self.whispers[chat_id][model_id] = content
 
+    async def pop_whisper(self, chat_id: str, model_id: str) -> Optional[str]:
+        if self.redis:
+            key = self._key(chat_id, "whispers")
+            async with self.redis.pipeline(transaction=True) as pipe:
+                content, _ = (
+                    await pipe.hget(key, model_id).hdel(key, model_id).execute()
+                )
+            return content
+        return self.whispers.get(chat_id, {}).pop(model_id, None)
+
+    async def clear_state(self, chat_id: str):
+        if self.redis:
+            await self.redis.delete(
+                *[
+                    self._key(chat_id, kind)
+                    for kind in [
+                        "bot_states",
+                        "speaking_history",
+                        "current_speaker",
+                        "override",
+                        "whispers",
+                    ]
+                ]
+            )
+            return
+        self.overrides.pop(chat_id, None)
+        self.whispers.pop(chat_id, None)
+        self.bot_states.pop(chat_id, None)
+        self.speaking_history.pop(chat_id, None)
+        self.current_speakers.pop(chat_id, None)
+
+    async def get_context(self, chat_id: str, limit: int) -> List[dict]:
+        """
+        Get the latest `limit` messages of the symposium, oldest first. The chat
+        is only read to build the window; after that, it is kept up to date as
+        messages are added.
+        """
+        context = self.contexts.get(chat_id)
+        if context is None or context.maxlen != limit:
+            messages = await run_in_threadpool(
+                Chats.get_messages_map_by_chat_id, chat_id
+            )
+            context = build_context_window(messages or {}, limit)
+            self.contexts[chat_id] = context
+        return list(context)
+
+    def update_context(self, chat_id: str, message: dict):
+        """Add a message to the symposium's window, or update it if already there."""
+        context = self.contexts.get(chat_id)
+        if context is None:
+            return
+
+        for i in range(len(context) - 1, -1, -1):
+            if context[i]["id"] == message["id"]:
+                context[i] = {**context[i], **message}
+                return
+        context.append(message)
+
     async def notify_update(self, chat_id: str):
-        if chat_id in self.events:
+        if self.redis:
+            await self.send_command({"action": "wake", "chat_id": chat_id})
+        elif chat_id in self.events:
+            # The chat was changed outside of the symposium
+            self.contexts.pop(chat_id, None)
             self.events[chat_id].set()
 
-    def is_symposium_active(self, chat_id: str) -> bool:
+    async def is_symposium_active(self, chat_id: str) -> bool:
         """Check if a symposium is currently active."""
+        if self.redis:
+            return bool(await self.redis.sismember(self._active_key, chat_id))
         return chat_id in self.active_symposiums
 
-    def get_current_speaker(self, chat_id: str) -> Optional[str]:
-        """Get the current speaker in a symposium."""
-        return self.current_speakers.get(chat_id)
-
-    def find_next_active_bot(self, chat_id: str, models: List[str], start_model: str) -> Optional[str]:
+    def find_next_active_bot(
+        self, bot_states: Dict[str, str], models: List[str], start_model: str
+    ) -> Optional[str]:
         """
         Find the next active bot in the model list, starting from a given model.
         Returns None if no active bots are found.
@@ -123,72 +336,206 @@ class SymposiumManager:
         for i in range(len(models)):
             check_idx = (start_idx + i + 1) % len(models)
             m_id = models[check_idx]
-            if self.get_bot_state(chat_id, m_id) == BotState.ACTIVE:
+            if bot_states.get(m_id, BotState.ACTIVE.value) == BotState.ACTIVE.value:
                 return m_id
         return None
 
-    def find_any_active_bot(self, chat_id: str, models: List[str]) -> Optional[str]:
+    def find_any_active_bot(
+        self, bot_states: Dict[str, str], models: List[str]
+    ) -> Optional[str]:
         """Find any active bot in the symposium."""
         for m_id in models:
-            if self.get_bot_state(chat_id, m_id) == BotState.ACTIVE:
+            if bot_states.get(m_id, BotState.ACTIVE.value) == BotState.ACTIVE.value:
                 return m_id
         return None
 
-    async def start_symposium(self, chat_id: str):
-        if chat_id in self.active_symposiums:
-            return
+    ####################
+    # Lifecycle
+    ####################
 
-        log.info(f"Starting symposium for chat {chat_id}")
-        self.events[chat_id] = asyncio.Event()
-        self.bot_states[chat_id] = {}
-        self.speaking_history[chat_id] = []
-        self.current_speakers[chat_id] = None
-        task = asyncio.create_task(self.symposium_loop(chat_id))
-        self.active_symposiums[chat_id] = task
+    async def start_symposium(self, chat_id: str):
+        if self.redis:
+            if not await self.redis.sadd(self._active_key, chat_id):
+                return
+            log.info(f"Starting symposium for chat {chat_id}")
+            await self.clear_state(chat_id)
+            # Whichever worker has room claims it
+            await self.send_command({"action": "schedule"})
+        else:
+            if chat_id in self.active_symposiums:
+                return
+
+            log.info(f"Starting symposium for chat {chat_id}")
+            await self.clear_state(chat_id)
+            self.start_local(chat_id)
         
         # Notify clients that symposium is active
-        await sio.emit(
+        await self.emit(
+            chat_id,
             "symposium:started",
             {"chat_id": chat_id},
         )
 
     async def stop_symposium(self, chat_id: str):
-        if chat_id in self.active_symposiums:
-            log.info(f"Stopping symposium for chat {chat_id}")
-            task = self.active_symposiums[chat_id]
-            task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                log.debug(f"Symposium task {chat_id} cancelled successfully")
-            finally:
-                del self.active_symposiums[chat_id]
+        if self.redis:
+            await self.redis.srem(self._active_key, chat_id)
+            await self.send_command({"action": "stop", "chat_id": chat_id})
+
+        log.info(f"Stopping symposium for chat {chat_id}")
+        await self.stop_local(chat_id)
 
         # Clean up all state
-        if chat_id in self.events:
-            del self.events[chat_id]
-        
-        self.overrides.pop(chat_id, None)
-        self.whispers.pop(chat_id, None)
-        self.bot_states.pop(chat_id, None)
-        self.speaking_history.pop(chat_id, None)
-        self.current_speakers.pop(chat_id, None)
+        await self.clear_state(chat_id)
         
         # Notify clients that symposium stopped
-        await sio.emit(
+        await self.emit(
+            chat_id,
             "symposium:stopped",
             {"chat_id": chat_id},
         )
+        self.user_ids.pop(chat_id, None)
+
+    def start_local(self, chat_id: str):
+        """Run the symposium's loop on this worker."""
+        self.events[chat_id] = asyncio.Event()
+        self.active_symposiums[chat_id] = asyncio.create_task(
+            self.symposium_loop(chat_id)
+        )
+
+    async def stop_local(self, chat_id: str):
+        """Stop the symposium's loop on this worker and give up its lease."""
+        task = self.active_symposiums.pop(chat_id, None)
+        # The loop itself stops symposia whose chat is gone
+        if task and task is not asyncio.current_task():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                log.debug(f"Symposium task {chat_id} cancelled successfully")
+
+        self.events.pop(chat_id, None)
+        self.contexts.pop(chat_id, None)
+
+        lease = self.leases.pop(chat_id, None)
+        if lease:
+            try:
+                await lease.arelease_lock()
+            except Exception as e:
+                log.debug(f"Failed to release symposium lease for {chat_id}: {e}")
+
+    ####################
+    # Scheduling (Redis)
+    ####################
+
+    async def send_command(self, command: dict):
+        await self.redis.publish(self._commands_channel, json.dumps(command))
+
+    async def command_listener(self):
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(self._commands_channel)
+
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
+            try:
+                command = json.loads(message["data"])
+                action = command.get("action")
+                chat_id = command.get("chat_id")
+
+                if action == "wake" and chat_id in self.events:
+                    self.contexts.pop(chat_id, None)
+                    self.events[chat_id].set()
+                elif action == "append" and chat_id in self.events:
+                    self.update_context(chat_id, command["message"])
+                elif action == "stop" and chat_id in self.active_symposiums:
+                    await self.stop_local(chat_id)
+                elif action == "schedule":
+                    self.schedule_event.set()
+            except Exception as e:
+                log.exception(f"Error handling symposium command: {e}")
+
+    async def schedule_loop(self):
+        while True:
+            try:
+                await self.schedule()
+            except Exception as e:
+                log.warning(f"Symposium scheduling failed: {e}")
+
+            try:
+                await asyncio.wait_for(
+                    self.schedule_event.wait(), timeout=SYMPOSIUM_LEASE_TIMEOUT / 3
+                )
+            except asyncio.TimeoutError:
+                pass
+            self.schedule_event.clear()
+
+    async def schedule(self):
+        """
+        Renew the leases of the symposia running here, hand back the ones over
+        this worker's fair share and claim unowned ones up to it.
+        """
+        now = time.time()
+        await self.redis.hset(self._workers_key, self.worker_id, now)
+
+        for chat_id, lease in list(self.leases.items()):
+            if not await lease.arenew_lock():
+                log.warning(f"Lost the lease on symposium {chat_id}")
+                await self.stop_local(chat_id)
+
+        active = await self.redis.smembers(self._active_key)
+        for chat_id in list(self.leases):
+            if chat_id not in active:
+                await self.stop_local(chat_id)
+
+        workers = await self.redis.hgetall(self._workers_key)
+        stale_workers = [
+            worker_id
+            for worker_id, seen in workers.items()
+            if now - float(seen) > SYMPOSIUM_LEASE_TIMEOUT
+        ]
+        if stale_workers:
+            await self.redis.hdel(self._workers_key, *stale_workers)
+        share = math.ceil(len(active) / max(len(workers) - len(stale_workers), 1))
+
+        # Hand back symposia between turns, e.g. when another worker joined
+        excess = len(self.leases) - share
+        for chat_id in list(self.leases):
+            if excess <= 0:
+                break
+            if not await self.get_current_speaker(chat_id):
+                log.info(f"Handing symposium {chat_id} over to another worker")
+                await self.stop_local(chat_id)
+                excess -= 1
+        if excess < len(self.leases) - share:
+            await self.send_command({"action": "schedule"})
+
+        unowned = [chat_id for chat_id in active if chat_id not in self.leases]
+        random.shuffle(unowned)
+        for chat_id in unowned:
+            if len(self.leases) >= share:
+                break
+
+            lease = RedisLock(
+                redis_url=None,
+                lock_name=self._key(chat_id, "lease"),
+                timeout_secs=SYMPOSIUM_LEASE_TIMEOUT,
+                redis=self.redis,
+            )
+            if await lease.aacquire_lock():
+                log.info(f"Running symposium {chat_id} on worker {self.worker_id}")
+                self.leases[chat_id] = lease
+                self.start_local(chat_id)
 
     async def symposium_loop(self, chat_id: str):
         event = self.events[chat_id]
         try:
             while True:
                 try:
-                    chat = await run_in_threadpool(Chats.get_chat_by_id, chat_id)
+                    chat = await run_in_threadpool(Chats.get_chat_config_by_id, chat_id)
                     if not chat or chat.archived:
                         await self.stop_symposium(chat_id)
                         break
+                    self.user_ids[chat_id] = chat.user_id
 
                     config = chat.config or {}
                     if config.get("paused", False):
@@ -209,25 +556,18 @@ class SymposiumManager:
                         await asyncio.sleep(interval)
                         continue
 
-                    history = chat.chat.get('history', {}).get('messages', {})
-                    # Optimize sorting for large histories
-                    if len(history) > 50:
-                        recent_threshold = int(time.time()) - 3600  # Last hour
-                        recent_history = {k: v for k, v in history.items() 
-                                          if v.get('timestamp', 0) > recent_threshold}
-                        sorted_messages = sorted(recent_history.values(), key=lambda x: x.get('timestamp', 0))
-                    else:
-                        sorted_messages = sorted(history.values(), key=lambda x: x.get('timestamp', 0))
+                    context_limit = max(1, int(config.get("context_limit", 20)))
+                    recent_msgs = await self.get_context(chat_id, context_limit)
 
                     next_model_id = models[0]
-                    override_model = self.overrides.pop(chat_id, None)
+                    override_model = await self.pop_next_speaker(chat_id)
                     was_tagged = False
 
                     if override_model and override_model in models:
                         next_model_id = override_model
                         was_tagged = True
-                    elif sorted_messages:
-                        last_msg = sorted_messages[-1]
+                    elif recent_msgs:
+                        last_msg = recent_msgs[-1]
 
                         content = last_msg.get('content', '')
                         tags = re.findall(r'@(?:"([^"]+)"|([a-zA-Z0-9_.:-]+))', content)
@@ -257,11 +597,14 @@ class SymposiumManager:
                                 next_model_id = models[0]
                     
                     # Check bot state and find appropriate speaker
-                    bot_state = self.get_bot_state(chat_id, next_model_id)
-                    
+                    bot_states = await self.get_all_bot_states(chat_id)
+                    bot_state = BotState(
+                        bot_states.get(next_model_id, BotState.ACTIVE.value)
+                    )
+
                     if bot_state == BotState.MUTED:
                         # Muted bot can't speak, find any active bot
-                        active_bot = self.find_any_active_bot(chat_id, models)
+                        active_bot = self.find_any_active_bot(bot_states, models)
                         if active_bot:
                             next_model_id = active_bot
                         else:
@@ -274,7 +617,9 @@ class SymposiumManager:
                             continue
                     elif bot_state == BotState.LISTENING and not was_tagged:
                         # Listening bot only responds when tagged, find next active bot
-                        active_bot = self.find_next_active_bot(chat_id, models, next_model_id)
+                        active_bot = self.find_next_active_bot(
+                            bot_states, models, next_model_id
+                        )
                         if active_bot:
                             next_model_id = active_bot
                         else:
@@ -286,15 +631,12 @@ class SymposiumManager:
                                 pass
                             continue
 
-                    context_limit = int(config.get('context_limit', 20))
-                    recent_msgs = sorted_messages[-context_limit:]
-
                     messages_payload = []
 
                     system_prompt = config.get('prompt', 'You are in a symposium.')
                     system_prompt += f"\n\nParticipants: {', '.join(models)}"
 
-                    whisper = self.whispers.get(chat_id, {}).pop(next_model_id, None)
+                    whisper = await self.pop_whisper(chat_id, next_model_id)
                     if whisper:
                         system_prompt += (
                             f"\n\nPrivate Instruction for {next_model_id}: {whisper}"
@@ -304,6 +646,9 @@ class SymposiumManager:
 
                     for msg in recent_msgs:
                         content = msg.get('content', '')
+                        if not content:
+                            # Turns that failed before producing any output
+                            continue
                         author_name = msg.get('modelName') or msg.get('model') or 'User'
                         if msg.get('role') == 'user':
                             author_name = "User"
@@ -314,26 +659,15 @@ class SymposiumManager:
                         })
 
                     user = await run_in_threadpool(Users.get_user_by_id, chat.user_id)
-                    request = MockRequest(self.app)
-                    request.state.metadata = {
-                        "chat_id": chat_id,
-                        "session_id": "symposium-autonomy",
-                        "user_id": chat.user_id
-                    }
-
-                    form_data = {
-                        "model": next_model_id,
-                        "messages": messages_payload,
-                        "stream": False,
-                    }
 
                     log.info(f"Symposium {chat_id}: Generating response from {next_model_id}")
                     
                     # Set current speaker and update bot state
-                    self.current_speakers[chat_id] = next_model_id
+                    await self.set_current_speaker(chat_id, next_model_id)
                     await self.set_bot_state(chat_id, next_model_id, BotState.SPEAKING)
 
-                    await sio.emit(
+                    await self.emit(
+                        chat_id,
                         "symposium:status",
                         {
                             "chat_id": chat_id,
@@ -343,85 +677,28 @@ class SymposiumManager:
                     )
 
                     try:
-                        response = await generate_chat_completion(request, form_data, user)
-
-                        content = ""
-                        if isinstance(response, StreamingResponse):
-                            async for chunk in response.body_iterator:
-                                if isinstance(chunk, bytes):
-                                    chunk = chunk.decode('utf-8', errors='ignore')
-
-                                for line in chunk.split('\n'):
-                                    if line.startswith('data: '):
-                                        data_str = line[6:]
-                                        if data_str == '[DONE]':
-                                            continue
-                                        try:
-                                            data = json.loads(data_str)
-                                            if 'choices' in data:
-                                                delta = data['choices'][0].get('delta', {}).get('content', '')
-                                                content += delta
-                                            elif 'content' in data:
-                                                content += data['content']
-                                        except json.JSONDecodeError:
-                                            log.debug(f"Failed to parse JSON chunk: {data_str[:100]}")
-                                        except Exception as e:
-                                            log.error(f"Error parsing response chunk: {e}")
-                        elif isinstance(response, JSONResponse):
-                            body = json.loads(response.body)
-                            if 'choices' in body:
-                                content = body['choices'][0]['message']['content']
-                        elif isinstance(response, dict):
-                            if 'choices' in response:
-                                content = response['choices'][0]['message']['content']
-                            elif 'content' in response:
-                                content = response['content']
+                        content = await self.generate_turn(
+                            chat_id,
+                            user,
+                            next_model_id,
+                            messages_payload,
+                            recent_msgs[-1]["id"] if recent_msgs else None,
+                        )
 
                         if content:
-                            message_id = str(uuid.uuid4())
-                            message = {
-                                "id": message_id,
-                                "parentId": recent_msgs[-1]['id'] if recent_msgs else None,
-                                "childrenIds": [],
-                                "role": "assistant",
-                                "content": content,
-                                "model": next_model_id,
-                                "modelName": next_model_id,
-                                "timestamp": int(time.time())
-                            }
-
-                            await run_in_threadpool(
-                                Chats.upsert_message_to_chat_by_id_and_message_id,
-                                chat_id, message_id, message
-                            )
-
-                            if message['parentId']:
-                                parent = await run_in_threadpool(
-                                    Chats.get_message_by_id_and_message_id,
-                                    chat_id, message['parentId']
-                                )
-                                if parent:
-                                    parent['childrenIds'] = parent.get('childrenIds', []) + [message_id]
-                                    await run_in_threadpool(
-                                        Chats.upsert_message_to_chat_by_id_and_message_id,
-                                        chat_id, message['parentId'], parent
-                                    )
-
                             # Track speaking history
                             word_count = len(content.split())
-                            if chat_id not in self.speaking_history:
-                                self.speaking_history[chat_id] = []
-                            self.speaking_history[chat_id].append((int(time.time()), next_model_id, word_count))
-                            
-                            # Emit symposium message for real-time update
-                            await sio.emit("symposium:message", {"chat_id": chat_id, "message": message})
-                        
+                            await self.add_speaking_entry(
+                                chat_id, next_model_id, word_count
+                            )
+
                         # Reset bot state from speaking to previous state (active by default)
                         prev_state = BotState.ACTIVE
                         await self.set_bot_state(chat_id, next_model_id, prev_state)
-                        self.current_speakers[chat_id] = None
+                        await self.set_current_speaker(chat_id, None)
 
-                        await sio.emit(
+                        await self.emit(
+                            chat_id,
                             "symposium:status",
                             {
                                 "chat_id": chat_id,
@@ -433,14 +710,18 @@ class SymposiumManager:
                         log.error(f"Symposium {chat_id}: Model {next_model_id} failed: {e}")
                         # Reset bot state on error
                         await self.set_bot_state(chat_id, next_model_id, BotState.ACTIVE)
-                        self.current_speakers[chat_id] = None
-                        
-                        await sio.emit("symposium:status", {
-                            "chat_id": chat_id,
-                            "model": next_model_id,
-                            "status": f"Error: {str(e)[:100]}",
-                            "error": True
-                        })
+                        await self.set_current_speaker(chat_id, None)
+
+                        await self.emit(
+                            chat_id,
+                            "symposium:status",
+                            {
+                                "chat_id": chat_id,
+                                "model": next_model_id,
+                                "status": f"Error: {str(e)[:100]}",
+                                "error": True,
+                            },
+                        )
                         # Continue to next iteration instead of crashing
                         await asyncio.sleep(5)
                         continue
@@ -458,17 +739,137 @@ class SymposiumManager:
         except asyncio.CancelledError:
             log.info(f"Symposium loop cancelled for {chat_id}")
 
-    async def splice_message(self, chat_id: str, content: str, user_id: str):
+    async def add_message(self, chat_id: str, message: dict):
+        """Store a message in the chat, linked to its parent, and in the symposium's window."""
+        await run_in_threadpool(Chats.append_message_to_chat_by_id, chat_id, message)
+
+        if chat_id in self.contexts:
+            self.update_context(chat_id, message)
+        elif self.redis:
+            # The symposium may be running on another worker
+            await self.send_command(
+                {"action": "append", "chat_id": chat_id, "message": message}
+            )
+
+    async def generate_turn(
+        self,
+        chat_id: str,
+        user,
+        model_id: str,
+        messages: List[dict],
+        parent_id: Optional[str],
+    ) -> str:
+        """
+        Generate one participant's message through the regular chat pipeline,
+        streaming it to the chat owner as it is generated. Returns the content.
+        """
+        request = MockRequest(self.app)
+        if not self.app.state.MODELS:
+            await get_all_models(request, user=user)
+
+        model = self.app.state.MODELS.get(model_id)
+        if not model:
+            raise Exception(f"Model {model_id} not found")
+
+        # The placeholder message the streamed content is written into
+        message = {
+            "id": str(uuid.uuid4()),
+            "parentId": parent_id,
+            "childrenIds": [],
+            "role": "assistant",
+            "content": "",
+            "model": model_id,
+            "modelName": model.get("name", model_id),
+            "timestamp": int(time.time()),
+            "done": False,
+        }
+        await self.add_message(chat_id, message)
+        await self.emit(
+            chat_id, "symposium:message", {"chat_id": chat_id, "message": message}
+        )
+
+        metadata = {
+            "user_id": user.id,
+            "chat_id": chat_id,
+            "message_id": message["id"],
+            "session_id": "symposium-autonomy",
+            "filter_ids": [],
+            "tool_ids": None,
+            "tool_servers": None,
+            "files": None,
+            "features": {},
+            "variables": {},
+            "model": model,
+            "direct": False,
+            "params": {
+                "stream_delta_chunk_size": None,
+                "reasoning_tags": None,
+                "function_calling": "default",
+            },
+        }
+        request.state.metadata = metadata
+
+        form_data = {
+            "model": model_id,
+            "messages": messages,
+            "stream": True,
+            "metadata": metadata,
+        }
+
         try:
-            chat = await run_in_threadpool(Chats.get_chat_by_id, chat_id)
-            if not chat:
-                log.warning(f"splice_message: Chat {chat_id} not found")
-                return False
+            form_data, metadata, events = await process_chat_payload(
+                request, form_data, user, metadata, model
+            )
+            response = await generate_chat_completion(request, form_data, user)
+            # Streams `chat:completion` events to the owner and stores the content
+            await process_chat_response(
+                request, response, form_data, user, metadata, model, events, None
+            )
+        except Exception as e:
+            await run_in_threadpool(
+                Chats.upsert_message_to_chat_by_id_and_message_id,
+                chat_id,
+                message["id"],
+                {"error": {"content": str(e)}, "done": True},
+            )
+            await get_event_emitter(metadata)(
+                {"type": "chat:message:error", "data": {"error": {"content": str(e)}}}
+            )
+            raise
 
-            history = chat.chat.get('history', {}).get('messages', {})
-            sorted_messages = sorted(history.values(), key=lambda x: x.get('timestamp', 0))
+        # The response handler swallows cancellation after saving the partial message
+        if asyncio.current_task().cancelling():
+            raise asyncio.CancelledError()
 
-            parent_id = sorted_messages[-1]['id'] if sorted_messages else None
+        chat = await run_in_threadpool(
+            Chats.upsert_message_to_chat_by_id_and_message_id,
+            chat_id,
+            message["id"],
+            {"done": True},
+        )
+        if chat:
+            message = chat.chat["history"]["messages"][message["id"]]
+        self.update_context(chat_id, message)
+
+        # Emit the final message for clients that track completed turns
+        await self.emit(
+            chat_id, "symposium:message", {"chat_id": chat_id, "message": message}
+        )
+        return message.get("content", "")
+
+    async def splice_message(self, chat_id: str, content: str, user_id: str):
+        try:
+            context = self.contexts.get(chat_id)
+            if context is None:
+                messages = await run_in_threadpool(
+                    Chats.get_messages_map_by_chat_id, chat_id
+                )
+                if messages is None:
+                    log.warning(f"splice_message: Chat {chat_id} not found")
+                    return False
+                context = build_context_window(messages, 1)
+
+            parent_id = context[-1]["id"] if context else None
 
             message_id = str(uuid.uuid4())
             message = {
@@ -483,25 +884,12 @@ class SymposiumManager:
                 "type": "echo"
             }
 
-            await run_in_threadpool(
-                Chats.upsert_message_to_chat_by_id_and_message_id,
-                chat_id, message_id, message
-            )
-
-            if parent_id:
-                parent = await run_in_threadpool(
-                    Chats.get_message_by_id_and_message_id,
-                    chat_id, parent_id
-                )
-                if parent:
-                    parent['childrenIds'] = parent.get('childrenIds', []) + [message_id]
-                    await run_in_threadpool(
-                        Chats.upsert_message_to_chat_by_id_and_message_id,
-                        chat_id, parent_id, parent
-                    )
+            await self.add_message(chat_id, message)
 
             # Emit symposium message for real-time update
-            await sio.emit("symposium:message", {"chat_id": chat_id, "message": message})
+            await self.emit(
+                chat_id, "symposium:message", {"chat_id": chat_id, "message": message}
+            )
             return True
         except Exception as e:
             log.error(f"Error splicing message to {chat_id}: {e}")
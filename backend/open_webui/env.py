@@ -1,3 +1,4 @@
+import functools
 import importlib.metadata
 import json
 import logging
@@ -11,8 +12,6 @@ from cryptography.hazmat.primitives import serialization
 import re
 
 
-import markdown
-from bs4 import BeautifulSoup
 from open_webui.constants import ERROR_MESSAGES
 
 ####################################
@@ -162,45 +161,55 @@ def parse_section(section):
     return items
 
 
-try:
-    changelog_path = BASE_DIR / "CHANGELOG.md"
-    with open(str(changelog_path.absolute()), "r", encoding="utf8") as file:
-        changelog_content = file.read()
+@functools.lru_cache(maxsize=1)
+def get_changelog() -> dict:
+    """The changelog as JSON, parsed on first request rather than at startup."""
+    import markdown
+    from bs4 import BeautifulSoup
 
-except Exception:
-    changelog_content = (pkgutil.get_data("open_webui", "CHANGELOG.md") or b"").decode()
+    try:
+        changelog_path = BASE_DIR / "CHANGELOG.md"
+        with open(str(changelog_path.absolute()), "r", encoding="utf8") as file:
+            changelog_content = file.read()
+
+    except Exception:
+        changelog_content = (
+            pkgutil.get_data("open_webui", "CHANGELOG.md") or b""
+        ).decode()
+
+    # Convert markdown content to HTML
+    html_content = markdown.markdown(changelog_content)
 
-# Convert markdown content to HTML
-html_content = markdown.markdown(changelog_content)
+    # Parse the HTML content
+    soup = BeautifulSoup(html_content, "html.parser")
 
-# Parse the HTML content
-soup = BeautifulSoup(html_content, "html.parser")
+    # Initialize JSON structure
+    changelog_json = {}
 
-# Initialize JSON structure
-changelog_json = {}
+    # Iterate over each version
+    for version in soup.find_all("h2"):
+        # Remove brackets
+        version_number = version.get_text().strip().split(" - ")[0][1:-1]
+        date = version.get_text().strip().split(" - ")[1]
 
-# Iterate over each version
-for version in soup.find_all("h2"):
-    version_number = version.get_text().strip().split(" - ")[0][1:-1]  # Remove brackets
-    date = version.get_text().strip().split(" - ")[1]
+        version_data = {"date": date}
 
-    version_data = {"date": date}
+        # Find the next sibling that is a h3 tag (section title)
+        current = version.find_next_sibling()
 
-    # Find the next sibling that is a h3 tag (section title)
-    current = version.find_next_sibling()
+        while current and current.name != "h2":
+            if current.name == "h3":
+                section_title = current.get_text().lower()  # e.g., "added", "fixed"
+                section_items = parse_section(current.find_next_sibling("ul"))
+                version_data[section_title] = section_items
 
-    while current and current.name != "h2":
-        if current.name == "h3":
-            section_title = current.get_text().lower()  # e.g., "added", "fixed"
-            section_items = parse_section(current.find_next_sibling("ul"))
-            version_data[section_title] = section_items
+            # Move to the next element
+            current = current.find_next_sibling()
 
-        # Move to the next element
-        current = current.find_next_sibling()
+        changelog_json[version_number] = version_data
 
-    changelog_json[version_number] = version_data
+    return changelog_json
 
-CHANGELOG = changelog_json
 
 ####################################
 # SAFE_MODE
@@ -395,6 +404,28 @@ try:
 except ValueError:
     REDIS_SENTINEL_MAX_RETRY_COUNT = 2
 
+# Per-user index of chat/folder metadata used by the sidebar listings. Without
+# Redis each process keeps its own index, and a write only updates the index of
+# the worker that handled it, so with several workers the others serve a stale
+# sidebar for up to CHAT_INDEX_LOCAL_CACHE_TTL seconds. Enabled by default only
+# with Redis.
+ENABLE_CHAT_INDEX_CACHE = (
+    os.environ.get("ENABLE_CHAT_INDEX_CACHE", str(REDIS_URL != "")).lower() == "true"
+)
+
+CHAT_INDEX_CACHE_TTL = os.environ.get("CHAT_INDEX_CACHE_TTL", "86400")
+try:
+    CHAT_INDEX_CACHE_TTL = int(CHAT_INDEX_CACHE_TTL)
+except ValueError:
+    CHAT_INDEX_CACHE_TTL = 86400
+
+# Lifetime of the in-process index when several workers run without Redis
+CHAT_INDEX_LOCAL_CACHE_TTL = os.environ.get("CHAT_INDEX_LOCAL_CACHE_TTL", "10")
+try:
+    CHAT_INDEX_LOCAL_CACHE_TTL = int(CHAT_INDEX_LOCAL_CACHE_TTL)
+except ValueError:
+    CHAT_INDEX_LOCAL_CACHE_TTL = 10
+
 ####################################
 # UVICORN WORKERS
 ####################################
@@ -592,6 +623,34 @@ else:
         CHAT_RESPONSE_MAX_TOOL_CALL_RETRIES = 30
 
 
+# Maximum number of tool calls from a single model turn that run at the same time
+CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS = os.environ.get(
+    "CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS", "5"
+)
+
+if CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS == "":
+    CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS = 5
+else:
+    try:
+        CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS = max(
+            int(CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS), 1
+        )
+    except Exception:
+        CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS = 5
+
+
+# Per tool call timeout in seconds, empty for no timeout
+CHAT_RESPONSE_TOOL_CALL_TIMEOUT = os.environ.get("CHAT_RESPONSE_TOOL_CALL_TIMEOUT", "")
+
+if CHAT_RESPONSE_TOOL_CALL_TIMEOUT == "":
+    CHAT_RESPONSE_TOOL_CALL_TIMEOUT = None
+else:
+    try:
+        CHAT_RESPONSE_TOOL_CALL_TIMEOUT = float(CHAT_RESPONSE_TOOL_CALL_TIMEOUT) or None
+    except Exception:
+        CHAT_RESPONSE_TOOL_CALL_TIMEOUT = None
+
+
 CHAT_STREAM_RESPONSE_CHUNK_MAX_BUFFER_SIZE = os.environ.get(
     "CHAT_STREAM_RESPONSE_CHUNK_MAX_BUFFER_SIZE", ""
 )
@@ -710,6 +769,205 @@ AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL", "True").lower() == "true"
 )
 
+# Seconds between background refreshes of OpenAPI tool server specs, 0 to disable
+TOOL_SERVER_SPEC_REFRESH_INTERVAL = os.environ.get(
+    "TOOL_SERVER_SPEC_REFRESH_INTERVAL", "300"
+)
+
+try:
+    TOOL_SERVER_SPEC_REFRESH_INTERVAL = int(TOOL_SERVER_SPEC_REFRESH_INTERVAL)
+except Exception:
+    TOOL_SERVER_SPEC_REFRESH_INTERVAL = 300
+
+# Without Redis, workers do not share the tool server snapshot, so a request
+# refetches the specs (conditionally, with their ETags) once the snapshot of its
+# worker is older than this many seconds
+TOOL_SERVER_SPEC_LOCAL_CACHE_TTL = os.environ.get(
+    "TOOL_SERVER_SPEC_LOCAL_CACHE_TTL", "10"
+)
+
+try:
+    TOOL_SERVER_SPEC_LOCAL_CACHE_TTL = int(TOOL_SERVER_SPEC_LOCAL_CACHE_TTL)
+except Exception:
+    TOOL_SERVER_SPEC_LOCAL_CACHE_TTL = 10
+
+
+####################################
+# MCP
+####################################
+
+ENABLE_MCP_CLIENT_POOL = (
+    os.environ.get("ENABLE_MCP_CLIENT_POOL", "True").lower() == "true"
+)
+
+MCP_CLIENT_POOL_MAX_SIZE = os.environ.get("MCP_CLIENT_POOL_MAX_SIZE", "64")
+
+try:
+    MCP_CLIENT_POOL_MAX_SIZE = max(int(MCP_CLIENT_POOL_MAX_SIZE), 1)
+except Exception:
+    MCP_CLIENT_POOL_MAX_SIZE = 64
+
+# Seconds an unused pooled MCP session is kept open
+MCP_CLIENT_POOL_IDLE_TIMEOUT = os.environ.get("MCP_CLIENT_POOL_IDLE_TIMEOUT", "300")
+
+try:
+    MCP_CLIENT_POOL_IDLE_TIMEOUT = int(MCP_CLIENT_POOL_IDLE_TIMEOUT)
+except Exception:
+    MCP_CLIENT_POOL_IDLE_TIMEOUT = 300
+
+# Seconds a pooled session's tool list is reused before it is listed again
+MCP_TOOL_SPECS_CACHE_TTL = os.environ.get("MCP_TOOL_SPECS_CACHE_TTL", "300")
+
+try:
+    MCP_TOOL_SPECS_CACHE_TTL = int(MCP_TOOL_SPECS_CACHE_TTL)
+except Exception:
+    MCP_TOOL_SPECS_CACHE_TTL = 300
+
+
+####################################
+# CODE INTERPRETER
+####################################
+
+# Maximum number of kernels kept per Jupyter server; 0 starts a fresh kernel
+# for every execution
+CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE = os.environ.get(
+    "CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE", "10"
+)
+
+try:
+    CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE = max(
+        int(CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE), 0
+    )
+except Exception:
+    CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE = 10
+
+# Number of started, unused kernels kept ready for new executions
+CODE_INTERPRETER_JUPYTER_KERNEL_POOL_MIN_IDLE = os.environ.get(
+    "CODE_INTERPRETER_JUPYTER_KERNEL_POOL_MIN_IDLE", "1"
+)
+
+try:
+    CODE_INTERPRETER_JUPYTER_KERNEL_POOL_MIN_IDLE = max(
+        int(CODE_INTERPRETER_JUPYTER_KERNEL_POOL_MIN_IDLE), 0
+    )
+except Exception:
+    CODE_INTERPRETER_JUPYTER_KERNEL_POOL_MIN_IDLE = 1
+
+# Seconds an unused kernel (or a chat's kernel) is kept before it is shut down
+CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT = os.environ.get(
+    "CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT", "600"
+)
+
+try:
+    CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT = int(
+        CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT
+    )
+except Exception:
+    CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT = 600
+
+# Keep one kernel per chat so variables persist across turns
+ENABLE_CODE_INTERPRETER_JUPYTER_CHAT_KERNELS = (
+    os.environ.get("ENABLE_CODE_INTERPRETER_JUPYTER_CHAT_KERNELS", "False").lower()
+    == "true"
+)
+
+
+####################################
+# SYMPOSIUM
+####################################
+
+# Seconds a worker's claim on a running symposium lasts without renewal, i.e.
+# how long a symposium can stall before another worker takes it over
+SYMPOSIUM_LEASE_TIMEOUT = os.environ.get("SYMPOSIUM_LEASE_TIMEOUT", "30")
+
+try:
+    SYMPOSIUM_LEASE_TIMEOUT = max(int(SYMPOSIUM_LEASE_TIMEOUT), 3)
+except Exception:
+    SYMPOSIUM_LEASE_TIMEOUT = 30
+
+
+####################################
+# AUDIO
+####################################
+
+# Maximum size of the synthesized speech cache; the least recently used files
+# are removed beyond it. 0 keeps every file
+SPEECH_CACHE_MAX_SIZE_MB = os.environ.get("SPEECH_CACHE_MAX_SIZE_MB", "1024")
+
+try:
+    SPEECH_CACHE_MAX_SIZE_MB = max(int(SPEECH_CACHE_MAX_SIZE_MB), 0)
+except Exception:
+    SPEECH_CACHE_MAX_SIZE_MB = 1024
+
+# Synthesize the sentences of a long text in parallel and stream them in order
+# (MP3 output only), so playback starts after the first sentence
+ENABLE_TTS_SENTENCE_STREAMING = (
+    os.environ.get("ENABLE_TTS_SENTENCE_STREAMING", "False").lower() == "true"
+)
+
+# Maximum number of sentences of one text synthesized at the same time
+TTS_SENTENCE_STREAMING_CONCURRENCY = os.environ.get(
+    "TTS_SENTENCE_STREAMING_CONCURRENCY", "4"
+)
+
+try:
+    TTS_SENTENCE_STREAMING_CONCURRENCY = max(int(TTS_SENTENCE_STREAMING_CONCURRENCY), 1)
+except Exception:
+    TTS_SENTENCE_STREAMING_CONCURRENCY = 4
+
+# Longest piece of audio transcribed at once; longer recordings are cut into
+# pieces at the quietest moment near this length
+AUDIO_STT_CHUNK_SECONDS = os.environ.get("AUDIO_STT_CHUNK_SECONDS", "120")
+
+try:
+    AUDIO_STT_CHUNK_SECONDS = max(int(AUDIO_STT_CHUNK_SECONDS), 10)
+except Exception:
+    AUDIO_STT_CHUNK_SECONDS = 120
+
+# Maximum number of audio pieces transcribed at the same time, across requests
+AUDIO_STT_MAX_WORKERS = os.environ.get("AUDIO_STT_MAX_WORKERS", "4")
+
+try:
+    AUDIO_STT_MAX_WORKERS = max(int(AUDIO_STT_MAX_WORKERS), 1)
+except Exception:
+    AUDIO_STT_MAX_WORKERS = 4
+
+# Local faster-whisper model settings
+WHISPER_COMPUTE_TYPE = os.environ.get("WHISPER_COMPUTE_TYPE", "int8")
+
+# CPU threads used by each whisper worker; 0 lets CTranslate2 decide
+WHISPER_CPU_THREADS = os.environ.get("WHISPER_CPU_THREADS", "0")
+
+try:
+    WHISPER_CPU_THREADS = max(int(WHISPER_CPU_THREADS), 0)
+except Exception:
+    WHISPER_CPU_THREADS = 0
+
+# Number of transcriptions the local model runs at the same time
+WHISPER_WORKERS = os.environ.get("WHISPER_WORKERS", "1")
+
+try:
+    WHISPER_WORKERS = max(int(WHISPER_WORKERS), 1)
+except Exception:
+    WHISPER_WORKERS = 1
+
+# Maximum number of short utterances transcribed together in one batch;
+# 1 disables batching
+WHISPER_BATCH_SIZE = os.environ.get("WHISPER_BATCH_SIZE", "8")
+
+try:
+    WHISPER_BATCH_SIZE = max(int(WHISPER_BATCH_SIZE), 1)
+except Exception:
+    WHISPER_BATCH_SIZE = 8
+
+# Milliseconds a worker waits for more utterances to fill a batch
+WHISPER_BATCH_WAIT_MS = os.environ.get("WHISPER_BATCH_WAIT_MS", "50")
+
+try:
+    WHISPER_BATCH_WAIT_MS = max(int(WHISPER_BATCH_WAIT_MS), 0)
+except Exception:
+    WHISPER_BATCH_WAIT_MS = 50
+
 
 ####################################
 # SENTENCE TRANSFORMERS
@@ -734,6 +992,13 @@ else:
     except Exception:
         SENTENCE_TRANSFORMERS_MODEL_KWARGS = None
 
+# Quantized ONNX export of the embedding model to load with the "onnx" backend,
+# e.g. "qint8_avx512", "qint8_avx512_vnni", "quint8_avx2" or "qint8_arm64";
+# loads onnx/model_<quantization>.onnx unless the model kwargs name a file
+SENTENCE_TRANSFORMERS_ONNX_QUANTIZATION = os.environ.get(
+    "SENTENCE_TRANSFORMERS_ONNX_QUANTIZATION", ""
+)
+
 
 SENTENCE_TRANSFORMERS_CROSS_ENCODER_BACKEND = os.environ.get(
     "SENTENCE_TRANSFORMERS_CROSS_ENCODER_BACKEND", ""
@@ -755,6 +1020,107 @@ else:
     except Exception:
         SENTENCE_TRANSFORMERS_CROSS_ENCODER_MODEL_KWARGS = None
 
+####################################
+# RERANKING
+####################################
+
+# Number of threads running reranking requests
+RERANKING_WORKERS = os.environ.get("RERANKING_WORKERS", "2")
+
+try:
+    RERANKING_WORKERS = max(int(RERANKING_WORKERS), 1)
+except Exception:
+    RERANKING_WORKERS = 2
+
+# Maximum number of (query, document) pairs scored together by a local
+# cross-encoder, across concurrent requests
+RERANKING_BATCH_SIZE = os.environ.get("RERANKING_BATCH_SIZE", "64")
+
+try:
+    RERANKING_BATCH_SIZE = max(int(RERANKING_BATCH_SIZE), 1)
+except Exception:
+    RERANKING_BATCH_SIZE = 64
+
+# Milliseconds a worker waits for more requests to fill a batch
+RERANKING_BATCH_WAIT_MS = os.environ.get("RERANKING_BATCH_WAIT_MS", "10")
+
+try:
+    RERANKING_BATCH_WAIT_MS = max(int(RERANKING_BATCH_WAIT_MS), 0)
+except Exception:
+    RERANKING_BATCH_WAIT_MS = 10
+
+# Seconds a search waits for reranking before keeping the retrieval order;
+# empty for no timeout
+RERANKING_TIMEOUT = os.environ.get("RERANKING_TIMEOUT", "30")
+
+if RERANKING_TIMEOUT == "":
+    RERANKING_TIMEOUT = None
+else:
+    try:
+        RERANKING_TIMEOUT = float(RERANKING_TIMEOUT) or None
+    except Exception:
+        RERANKING_TIMEOUT = 30.0
+
+# Maximum number of reranker scores kept for repeated (query, chunk) pairs;
+# 0 disables the cache
+RERANKING_CACHE_SIZE = os.environ.get("RERANKING_CACHE_SIZE", "10000")
+
+try:
+    RERANKING_CACHE_SIZE = max(int(RERANKING_CACHE_SIZE), 0)
+except Exception:
+    RERANKING_CACHE_SIZE = 10000
+
+# Seconds a cached reranker score is reused; 0 keeps scores until evicted
+RERANKING_CACHE_TTL = os.environ.get("RERANKING_CACHE_TTL", "3600")
+
+try:
+    RERANKING_CACHE_TTL = max(int(RERANKING_CACHE_TTL), 0)
+except Exception:
+    RERANKING_CACHE_TTL = 3600
+
+####################################
+# EMBEDDING SERVER
+####################################
+
+EMBEDDING_SERVER_HOST = os.environ.get("EMBEDDING_SERVER_HOST", "127.0.0.1")
+
+try:
+    EMBEDDING_SERVER_PORT = int(os.environ.get("EMBEDDING_SERVER_PORT", "8090"))
+except Exception:
+    EMBEDDING_SERVER_PORT = 8090
+
+# Comma-separated models the embedding server loads on request, besides the
+# RAG_EMBEDDING_MODEL currently set in the admin settings
+EMBEDDING_SERVER_MODELS = [
+    model.strip()
+    for model in os.environ.get("EMBEDDING_SERVER_MODELS", "").split(",")
+    if model.strip()
+]
+
+# Number of processes of the embedding server, each holding one model copy
+EMBEDDING_SERVER_WORKERS = os.environ.get("EMBEDDING_SERVER_WORKERS", "1")
+
+try:
+    EMBEDDING_SERVER_WORKERS = max(int(EMBEDDING_SERVER_WORKERS), 1)
+except Exception:
+    EMBEDDING_SERVER_WORKERS = 1
+
+# Maximum number of texts encoded together in one model call, across requests
+EMBEDDING_SERVER_BATCH_SIZE = os.environ.get("EMBEDDING_SERVER_BATCH_SIZE", "64")
+
+try:
+    EMBEDDING_SERVER_BATCH_SIZE = max(int(EMBEDDING_SERVER_BATCH_SIZE), 1)
+except Exception:
+    EMBEDDING_SERVER_BATCH_SIZE = 64
+
+# Milliseconds a process waits for more requests to fill a batch
+EMBEDDING_SERVER_BATCH_WAIT_MS = os.environ.get("EMBEDDING_SERVER_BATCH_WAIT_MS", "5")
+
+try:
+    EMBEDDING_SERVER_BATCH_WAIT_MS = max(int(EMBEDDING_SERVER_BATCH_WAIT_MS), 0)
+except Exception:
+    EMBEDDING_SERVER_BATCH_WAIT_MS = 5
+
 ####################################
 # OFFLINE_MODE
 ####################################
@@ -101,6 +101,8 @@ from open_webui.routers.retrieval import (
     get_ef,
     get_rf,
 )
+from open_webui.retrieval.models.lazy import apreload_models
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 
 from open_webui.internal.db import Session, engine
 
@@ -209,6 +211,7 @@ from open_webui.config import (
     FIRECRAWL_API_KEY,
     WEB_LOADER_ENGINE,
     WEB_LOADER_CONCURRENT_REQUESTS,
+    WEB_LOADER_TIMEOUT,
     WHISPER_MODEL,
     WHISPER_VAD_FILTER,
     WHISPER_LANGUAGE,
@@ -229,6 +232,7 @@ from open_webui.config import (
     RAG_EXTERNAL_RERANKER_API_KEY,
     RAG_RERANKING_MODEL_AUTO_UPDATE,
     RAG_RERANKING_MODEL_TRUST_REMOTE_CODE,
+    RAG_MODELS_PRELOAD,
     RAG_EMBEDDING_ENGINE,
     RAG_EMBEDDING_BATCH_SIZE,
     RAG_TOP_K,
@@ -446,7 +450,7 @@ from open_webui.env import (
     LICENSE_KEY,
     AUDIT_EXCLUDED_PATHS,
     AUDIT_LOG_LEVEL,
-    CHANGELOG,
+    get_changelog,
     REDIS_URL,
     REDIS_CLUSTER,
     REDIS_KEY_PREFIX,
@@ -479,6 +483,7 @@ from open_webui.env import (
     EXTERNAL_PWA_MANIFEST_URL,
     AIOHTTP_CLIENT_SESSION_SSL,
     ENABLE_STAR_SESSIONS_MIDDLEWARE,
+    TOOL_SERVER_SPEC_REFRESH_INTERVAL,
 )
 from open_webui.internal.db import get_db
 
@@ -496,6 +501,8 @@ from open_webui.utils.chat import (
 )
 from open_webui.utils.embeddings import generate_embeddings
 from open_webui.utils.middleware import process_chat_payload, process_chat_response
+from open_webui.utils.mcp.pool import MCP_CLIENT_POOL
+from open_webui.utils.code_interpreter import close_jupyter_kernel_pools
 from open_webui.utils.access_control import has_access
 
 from open_webui.utils.auth import (
@@ -506,6 +513,7 @@ from open_webui.utils.auth import (
     get_verified_user,
 )
 from open_webui.utils.plugin import install_tool_and_function_dependencies
+from open_webui.utils.tools import periodic_tool_servers_refresh
 from open_webui.utils.oauth import (
     get_oauth_client_info_with_dynamic_client_registration,
     encrypt_data,
@@ -608,6 +616,25 @@ async def lifespan(app: FastAPI):
 
     asyncio.create_task(periodic_usage_pool_cleanup())
 
+    if RAG_MODELS_PRELOAD:
+        # Load local models and the vector db client while the rest of the startup runs
+        app.state.models_preload_task = asyncio.create_task(
+            apreload_models(app.state.ef, app.state.rf)
+        )
+        app.state.vector_db_preload_task = asyncio.create_task(
+            VECTOR_DB_CLIENT.apreload()
+        )
+
+    if MCP_CLIENT_POOL:
+        app.state.mcp_client_pool_reaper_task = asyncio.create_task(
+            MCP_CLIENT_POOL.reap()
+        )
+
+    if TOOL_SERVER_SPEC_REFRESH_INTERVAL > 0:
+        app.state.tool_servers_refresh_task = asyncio.create_task(
+            periodic_tool_servers_refresh(app)
+        )
+
     symposium_manager.init_app(app)
     # Restart active symposiums
     with get_db() as db:
@@ -642,9 +669,24 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    await symposium_manager.shutdown()
+
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    if hasattr(app.state, "tool_servers_refresh_task"):
+        app.state.tool_servers_refresh_task.cancel()
+
+    if hasattr(app.state, "mcp_client_pool_reaper_task"):
+        app.state.mcp_client_pool_reaper_task.cancel()
+
+    if MCP_CLIENT_POOL:
+        await MCP_CLIENT_POOL.close()
+
+    await VECTOR_DB_CLIENT.aclose()
+
+    await close_jupyter_kernel_pools()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -721,6 +763,8 @@ app.state.OPENAI_MODELS = {}
 
 app.state.config.TOOL_SERVER_CONNECTIONS = TOOL_SERVER_CONNECTIONS
 app.state.TOOL_SERVERS = []
+app.state.TOOL_SERVERS_BY_ID = {}
+app.state.TOOL_SERVERS_VERSION = None
 
 ########################################
 #
@@ -949,6 +993,7 @@ app.state.config.WEB_SEARCH_CONCURRENT_REQUESTS = WEB_SEARCH_CONCURRENT_REQUESTS
 
 app.state.config.WEB_LOADER_ENGINE = WEB_LOADER_ENGINE
 app.state.config.WEB_LOADER_CONCURRENT_REQUESTS = WEB_LOADER_CONCURRENT_REQUESTS
+app.state.config.WEB_LOADER_TIMEOUT = WEB_LOADER_TIMEOUT
 
 app.state.config.WEB_SEARCH_TRUST_ENV = WEB_SEARCH_TRUST_ENV
 app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL = (
@@ -1014,6 +1059,7 @@ try:
         app.state.config.RAG_EMBEDDING_ENGINE,
         app.state.config.RAG_EMBEDDING_MODEL,
         RAG_EMBEDDING_MODEL_AUTO_UPDATE,
+        lazy=True,
     )
     if (
         app.state.config.ENABLE_RAG_HYBRID_SEARCH
@@ -1025,6 +1071,7 @@ try:
             app.state.config.RAG_EXTERNAL_RERANKER_URL,
             app.state.config.RAG_EXTERNAL_RERANKER_API_KEY,
             RAG_RERANKING_MODEL_AUTO_UPDATE,
+            lazy=True,
         )
     else:
         app.state.rf = None
@@ -1715,7 +1762,10 @@ async def chat_completion(
             try:
                 if mcp_clients := metadata.get("mcp_clients"):
                     for client in reversed(mcp_clients.values()):
-                        await client.disconnect()
+                        if MCP_CLIENT_POOL:
+                            await MCP_CLIENT_POOL.release(client)
+                        else:
+                            await client.disconnect()
             except Exception as e:
                 log.debug(f"Error cleaning up: {e}")
                 pass
@@ -2035,7 +2085,8 @@ async def get_app_latest_release_version(user=Depends(get_verified_user)):
 
 @app.get("/api/changelog")
 async def get_app_changelog():
-    return {key: CHANGELOG[key] for idx, key in enumerate(CHANGELOG) if idx < 5}
+    changelog = get_changelog()
+    return {key: changelog[key] for idx, key in enumerate(changelog) if idx < 5}
 
 
 @app.get("/api/usage")
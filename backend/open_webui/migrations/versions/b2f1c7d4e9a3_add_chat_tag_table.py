@@ -0,0 +1,91 @@
+"""Add chat_tag table
+
+Revision ID: b2f1c7d4e9a3
+Revises: 37f288994c47
+Create Date: 2025-11-24 10:12:41.318207
+
+"""
+
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b2f1c7d4e9a3"
+down_revision: Union[str, None] = "37f288994c47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    # 1. Create the chat <-> tag association table
+    op.create_table(
+        "chat_tag",
+        sa.Column(
+            "chat_id",
+            sa.Text(),
+            sa.ForeignKey("chat.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("tag_id", sa.Text(), nullable=False),
+        sa.Column("user_id", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("chat_id", "tag_id", name="pk_chat_id_tag_id"),
+    )
+    op.create_index("chat_tag_user_id_tag_id_idx", "chat_tag", ["user_id", "tag_id"])
+
+    # 2. Backfill from chat.meta.tags (shared chat copies are not indexed)
+    connection = op.get_bind()
+
+    chat_table = sa.Table(
+        "chat",
+        sa.MetaData(),
+        sa.Column("id", sa.Text()),
+        sa.Column("user_id", sa.Text()),
+        sa.Column("meta", sa.JSON()),
+    )
+    chat_tag_table = sa.Table(
+        "chat_tag",
+        sa.MetaData(),
+        sa.Column("chat_id", sa.Text()),
+        sa.Column("tag_id", sa.Text()),
+        sa.Column("user_id", sa.Text()),
+    )
+
+    results = connection.execute(
+        sa.select(chat_table.c.id, chat_table.c.user_id, chat_table.c.meta).where(
+            sa.not_(chat_table.c.user_id.like("shared-%"))
+        )
+    ).fetchall()
+
+    rows = []
+    for chat_id, user_id, meta in results:
+        if isinstance(meta, str):
+            try:
+                meta = json.loads(meta)
+            except Exception:
+                continue  # skip invalid JSON
+
+        tags = meta.get("tags", []) if isinstance(meta, dict) else []
+        if not isinstance(tags, list):
+            continue
+
+        for tag_id in set(tag for tag in tags if isinstance(tag, str)):
+            rows.append({"chat_id": chat_id, "tag_id": tag_id, "user_id": user_id})
+
+        if len(rows) >= BATCH_SIZE:
+            connection.execute(chat_tag_table.insert(), rows)
+            rows = []
+
+    if rows:
+        connection.execute(chat_tag_table.insert(), rows)
+
+
+def downgrade() -> None:
+    # chat.meta.tags is kept in sync, so the association table can simply be dropped
+    op.drop_index("chat_tag_user_id_tag_id_idx", table_name="chat_tag")
+    op.drop_table("chat_tag")
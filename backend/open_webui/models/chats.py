@@ -7,10 +7,21 @@ from typing import Optional
 from open_webui.internal.db import Base, get_db
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.folders import Folders
+from open_webui.utils.chat_index import CHAT_INDEX
 from open_webui.env import SRC_LOG_LEVELS
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON, Index
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    ForeignKey,
+    String,
+    Text,
+    JSON,
+    Index,
+    PrimaryKeyConstraint,
+)
 from sqlalchemy import or_, func, select, and_, text
 from sqlalchemy.sql import exists
 from sqlalchemy.sql.expression import bindparam
@@ -59,6 +70,25 @@ class Chat(Base):
     )
 
 
+class ChatTag(Base):
+    """
+    Chat <-> tag association, kept in sync with `Chat.meta["tags"]` so tag
+    filtering and counting are index lookups instead of JSON scans.
+    """
+
+    __tablename__ = "chat_tag"
+
+    chat_id = Column(Text, ForeignKey("chat.id", ondelete="CASCADE"), nullable=False)
+    tag_id = Column(Text, nullable=False)
+    user_id = Column(Text, nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("chat_id", "tag_id", name="pk_chat_id_tag_id"),
+        # WHERE user_id = ... AND tag_id = ...
+        Index("chat_tag_user_id_tag_id_idx", "user_id", "tag_id"),
+    )
+
+
 class ChatModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -137,6 +167,14 @@ class ChatTitleIdResponse(BaseModel):
     mode: Optional[str] = None
 
 
+class ChatConfigResponse(BaseModel):
+    id: str
+    user_id: str
+    archived: bool = False
+    mode: Optional[str] = None
+    config: Optional[dict] = None
+
+
 class ChatTable:
     def _clean_null_bytes(self, obj):
         """
@@ -175,6 +213,67 @@ class ChatTable:
 
         return changed
 
+    def _chat_index_entry(self, chat) -> dict:
+        return {
+            "id": chat.id,
+            "title": chat.title,
+            "updated_at": chat.updated_at,
+            "created_at": chat.created_at,
+            "mode": chat.mode,
+            "folder_id": chat.folder_id,
+            "pinned": bool(chat.pinned),
+            "archived": bool(chat.archived),
+            "tags": (chat.meta or {}).get("tags", []),
+        }
+
+    def _update_chat_index(self, chat):
+        if CHAT_INDEX and chat is not None:
+            CHAT_INDEX.upsert("chats", chat.user_id, self._chat_index_entry(chat))
+
+    def _remove_from_chat_index(self, user_id: str, ids: list[str]):
+        if CHAT_INDEX:
+            CHAT_INDEX.remove("chats", user_id, ids)
+
+    def _invalidate_chat_index(self, user_id: str):
+        if CHAT_INDEX:
+            CHAT_INDEX.invalidate(user_id, "chats")
+
+    def _set_chat_tags(self, db, chat, tag_ids: list[str]):
+        # Keeps `meta.tags` and the chat_tag rows in sync within the caller's transaction
+        tag_ids = list(dict.fromkeys(tag_ids))
+        chat.meta = {**(chat.meta or {}), "tags": tag_ids}
+
+        db.query(ChatTag).filter_by(chat_id=chat.id).delete()
+        db.add_all(
+            [
+                ChatTag(chat_id=chat.id, tag_id=tag_id, user_id=chat.user_id)
+                for tag_id in tag_ids
+            ]
+        )
+
+    def _get_chat_index_entries(self, user_id: str) -> list[dict]:
+        def load_entries():
+            with get_db() as db:
+                rows = (
+                    db.query(Chat)
+                    .filter_by(user_id=user_id)
+                    .with_entities(
+                        Chat.id,
+                        Chat.title,
+                        Chat.updated_at,
+                        Chat.created_at,
+                        Chat.mode,
+                        Chat.folder_id,
+                        Chat.pinned,
+                        Chat.archived,
+                        Chat.meta,
+                    )
+                    .all()
+                )
+                return [self._chat_index_entry(row) for row in rows]
+
+        return CHAT_INDEX.get("chats", user_id, load_entries)
+
     def insert_new_chat(self, user_id: str, form_data: ChatForm) -> Optional[ChatModel]:
         with get_db() as db:
             id = str(uuid.uuid4())
@@ -200,6 +299,7 @@ class ChatTable:
             db.add(chat_item)
             db.commit()
             db.refresh(chat_item)
+            self._update_chat_index(chat_item)
             return ChatModel.model_validate(chat_item) if chat_item else None
 
     def _chat_import_form_to_chat_model(
@@ -238,7 +338,15 @@ class ChatTable:
                 chats.append(Chat(**chat.model_dump()))
 
             db.add_all(chats)
+            db.add_all(
+                [
+                    ChatTag(chat_id=chat.id, tag_id=tag_id, user_id=user_id)
+                    for chat in chats
+                    for tag_id in set((chat.meta or {}).get("tags", []))
+                ]
+            )
             db.commit()
+            self._invalidate_chat_index(user_id)
             return [ChatModel.model_validate(chat) for chat in chats]
 
     def update_chat_by_id(self, id: str, chat: dict) -> Optional[ChatModel]:
@@ -256,6 +364,7 @@ class ChatTable:
 
                 db.commit()
                 db.refresh(chat_item)
+                self._update_chat_index(chat_item)
 
                 return ChatModel.model_validate(chat_item)
         except Exception:
@@ -269,6 +378,7 @@ class ChatTable:
                 chat_item.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat_item)
+                self._update_chat_index(chat_item)
                 return ChatModel.model_validate(chat_item)
         except Exception:
             return None
@@ -290,17 +400,17 @@ class ChatTable:
         if chat is None:
             return None
 
+        old_tags = chat.meta.get("tags", [])
         self.delete_all_tags_by_id_and_user_id(id, user.id)
 
-        for tag in chat.meta.get("tags", []):
-            if self.count_chats_by_tag_name_and_user_id(tag, user.id) == 0:
+        counts = self.count_chats_by_tag_names_and_user_id(old_tags, user.id)
+        for tag in old_tags:
+            if counts.get(tag, 0) == 0:
                 Tags.delete_tag_by_name_and_user_id(tag, user.id)
 
-        for tag_name in tags:
-            if tag_name.lower() == "none":
-                continue
-
-            self.add_chat_tag_by_id_and_user_id_and_tag_name(id, user.id, tag_name)
+        self.add_chat_tags_by_id_and_user_id_and_tag_names(
+            id, user.id, [tag_name for tag_name in tags if tag_name.lower() != "none"]
+        )
         return self.get_chat_by_id(id)
 
     def get_chat_title_by_id(self, id: str) -> Optional[str]:
@@ -353,6 +463,48 @@ class ChatTable:
         chat["history"] = history
         return self.update_chat_by_id(id, chat)
 
+    def append_message_to_chat_by_id(
+        self, id: str, message: dict
+    ) -> Optional[ChatModel]:
+        """
+        Add a new message and link it to its parent in a single read and
+        write of the chat, making it the current message.
+        """
+        try:
+            with get_db() as db:
+                chat_item = db.get(Chat, id)
+                if chat_item is None:
+                    return None
+
+                # Copy what changes, so the stored JSON is not modified in place
+                chat = chat_item.chat or {}
+                history = {**chat.get("history", {})}
+                messages = {**history.get("messages", {})}
+
+                message = self._clean_null_bytes(message)
+                messages[message["id"]] = message
+
+                parent_id = message.get("parentId")
+                if parent_id in messages:
+                    messages[parent_id] = {
+                        **messages[parent_id],
+                        "childrenIds": messages[parent_id].get("childrenIds", [])
+                        + [message["id"]],
+                    }
+
+                history["messages"] = messages
+                history["currentId"] = message["id"]
+                chat_item.chat = {**chat, "history": history}
+                chat_item.updated_at = int(time.time())
+
+                db.commit()
+                db.refresh(chat_item)
+                self._update_chat_index(chat_item)
+
+                return ChatModel.model_validate(chat_item)
+        except Exception:
+            return None
+
     def add_message_status_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, status: dict
     ) -> Optional[ChatModel]:
@@ -466,6 +618,7 @@ class ChatTable:
             with get_db() as db:
                 db.query(Chat).filter_by(user_id=user_id).update({"archived": False})
                 db.commit()
+                self._invalidate_chat_index(user_id)
                 return True
         except Exception:
             return False
@@ -491,6 +644,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
+                self._update_chat_index(chat)
                 return ChatModel.model_validate(chat)
         except Exception:
             return None
@@ -504,6 +658,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
+                self._update_chat_index(chat)
                 return ChatModel.model_validate(chat)
         except Exception:
             return None
@@ -513,6 +668,7 @@ class ChatTable:
             with get_db() as db:
                 db.query(Chat).filter_by(user_id=user_id).update({"archived": True})
                 db.commit()
+                self._invalidate_chat_index(user_id)
                 return True
         except Exception:
             return False
@@ -605,6 +761,23 @@ class ChatTable:
         skip: Optional[int] = None,
         limit: Optional[int] = None,
     ) -> list[ChatTitleIdResponse]:
+        if CHAT_INDEX:
+            entries = [
+                entry
+                for entry in self._get_chat_index_entries(user_id)
+                if (include_folders or entry["folder_id"] is None)
+                and (include_pinned or not entry["pinned"])
+                and (include_archived or not entry["archived"])
+            ]
+            entries.sort(key=lambda entry: entry["updated_at"], reverse=True)
+
+            start = skip or 0
+            end = start + limit if limit else None
+            return [
+                ChatTitleIdResponse.model_validate(entry)
+                for entry in entries[start:end]
+            ]
+
         with get_db() as db:
             query = db.query(Chat).filter_by(user_id=user_id)
 
@@ -665,11 +838,36 @@ class ChatTable:
                 if self._sanitize_chat_row(chat_item):
                     db.commit()
                     db.refresh(chat_item)
+                    self._update_chat_index(chat_item)
 
                 return ChatModel.model_validate(chat_item)
         except Exception:
             return None
 
+    def get_chat_config_by_id(self, id: str) -> Optional[ChatConfigResponse]:
+        """Get a chat's owner, state and config without loading its messages."""
+        with get_db() as db:
+            chat = (
+                db.query(Chat)
+                .filter_by(id=id)
+                .with_entities(
+                    Chat.id, Chat.user_id, Chat.archived, Chat.mode, Chat.config
+                )
+                .first()
+            )
+            if chat is None:
+                return None
+
+            return ChatConfigResponse.model_validate(
+                {
+                    "id": chat[0],
+                    "user_id": chat[1],
+                    "archived": bool(chat[2]),
+                    "mode": chat[3],
+                    "config": chat[4],
+                }
+            )
+
     def get_chat_by_share_id(self, id: str) -> Optional[ChatModel]:
         try:
             with get_db() as db:
@@ -710,6 +908,23 @@ class ChatTable:
             )
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
+    def get_pinned_chat_title_id_list_by_user_id(
+        self, user_id: str
+    ) -> list[ChatTitleIdResponse]:
+        if CHAT_INDEX:
+            entries = [
+                entry
+                for entry in self._get_chat_index_entries(user_id)
+                if entry["pinned"] and not entry["archived"]
+            ]
+            entries.sort(key=lambda entry: entry["updated_at"], reverse=True)
+            return [ChatTitleIdResponse.model_validate(entry) for entry in entries]
+
+        return [
+            ChatTitleIdResponse(**chat.model_dump())
+            for chat in self.get_pinned_chats_by_user_id(user_id)
+        ]
+
     def get_pinned_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
             all_chats = (
@@ -818,6 +1033,21 @@ class ChatTable:
             if folder_ids:
                 query = query.filter(Chat.folder_id.in_(folder_ids))
 
+            # Check if there are any tags to filter, it should have all the tags
+            if "none" in tag_ids:
+                query = query.filter(~exists().where(ChatTag.chat_id == Chat.id))
+            elif tag_ids:
+                query = query.filter(
+                    and_(
+                        *[
+                            exists().where(
+                                ChatTag.chat_id == Chat.id, ChatTag.tag_id == tag_id
+                            )
+                            for tag_id in tag_ids
+                        ]
+                    )
+                )
+
             query = query.order_by(Chat.updated_at.desc())
 
             # Check if the database dialect is either 'sqlite' or 'postgresql'
@@ -838,36 +1068,6 @@ class ChatTable:
                     ).params(title_key=f"%{search_text}%", content_key=search_text)
                 )
 
-                # Check if there are any tags to filter, it should have all the tags
-                if "none" in tag_ids:
-                    query = query.filter(
-                        text(
-                            """
-                            NOT EXISTS (
-                                SELECT 1
-                                FROM json_each(Chat.meta, '$.tags') AS tag
-                            )
-                            """
-                        )
-                    )
-                elif tag_ids:
-                    query = query.filter(
-                        and_(
-                            *[
-                                text(
-                                    f"""
-                                    EXISTS (
-                                        SELECT 1
-                                        FROM json_each(Chat.meta, '$.tags') AS tag
-                                        WHERE tag.value = :tag_id_{tag_idx}
-                                    )
-                                    """
-                                ).params(**{f"tag_id_{tag_idx}": tag_id})
-                                for tag_idx, tag_id in enumerate(tag_ids)
-                            ]
-                        )
-                    )
-
             elif dialect_name == "postgresql":
                 # PostgreSQL doesn't allow null bytes in text. We filter those out by checking
                 # the JSON representation for \u0000 before attempting text extraction
@@ -896,35 +1096,6 @@ class ChatTable:
                     )
                 ).params(title_key=f"%{search_text}%", content_key=search_text.lower())
 
-                # Check if there are any tags to filter, it should have all the tags
-                if "none" in tag_ids:
-                    query = query.filter(
-                        text(
-                            """
-                            NOT EXISTS (
-                                SELECT 1
-                                FROM json_array_elements_text(Chat.meta->'tags') AS tag
-                            )
-                            """
-                        )
-                    )
-                elif tag_ids:
-                    query = query.filter(
-                        and_(
-                            *[
-                                text(
-                                    f"""
-                                    EXISTS (
-                                        SELECT 1
-                                        FROM json_array_elements_text(Chat.meta->'tags') AS tag
-                                        WHERE tag = :tag_id_{tag_idx}
-                                    )
-                                    """
-                                ).params(**{f"tag_id_{tag_idx}": tag_id})
-                                for tag_idx, tag_id in enumerate(tag_ids)
-                            ]
-                        )
-                    )
             else:
                 raise NotImplementedError(
                     f"Unsupported dialect: {db.bind.dialect.name}"
@@ -982,6 +1153,7 @@ class ChatTable:
                 chat.pinned = False
                 db.commit()
                 db.refresh(chat)
+                self._update_chat_index(chat)
                 return ChatModel.model_validate(chat)
         except Exception:
             return None
@@ -996,91 +1168,87 @@ class ChatTable:
         self, user_id: str, tag_name: str, skip: int = 0, limit: int = 50
     ) -> list[ChatModel]:
         with get_db() as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
             tag_id = tag_name.replace(" ", "_").lower()
 
-            log.info(f"DB dialect name: {db.bind.dialect.name}")
-            if db.bind.dialect.name == "sqlite":
-                # SQLite JSON1 querying for tags within the meta JSON field
-                query = query.filter(
-                    text(
-                        f"EXISTS (SELECT 1 FROM json_each(Chat.meta, '$.tags') WHERE json_each.value = :tag_id)"
-                    )
-                ).params(tag_id=tag_id)
-            elif db.bind.dialect.name == "postgresql":
-                # PostgreSQL JSON query for tags within the meta JSON field (for `json` type)
-                query = query.filter(
-                    text(
-                        "EXISTS (SELECT 1 FROM json_array_elements_text(Chat.meta->'tags') elem WHERE elem = :tag_id)"
-                    )
-                ).params(tag_id=tag_id)
-            else:
-                raise NotImplementedError(
-                    f"Unsupported dialect: {db.bind.dialect.name}"
-                )
-
-            all_chats = query.all()
+            all_chats = (
+                db.query(Chat)
+                .join(ChatTag, ChatTag.chat_id == Chat.id)
+                .filter(ChatTag.user_id == user_id, ChatTag.tag_id == tag_id)
+                .order_by(Chat.updated_at.desc())
+                .all()
+            )
             log.debug(f"all_chats: {all_chats}")
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str
     ) -> Optional[ChatModel]:
-        tag = Tags.get_tag_by_name_and_user_id(tag_name, user_id)
-        if tag is None:
-            tag = Tags.insert_new_tag(tag_name, user_id)
+        return self.add_chat_tags_by_id_and_user_id_and_tag_names(
+            id, user_id, [tag_name]
+        )
+
+    def add_chat_tags_by_id_and_user_id_and_tag_names(
+        self, id: str, user_id: str, tag_names: list[str]
+    ) -> Optional[ChatModel]:
+        tag_names_by_id = {
+            tag_name.replace(" ", "_").lower(): tag_name for tag_name in tag_names
+        }
+        existing_tag_ids = {
+            tag.id
+            for tag in Tags.get_tags_by_ids_and_user_id(
+                list(tag_names_by_id.keys()), user_id
+            )
+        }
+        for tag_id, tag_name in tag_names_by_id.items():
+            if tag_id not in existing_tag_ids:
+                Tags.insert_new_tag(tag_name, user_id)
+
         try:
             with get_db() as db:
                 chat = db.get(Chat, id)
 
-                tag_id = tag.id
-                if tag_id not in chat.meta.get("tags", []):
-                    chat.meta = {
-                        **chat.meta,
-                        "tags": list(set(chat.meta.get("tags", []) + [tag_id])),
-                    }
+                tags = chat.meta.get("tags", [])
+                new_tag_ids = [
+                    tag_id for tag_id in tag_names_by_id if tag_id not in tags
+                ]
+                if new_tag_ids:
+                    self._set_chat_tags(db, chat, tags + new_tag_ids)
 
                 db.commit()
                 db.refresh(chat)
+                self._update_chat_index(chat)
                 return ChatModel.model_validate(chat)
         except Exception:
             return None
 
     def count_chats_by_tag_name_and_user_id(self, tag_name: str, user_id: str) -> int:
-        with get_db() as db:  # Assuming `get_db()` returns a session object
-            query = db.query(Chat).filter_by(user_id=user_id, archived=False)
-
-            # Normalize the tag_name for consistency
-            tag_id = tag_name.replace(" ", "_").lower()
-
-            if db.bind.dialect.name == "sqlite":
-                # SQLite JSON1 support for querying the tags inside the `meta` JSON field
-                query = query.filter(
-                    text(
-                        f"EXISTS (SELECT 1 FROM json_each(Chat.meta, '$.tags') WHERE json_each.value = :tag_id)"
-                    )
-                ).params(tag_id=tag_id)
+        count = self.count_chats_by_tag_names_and_user_id([tag_name], user_id).get(
+            tag_name.replace(" ", "_").lower(), 0
+        )
+        log.info(f"Count of chats for tag '{tag_name}': {count}")
+        return count
 
-            elif db.bind.dialect.name == "postgresql":
-                # PostgreSQL JSONB support for querying the tags inside the `meta` JSON field
-                query = query.filter(
-                    text(
-                        "EXISTS (SELECT 1 FROM json_array_elements_text(Chat.meta->'tags') elem WHERE elem = :tag_id)"
-                    )
-                ).params(tag_id=tag_id)
+    def count_chats_by_tag_names_and_user_id(
+        self, tag_names: list[str], user_id: str
+    ) -> dict[str, int]:
+        """Count the user's non-archived chats per tag id in a single query."""
+        tag_ids = list({tag_name.replace(" ", "_").lower() for tag_name in tag_names})
+        if not tag_ids:
+            return {}
 
-            else:
-                raise NotImplementedError(
-                    f"Unsupported dialect: {db.bind.dialect.name}"
+        with get_db() as db:
+            rows = (
+                db.query(ChatTag.tag_id, func.count(ChatTag.chat_id))
+                .join(Chat, Chat.id == ChatTag.chat_id)
+                .filter(
+                    ChatTag.user_id == user_id,
+                    ChatTag.tag_id.in_(tag_ids),
+                    Chat.archived == False,
                 )
-
-            # Get the count of matching records
-            count = query.count()
-
-            # Debugging output for inspection
-            log.info(f"Count of chats for tag '{tag_name}': {count}")
-
-            return count
+                .group_by(ChatTag.tag_id)
+                .all()
+            )
+            return {tag_id: count for tag_id, count in rows}
 
     def count_chats_by_folder_id_and_user_id(self, folder_id: str, user_id: str) -> int:
         with get_db() as db:
@@ -1101,12 +1269,9 @@ class ChatTable:
                 tags = chat.meta.get("tags", [])
                 tag_id = tag_name.replace(" ", "_").lower()
 
-                tags = [tag for tag in tags if tag != tag_id]
-                chat.meta = {
-                    **chat.meta,
-                    "tags": list(set(tags)),
-                }
+                self._set_chat_tags(db, chat, [tag for tag in tags if tag != tag_id])
                 db.commit()
+                self._update_chat_index(chat)
                 return True
         except Exception:
             return False
@@ -1115,11 +1280,9 @@ class ChatTable:
         try:
             with get_db() as db:
                 chat = db.get(Chat, id)
-                chat.meta = {
-                    **chat.meta,
-                    "tags": [],
-                }
+                self._set_chat_tags(db, chat, [])
                 db.commit()
+                self._update_chat_index(chat)
 
                 return True
         except Exception:
@@ -1128,8 +1291,12 @@ class ChatTable:
     def delete_chat_by_id(self, id: str) -> bool:
         try:
             with get_db() as db:
+                user_id = db.query(Chat.user_id).filter_by(id=id).scalar()
+                db.query(ChatTag).filter_by(chat_id=id).delete()
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
+                if user_id:
+                    self._remove_from_chat_index(user_id, [id])
 
                 return True and self.delete_shared_chat_by_chat_id(id)
         except Exception:
@@ -1138,8 +1305,10 @@ class ChatTable:
     def delete_chat_by_id_and_user_id(self, id: str, user_id: str) -> bool:
         try:
             with get_db() as db:
+                db.query(ChatTag).filter_by(chat_id=id, user_id=user_id).delete()
                 db.query(Chat).filter_by(id=id, user_id=user_id).delete()
                 db.commit()
+                self._remove_from_chat_index(user_id, [id])
 
                 return True and self.delete_shared_chat_by_chat_id(id)
         except Exception:
@@ -1150,8 +1319,10 @@ class ChatTable:
             with get_db() as db:
                 self.delete_shared_chats_by_user_id(user_id)
 
+                db.query(ChatTag).filter_by(user_id=user_id).delete()
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
+                self._invalidate_chat_index(user_id)
 
                 return True
         except Exception:
@@ -1162,8 +1333,16 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db() as db:
+                db.query(ChatTag).filter(
+                    ChatTag.chat_id.in_(
+                        select(Chat.id).where(
+                            Chat.user_id == user_id, Chat.folder_id == folder_id
+                        )
+                    )
+                ).delete(synchronize_session=False)
                 db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
                 db.commit()
+                self._invalidate_chat_index(user_id)
 
                 return True
         except Exception:
@@ -1178,6 +1357,7 @@ class ChatTable:
                     {"folder_id": new_folder_id}
                 )
                 db.commit()
+                self._invalidate_chat_index(user_id)
 
                 return True
         except Exception:
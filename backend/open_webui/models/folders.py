@@ -9,6 +9,7 @@ from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, Text, JSON, Boolean, func
 
 from open_webui.internal.db import Base, get_db
+from open_webui.utils.chat_index import CHAT_INDEX
 from open_webui.env import SRC_LOG_LEVELS
 
 
@@ -84,6 +85,10 @@ class FolderUpdateForm(BaseModel):
 
 
 class FolderTable:
+    def _update_folder_index(self, folder: Optional[FolderModel]):
+        if CHAT_INDEX and folder is not None:
+            CHAT_INDEX.upsert("folders", folder.user_id, folder.model_dump())
+
     def insert_new_folder(
         self, user_id: str, form_data: FolderForm, parent_id: Optional[str] = None
     ) -> Optional[FolderModel]:
@@ -105,7 +110,9 @@ class FolderTable:
                 db.commit()
                 db.refresh(result)
                 if result:
-                    return FolderModel.model_validate(result)
+                    folder = FolderModel.model_validate(result)
+                    self._update_folder_index(folder)
+                    return folder
                 else:
                     return None
             except Exception as e:
@@ -151,11 +158,19 @@ class FolderTable:
             return None
 
     def get_folders_by_user_id(self, user_id: str) -> list[FolderModel]:
-        with get_db() as db:
-            return [
-                FolderModel.model_validate(folder)
-                for folder in db.query(Folder).filter_by(user_id=user_id).all()
-            ]
+        def load_folders():
+            with get_db() as db:
+                return [
+                    FolderModel.model_validate(folder).model_dump()
+                    for folder in db.query(Folder).filter_by(user_id=user_id).all()
+                ]
+
+        folders = (
+            CHAT_INDEX.get("folders", user_id, load_folders)
+            if CHAT_INDEX
+            else load_folders()
+        )
+        return [FolderModel.model_validate(folder) for folder in folders]
 
     def get_folder_by_parent_id_and_user_id_and_name(
         self, parent_id: Optional[str], user_id: str, name: str
@@ -207,7 +222,9 @@ class FolderTable:
 
                 db.commit()
 
-                return FolderModel.model_validate(folder)
+                folder = FolderModel.model_validate(folder)
+                self._update_folder_index(folder)
+                return folder
         except Exception as e:
             log.error(f"update_folder: {e}")
             return
@@ -253,7 +270,9 @@ class FolderTable:
                 folder.updated_at = int(time.time())
                 db.commit()
 
-                return FolderModel.model_validate(folder)
+                folder = FolderModel.model_validate(folder)
+                self._update_folder_index(folder)
+                return folder
         except Exception as e:
             log.error(f"update_folder: {e}")
             return
@@ -273,7 +292,9 @@ class FolderTable:
 
                 db.commit()
 
-                return FolderModel.model_validate(folder)
+                folder = FolderModel.model_validate(folder)
+                self._update_folder_index(folder)
+                return folder
         except Exception as e:
             log.error(f"update_folder: {e}")
             return
@@ -305,6 +326,9 @@ class FolderTable:
                 delete_children(folder)
                 db.delete(folder)
                 db.commit()
+
+                if CHAT_INDEX:
+                    CHAT_INDEX.remove("folders", user_id, folder_ids)
                 return folder_ids
         except Exception as e:
             log.error(f"delete_folder: {e}")
@@ -0,0 +1,546 @@
+"""
+Local embedding server for the SentenceTransformers engine.
+
+Run it next to the uvicorn workers with
+
+    python -m open_webui.retrieval.embedding_server
+
+and point the workers at it with RAG_EMBEDDING_SERVER_URL, so that they share
+one set of model processes instead of loading a model copy each.
+
+    python -m open_webui.retrieval.embedding_server --benchmark MODEL
+
+prints the throughput of MODEL in sentences per second at several batch sizes.
+"""
+
+import argparse
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+from typing import Callable, Iterable, Optional, Sequence, Union
+
+import aiohttp
+import numpy as np
+import requests
+from fastapi import FastAPI, HTTPException, Response
+from pydantic import BaseModel
+
+from open_webui.env import (
+    AIOHTTP_CLIENT_TIMEOUT,
+    DEVICE_TYPE,
+    EMBEDDING_SERVER_BATCH_SIZE,
+    EMBEDDING_SERVER_BATCH_WAIT_MS,
+    EMBEDDING_SERVER_HOST,
+    EMBEDDING_SERVER_MODELS,
+    EMBEDDING_SERVER_PORT,
+    EMBEDDING_SERVER_WORKERS,
+    SENTENCE_TRANSFORMERS_BACKEND,
+    SENTENCE_TRANSFORMERS_MODEL_KWARGS,
+    SENTENCE_TRANSFORMERS_ONNX_QUANTIZATION,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+def load_sentence_transformer(model_path: str, trust_remote_code: bool = False):
+    from sentence_transformers import SentenceTransformer
+
+    model_kwargs = dict(SENTENCE_TRANSFORMERS_MODEL_KWARGS or {})
+    if (
+        SENTENCE_TRANSFORMERS_BACKEND == "onnx"
+        and SENTENCE_TRANSFORMERS_ONNX_QUANTIZATION
+    ):
+        model_kwargs.setdefault(
+            "file_name", f"onnx/model_{SENTENCE_TRANSFORMERS_ONNX_QUANTIZATION}.onnx"
+        )
+
+    return SentenceTransformer(
+        model_path,
+        device=DEVICE_TYPE,
+        trust_remote_code=trust_remote_code,
+        backend=SENTENCE_TRANSFORMERS_BACKEND,
+        model_kwargs=model_kwargs or None,
+    )
+
+
+def run_model_process(conn, loader: Callable, trust_remote_code: bool, threads: int):
+    """
+    Serves encode requests from the pool over `conn`, keeping the last used
+    model loaded.
+    """
+    if DEVICE_TYPE == "cpu":
+        # Share the cores between the processes of the pool
+        os.environ["OMP_NUM_THREADS"] = str(threads)
+        try:
+            import torch
+
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+
+    models = {}
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+
+        model_path, texts, prompt = request
+        try:
+            if model_path not in models:
+                models.clear()
+                models[model_path] = loader(model_path, trust_remote_code)
+
+            embeddings = models[model_path].encode(
+                texts,
+                batch_size=len(texts),
+                convert_to_numpy=True,
+                **({"prompt": prompt} if prompt else {}),
+            )
+            conn.send((True, np.asarray(embeddings, dtype=np.float32)))
+        except Exception as e:
+            conn.send((False, f"{type(e).__name__}: {e}"))
+
+
+class EmbeddingJob:
+    def __init__(self, model_path: str, texts: list[str], prompt: Optional[str]):
+        self.model_path = model_path
+        self.texts = texts
+        self.prompt = prompt
+        self.future: Future = Future()
+        self.queued_at = time.monotonic()
+
+    @property
+    def key(self) -> tuple:
+        return (self.model_path, self.prompt)
+
+
+class EmbeddingPool:
+    """
+    Encodes texts with a pool of model processes.
+
+    Each of the `processes` holds its own model copy and is fed by a thread of
+    this process. Requests for the same model and prompt queued within
+    `batch_wait` seconds of each other are encoded in one model call of up to
+    `batch_size` texts; larger requests are split into several calls, which
+    the processes run in parallel. A process that dies is restarted, and the
+    requests it was encoding fail.
+    """
+
+    def __init__(
+        self,
+        processes: int = EMBEDDING_SERVER_WORKERS,
+        batch_size: int = EMBEDDING_SERVER_BATCH_SIZE,
+        batch_wait: float = EMBEDDING_SERVER_BATCH_WAIT_MS / 1000,
+        loader: Callable = load_sentence_transformer,
+        trust_remote_code: bool = False,
+    ):
+        self.processes = processes
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.loader = loader
+        self.trust_remote_code = trust_remote_code
+
+        self.queue: queue.Queue = queue.Queue()
+        self.busy = 0
+        self.completed = 0
+        self.failed = 0
+        self.restarts = 0
+        self.batches = 0
+        self.batched = 0
+        self.latencies: deque = deque(maxlen=1000)
+        self._lock = threading.Lock()
+
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: list = [None] * processes
+        self._threads = [
+            threading.Thread(target=self._run, args=(i,), name=f"embedding-{i}")
+            for i in range(processes)
+        ]
+
+    def start(self):
+        for index in range(self.processes):
+            self._start_process(index)
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def close(self):
+        for _ in self._threads:
+            self.queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        for process, conn in self._workers:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            process.join(timeout=5)
+
+    def submit(
+        self, model_path: str, texts: list[str], prompt: Optional[str] = None
+    ) -> list[Future]:
+        """Queue texts to encode, in jobs of at most `batch_size` texts."""
+        jobs = [
+            EmbeddingJob(model_path, texts[i : i + self.batch_size], prompt)
+            for i in range(0, len(texts), self.batch_size)
+        ]
+        for job in jobs:
+            self.queue.put(job)
+        return [job.future for job in jobs]
+
+    async def aencode(
+        self, model_path: str, texts: list[str], prompt: Optional[str] = None
+    ) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        futures = self.submit(model_path, texts, prompt)
+        results = await asyncio.gather(
+            *(asyncio.wrap_future(future) for future in futures)
+        )
+        return np.concatenate(results)
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self.latencies)
+            stats = {
+                "processes": self.processes,
+                "busy": self.busy,
+                "queue_depth": self.queue.qsize(),
+                "completed": self.completed,
+                "failed": self.failed,
+                "restarts": self.restarts,
+                "batches": self.batches,
+                "avg_batch_size": (
+                    round(self.batched / self.batches, 2) if self.batches else None
+                ),
+            }
+
+        if latencies:
+            stats["latency_ms"] = {
+                "avg": round(sum(latencies) / len(latencies) * 1000, 1),
+                "p50": round(latencies[len(latencies) // 2] * 1000, 1),
+                "p95": round(latencies[int(len(latencies) * 0.95)] * 1000, 1),
+            }
+        return stats
+
+    def _start_process(self, index: int):
+        conn, child_conn = self._context.Pipe()
+        threads = max((os.cpu_count() or 1) // self.processes, 1)
+        process = self._context.Process(
+            target=run_model_process,
+            args=(child_conn, self.loader, self.trust_remote_code, threads),
+            name=f"embedding-{index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self._workers[index] = (process, conn)
+
+    def _run(self, index: int):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            if not job.future.set_running_or_notify_cancel():
+                continue
+
+            with self._lock:
+                self.busy += 1
+            try:
+                batch, jobs = self._collect_batch(job)
+                self._encode(index, batch)
+                for job in jobs:
+                    if job.future.set_running_or_notify_cancel():
+                        self._encode(index, [job])
+            finally:
+                with self._lock:
+                    self.busy -= 1
+
+    def _collect_batch(self, job: EmbeddingJob) -> tuple[list, list]:
+        """
+        Gather the requests for the same model and prompt queued within the
+        batch window; other requests are returned separately to run after the
+        batch.
+        """
+        batch, jobs = [job], []
+        texts = len(job.texts)
+        deadline = time.monotonic() + self.batch_wait
+        while texts < self.batch_size:
+            try:
+                job = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+
+            if job is None:
+                # Leave the stop signal for after this batch
+                self.queue.put(None)
+                break
+            if job.key != batch[0].key or texts + len(job.texts) > self.batch_size:
+                jobs.append(job)
+            elif job.future.set_running_or_notify_cancel():
+                batch.append(job)
+                texts += len(job.texts)
+        return batch, jobs
+
+    def _restart_process(self, index: int, error: Exception):
+        log.error(f"Embedding process {index} stopped, restarting it: {error}")
+        self._workers[index][0].join(timeout=5)
+        with self._lock:
+            self.restarts += 1
+        self._start_process(index)
+
+    def _encode(self, index: int, batch: Sequence[EmbeddingJob]):
+        texts = [text for job in batch for text in job.texts]
+        request = (batch[0].model_path, texts, batch[0].prompt)
+
+        ok, result = False, "Embedding process stopped"
+        # A process found stopped before it got the batch is replaced and the
+        # batch sent again; a process stopping while encoding fails the batch
+        for _ in range(2):
+            conn = self._workers[index][1]
+            try:
+                conn.send(request)
+            except OSError as e:
+                self._restart_process(index, e)
+                continue
+
+            try:
+                ok, result = conn.recv()
+            except (EOFError, OSError) as e:
+                self._restart_process(index, e)
+                result = f"Embedding process stopped: {e}"
+            break
+
+        if not ok:
+            with self._lock:
+                self.failed += len(batch)
+            for job in batch:
+                job.future.set_exception(Exception(result))
+            return
+
+        with self._lock:
+            self.batches += 1
+            self.batched += len(texts)
+
+        offset = 0
+        for job in batch:
+            latency = time.monotonic() - job.queued_at
+            with self._lock:
+                self.completed += 1
+                self.latencies.append(latency)
+            job.future.set_result(result[offset : offset + len(job.texts)])
+            offset += len(job.texts)
+
+
+class EmbedForm(BaseModel):
+    model: str
+    texts: list[str]
+    prompt: Optional[str] = None
+
+
+def create_app(
+    pool: EmbeddingPool,
+    get_model_path: Callable[[str], str],
+    get_models: Callable[[], Iterable[str]],
+) -> FastAPI:
+    """
+    Serve `pool` over HTTP. Embeddings are returned as raw float32 rows, with
+    their shape in the X-Embedding-Shape header. Only the models returned by
+    `get_models()`, called on each request, are accepted, since a model is
+    downloaded and loaded by the first request naming it.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        pool.start()
+        yield
+        await asyncio.to_thread(pool.close)
+
+    app = FastAPI(lifespan=lifespan)
+    model_path = functools.lru_cache(maxsize=16)(get_model_path)
+
+    @app.post("/embed")
+    async def embed(form_data: EmbedForm):
+        if form_data.model not in await asyncio.to_thread(get_models):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Model '{form_data.model}' is not served by this embedding server",
+            )
+
+        try:
+            path = await asyncio.to_thread(model_path, form_data.model)
+            embeddings = await pool.aencode(path, form_data.texts, form_data.prompt)
+        except Exception as e:
+            log.exception(f"Error encoding texts: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+        return Response(
+            content=embeddings.tobytes(),
+            media_type="application/octet-stream",
+            headers={"X-Embedding-Shape": ",".join(map(str, embeddings.shape))},
+        )
+
+    @app.get("/stats")
+    async def get_stats():
+        return pool.stats()
+
+    @app.get("/health")
+    async def get_health():
+        return {"status": True}
+
+    return app
+
+
+def parse_embeddings(content: bytes, shape: str) -> np.ndarray:
+    return np.frombuffer(content, dtype=np.float32).reshape(
+        [int(size) for size in shape.split(",")]
+    )
+
+
+class EmbeddingServerClient:
+    """
+    Stands in for a local SentenceTransformer, sending the texts to encode to
+    the embedding server.
+    """
+
+    def __init__(self, url: str, model: str):
+        self.url = url.rstrip("/")
+        self.model = model
+
+    def _form_data(self, sentences: Union[str, list[str]], prompt: Optional[str]):
+        texts = [sentences] if isinstance(sentences, str) else list(sentences)
+        return {"model": self.model, "texts": texts, "prompt": prompt}
+
+    def encode(
+        self, sentences: Union[str, list[str]], prompt: Optional[str] = None, **kwargs
+    ) -> np.ndarray:
+        r = requests.post(
+            f"{self.url}/embed",
+            json=self._form_data(sentences, prompt),
+            timeout=AIOHTTP_CLIENT_TIMEOUT,
+        )
+        r.raise_for_status()
+        embeddings = parse_embeddings(r.content, r.headers["X-Embedding-Shape"])
+        return embeddings[0] if isinstance(sentences, str) else embeddings
+
+    async def aencode(
+        self, sentences: Union[str, list[str]], prompt: Optional[str] = None
+    ) -> np.ndarray:
+        async with aiohttp.ClientSession(
+            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
+        ) as session:
+            async with session.post(
+                f"{self.url}/embed", json=self._form_data(sentences, prompt)
+            ) as r:
+                r.raise_for_status()
+                embeddings = parse_embeddings(
+                    await r.read(), r.headers["X-Embedding-Shape"]
+                )
+        return embeddings[0] if isinstance(sentences, str) else embeddings
+
+
+def benchmark(
+    pool: EmbeddingPool,
+    model_path: str,
+    batch_sizes: Sequence[int] = (1, 8, 32, 64, 128),
+    sentences: int = 1024,
+) -> list[dict]:
+    """
+    Encode `sentences` single-sentence requests, all queued at once, with each
+    batch size; returns the throughput in sentences per second.
+    """
+    texts = [
+        f"Sentence {i} of the embedding throughput benchmark, about a dozen words long."
+        for i in range(sentences)
+    ]
+    # Load the model in every process before measuring
+    for future in pool.submit(model_path, texts[: pool.processes * pool.batch_size]):
+        future.result()
+
+    results = []
+    for batch_size in batch_sizes:
+        pool.batch_size = batch_size
+        start = time.perf_counter()
+        futures = [pool.submit(model_path, [text])[0] for text in texts]
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - start
+        results.append(
+            {
+                "batch_size": batch_size,
+                "sentences_per_second": round(sentences / elapsed, 1),
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default=EMBEDDING_SERVER_HOST)
+    parser.add_argument("--port", type=int, default=EMBEDDING_SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=EMBEDDING_SERVER_WORKERS)
+    parser.add_argument(
+        "--model",
+        action="append",
+        help="a model to serve besides RAG_EMBEDDING_MODEL, repeated for several",
+    )
+    parser.add_argument("--benchmark", metavar="MODEL")
+    args = parser.parse_args()
+
+    # Imported here, so that the model processes do not load the app config
+    from open_webui.config import (
+        RAG_EMBEDDING_MODEL,
+        RAG_EMBEDDING_MODEL_AUTO_UPDATE,
+        RAG_EMBEDDING_MODEL_TRUST_REMOTE_CODE,
+        get_config,
+    )
+    from open_webui.retrieval.utils import get_model_path
+
+    pool = EmbeddingPool(
+        processes=args.workers, trust_remote_code=RAG_EMBEDDING_MODEL_TRUST_REMOTE_CODE
+    )
+    get_path = functools.partial(
+        get_model_path, update_model=RAG_EMBEDDING_MODEL_AUTO_UPDATE
+    )
+
+    if args.benchmark:
+        pool.start()
+        try:
+            for result in benchmark(pool, get_path(args.benchmark)):
+                print(
+                    f"batch size {result['batch_size']:>4}: "
+                    f"{result['sentences_per_second']:>8.1f} sentences/s"
+                )
+        finally:
+            pool.close()
+        return
+
+    import uvicorn
+
+    models = set(args.model or EMBEDDING_SERVER_MODELS)
+
+    def get_models() -> set[str]:
+        # The embedding model is read from the stored config, so that a model
+        # an admin selects is served without restarting this server
+        model = get_config().get("rag", {}).get("embedding_model")
+        return models | {model or RAG_EMBEDDING_MODEL.value}
+
+    log.info(f"Serving embedding models: {', '.join(sorted(get_models()))}")
+    uvicorn.run(create_app(pool, get_path, get_models), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,8 @@
 import requests
 import logging
-import ftfy
 import sys
 import json
 
-from azure.identity import DefaultAzureCredential
 from langchain_community.document_loaders import (
     AzureAIDocumentIntelligenceLoader,
     BSHTMLLoader,
@@ -234,6 +232,8 @@ class Loader:
     def load(
         self, filename: str, file_content_type: str, file_path: str
     ) -> list[Document]:
+        import ftfy
+
         loader = self._get_loader(filename, file_content_type, file_path)
         docs = loader.load()
 
@@ -364,6 +364,8 @@ class Loader:
                     api_key=self.kwargs.get("DOCUMENT_INTELLIGENCE_KEY"),
                 )
             else:
+                from azure.identity import DefaultAzureCredential
+
                 loader = AzureAIDocumentIntelligenceLoader(
                     file_path=file_path,
                     api_endpoint=self.kwargs.get("DOCUMENT_INTELLIGENCE_ENDPOINT"),
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+class LazyModel:
+    """
+    Stands in for a local model until it is first used.
+
+    The model is loaded by `loader` on the first attribute access, in the
+    thread making it (embedding and reranking calls already run off the event
+    loop), or ahead of time with `aload`. Concurrent first uses wait for a
+    single load; a failed load is raised again on later uses instead of being
+    retried on every request.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], Any]):
+        self.name = name
+        self.load_time: Optional[float] = None
+
+        self._loader = loader
+        self._model = None
+        self._error: Optional[Exception] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self) -> Any:
+        if self._model is not None:
+            return self._model
+
+        with self._lock:
+            if self._error is not None:
+                raise self._error
+            if self._model is None:
+                log.info(f"Loading {self.name}")
+                start = time.monotonic()
+                try:
+                    model = self._loader()
+                    if model is None:
+                        raise Exception(f"Failed to load {self.name}")
+                except Exception as e:
+                    self._error = e
+                    raise
+
+                self.load_time = time.monotonic() - start
+                self._model = model
+                log.info(f"Loaded {self.name} in {self.load_time:.1f}s")
+        return self._model
+
+    async def aload(self) -> Any:
+        return await asyncio.to_thread(self.load)
+
+    def status(self) -> dict:
+        return {
+            "name": self.name,
+            "loaded": self.loaded,
+            "load_time": (
+                round(self.load_time, 2) if self.load_time is not None else None
+            ),
+            "error": str(self._error) if self._error is not None else None,
+        }
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not set in __init__; private and special
+        # names are not forwarded so copying or pickling the proxy cannot recurse
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+
+async def apreload_models(*models: Any):
+    """Load the given lazy models in parallel, logging rather than raising errors."""
+    models = [model for model in models if isinstance(model, LazyModel)]
+    results = await asyncio.gather(
+        *(model.aload() for model in models), return_exceptions=True
+    )
+    for model, result in zip(models, results):
+        if isinstance(result, Exception):
+            log.error(f"Error preloading {model.name}: {result}")
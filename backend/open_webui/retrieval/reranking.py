@@ -0,0 +1,349 @@
+import asyncio
+import hashlib
+import logging
+import math
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Any, Optional, Sequence
+
+from opentelemetry import metrics
+
+from open_webui.env import (
+    RERANKING_BATCH_SIZE,
+    RERANKING_BATCH_WAIT_MS,
+    RERANKING_CACHE_SIZE,
+    RERANKING_CACHE_TTL,
+    RERANKING_TIMEOUT,
+    RERANKING_WORKERS,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+meter = metrics.get_meter(__name__)
+
+latency_histogram = meter.create_histogram(
+    name="webui.rerank.latency",
+    description="Time from queueing a reranking request to its scores",
+    unit="ms",
+)
+batch_size_histogram = meter.create_histogram(
+    name="webui.rerank.batch.size",
+    description="(query, document) pairs scored per reranker call",
+    unit="1",
+)
+
+
+class RerankJob:
+    def __init__(
+        self,
+        model: Any,
+        pairs: list[tuple[str, str]],
+        kwargs: Optional[dict] = None,
+        batchable: bool = False,
+    ):
+        self.model = model
+        self.pairs = pairs
+        self.kwargs = kwargs or {}
+        self.batchable = batchable
+        self.future: Future = Future()
+        self.queued_at = time.monotonic()
+
+
+class RerankWorker:
+    """
+    Runs reranking models off the event loop.
+
+    Requests are queued and picked up by `workers` threads, started on first
+    use. Requests for the same local cross-encoder queued within `batch_wait`
+    seconds of each other are scored in one `predict` call, up to
+    `batch_size` pairs; ColBERT and external rerankers score a single query
+    per call, so their requests run one at a time. A request that fails or
+    is not scored within `timeout` seconds gets no scores, and the search
+    keeps its retrieval order.
+    """
+
+    def __init__(
+        self,
+        workers: int = RERANKING_WORKERS,
+        batch_size: int = RERANKING_BATCH_SIZE,
+        batch_wait: float = RERANKING_BATCH_WAIT_MS / 1000,
+        timeout: Optional[float] = RERANKING_TIMEOUT,
+    ):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.timeout = timeout
+
+        self.queue: queue.Queue = queue.Queue()
+        self.threads: list[threading.Thread] = []
+        self.busy = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.batches = 0
+        self.batched = 0
+        self.latencies: deque = deque(maxlen=1000)
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            while len(self.threads) < self.workers:
+                thread = threading.Thread(
+                    target=self._run, name=f"rerank-{len(self.threads)}", daemon=True
+                )
+                thread.start()
+                self.threads.append(thread)
+
+    async def arerank(
+        self,
+        model: Any,
+        pairs: list[tuple[str, str]],
+        kwargs: Optional[dict] = None,
+        batchable: bool = False,
+    ) -> Optional[Sequence[float]]:
+        """Score (query, document) pairs with `model`, or None if that failed."""
+        if not pairs:
+            return []
+
+        self._start()
+        job = RerankJob(model, pairs, kwargs, batchable)
+        self.queue.put(job)
+
+        try:
+            # Cancelling the wrapper drops the job if no worker picked it up yet
+            return await asyncio.wait_for(
+                asyncio.wrap_future(job.future), timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            log.warning(f"Reranking timed out after {self.timeout}s")
+            with self._lock:
+                self.timed_out += 1
+        except Exception as e:
+            log.exception(f"Error in reranking: {e}")
+        return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self.latencies)
+            stats = {
+                "workers": len(self.threads),
+                "busy": self.busy,
+                "queue_depth": self.queue.qsize(),
+                "completed": self.completed,
+                "failed": self.failed,
+                "timed_out": self.timed_out,
+                "batches": self.batches,
+                "avg_batch_pairs": (
+                    round(self.batched / self.batches, 2) if self.batches else None
+                ),
+            }
+
+        if latencies:
+            stats["latency_ms"] = {
+                "avg": round(sum(latencies) / len(latencies) * 1000, 1),
+                "p50": round(latencies[len(latencies) // 2] * 1000, 1),
+                "p95": round(latencies[int(len(latencies) * 0.95)] * 1000, 1),
+            }
+        return stats
+
+    def _run(self):
+        while True:
+            job = self.queue.get()
+            # Skip requests whose caller stopped waiting
+            if not job.future.set_running_or_notify_cancel():
+                continue
+
+            with self._lock:
+                self.busy += 1
+            try:
+                batch, jobs = [job], []
+                if job.batchable:
+                    batch, jobs = self._collect_batch(job)
+
+                self._predict(batch)
+                for job in jobs:
+                    if job.future.set_running_or_notify_cancel():
+                        self._predict([job])
+            finally:
+                with self._lock:
+                    self.busy -= 1
+
+    def _collect_batch(self, job: RerankJob) -> tuple[list, list]:
+        """
+        Gather the requests for the same model queued within the batch window;
+        other requests are returned separately to run after the batch.
+        """
+        batch, jobs = [job], []
+        pairs = len(job.pairs)
+        deadline = time.monotonic() + self.batch_wait
+        while pairs < self.batch_size:
+            try:
+                job = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+
+            if not (job.batchable and job.model is batch[0].model):
+                jobs.append(job)
+            elif job.future.set_running_or_notify_cancel():
+                batch.append(job)
+                pairs += len(job.pairs)
+        return batch, jobs
+
+    def _predict(self, batch: Sequence[RerankJob]):
+        pairs = [pair for job in batch for pair in job.pairs]
+        try:
+            scores = batch[0].model.predict(pairs, **batch[0].kwargs)
+        except Exception as e:
+            with self._lock:
+                self.failed += len(batch)
+            for job in batch:
+                job.future.set_exception(e)
+            return
+
+        batch_size_histogram.record(len(pairs))
+        with self._lock:
+            self.batches += 1
+            self.batched += len(pairs)
+
+        if len(batch) == 1 or scores is None:
+            results = [scores] * len(batch)
+        else:
+            scores = scores.tolist() if not isinstance(scores, list) else scores
+            results, offset = [], 0
+            for job in batch:
+                results.append(scores[offset : offset + len(job.pairs)])
+                offset += len(job.pairs)
+
+        for job, result in zip(batch, results):
+            latency = time.monotonic() - job.queued_at
+            latency_histogram.record(latency * 1000)
+            with self._lock:
+                self.completed += 1
+                self.latencies.append(latency)
+            job.future.set_result(result)
+
+
+class RerankScoreCache:
+    """
+    LRU cache of reranker scores keyed by model, normalized query hash and
+    chunk content hash. Entries expire `ttl` seconds after they were scored.
+    """
+
+    def __init__(self, max_size: int = RERANKING_CACHE_SIZE, ttl=RERANKING_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self._scores: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, key: tuple) -> Optional[Any]:
+        with self._lock:
+            entry = self._scores.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._scores[key]
+                self.misses += 1
+                return None
+
+            self._scores.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: tuple, score: Any):
+        expires_at = time.monotonic() + self.ttl if self.ttl else math.inf
+        with self._lock:
+            self._scores[key] = (expires_at, score)
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.max_size:
+                self._scores.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._scores), "hits": self.hits, "misses": self.misses}
+
+
+def get_text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def get_query_hash(query: str) -> str:
+    # Queries differing only in case or spacing get the same scores
+    return get_text_hash(" ".join(query.split()).casefold())
+
+
+RERANK_WORKER = RerankWorker()
+RERANK_SCORE_CACHE = RerankScoreCache()
+
+
+async def arerank(
+    model: Any,
+    model_id: str,
+    pairs: list[tuple[str, str]],
+    kwargs: Optional[dict] = None,
+    batchable: bool = False,
+    pairwise: bool = True,
+) -> Optional[Sequence[float]]:
+    """
+    Score (query, document) pairs, sending only those without a cached score
+    to the model. Rerankers whose scores depend on the other documents (not
+    `pairwise`, e.g. ColBERT's softmax) are cached per set of documents.
+    """
+    if not RERANK_SCORE_CACHE.enabled or not pairs:
+        return await RERANK_WORKER.arerank(model, pairs, kwargs, batchable)
+
+    query_hash = get_query_hash(pairs[0][0])
+    document_hashes = [get_text_hash(document) for _, document in pairs]
+
+    if not pairwise:
+        key = (model_id, query_hash, get_text_hash("".join(document_hashes)))
+        scores = RERANK_SCORE_CACHE.get(key)
+        if scores is None:
+            scores = await RERANK_WORKER.arerank(model, pairs, kwargs, batchable)
+            if scores is not None:
+                scores = scores.tolist() if not isinstance(scores, list) else scores
+                RERANK_SCORE_CACHE.set(key, scores)
+        return scores
+
+    keys = [(model_id, query_hash, document_hash) for document_hash in document_hashes]
+    scores = [RERANK_SCORE_CACHE.get(key) for key in keys]
+
+    missing = [index for index, score in enumerate(scores) if score is None]
+    if missing:
+        missing_scores = await RERANK_WORKER.arerank(
+            model, [pairs[index] for index in missing], kwargs, batchable
+        )
+        if missing_scores is None:
+            return None
+
+        if not isinstance(missing_scores, list):
+            missing_scores = missing_scores.tolist()
+        for index, score in zip(missing, missing_scores):
+            scores[index] = score
+            RERANK_SCORE_CACHE.set(keys[index], score)
+    return scores
+
+
+def observe_queue_depth(
+    options: metrics.CallbackOptions,
+) -> Sequence[metrics.Observation]:
+    return [metrics.Observation(value=RERANK_WORKER.queue.qsize())]
+
+
+meter.create_observable_gauge(
+    name="webui.rerank.queue.depth",
+    description="Reranking requests waiting for a worker",
+    unit="1",
+    callbacks=[observe_queue_depth],
+)
@@ -2,16 +2,15 @@ import logging
 import os
 from typing import Awaitable, Optional, Union
 
+import numpy as np
 import requests
 import aiohttp
 import asyncio
 import hashlib
-from concurrent.futures import ThreadPoolExecutor
 import time
 import re
 
 from urllib.parse import quote
-from huggingface_hub import snapshot_download
 from langchain.retrievers import ContextualCompressionRetriever, EnsembleRetriever
 from langchain_community.retrievers import BM25Retriever
 from langchain_core.documents import Document
@@ -27,6 +26,8 @@ from open_webui.models.knowledge import Knowledges
 from open_webui.models.chats import Chats
 from open_webui.models.notes import Notes
 
+from open_webui.retrieval.embedding_server import EmbeddingServerClient
+from open_webui.retrieval.reranking import arerank
 from open_webui.retrieval.vector.main import GetResult
 from open_webui.utils.access_control import has_access
 from open_webui.utils.headers import include_user_info_headers
@@ -111,7 +112,7 @@ class VectorSearchRetriever(BaseRetriever):
         run_manager: CallbackManagerForRetrieverRun,
     ) -> list[Document]:
         embedding = await self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
-        result = VECTOR_DB_CLIENT.search(
+        result = await VECTOR_DB_CLIENT.asearch(
             collection_name=self.collection_name,
             vectors=[embedding],
             limit=self.top_k,
@@ -125,6 +126,7 @@ class VectorSearchRetriever(BaseRetriever):
         for idx in range(len(ids)):
             results.append(
                 Document(
+                    id=ids[idx],
                     metadata=metadatas[idx],
                     page_content=documents[idx],
                 )
@@ -166,6 +168,40 @@ def get_doc(collection_name: str, user: UserModel = None):
         raise e
 
 
+async def aquery_doc(
+    collection_name: str, query_embedding: list[float], k: int, user: UserModel = None
+):
+    try:
+        log.debug(f"query_doc:doc {collection_name}")
+        result = await VECTOR_DB_CLIENT.asearch(
+            collection_name=collection_name,
+            vectors=[query_embedding],
+            limit=k,
+        )
+
+        if result:
+            log.info(f"query_doc:result {result.ids} {result.metadatas}")
+
+        return result
+    except Exception as e:
+        log.exception(f"Error querying doc {collection_name} with limit {k}: {e}")
+        raise e
+
+
+async def aget_doc(collection_name: str, user: UserModel = None):
+    try:
+        log.debug(f"get_doc:doc {collection_name}")
+        result = await VECTOR_DB_CLIENT.aget(collection_name=collection_name)
+
+        if result:
+            log.info(f"query_doc:result {result.ids} {result.metadatas}")
+
+        return result
+    except Exception as e:
+        log.exception(f"Error getting doc {collection_name}: {e}")
+        raise e
+
+
 def get_enriched_texts(collection_result: GetResult) -> list[str]:
     enriched_texts = []
     for idx, text in enumerate(collection_result.documents[0]):
@@ -204,6 +240,20 @@ def get_enriched_texts(collection_result: GetResult) -> list[str]:
     return enriched_texts
 
 
+def cache_query_embeddings(embedding_function):
+    """Embed each query text once, however often it is used during one search."""
+    cache = {}
+
+    async def cached_embedding_function(query, prefix=None):
+        if not isinstance(query, str):
+            return await embedding_function(query, prefix)
+        if (query, prefix) not in cache:
+            cache[(query, prefix)] = await embedding_function(query, prefix)
+        return cache[(query, prefix)]
+
+    return cached_embedding_function
+
+
 async def query_doc_with_hybrid_search(
     collection_name: str,
     collection_result: GetResult,
@@ -246,9 +296,13 @@ async def query_doc_with_hybrid_search(
         bm25_retriever = BM25Retriever.from_texts(
             texts=bm25_texts,
             metadatas=collection_result.metadatas[0],
+            ids=collection_result.ids[0] if collection_result.ids else None,
         )
         bm25_retriever.k = k
 
+        # The vector search and the similarity scoring embed the same query
+        embedding_function = cache_query_embeddings(embedding_function)
+
         vector_search_retriever = VectorSearchRetriever(
             collection_name=collection_name,
             embedding_function=embedding_function,
@@ -270,6 +324,7 @@ async def query_doc_with_hybrid_search(
             )
 
         compressor = RerankCompressor(
+            collection_name=collection_name,
             embedding_function=embedding_function,
             top_n=k_reranker,
             reranking_function=reranking_function,
@@ -399,6 +454,21 @@ def get_all_items_from_collections(collection_names: list[str]) -> dict:
     return merge_get_results(results)
 
 
+async def aget_all_items_from_collections(collection_names: list[str]) -> dict:
+    results = []
+
+    for collection_name in collection_names:
+        if collection_name:
+            try:
+                result = await aget_doc(collection_name=collection_name)
+                if result is not None:
+                    results.append(result.model_dump())
+            except Exception as e:
+                log.exception(f"Error when querying the collection: {e}")
+
+    return merge_get_results(results)
+
+
 async def query_collection(
     collection_names: list[str],
     queries: list[str],
@@ -408,10 +478,10 @@ async def query_collection(
     results = []
     error = False
 
-    def process_query_collection(collection_name, query_embedding):
+    async def process_query_collection(collection_name, query_embedding):
         try:
             if collection_name:
-                result = query_doc(
+                result = await aquery_doc(
                     collection_name=collection_name,
                     k=k,
                     query_embedding=query_embedding,
@@ -431,15 +501,13 @@ async def query_collection(
         f"query_collection: processing {len(queries)} queries across {len(collection_names)} collections"
     )
 
-    with ThreadPoolExecutor() as executor:
-        future_results = []
-        for query_embedding in query_embeddings:
-            for collection_name in collection_names:
-                result = executor.submit(
-                    process_query_collection, collection_name, query_embedding
-                )
-                future_results.append(result)
-        task_results = [future.result() for future in future_results]
+    task_results = await asyncio.gather(
+        *[
+            process_query_collection(collection_name, query_embedding)
+            for query_embedding in query_embeddings
+            for collection_name in collection_names
+        ]
+    )
 
     for result, err in task_results:
         if err is not None:
@@ -472,9 +540,9 @@ async def query_collection_with_hybrid_search(
     for collection_name in collection_names:
         try:
             log.debug(
-                f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}"
+                f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.aget:collection {collection_name}"
             )
-            collection_results[collection_name] = VECTOR_DB_CLIENT.get(
+            collection_results[collection_name] = await VECTOR_DB_CLIENT.aget(
                 collection_name=collection_name
             )
         except Exception as e:
@@ -783,7 +851,14 @@ def get_embedding_function(
     embedding_batch_size,
     azure_api_version=None,
 ) -> Awaitable:
-    if embedding_engine == "":
+    if embedding_engine == "" and isinstance(embedding_function, EmbeddingServerClient):
+        # Sentence transformers on the shared embedding server
+        async def async_embedding_function(query, prefix=None, user=None):
+            embeddings = await embedding_function.aencode(query, prompt=prefix)
+            return embeddings.tolist()
+
+        return async_embedding_function
+    elif embedding_engine == "":
         # Sentence transformers: CPU-bound sync operation
         async def async_embedding_function(query, prefix=None, user=None):
             return await asyncio.to_thread(
@@ -896,15 +971,28 @@ async def generate_embeddings(
 def get_reranking_function(reranking_engine, reranking_model, reranking_function):
     if reranking_function is None:
         return None
-    if reranking_engine == "external":
-        return lambda query, documents, user=None: reranking_function.predict(
-            [(query, doc.page_content) for doc in documents], user=user
-        )
-    else:
-        return lambda query, documents, user=None: reranking_function.predict(
-            [(query, doc.page_content) for doc in documents]
+
+    # Decided from the engine and model name, as local models may not be loaded yet
+    external = reranking_engine == "external" and not is_colbert_model(reranking_model)
+    # Cross-encoders score pairs of any query, so concurrent requests share calls
+    batchable = not external and not is_colbert_model(reranking_model)
+    # ColBERT normalizes its scores over the documents of each call
+    pairwise = batchable or external
+    url = reranking_function.url if external else ""
+    model_id = f"{reranking_engine}:{url}:{reranking_model}"
+
+    async def rerank(query, documents, user=None):
+        return await arerank(
+            reranking_function,
+            model_id,
+            [(query, doc.page_content) for doc in documents],
+            kwargs={"user": user} if external else None,
+            batchable=batchable,
+            pairwise=pairwise,
         )
 
+    return rerank
+
 
 async def get_sources_from_items(
     request,
@@ -1129,7 +1217,9 @@ async def get_sources_from_items(
 
             try:
                 if full_context:
-                    query_result = get_all_items_from_collections(collection_names)
+                    query_result = await aget_all_items_from_collections(
+                        collection_names
+                    )
                 else:
                     query_result = None  # Initialize to None
                     if hybrid_search:
@@ -1187,7 +1277,16 @@ async def get_sources_from_items(
     return sources
 
 
+COLBERT_MODELS = ["jinaai/jina-colbert-v2"]
+
+
+def is_colbert_model(model: Optional[str]) -> bool:
+    return bool(model) and any(name in model for name in COLBERT_MODELS)
+
+
 def get_model_path(model: str, update_model: bool = False):
+    from huggingface_hub import snapshot_download
+
     # Construct huggingface_hub kwargs with local_files_only to return the snapshot path
     cache_dir = os.getenv("SENTENCE_TRANSFORMERS_HOME")
 
@@ -1235,7 +1334,15 @@ from langchain_core.callbacks import Callbacks
 from langchain_core.documents import BaseDocumentCompressor, Document
 
 
+def cosine_similarity(query_embedding, embeddings) -> list[float]:
+    query = np.asarray(query_embedding, dtype=np.float32)
+    matrix = np.asarray(embeddings, dtype=np.float32).reshape(len(embeddings), -1)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    return (matrix @ query / np.maximum(norms, 1e-12)).tolist()
+
+
 class RerankCompressor(BaseDocumentCompressor):
+    collection_name: Optional[str] = None
     embedding_function: Any
     top_n: int
     reranking_function: Any
@@ -1274,17 +1381,15 @@ class RerankCompressor(BaseDocumentCompressor):
 
         scores = None
         if reranking:
-            scores = self.reranking_function(query, documents)
+            scores = await self.reranking_function(query, documents)
         else:
-            from sentence_transformers import util
-
             query_embedding = await self.embedding_function(
                 query, RAG_EMBEDDING_QUERY_PREFIX
             )
-            document_embedding = await self.embedding_function(
-                [doc.page_content for doc in documents], RAG_EMBEDDING_CONTENT_PREFIX
+            document_embeddings = await self.aget_document_embeddings(
+                documents, len(query_embedding)
             )
-            scores = util.cos_sim(query_embedding, document_embedding)[0]
+            scores = cosine_similarity(query_embedding, document_embeddings)
 
         if scores is not None:
             docs_with_scores = list(
@@ -1314,3 +1419,41 @@ class RerankCompressor(BaseDocumentCompressor):
                 "No valid scores found, check your reranking function. Returning original documents."
             )
             return documents
+
+    async def aget_document_embeddings(
+        self, documents: Sequence[Document], dimension: int
+    ) -> list:
+        """
+        The vectors stored for the documents; only documents without a stored
+        vector of the query's dimension are embedded again.
+        """
+        vectors = {}
+        ids = [doc.id for doc in documents if doc.id]
+        if self.collection_name and ids:
+            try:
+                vectors = (
+                    await VECTOR_DB_CLIENT.aget_vectors(self.collection_name, ids) or {}
+                )
+            except Exception as e:
+                log.debug(
+                    f"Failed to get stored vectors for {self.collection_name}: {e}"
+                )
+
+        embeddings = []
+        for doc in documents:
+            vector = vectors.get(doc.id) if doc.id else None
+            # Vectors of a previous embedding model may have another dimension
+            embeddings.append(
+                vector if vector is not None and len(vector) == dimension else None
+            )
+
+        missing = [index for index, vector in enumerate(embeddings) if vector is None]
+        if missing:
+            log.debug(f"Embedding {len(missing)} of {len(documents)} documents")
+            missing_embeddings = await self.embedding_function(
+                [documents[index].page_content for index in missing],
+                RAG_EMBEDDING_CONTENT_PREFIX,
+            )
+            for index, vector in zip(missing, missing_embeddings):
+                embeddings[index] = vector
+        return embeddings
@@ -0,0 +1,117 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional
+
+from open_webui.config import (
+    VECTOR_DB_BULK_BATCH_SIZE,
+    VECTOR_DB_BULK_CONCURRENCY,
+    VECTOR_DB_BULK_RETRIES,
+)
+from open_webui.env import SRC_LOG_LEVELS
+from open_webui.retrieval.vector.main import VectorDBBase, VectorItem
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+# Seconds before the first retry of a failed batch, doubled on every retry
+RETRY_DELAY = 0.5
+
+
+def batched(items: Iterable[VectorItem], batch_size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def write_batch(
+    client: VectorDBBase,
+    collection_name: str,
+    batch: list[VectorItem],
+    upsert: bool,
+    retries: int,
+) -> int:
+    for attempt in range(retries + 1):
+        # A failed attempt may have written part of the batch, so retries upsert
+        write = client.upsert if upsert or attempt > 0 else client.insert
+        try:
+            write(collection_name=collection_name, items=batch)
+            return len(batch)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = RETRY_DELAY * 2**attempt
+            log.warning(
+                f"writing {len(batch)} items to {collection_name} failed, "
+                f"retrying in {delay}s: {e}"
+            )
+            time.sleep(delay)
+
+
+def bulk_write(
+    client: VectorDBBase,
+    collection_name: str,
+    items: Iterable[VectorItem],
+    upsert: bool = False,
+    batch_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    retries: Optional[int] = None,
+    progress: Optional[Callable[[int, Optional[int]], None]] = None,
+) -> int:
+    """
+    Write items to a collection in batches, with several batches in flight.
+
+    Only `concurrency` batches are taken from `items` at a time, so an iterator
+    is consumed as fast as the backend accepts it. A failed batch is retried
+    `retries` times before its error is raised. `progress(written, total)` is
+    called after each batch, with `total` None when `items` has no length.
+
+    Returns:
+        int: The number of items written.
+    """
+    batch_size = max(batch_size or VECTOR_DB_BULK_BATCH_SIZE, 1)
+    concurrency = max(concurrency or VECTOR_DB_BULK_CONCURRENCY, 1)
+    retries = VECTOR_DB_BULK_RETRIES if retries is None else retries
+
+    total = len(items) if hasattr(items, "__len__") else None
+    batches = batched(items, batch_size)
+    written = 0
+
+    def done(count: int):
+        nonlocal written
+        written += count
+        if progress:
+            progress(written, total)
+
+    # The first batch creates the collection, so it is written on its own
+    first = next(batches, None)
+    if first is None:
+        return 0
+    done(write_batch(client, collection_name, first, upsert, retries))
+
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="vector-bulk"
+    ) as executor:
+        pending = set()
+        try:
+            for batch in batches:
+                if len(pending) >= concurrency:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        done(future.result())
+                pending.add(
+                    executor.submit(
+                        write_batch, client, collection_name, batch, upsert, retries
+                    )
+                )
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done(future.result())
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+    return written
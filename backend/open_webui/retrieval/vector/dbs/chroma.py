@@ -1,5 +1,7 @@
+import asyncio
 import chromadb
 import logging
+from contextlib import asynccontextmanager
 from chromadb import Settings
 from chromadb.utils.batch_utils import create_batches
 
@@ -23,6 +25,8 @@ from open_webui.config import (
     CHROMA_DATABASE,
     CHROMA_CLIENT_AUTH_PROVIDER,
     CHROMA_CLIENT_AUTH_CREDENTIALS,
+    VECTOR_DB_POOL_SIZE,
+    VECTOR_DB_POOL_TIMEOUT,
 )
 from open_webui.env import SRC_LOG_LEVELS
 
@@ -30,6 +34,42 @@ log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
+def _search_result(result) -> SearchResult:
+    # chromadb has cosine distance, 2 (worst) -> 0 (best). Re-odering to 0 -> 1
+    # https://docs.trychroma.com/docs/collections/configure cosine equation
+    distances: list = result["distances"][0]
+    distances = [2 - dist for dist in distances]
+    distances = [[dist / 2 for dist in distances]]
+
+    return SearchResult(
+        **{
+            "ids": result["ids"],
+            "distances": distances,
+            "documents": result["documents"],
+            "metadatas": result["metadatas"],
+        }
+    )
+
+
+def _get_result(result) -> GetResult:
+    return GetResult(
+        **{
+            "ids": [result["ids"]],
+            "documents": [result["documents"]],
+            "metadatas": [result["metadatas"]],
+        }
+    )
+
+
+def _item_columns(items: list[VectorItem]) -> dict:
+    return {
+        "ids": [item["id"] for item in items],
+        "documents": [item["text"] for item in items],
+        "embeddings": [item["vector"] for item in items],
+        "metadatas": [process_metadata(item["metadata"]) for item in items],
+    }
+
+
 class ChromaClient(VectorDBBase):
     def __init__(self):
         settings_dict = {
@@ -43,6 +83,12 @@ class ChromaClient(VectorDBBase):
                 CHROMA_CLIENT_AUTH_CREDENTIALS
             )
 
+        self.settings = Settings(**settings_dict)
+        self.async_client = None
+        self._async_client_lock = asyncio.Lock()
+        # The async http client does not limit its connections itself
+        self._async_slots = asyncio.Semaphore(VECTOR_DB_POOL_SIZE)
+
         if CHROMA_HTTP_HOST != "":
             self.client = chromadb.HttpClient(
                 host=CHROMA_HTTP_HOST,
@@ -51,20 +97,20 @@ class ChromaClient(VectorDBBase):
                 ssl=CHROMA_HTTP_SSL,
                 tenant=CHROMA_TENANT,
                 database=CHROMA_DATABASE,
-                settings=Settings(**settings_dict),
+                settings=self.settings,
             )
         else:
             self.client = chromadb.PersistentClient(
                 path=CHROMA_DATA_PATH,
-                settings=Settings(**settings_dict),
+                settings=self.settings,
                 tenant=CHROMA_TENANT,
                 database=CHROMA_DATABASE,
             )
 
     def has_collection(self, collection_name: str) -> bool:
         # Check if the collection exists based on the collection name.
-        collection_names = self.client.list_collections()
-        return collection_name in collection_names
+        collections = self.client.list_collections()
+        return collection_name in [collection.name for collection in collections]
 
     def delete_collection(self, collection_name: str):
         # Delete the collection based on the collection name.
@@ -81,21 +127,7 @@ class ChromaClient(VectorDBBase):
                     query_embeddings=vectors,
                     n_results=limit,
                 )
-
-                # chromadb has cosine distance, 2 (worst) -> 0 (best). Re-odering to 0 -> 1
-                # https://docs.trychroma.com/docs/collections/configure cosine equation
-                distances: list = result["distances"][0]
-                distances = [2 - dist for dist in distances]
-                distances = [[dist / 2 for dist in distances]]
-
-                return SearchResult(
-                    **{
-                        "ids": result["ids"],
-                        "distances": distances,
-                        "documents": result["documents"],
-                        "metadatas": result["metadatas"],
-                    }
-                )
+                return _search_result(result)
             return None
         except Exception as e:
             return None
@@ -111,14 +143,7 @@ class ChromaClient(VectorDBBase):
                     where=filter,
                     limit=limit,
                 )
-
-                return GetResult(
-                    **{
-                        "ids": [result["ids"]],
-                        "documents": [result["documents"]],
-                        "metadatas": [result["metadatas"]],
-                    }
-                )
+                return _get_result(result)
             return None
         except:
             return None
@@ -128,33 +153,21 @@ class ChromaClient(VectorDBBase):
         collection = self.client.get_collection(name=collection_name)
         if collection:
             result = collection.get()
-            return GetResult(
-                **{
-                    "ids": [result["ids"]],
-                    "documents": [result["documents"]],
-                    "metadatas": [result["metadatas"]],
-                }
-            )
+            return _get_result(result)
         return None
 
+    def get_vectors(self, collection_name: str, ids: list[str]) -> Optional[dict]:
+        collection = self.client.get_collection(name=collection_name)
+        result = collection.get(ids=ids, include=["embeddings"])
+        return dict(zip(result["ids"], result["embeddings"]))
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         collection = self.client.get_or_create_collection(
             name=collection_name, metadata={"hnsw:space": "cosine"}
         )
 
-        ids = [item["id"] for item in items]
-        documents = [item["text"] for item in items]
-        embeddings = [item["vector"] for item in items]
-        metadatas = [process_metadata(item["metadata"]) for item in items]
-
-        for batch in create_batches(
-            api=self.client,
-            documents=documents,
-            embeddings=embeddings,
-            ids=ids,
-            metadatas=metadatas,
-        ):
+        for batch in create_batches(api=self.client, **_item_columns(items)):
             collection.add(*batch)
 
     def upsert(self, collection_name: str, items: list[VectorItem]):
@@ -163,14 +176,7 @@ class ChromaClient(VectorDBBase):
             name=collection_name, metadata={"hnsw:space": "cosine"}
         )
 
-        ids = [item["id"] for item in items]
-        documents = [item["text"] for item in items]
-        embeddings = [item["vector"] for item in items]
-        metadatas = [process_metadata(item["metadata"]) for item in items]
-
-        collection.upsert(
-            ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas
-        )
+        collection.upsert(**_item_columns(items))
 
     def delete(
         self,
@@ -196,3 +202,144 @@ class ChromaClient(VectorDBBase):
     def reset(self):
         # Resets the database. This will delete all collections and item entries.
         return self.client.reset()
+
+    # The embedded client has no async API and keeps the default of running
+    # the sync methods in a thread; a chroma server is queried over async http.
+
+    @property
+    def is_async(self) -> bool:
+        return CHROMA_HTTP_HOST != ""
+
+    @asynccontextmanager
+    async def _aconnection(self):
+        # Waits for one of the VECTOR_DB_POOL_SIZE slots before using the client
+        await asyncio.wait_for(self._async_slots.acquire(), VECTOR_DB_POOL_TIMEOUT)
+        try:
+            if self.async_client is None:
+                async with self._async_client_lock:
+                    if self.async_client is None:
+                        self.async_client = await chromadb.AsyncHttpClient(
+                            host=CHROMA_HTTP_HOST,
+                            port=CHROMA_HTTP_PORT,
+                            headers=CHROMA_HTTP_HEADERS,
+                            ssl=CHROMA_HTTP_SSL,
+                            tenant=CHROMA_TENANT,
+                            database=CHROMA_DATABASE,
+                            settings=self.settings,
+                        )
+            yield self.async_client
+        finally:
+            self._async_slots.release()
+
+    async def ahas_collection(self, collection_name: str) -> bool:
+        if not self.is_async:
+            return await super().ahas_collection(collection_name)
+        async with self._aconnection() as client:
+            collections = await client.list_collections()
+        return collection_name in [collection.name for collection in collections]
+
+    async def adelete_collection(self, collection_name: str):
+        if not self.is_async:
+            return await super().adelete_collection(collection_name)
+        async with self._aconnection() as client:
+            return await client.delete_collection(name=collection_name)
+
+    async def asearch(
+        self, collection_name: str, vectors: list[list[float | int]], limit: int
+    ) -> Optional[SearchResult]:
+        if not self.is_async:
+            return await super().asearch(collection_name, vectors, limit)
+        try:
+            async with self._aconnection() as client:
+                collection = await client.get_collection(name=collection_name)
+                result = await collection.query(
+                    query_embeddings=vectors,
+                    n_results=limit,
+                )
+            return _search_result(result)
+        except Exception as e:
+            return None
+
+    async def aquery(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        if not self.is_async:
+            return await super().aquery(collection_name, filter, limit)
+        try:
+            async with self._aconnection() as client:
+                collection = await client.get_collection(name=collection_name)
+                result = await collection.get(where=filter, limit=limit)
+            return _get_result(result)
+        except:
+            return None
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        if not self.is_async:
+            return await super().aget(collection_name)
+        async with self._aconnection() as client:
+            collection = await client.get_collection(name=collection_name)
+            result = await collection.get()
+        return _get_result(result)
+
+    async def aget_vectors(
+        self, collection_name: str, ids: list[str]
+    ) -> Optional[dict]:
+        if not self.is_async:
+            return await super().aget_vectors(collection_name, ids)
+        async with self._aconnection() as client:
+            collection = await client.get_collection(name=collection_name)
+            result = await collection.get(ids=ids, include=["embeddings"])
+        return dict(zip(result["ids"], result["embeddings"]))
+
+    async def ainsert(self, collection_name: str, items: list[VectorItem]):
+        if not self.is_async:
+            return await super().ainsert(collection_name, items)
+        columns = _item_columns(items)
+        async with self._aconnection() as client:
+            collection = await client.get_or_create_collection(
+                name=collection_name, metadata={"hnsw:space": "cosine"}
+            )
+            batch_size = await client.get_max_batch_size()
+            for start in range(0, len(items), batch_size):
+                await collection.add(
+                    **{
+                        key: values[start : start + batch_size]
+                        for key, values in columns.items()
+                    }
+                )
+
+    async def aupsert(self, collection_name: str, items: list[VectorItem]):
+        if not self.is_async:
+            return await super().aupsert(collection_name, items)
+        async with self._aconnection() as client:
+            collection = await client.get_or_create_collection(
+                name=collection_name, metadata={"hnsw:space": "cosine"}
+            )
+            await collection.upsert(**_item_columns(items))
+
+    async def adelete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ):
+        if not self.is_async:
+            return await super().adelete(collection_name, ids, filter)
+        try:
+            async with self._aconnection() as client:
+                collection = await client.get_collection(name=collection_name)
+                if ids:
+                    await collection.delete(ids=ids)
+                elif filter:
+                    await collection.delete(where=filter)
+        except Exception as e:
+            # If collection doesn't exist, that's fine - nothing to delete
+            log.debug(
+                f"Attempted to delete from non-existent collection {collection_name}. Ignoring."
+            )
+
+    async def areset(self):
+        if not self.is_async:
+            return await super().areset()
+        async with self._aconnection() as client:
+            return await client.reset()
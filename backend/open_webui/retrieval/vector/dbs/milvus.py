@@ -259,6 +259,15 @@ class MilvusClient(VectorDBBase):
         # This will use the paginated query logic.
         return self.query(collection_name=collection_name, filter={}, limit=-1)
 
+    def get_vectors(self, collection_name: str, ids: list[str]) -> Optional[dict]:
+        collection_name = collection_name.replace("-", "_")
+        results = self.client.get(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            ids=ids,
+            output_fields=["id", "vector"],
+        )
+        return {result["id"]: result["vector"] for result in results}
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         collection_name = collection_name.replace("-", "_")
@@ -1,5 +1,5 @@
-from opensearchpy import OpenSearch
-from opensearchpy.helpers import bulk
+from opensearchpy import AsyncOpenSearch, OpenSearch
+from opensearchpy.helpers import async_bulk, bulk
 from typing import Optional
 
 from open_webui.retrieval.vector.utils import process_metadata
@@ -15,17 +15,23 @@ from open_webui.config import (
     OPENSEARCH_CERT_VERIFY,
     OPENSEARCH_USERNAME,
     OPENSEARCH_PASSWORD,
+    VECTOR_DB_POOL_SIZE,
 )
 
 
 class OpenSearchClient(VectorDBBase):
     def __init__(self):
         self.index_prefix = "open_webui"
-        self.client = OpenSearch(
-            hosts=[OPENSEARCH_URI],
-            use_ssl=OPENSEARCH_SSL,
-            verify_certs=OPENSEARCH_CERT_VERIFY,
-            http_auth=(OPENSEARCH_USERNAME, OPENSEARCH_PASSWORD),
+        connection_kwargs = {
+            "hosts": [OPENSEARCH_URI],
+            "use_ssl": OPENSEARCH_SSL,
+            "verify_certs": OPENSEARCH_CERT_VERIFY,
+            "http_auth": (OPENSEARCH_USERNAME, OPENSEARCH_PASSWORD),
+        }
+        self.client = OpenSearch(**connection_kwargs)
+        # maxsize is the number of connections kept open by the aiohttp session
+        self.async_client = AsyncOpenSearch(
+            **connection_kwargs, maxsize=VECTOR_DB_POOL_SIZE
         )
 
     def _get_index_name(self, collection_name: str) -> str:
@@ -68,8 +74,8 @@ class OpenSearchClient(VectorDBBase):
             metadatas=[metadatas],
         )
 
-    def _create_index(self, collection_name: str, dimension: int):
-        body = {
+    def _index_body(self, dimension: int) -> dict:
+        return {
             "settings": {"index": {"knn": True}},
             "mappings": {
                 "properties": {
@@ -94,10 +100,84 @@ class OpenSearchClient(VectorDBBase):
                 }
             },
         }
+
+    def _create_index(self, collection_name: str, dimension: int):
         self.client.indices.create(
-            index=self._get_index_name(collection_name), body=body
+            index=self._get_index_name(collection_name),
+            body=self._index_body(dimension),
         )
 
+    def _search_body(self, vectors: list[list[float | int]], limit: int) -> dict:
+        return {
+            "size": limit,
+            "_source": ["text", "metadata"],
+            "query": {
+                "script_score": {
+                    "query": {"match_all": {}},
+                    "script": {
+                        "source": "(cosineSimilarity(params.query_value, doc[params.field]) + 1.0) / 2.0",
+                        "params": {
+                            "field": "vector",
+                            "query_value": vectors[0],
+                        },  # Assuming single query vector
+                    },
+                }
+            },
+        }
+
+    def _filter_body(self, filter: dict) -> dict:
+        return {
+            "query": {
+                "bool": {
+                    "filter": [
+                        {"term": {"metadata." + str(field) + ".keyword": value}}
+                        for field, value in filter.items()
+                    ]
+                }
+            }
+        }
+
+    def _insert_actions(self, collection_name: str, items: list[VectorItem]):
+        return [
+            {
+                "_op_type": "index",
+                "_index": self._get_index_name(collection_name),
+                "_id": item["id"],
+                "_source": {
+                    "vector": item["vector"],
+                    "text": item["text"],
+                    "metadata": process_metadata(item["metadata"]),
+                },
+            }
+            for item in items
+        ]
+
+    def _upsert_actions(self, collection_name: str, items: list[VectorItem]):
+        return [
+            {
+                "_op_type": "update",
+                "_index": self._get_index_name(collection_name),
+                "_id": item["id"],
+                "doc": {
+                    "vector": item["vector"],
+                    "text": item["text"],
+                    "metadata": process_metadata(item["metadata"]),
+                },
+                "doc_as_upsert": True,
+            }
+            for item in items
+        ]
+
+    def _delete_actions(self, collection_name: str, ids: list[str]):
+        return [
+            {
+                "_op_type": "delete",
+                "_index": self._get_index_name(collection_name),
+                "_id": id,
+            }
+            for id in ids
+        ]
+
     def _create_batches(self, items: list[VectorItem], batch_size=100):
         for i in range(0, len(items), batch_size):
             yield items[i : i + batch_size]
@@ -119,25 +199,9 @@ class OpenSearchClient(VectorDBBase):
             if not self.has_collection(collection_name):
                 return None
 
-            query = {
-                "size": limit,
-                "_source": ["text", "metadata"],
-                "query": {
-                    "script_score": {
-                        "query": {"match_all": {}},
-                        "script": {
-                            "source": "(cosineSimilarity(params.query_value, doc[params.field]) + 1.0) / 2.0",
-                            "params": {
-                                "field": "vector",
-                                "query_value": vectors[0],
-                            },  # Assuming single query vector
-                        },
-                    }
-                },
-            }
-
             result = self.client.search(
-                index=self._get_index_name(collection_name), body=query
+                index=self._get_index_name(collection_name),
+                body=self._search_body(vectors, limit),
             )
 
             return self._result_to_search_result(result)
@@ -151,23 +215,11 @@ class OpenSearchClient(VectorDBBase):
         if not self.has_collection(collection_name):
             return None
 
-        query_body = {
-            "query": {"bool": {"filter": []}},
-            "_source": ["text", "metadata"],
-        }
-
-        for field, value in filter.items():
-            query_body["query"]["bool"]["filter"].append(
-                {"term": {"metadata." + str(field) + ".keyword": value}}
-            )
-
-        size = limit if limit else 10000
-
         try:
             result = self.client.search(
                 index=self._get_index_name(collection_name),
-                body=query_body,
-                size=size,
+                body={**self._filter_body(filter), "_source": ["text", "metadata"]},
+                size=limit if limit else 10000,
             )
 
             return self._result_to_get_result(result)
@@ -193,20 +245,7 @@ class OpenSearchClient(VectorDBBase):
         )
 
         for batch in self._create_batches(items):
-            actions = [
-                {
-                    "_op_type": "index",
-                    "_index": self._get_index_name(collection_name),
-                    "_id": item["id"],
-                    "_source": {
-                        "vector": item["vector"],
-                        "text": item["text"],
-                        "metadata": process_metadata(item["metadata"]),
-                    },
-                }
-                for item in batch
-            ]
-            bulk(self.client, actions)
+            bulk(self.client, self._insert_actions(collection_name, batch))
         self.client.indices.refresh(self._get_index_name(collection_name))
 
     def upsert(self, collection_name: str, items: list[VectorItem]):
@@ -215,21 +254,7 @@ class OpenSearchClient(VectorDBBase):
         )
 
         for batch in self._create_batches(items):
-            actions = [
-                {
-                    "_op_type": "update",
-                    "_index": self._get_index_name(collection_name),
-                    "_id": item["id"],
-                    "doc": {
-                        "vector": item["vector"],
-                        "text": item["text"],
-                        "metadata": process_metadata(item["metadata"]),
-                    },
-                    "doc_as_upsert": True,
-                }
-                for item in batch
-            ]
-            bulk(self.client, actions)
+            bulk(self.client, self._upsert_actions(collection_name, batch))
         self.client.indices.refresh(self._get_index_name(collection_name))
 
     def delete(
@@ -239,25 +264,11 @@ class OpenSearchClient(VectorDBBase):
         filter: Optional[dict] = None,
     ):
         if ids:
-            actions = [
-                {
-                    "_op_type": "delete",
-                    "_index": self._get_index_name(collection_name),
-                    "_id": id,
-                }
-                for id in ids
-            ]
-            bulk(self.client, actions)
+            bulk(self.client, self._delete_actions(collection_name, ids))
         elif filter:
-            query_body = {
-                "query": {"bool": {"filter": []}},
-            }
-            for field, value in filter.items():
-                query_body["query"]["bool"]["filter"].append(
-                    {"term": {"metadata." + str(field) + ".keyword": value}}
-                )
             self.client.delete_by_query(
-                index=self._get_index_name(collection_name), body=query_body
+                index=self._get_index_name(collection_name),
+                body=self._filter_body(filter),
             )
         self.client.indices.refresh(self._get_index_name(collection_name))
 
@@ -265,3 +276,109 @@ class OpenSearchClient(VectorDBBase):
         indices = self.client.indices.get(index=f"{self.index_prefix}_*")
         for index in indices:
             self.client.indices.delete(index=index)
+
+    async def ahas_collection(self, collection_name: str) -> bool:
+        return await self.async_client.indices.exists(
+            index=self._get_index_name(collection_name)
+        )
+
+    async def adelete_collection(self, collection_name: str):
+        await self.async_client.indices.delete(
+            index=self._get_index_name(collection_name)
+        )
+
+    async def asearch(
+        self, collection_name: str, vectors: list[list[float | int]], limit: int
+    ) -> Optional[SearchResult]:
+        try:
+            if not await self.ahas_collection(collection_name):
+                return None
+
+            result = await self.async_client.search(
+                index=self._get_index_name(collection_name),
+                body=self._search_body(vectors, limit),
+            )
+            return self._result_to_search_result(result)
+        except Exception as e:
+            return None
+
+    async def aquery(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        if not await self.ahas_collection(collection_name):
+            return None
+
+        try:
+            result = await self.async_client.search(
+                index=self._get_index_name(collection_name),
+                body={**self._filter_body(filter), "_source": ["text", "metadata"]},
+                size=limit if limit else 10000,
+            )
+            return self._result_to_get_result(result)
+        except Exception as e:
+            return None
+
+    async def _acreate_index_if_not_exists(self, collection_name: str, dimension: int):
+        if not await self.ahas_collection(collection_name):
+            await self.async_client.indices.create(
+                index=self._get_index_name(collection_name),
+                body=self._index_body(dimension),
+            )
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        result = await self.async_client.search(
+            index=self._get_index_name(collection_name),
+            body={"query": {"match_all": {}}, "_source": ["text", "metadata"]},
+        )
+        return self._result_to_get_result(result)
+
+    async def ainsert(self, collection_name: str, items: list[VectorItem]):
+        await self._acreate_index_if_not_exists(
+            collection_name=collection_name, dimension=len(items[0]["vector"])
+        )
+        for batch in self._create_batches(items):
+            await async_bulk(
+                self.async_client, self._insert_actions(collection_name, batch)
+            )
+        await self.async_client.indices.refresh(
+            index=self._get_index_name(collection_name)
+        )
+
+    async def aupsert(self, collection_name: str, items: list[VectorItem]):
+        await self._acreate_index_if_not_exists(
+            collection_name=collection_name, dimension=len(items[0]["vector"])
+        )
+        for batch in self._create_batches(items):
+            await async_bulk(
+                self.async_client, self._upsert_actions(collection_name, batch)
+            )
+        await self.async_client.indices.refresh(
+            index=self._get_index_name(collection_name)
+        )
+
+    async def adelete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ):
+        if ids:
+            await async_bulk(
+                self.async_client, self._delete_actions(collection_name, ids)
+            )
+        elif filter:
+            await self.async_client.delete_by_query(
+                index=self._get_index_name(collection_name),
+                body=self._filter_body(filter),
+            )
+        await self.async_client.indices.refresh(
+            index=self._get_index_name(collection_name)
+        )
+
+    async def areset(self):
+        indices = await self.async_client.indices.get(index=f"{self.index_prefix}_*")
+        for index in indices:
+            await self.async_client.indices.delete(index=index)
+
+    async def aclose(self):
+        await self.async_client.close()
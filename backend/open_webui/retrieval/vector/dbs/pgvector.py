@@ -1,7 +1,9 @@
 from typing import Optional, List, Dict, Any, Tuple
+import asyncio
 import logging
 import json
 from sqlalchemy import (
+    bindparam,
     func,
     literal,
     cast,
@@ -21,7 +23,9 @@ from sqlalchemy.sql import true
 from sqlalchemy.pool import NullPool, QueuePool
 
 from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
-from sqlalchemy.dialects.postgresql import JSONB, array
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from pgvector.sqlalchemy import Vector, HALFVEC
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.exc import NoSuchTableError
@@ -49,9 +53,10 @@ from open_webui.config import (
     PGVECTOR_HNSW_EF_CONSTRUCTION,
     PGVECTOR_IVFFLAT_LISTS,
     PGVECTOR_USE_HALFVEC,
+    VECTOR_DB_POOL_SIZE,
 )
 
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import DATABASE_URL, SRC_LOG_LEVELS
 
 VECTOR_LENGTH = PGVECTOR_INITIALIZE_MAX_VECTOR_LENGTH
 USE_HALFVEC = PGVECTOR_USE_HALFVEC
@@ -72,6 +77,35 @@ def pgcrypto_decrypt(col, key, outtype="text"):
     return func.cast(func.pgp_sym_decrypt(col, literal(key)), outtype)
 
 
+def get_async_db_url(db_url: str):
+    """The given postgres url, using the asyncpg driver."""
+    url = make_url(db_url).set(drivername="postgresql+asyncpg")
+    query = dict(url.query)
+    # asyncpg takes libpq's sslmode as ssl
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return url.set(query=query)
+
+
+def create_async_vector_engine(db_url: str):
+    if isinstance(PGVECTOR_POOL_SIZE, int) and PGVECTOR_POOL_SIZE <= 0:
+        return create_async_engine(
+            get_async_db_url(db_url), pool_pre_ping=True, poolclass=NullPool
+        )
+    return create_async_engine(
+        get_async_db_url(db_url),
+        pool_size=(
+            PGVECTOR_POOL_SIZE
+            if isinstance(PGVECTOR_POOL_SIZE, int)
+            else VECTOR_DB_POOL_SIZE
+        ),
+        max_overflow=PGVECTOR_POOL_MAX_OVERFLOW,
+        pool_timeout=PGVECTOR_POOL_TIMEOUT,
+        pool_recycle=PGVECTOR_POOL_RECYCLE,
+        pool_pre_ping=True,
+    )
+
+
 class DocumentChunk(Base):
     __tablename__ = "document_chunk"
 
@@ -119,6 +153,20 @@ class PgvectorClient(VectorDBBase):
             )
             self.session = scoped_session(SessionLocal)
 
+        # The async methods use their own asyncpg connection pool, and fall back
+        # to running the sync methods in a thread without asyncpg installed
+        self.async_engine = None
+        self.async_session = None
+        try:
+            self.async_engine = create_async_vector_engine(
+                PGVECTOR_DB_URL or DATABASE_URL
+            )
+            self.async_session = async_sessionmaker(
+                self.async_engine, expire_on_commit=False
+            )
+        except ImportError as e:
+            log.warning(f"asyncpg is not installed, pgvector queries use threads: {e}")
+
         try:
             # Ensure the pgvector extension is available
             # Use a conditional check to avoid permission issues on Azure PostgreSQL
@@ -303,36 +351,194 @@ class PgvectorClient(VectorDBBase):
             vector = vector[:VECTOR_LENGTH]
         return vector
 
+    def _pgcrypto_insert_statement(self, upsert: bool = False):
+        # Use raw SQL for BYTEA/pgcrypto
+        on_conflict = (
+            """
+            ON CONFLICT (id) DO UPDATE SET
+              vector = EXCLUDED.vector,
+              collection_name = EXCLUDED.collection_name,
+              text = EXCLUDED.text,
+              vmetadata = EXCLUDED.vmetadata
+            """
+            if upsert
+            else "ON CONFLICT (id) DO NOTHING"
+        )
+        return text(
+            f"""
+            INSERT INTO document_chunk
+            (id, vector, collection_name, text, vmetadata)
+            VALUES (
+                :id, :vector, :collection_name,
+                pgp_sym_encrypt(:text, :key),
+                pgp_sym_encrypt(:metadata_text, :key)
+            )
+            {on_conflict}
+        """
+        ).bindparams(bindparam("vector", type_=VECTOR_TYPE_FACTORY(dim=VECTOR_LENGTH)))
+
+    def _pgcrypto_insert_params(
+        self, collection_name: str, items: List[VectorItem]
+    ) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": item["id"],
+                "vector": self.adjust_vector_length(item["vector"]),
+                "collection_name": collection_name,
+                "text": item["text"],
+                # Ensure metadata is converted to its JSON text representation
+                "metadata_text": json.dumps(item["metadata"]),
+                "key": PGVECTOR_PGCRYPTO_KEY,
+            }
+            for item in items
+        ]
+
+    def _result_fields(self) -> list:
+        if PGVECTOR_PGCRYPTO:
+            return [
+                DocumentChunk.id,
+                pgcrypto_decrypt(DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text).label(
+                    "text"
+                ),
+                pgcrypto_decrypt(
+                    DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+                ).label("vmetadata"),
+            ]
+        return [DocumentChunk.id, DocumentChunk.text, DocumentChunk.vmetadata]
+
+    def _metadata_clauses(self, filter: Dict[str, Any]) -> list:
+        if PGVECTOR_PGCRYPTO:
+            # decrypt then check key: JSON filter after decryption
+            vmetadata = pgcrypto_decrypt(
+                DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+            )
+        else:
+            vmetadata = DocumentChunk.vmetadata
+        return [vmetadata[key].astext == str(value) for key, value in filter.items()]
+
+    def _search_statement(
+        self, collection_name: str, vectors: List[List[float]], limit: Optional[int]
+    ):
+        # Each query vector is bound as a single parameter cast to the column type
+        def vector_expr(vector):
+            return cast(
+                bindparam(None, vector, type_=VECTOR_TYPE_FACTORY(VECTOR_LENGTH)),
+                VECTOR_TYPE_FACTORY(VECTOR_LENGTH),
+            )
+
+        # Create the values for query vectors
+        qid_col = column("qid", Integer)
+        q_vector_col = column("q_vector", VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
+        query_vectors = (
+            values(qid_col, q_vector_col)
+            .data([(idx, vector_expr(vector)) for idx, vector in enumerate(vectors)])
+            .alias("query_vectors")
+        )
+
+        result_fields = self._result_fields()
+        result_fields.append(
+            (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)).label(
+                "distance"
+            )
+        )
+
+        # Build the lateral subquery for each query vector
+        subq = (
+            select(*result_fields)
+            .where(DocumentChunk.collection_name == collection_name)
+            .order_by((DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)))
+        )
+        if limit is not None:
+            subq = subq.limit(limit)
+        subq = subq.lateral("result")
+
+        # Build the main query by joining query_vectors and the lateral subquery
+        return (
+            select(
+                query_vectors.c.qid,
+                subq.c.id,
+                subq.c.text,
+                subq.c.vmetadata,
+                subq.c.distance,
+            )
+            .select_from(query_vectors)
+            .join(subq, true())
+            .order_by(query_vectors.c.qid, subq.c.distance)
+        )
+
+    def _search_result(self, results, num_queries: int) -> SearchResult:
+        ids = [[] for _ in range(num_queries)]
+        distances = [[] for _ in range(num_queries)]
+        documents = [[] for _ in range(num_queries)]
+        metadatas = [[] for _ in range(num_queries)]
+
+        for row in results:
+            qid = int(row.qid)
+            ids[qid].append(row.id)
+            # normalize and re-orders pgvec distance from [2, 0] to [0, 1] score range
+            # https://github.com/pgvector/pgvector?tab=readme-ov-file#querying
+            distances[qid].append((2.0 - row.distance) / 2.0)
+            documents[qid].append(row.text)
+            metadatas[qid].append(row.vmetadata)
+
+        return SearchResult(
+            ids=ids, distances=distances, documents=documents, metadatas=metadatas
+        )
+
+    def _query_statement(
+        self, collection_name: str, filter: Dict[str, Any], limit: Optional[int]
+    ):
+        stmt = select(*self._result_fields()).where(
+            DocumentChunk.collection_name == collection_name,
+            *self._metadata_clauses(filter),
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return stmt
+
+    def _get_vectors_statement(self, collection_name: str, ids: List[str]):
+        return select(DocumentChunk.id, DocumentChunk.vector).where(
+            DocumentChunk.collection_name == collection_name,
+            DocumentChunk.id.in_(ids),
+        )
+
+    def _vectors_result(self, results) -> Dict[str, List[float]]:
+        # Half-precision vectors are returned as HalfVector objects
+        return {
+            row.id: (
+                row.vector.to_list() if hasattr(row.vector, "to_list") else row.vector
+            )
+            for row in results
+            if row.vector is not None
+        }
+
+    def _delete_statement(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict[str, Any]] = None,
+    ):
+        wheres = [DocumentChunk.collection_name == collection_name]
+        if ids:
+            wheres.append(DocumentChunk.id.in_(ids))
+        if filter:
+            wheres.extend(self._metadata_clauses(filter))
+        return DocumentChunk.__table__.delete().where(*wheres)
+
+    def _has_collection_statement(self, collection_name: str):
+        return (
+            select(DocumentChunk.id)
+            .where(DocumentChunk.collection_name == collection_name)
+            .limit(1)
+        )
+
     def insert(self, collection_name: str, items: List[VectorItem]) -> None:
         try:
             if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    # Use raw SQL for BYTEA/pgcrypto
-                    # Ensure metadata is converted to its JSON text representation
-                    json_metadata = json.dumps(item["metadata"])
-                    self.session.execute(
-                        text(
-                            """
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO NOTHING
-                        """
-                        ),
-                        {
-                            "id": item["id"],
-                            "vector": vector,
-                            "collection_name": collection_name,
-                            "text": item["text"],
-                            "metadata_text": json_metadata,
-                            "key": PGVECTOR_PGCRYPTO_KEY,
-                        },
-                    )
+                self.session.execute(
+                    self._pgcrypto_insert_statement(),
+                    self._pgcrypto_insert_params(collection_name, items),
+                )
                 self.session.commit()
                 log.info(f"Encrypted & inserted {len(items)} into '{collection_name}'")
 
@@ -361,35 +567,10 @@ class PgvectorClient(VectorDBBase):
     def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
         try:
             if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    json_metadata = json.dumps(item["metadata"])
-                    self.session.execute(
-                        text(
-                            """
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO UPDATE SET
-                              vector = EXCLUDED.vector,
-                              collection_name = EXCLUDED.collection_name,
-                              text = EXCLUDED.text,
-                              vmetadata = EXCLUDED.vmetadata
-                        """
-                        ),
-                        {
-                            "id": item["id"],
-                            "vector": vector,
-                            "collection_name": collection_name,
-                            "text": item["text"],
-                            "metadata_text": json_metadata,
-                            "key": PGVECTOR_PGCRYPTO_KEY,
-                        },
-                    )
+                self.session.execute(
+                    self._pgcrypto_insert_statement(upsert=True),
+                    self._pgcrypto_insert_params(collection_name, items),
+                )
                 self.session.commit()
                 log.info(f"Encrypted & upserted {len(items)} into '{collection_name}'")
             else:
@@ -437,100 +618,12 @@ class PgvectorClient(VectorDBBase):
 
             # Adjust query vectors to VECTOR_LENGTH
             vectors = [self.adjust_vector_length(vector) for vector in vectors]
-            num_queries = len(vectors)
-
-            def vector_expr(vector):
-                return cast(array(vector), VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
-
-            # Create the values for query vectors
-            qid_col = column("qid", Integer)
-            q_vector_col = column("q_vector", VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
-            query_vectors = (
-                values(qid_col, q_vector_col)
-                .data(
-                    [(idx, vector_expr(vector)) for idx, vector in enumerate(vectors)]
-                )
-                .alias("query_vectors")
-            )
-
-            result_fields = [
-                DocumentChunk.id,
-            ]
-            if PGVECTOR_PGCRYPTO:
-                result_fields.append(
-                    pgcrypto_decrypt(
-                        DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
-                    ).label("text")
-                )
-                result_fields.append(
-                    pgcrypto_decrypt(
-                        DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
-                    ).label("vmetadata")
-                )
-            else:
-                result_fields.append(DocumentChunk.text)
-                result_fields.append(DocumentChunk.vmetadata)
-            result_fields.append(
-                (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)).label(
-                    "distance"
-                )
-            )
-
-            # Build the lateral subquery for each query vector
-            subq = (
-                select(*result_fields)
-                .where(DocumentChunk.collection_name == collection_name)
-                .order_by(
-                    (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector))
-                )
-            )
-            if limit is not None:
-                subq = subq.limit(limit)
-            subq = subq.lateral("result")
-
-            # Build the main query by joining query_vectors and the lateral subquery
-            stmt = (
-                select(
-                    query_vectors.c.qid,
-                    subq.c.id,
-                    subq.c.text,
-                    subq.c.vmetadata,
-                    subq.c.distance,
-                )
-                .select_from(query_vectors)
-                .join(subq, true())
-                .order_by(query_vectors.c.qid, subq.c.distance)
-            )
-
-            result_proxy = self.session.execute(stmt)
-            results = result_proxy.all()
-
-            ids = [[] for _ in range(num_queries)]
-            distances = [[] for _ in range(num_queries)]
-            documents = [[] for _ in range(num_queries)]
-            metadatas = [[] for _ in range(num_queries)]
-
-            if not results:
-                return SearchResult(
-                    ids=ids,
-                    distances=distances,
-                    documents=documents,
-                    metadatas=metadatas,
-                )
-
-            for row in results:
-                qid = int(row.qid)
-                ids[qid].append(row.id)
-                # normalize and re-orders pgvec distance from [2, 0] to [0, 1] score range
-                # https://github.com/pgvector/pgvector?tab=readme-ov-file#querying
-                distances[qid].append((2.0 - row.distance) / 2.0)
-                documents[qid].append(row.text)
-                metadatas[qid].append(row.vmetadata)
+            results = self.session.execute(
+                self._search_statement(collection_name, vectors, limit)
+            ).all()
 
             self.session.rollback()  # read-only transaction
-            return SearchResult(
-                ids=ids, distances=distances, documents=documents, metadatas=metadatas
-            )
+            return self._search_result(results, len(vectors))
         except Exception as e:
             self.session.rollback()
             log.exception(f"Error during search: {e}")
@@ -540,43 +633,9 @@ class PgvectorClient(VectorDBBase):
         self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
     ) -> Optional[GetResult]:
         try:
-            if PGVECTOR_PGCRYPTO:
-                # Build where clause for vmetadata filter
-                where_clauses = [DocumentChunk.collection_name == collection_name]
-                for key, value in filter.items():
-                    # decrypt then check key: JSON filter after decryption
-                    where_clauses.append(
-                        pgcrypto_decrypt(
-                            DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
-                        )[key].astext
-                        == str(value)
-                    )
-                stmt = select(
-                    DocumentChunk.id,
-                    pgcrypto_decrypt(
-                        DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
-                    ).label("text"),
-                    pgcrypto_decrypt(
-                        DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
-                    ).label("vmetadata"),
-                ).where(*where_clauses)
-                if limit is not None:
-                    stmt = stmt.limit(limit)
-                results = self.session.execute(stmt).all()
-            else:
-                query = self.session.query(DocumentChunk).filter(
-                    DocumentChunk.collection_name == collection_name
-                )
-
-                for key, value in filter.items():
-                    query = query.filter(
-                        DocumentChunk.vmetadata[key].astext == str(value)
-                    )
-
-                if limit is not None:
-                    query = query.limit(limit)
-
-                results = query.all()
+            results = self.session.execute(
+                self._query_statement(collection_name, filter, limit)
+            ).all()
 
             if not results:
                 return None
@@ -600,38 +659,16 @@ class PgvectorClient(VectorDBBase):
         self, collection_name: str, limit: Optional[int] = None
     ) -> Optional[GetResult]:
         try:
-            if PGVECTOR_PGCRYPTO:
-                stmt = select(
-                    DocumentChunk.id,
-                    pgcrypto_decrypt(
-                        DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
-                    ).label("text"),
-                    pgcrypto_decrypt(
-                        DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
-                    ).label("vmetadata"),
-                ).where(DocumentChunk.collection_name == collection_name)
-                if limit is not None:
-                    stmt = stmt.limit(limit)
-                results = self.session.execute(stmt).all()
-                ids = [[row.id for row in results]]
-                documents = [[row.text for row in results]]
-                metadatas = [[row.vmetadata for row in results]]
-            else:
+            results = self.session.execute(
+                self._query_statement(collection_name, {}, limit)
+            ).all()
 
-                query = self.session.query(DocumentChunk).filter(
-                    DocumentChunk.collection_name == collection_name
-                )
-                if limit is not None:
-                    query = query.limit(limit)
-
-                results = query.all()
-
-                if not results:
-                    return None
+            if not results and not PGVECTOR_PGCRYPTO:
+                return None
 
-                ids = [[result.id for result in results]]
-                documents = [[result.text for result in results]]
-                metadatas = [[result.vmetadata for result in results]]
+            ids = [[row.id for row in results]]
+            documents = [[row.text for row in results]]
+            metadatas = [[row.vmetadata for row in results]]
 
             self.session.rollback()  # read-only transaction
             return GetResult(ids=ids, documents=documents, metadatas=metadatas)
@@ -640,6 +677,20 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during get: {e}")
             return None
 
+    def get_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        try:
+            results = self.session.execute(
+                self._get_vectors_statement(collection_name, ids)
+            ).all()
+            self.session.rollback()  # read-only transaction
+            return self._vectors_result(results)
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error during get_vectors: {e}")
+            return None
+
     def delete(
         self,
         collection_name: str,
@@ -647,33 +698,10 @@ class PgvectorClient(VectorDBBase):
         filter: Optional[Dict[str, Any]] = None,
     ) -> None:
         try:
-            if PGVECTOR_PGCRYPTO:
-                wheres = [DocumentChunk.collection_name == collection_name]
-                if ids:
-                    wheres.append(DocumentChunk.id.in_(ids))
-                if filter:
-                    for key, value in filter.items():
-                        wheres.append(
-                            pgcrypto_decrypt(
-                                DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
-                            )[key].astext
-                            == str(value)
-                        )
-                stmt = DocumentChunk.__table__.delete().where(*wheres)
-                result = self.session.execute(stmt)
-                deleted = result.rowcount
-            else:
-                query = self.session.query(DocumentChunk).filter(
-                    DocumentChunk.collection_name == collection_name
-                )
-                if ids:
-                    query = query.filter(DocumentChunk.id.in_(ids))
-                if filter:
-                    for key, value in filter.items():
-                        query = query.filter(
-                            DocumentChunk.vmetadata[key].astext == str(value)
-                        )
-                deleted = query.delete(synchronize_session=False)
+            result = self.session.execute(
+                self._delete_statement(collection_name, ids, filter)
+            )
+            deleted = result.rowcount
             self.session.commit()
             log.info(f"Deleted {deleted} items from collection '{collection_name}'.")
         except Exception as e:
@@ -699,9 +727,9 @@ class PgvectorClient(VectorDBBase):
     def has_collection(self, collection_name: str) -> bool:
         try:
             exists = (
-                self.session.query(DocumentChunk)
-                .filter(DocumentChunk.collection_name == collection_name)
-                .first()
+                self.session.execute(
+                    self._has_collection_statement(collection_name)
+                ).first()
                 is not None
             )
             self.session.rollback()  # read-only transaction
@@ -714,3 +742,231 @@ class PgvectorClient(VectorDBBase):
     def delete_collection(self, collection_name: str) -> None:
         self.delete(collection_name)
         log.info(f"Collection '{collection_name}' deleted.")
+
+    async def ainsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        if self.async_session is None:
+            return await super().ainsert(collection_name, items)
+
+        async with self.async_session() as session:
+            try:
+                if PGVECTOR_PGCRYPTO:
+                    await session.execute(
+                        self._pgcrypto_insert_statement(),
+                        self._pgcrypto_insert_params(collection_name, items),
+                    )
+                else:
+                    await session.execute(
+                        pg_insert(DocumentChunk.__table__),
+                        self._insert_rows(collection_name, items),
+                    )
+                await session.commit()
+                log.info(
+                    f"Inserted {len(items)} items into collection '{collection_name}'."
+                )
+            except Exception as e:
+                await session.rollback()
+                log.exception(f"Error during insert: {e}")
+                raise
+
+    async def aupsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        if self.async_session is None:
+            return await super().aupsert(collection_name, items)
+
+        async with self.async_session() as session:
+            try:
+                if PGVECTOR_PGCRYPTO:
+                    await session.execute(
+                        self._pgcrypto_insert_statement(upsert=True),
+                        self._pgcrypto_insert_params(collection_name, items),
+                    )
+                else:
+                    stmt = pg_insert(DocumentChunk.__table__)
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=[DocumentChunk.id],
+                        set_={
+                            "vector": stmt.excluded.vector,
+                            "collection_name": stmt.excluded.collection_name,
+                            "text": stmt.excluded.text,
+                            "vmetadata": stmt.excluded.vmetadata,
+                        },
+                    )
+                    await session.execute(
+                        stmt, self._insert_rows(collection_name, items)
+                    )
+                await session.commit()
+                log.info(
+                    f"Upserted {len(items)} items into collection '{collection_name}'."
+                )
+            except Exception as e:
+                await session.rollback()
+                log.exception(f"Error during upsert: {e}")
+                raise
+
+    def _insert_rows(
+        self, collection_name: str, items: List[VectorItem]
+    ) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": item["id"],
+                "vector": self.adjust_vector_length(item["vector"]),
+                "collection_name": collection_name,
+                "text": item["text"],
+                "vmetadata": process_metadata(item["metadata"]),
+            }
+            for item in items
+        ]
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: List[List[float]],
+        limit: Optional[int] = None,
+    ) -> Optional[SearchResult]:
+        if self.async_session is None:
+            return await super().asearch(collection_name, vectors, limit)
+        if not vectors:
+            return None
+
+        try:
+            vectors = [self.adjust_vector_length(vector) for vector in vectors]
+            async with self.async_session() as session:
+                results = (
+                    await session.execute(
+                        self._search_statement(collection_name, vectors, limit)
+                    )
+                ).all()
+            return self._search_result(results, len(vectors))
+        except Exception as e:
+            log.exception(f"Error during search: {e}")
+            return None
+
+    async def aquery(
+        self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        if self.async_session is None:
+            return await super().aquery(collection_name, filter, limit)
+
+        try:
+            async with self.async_session() as session:
+                results = (
+                    await session.execute(
+                        self._query_statement(collection_name, filter, limit)
+                    )
+                ).all()
+
+            if not results:
+                return None
+
+            return GetResult(
+                ids=[[result.id for result in results]],
+                documents=[[result.text for result in results]],
+                metadatas=[[result.vmetadata for result in results]],
+            )
+        except Exception as e:
+            log.exception(f"Error during query: {e}")
+            return None
+
+    async def aget(
+        self, collection_name: str, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        if self.async_session is None:
+            return await asyncio.to_thread(self.get, collection_name, limit)
+
+        try:
+            async with self.async_session() as session:
+                results = (
+                    await session.execute(
+                        self._query_statement(collection_name, {}, limit)
+                    )
+                ).all()
+
+            if not results and not PGVECTOR_PGCRYPTO:
+                return None
+
+            return GetResult(
+                ids=[[row.id for row in results]],
+                documents=[[row.text for row in results]],
+                metadatas=[[row.vmetadata for row in results]],
+            )
+        except Exception as e:
+            log.exception(f"Error during get: {e}")
+            return None
+
+    async def aget_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        if self.async_session is None:
+            return await super().aget_vectors(collection_name, ids)
+
+        try:
+            async with self.async_session() as session:
+                results = (
+                    await session.execute(
+                        self._get_vectors_statement(collection_name, ids)
+                    )
+                ).all()
+            return self._vectors_result(results)
+        except Exception as e:
+            log.exception(f"Error during get_vectors: {e}")
+            return None
+
+    async def adelete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if self.async_session is None:
+            return await super().adelete(collection_name, ids, filter)
+
+        async with self.async_session() as session:
+            try:
+                result = await session.execute(
+                    self._delete_statement(collection_name, ids, filter)
+                )
+                await session.commit()
+                log.info(
+                    f"Deleted {result.rowcount} items from collection '{collection_name}'."
+                )
+            except Exception as e:
+                await session.rollback()
+                log.exception(f"Error during delete: {e}")
+                raise
+
+    async def areset(self) -> None:
+        if self.async_session is None:
+            return await super().areset()
+
+        async with self.async_session() as session:
+            try:
+                result = await session.execute(DocumentChunk.__table__.delete())
+                await session.commit()
+                log.info(
+                    f"Reset complete. Deleted {result.rowcount} items from 'document_chunk' table."
+                )
+            except Exception as e:
+                await session.rollback()
+                log.exception(f"Error during reset: {e}")
+                raise
+
+    async def ahas_collection(self, collection_name: str) -> bool:
+        if self.async_session is None:
+            return await super().ahas_collection(collection_name)
+
+        try:
+            async with self.async_session() as session:
+                result = await session.execute(
+                    self._has_collection_statement(collection_name)
+                )
+                return result.first() is not None
+        except Exception as e:
+            log.exception(f"Error checking collection existence: {e}")
+            return False
+
+    async def adelete_collection(self, collection_name: str) -> None:
+        await self.adelete(collection_name)
+        log.info(f"Collection '{collection_name}' deleted.")
+
+    async def aclose(self) -> None:
+        if self.async_engine is not None:
+            await self.async_engine.dispose()
@@ -2,7 +2,8 @@ from typing import Optional
 import logging
 from urllib.parse import urlparse
 
-from qdrant_client import QdrantClient as Qclient
+import httpx
+from qdrant_client import AsyncQdrantClient, QdrantClient as Qclient
 from qdrant_client.http.models import PointStruct
 from qdrant_client.models import models
 
@@ -21,6 +22,7 @@ from open_webui.config import (
     QDRANT_COLLECTION_PREFIX,
     QDRANT_TIMEOUT,
     QDRANT_HNSW_M,
+    VECTOR_DB_POOL_SIZE,
 )
 from open_webui.env import SRC_LOG_LEVELS
 
@@ -43,28 +45,38 @@ class QdrantClient(VectorDBBase):
 
         if not self.QDRANT_URI:
             self.client = None
+            self.async_client = None
             return
 
+        self.client = Qclient(**self._client_kwargs())
+        self.async_client = AsyncQdrantClient(
+            **self._client_kwargs(),
+            limits=httpx.Limits(
+                max_connections=VECTOR_DB_POOL_SIZE,
+                max_keepalive_connections=VECTOR_DB_POOL_SIZE,
+            ),
+        )
+
+    def _client_kwargs(self) -> dict:
         # Unified handling for either scheme
         parsed = urlparse(self.QDRANT_URI)
         host = parsed.hostname or self.QDRANT_URI
         http_port = parsed.port or 6333  # default REST port
 
         if self.PREFER_GRPC:
-            self.client = Qclient(
-                host=host,
-                port=http_port,
-                grpc_port=self.GRPC_PORT,
-                prefer_grpc=self.PREFER_GRPC,
-                api_key=self.QDRANT_API_KEY,
-                timeout=self.QDRANT_TIMEOUT,
-            )
-        else:
-            self.client = Qclient(
-                url=self.QDRANT_URI,
-                api_key=self.QDRANT_API_KEY,
-                timeout=QDRANT_TIMEOUT,
-            )
+            return {
+                "host": host,
+                "port": http_port,
+                "grpc_port": self.GRPC_PORT,
+                "prefer_grpc": self.PREFER_GRPC,
+                "api_key": self.QDRANT_API_KEY,
+                "timeout": self.QDRANT_TIMEOUT,
+            }
+        return {
+            "url": self.QDRANT_URI,
+            "api_key": self.QDRANT_API_KEY,
+            "timeout": self.QDRANT_TIMEOUT,
+        }
 
     def _result_to_get_result(self, points) -> GetResult:
         ids = []
@@ -85,39 +97,42 @@ class QdrantClient(VectorDBBase):
             }
         )
 
-    def _create_collection(self, collection_name: str, dimension: int):
-        collection_name_with_prefix = f"{self.collection_prefix}_{collection_name}"
-        self.client.create_collection(
-            collection_name=collection_name_with_prefix,
-            vectors_config=models.VectorParams(
+    def _collection_config(self, dimension: int) -> dict:
+        return {
+            "vectors_config": models.VectorParams(
                 size=dimension,
                 distance=models.Distance.COSINE,
                 on_disk=self.QDRANT_ON_DISK,
             ),
-            hnsw_config=models.HnswConfigDiff(
+            "hnsw_config": models.HnswConfigDiff(
                 m=self.QDRANT_HNSW_M,
             ),
-        )
+        }
 
-        # Create payload indexes for efficient filtering
-        self.client.create_payload_index(
-            collection_name=collection_name_with_prefix,
-            field_name="metadata.hash",
-            field_schema=models.KeywordIndexParams(
-                type=models.KeywordIndexType.KEYWORD,
-                is_tenant=False,
-                on_disk=self.QDRANT_ON_DISK,
-            ),
-        )
-        self.client.create_payload_index(
+    def _payload_indexes(self) -> list[dict]:
+        # Payload indexes for efficient filtering
+        return [
+            {
+                "field_name": field_name,
+                "field_schema": models.KeywordIndexParams(
+                    type=models.KeywordIndexType.KEYWORD,
+                    is_tenant=False,
+                    on_disk=self.QDRANT_ON_DISK,
+                ),
+            }
+            for field_name in ("metadata.hash", "metadata.file_id")
+        ]
+
+    def _create_collection(self, collection_name: str, dimension: int):
+        collection_name_with_prefix = f"{self.collection_prefix}_{collection_name}"
+        self.client.create_collection(
             collection_name=collection_name_with_prefix,
-            field_name="metadata.file_id",
-            field_schema=models.KeywordIndexParams(
-                type=models.KeywordIndexType.KEYWORD,
-                is_tenant=False,
-                on_disk=self.QDRANT_ON_DISK,
-            ),
+            **self._collection_config(dimension),
         )
+        for payload_index in self._payload_indexes():
+            self.client.create_payload_index(
+                collection_name=collection_name_with_prefix, **payload_index
+            )
         log.info(f"collection {collection_name_with_prefix} successfully created!")
 
     def _create_collection_if_not_exists(self, collection_name, dimension):
@@ -136,6 +151,41 @@ class QdrantClient(VectorDBBase):
             for item in items
         ]
 
+    def _result_to_search_result(self, points) -> SearchResult:
+        get_result = self._result_to_get_result(points)
+        return SearchResult(
+            ids=get_result.ids,
+            documents=get_result.documents,
+            metadatas=get_result.metadatas,
+            # qdrant distance is [-1, 1], normalize to [0, 1]
+            distances=[[(point.score + 1.0) / 2.0 for point in points]],
+        )
+
+    def _metadata_conditions(self, filter: dict) -> list:
+        return [
+            models.FieldCondition(
+                key=f"metadata.{key}", match=models.MatchValue(value=value)
+            )
+            for key, value in filter.items()
+        ]
+
+    def _delete_selector(
+        self, ids: Optional[list[str]] = None, filter: Optional[dict] = None
+    ):
+        field_conditions = []
+
+        if ids:
+            field_conditions = [
+                models.FieldCondition(
+                    key="metadata.id", match=models.MatchValue(value=id_value)
+                )
+                for id_value in ids
+            ]
+        elif filter:
+            field_conditions = self._metadata_conditions(filter)
+
+        return models.FilterSelector(filter=models.Filter(must=field_conditions))
+
     def has_collection(self, collection_name: str) -> bool:
         return self.client.collection_exists(
             f"{self.collection_prefix}_{collection_name}"
@@ -158,14 +208,7 @@ class QdrantClient(VectorDBBase):
             query=vectors[0],
             limit=limit,
         )
-        get_result = self._result_to_get_result(query_response.points)
-        return SearchResult(
-            ids=get_result.ids,
-            documents=get_result.documents,
-            metadatas=get_result.metadatas,
-            # qdrant distance is [-1, 1], normalize to [0, 1]
-            distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
-        )
+        return self._result_to_search_result(query_response.points)
 
     def query(self, collection_name: str, filter: dict, limit: Optional[int] = None):
         # Construct the filter string for querying
@@ -175,17 +218,9 @@ class QdrantClient(VectorDBBase):
             if limit is None:
                 limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
 
-            field_conditions = []
-            for key, value in filter.items():
-                field_conditions.append(
-                    models.FieldCondition(
-                        key=f"metadata.{key}", match=models.MatchValue(value=value)
-                    )
-                )
-
             points = self.client.scroll(
                 collection_name=f"{self.collection_prefix}_{collection_name}",
-                scroll_filter=models.Filter(should=field_conditions),
+                scroll_filter=models.Filter(should=self._metadata_conditions(filter)),
                 limit=limit,
             )
             return self._result_to_get_result(points[0])
@@ -201,6 +236,15 @@ class QdrantClient(VectorDBBase):
         )
         return self._result_to_get_result(points[0])
 
+    def get_vectors(self, collection_name: str, ids: list[str]) -> Optional[dict]:
+        points = self.client.retrieve(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            ids=ids,
+            with_payload=False,
+            with_vectors=True,
+        )
+        return {str(point.id): point.vector for point in points}
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         self._create_collection_if_not_exists(collection_name, len(items[0]["vector"]))
@@ -220,30 +264,9 @@ class QdrantClient(VectorDBBase):
         filter: Optional[dict] = None,
     ):
         # Delete the items from the collection based on the ids.
-        field_conditions = []
-
-        if ids:
-            for id_value in ids:
-                field_conditions.append(
-                    models.FieldCondition(
-                        key="metadata.id",
-                        match=models.MatchValue(value=id_value),
-                    ),
-                ),
-        elif filter:
-            for key, value in filter.items():
-                field_conditions.append(
-                    models.FieldCondition(
-                        key=f"metadata.{key}",
-                        match=models.MatchValue(value=value),
-                    ),
-                ),
-
         return self.client.delete(
             collection_name=f"{self.collection_prefix}_{collection_name}",
-            points_selector=models.FilterSelector(
-                filter=models.Filter(must=field_conditions)
-            ),
+            points_selector=self._delete_selector(ids, filter),
         )
 
     def reset(self):
@@ -252,3 +275,114 @@ class QdrantClient(VectorDBBase):
         for collection_name in collection_names:
             if collection_name.name.startswith(self.collection_prefix):
                 self.client.delete_collection(collection_name=collection_name.name)
+
+    async def _acreate_collection_if_not_exists(self, collection_name, dimension):
+        if await self.ahas_collection(collection_name=collection_name):
+            return
+
+        collection_name_with_prefix = f"{self.collection_prefix}_{collection_name}"
+        await self.async_client.create_collection(
+            collection_name=collection_name_with_prefix,
+            **self._collection_config(dimension),
+        )
+        for payload_index in self._payload_indexes():
+            await self.async_client.create_payload_index(
+                collection_name=collection_name_with_prefix, **payload_index
+            )
+        log.info(f"collection {collection_name_with_prefix} successfully created!")
+
+    async def ahas_collection(self, collection_name: str) -> bool:
+        return await self.async_client.collection_exists(
+            f"{self.collection_prefix}_{collection_name}"
+        )
+
+    async def adelete_collection(self, collection_name: str):
+        return await self.async_client.delete_collection(
+            collection_name=f"{self.collection_prefix}_{collection_name}"
+        )
+
+    async def asearch(
+        self, collection_name: str, vectors: list[list[float | int]], limit: int
+    ) -> Optional[SearchResult]:
+        if limit is None:
+            limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
+
+        query_response = await self.async_client.query_points(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            query=vectors[0],
+            limit=limit,
+        )
+        return self._result_to_search_result(query_response.points)
+
+    async def aquery(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ):
+        if not await self.ahas_collection(collection_name):
+            return None
+        try:
+            if limit is None:
+                limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
+
+            points = await self.async_client.scroll(
+                collection_name=f"{self.collection_prefix}_{collection_name}",
+                scroll_filter=models.Filter(should=self._metadata_conditions(filter)),
+                limit=limit,
+            )
+            return self._result_to_get_result(points[0])
+        except Exception as e:
+            log.exception(f"Error querying a collection '{collection_name}': {e}")
+            return None
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        points = await self.async_client.scroll(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            limit=NO_LIMIT,  # otherwise qdrant would set limit to 10!
+        )
+        return self._result_to_get_result(points[0])
+
+    async def aget_vectors(
+        self, collection_name: str, ids: list[str]
+    ) -> Optional[dict]:
+        points = await self.async_client.retrieve(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            ids=ids,
+            with_payload=False,
+            with_vectors=True,
+        )
+        return {str(point.id): point.vector for point in points}
+
+    async def ainsert(self, collection_name: str, items: list[VectorItem]):
+        # Points are written with upsert, which also inserts new points
+        await self.aupsert(collection_name, items)
+
+    async def aupsert(self, collection_name: str, items: list[VectorItem]):
+        await self._acreate_collection_if_not_exists(
+            collection_name, len(items[0]["vector"])
+        )
+        points = self._create_points(items)
+        return await self.async_client.upsert(
+            f"{self.collection_prefix}_{collection_name}", points
+        )
+
+    async def adelete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ):
+        return await self.async_client.delete(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            points_selector=self._delete_selector(ids, filter),
+        )
+
+    async def areset(self):
+        collections = (await self.async_client.get_collections()).collections
+        for collection in collections:
+            if collection.name.startswith(self.collection_prefix):
+                await self.async_client.delete_collection(
+                    collection_name=collection.name
+                )
+
+    async def aclose(self):
+        if self.async_client is not None:
+            await self.async_client.close()
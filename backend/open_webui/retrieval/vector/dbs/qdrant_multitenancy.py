@@ -3,6 +3,7 @@ from typing import Optional, Tuple, List, Dict, Any
 from urllib.parse import urlparse
 
 import grpc
+import httpx
 from open_webui.config import (
     QDRANT_API_KEY,
     QDRANT_GRPC_PORT,
@@ -12,6 +13,7 @@ from open_webui.config import (
     QDRANT_COLLECTION_PREFIX,
     QDRANT_TIMEOUT,
     QDRANT_HNSW_M,
+    VECTOR_DB_POOL_SIZE,
 )
 from open_webui.env import SRC_LOG_LEVELS
 from open_webui.retrieval.vector.main import (
@@ -20,7 +22,7 @@ from open_webui.retrieval.vector.main import (
     VectorDBBase,
     VectorItem,
 )
-from qdrant_client import QdrantClient as Qclient
+from qdrant_client import AsyncQdrantClient, QdrantClient as Qclient
 from qdrant_client.http.exceptions import UnexpectedResponse
 from qdrant_client.http.models import PointStruct
 from qdrant_client.models import models
@@ -45,6 +47,23 @@ def _metadata_filter(key: str, value: Any) -> models.FieldCondition:
     )
 
 
+def _delete_selector(
+    tenant_id: str,
+    ids: Optional[List[str]] = None,
+    filter: Optional[Dict[str, Any]] = None,
+) -> models.FilterSelector:
+    must_conditions = [_tenant_filter(tenant_id)]
+    should_conditions = []
+    if ids:
+        should_conditions = [_metadata_filter("id", id_value) for id_value in ids]
+    elif filter:
+        must_conditions += [_metadata_filter(k, v) for k, v in filter.items()]
+
+    return models.FilterSelector(
+        filter=models.Filter(must=must_conditions, should=should_conditions)
+    )
+
+
 class QdrantClient(VectorDBBase):
     def __init__(self):
         self.collection_prefix = QDRANT_COLLECTION_PREFIX
@@ -61,26 +80,13 @@ class QdrantClient(VectorDBBase):
                 "QDRANT_URI is not set. Please configure it in the environment variables."
             )
 
-        # Unified handling for either scheme
-        parsed = urlparse(self.QDRANT_URI)
-        host = parsed.hostname or self.QDRANT_URI
-        http_port = parsed.port or 6333  # default REST port
-
-        self.client = (
-            Qclient(
-                host=host,
-                port=http_port,
-                grpc_port=self.GRPC_PORT,
-                prefer_grpc=self.PREFER_GRPC,
-                api_key=self.QDRANT_API_KEY,
-                timeout=self.QDRANT_TIMEOUT,
-            )
-            if self.PREFER_GRPC
-            else Qclient(
-                url=self.QDRANT_URI,
-                api_key=self.QDRANT_API_KEY,
-                timeout=self.QDRANT_TIMEOUT,
-            )
+        self.client = Qclient(**self._client_kwargs())
+        self.async_client = AsyncQdrantClient(
+            **self._client_kwargs(),
+            limits=httpx.Limits(
+                max_connections=VECTOR_DB_POOL_SIZE,
+                max_keepalive_connections=VECTOR_DB_POOL_SIZE,
+            ),
         )
 
         # Main collection types for multi-tenancy
@@ -90,6 +96,27 @@ class QdrantClient(VectorDBBase):
         self.WEB_SEARCH_COLLECTION = f"{self.collection_prefix}_web-search"
         self.HASH_BASED_COLLECTION = f"{self.collection_prefix}_hash-based"
 
+    def _client_kwargs(self) -> dict:
+        # Unified handling for either scheme
+        parsed = urlparse(self.QDRANT_URI)
+        host = parsed.hostname or self.QDRANT_URI
+        http_port = parsed.port or 6333  # default REST port
+
+        if self.PREFER_GRPC:
+            return {
+                "host": host,
+                "port": http_port,
+                "grpc_port": self.GRPC_PORT,
+                "prefer_grpc": self.PREFER_GRPC,
+                "api_key": self.QDRANT_API_KEY,
+                "timeout": self.QDRANT_TIMEOUT,
+            }
+        return {
+            "url": self.QDRANT_URI,
+            "api_key": self.QDRANT_API_KEY,
+            "timeout": self.QDRANT_TIMEOUT,
+        }
+
     def _result_to_get_result(self, points) -> GetResult:
         ids, documents, metadatas = [], [], []
         for point in points:
@@ -99,6 +126,15 @@ class QdrantClient(VectorDBBase):
             metadatas.append(payload["metadata"])
         return GetResult(ids=[ids], documents=[documents], metadatas=[metadatas])
 
+    def _result_to_search_result(self, points) -> SearchResult:
+        get_result = self._result_to_get_result(points)
+        return SearchResult(
+            ids=get_result.ids,
+            documents=get_result.documents,
+            metadatas=get_result.metadatas,
+            distances=[[(point.score + 1.0) / 2.0 for point in points]],
+        )
+
     def _get_collection_and_tenant_id(self, collection_name: str) -> Tuple[str, str]:
         """
         Maps the traditional collection name to multi-tenant collection and tenant ID.
@@ -136,48 +172,59 @@ class QdrantClient(VectorDBBase):
         else:
             return self.KNOWLEDGE_COLLECTION, tenant_id
 
-    def _create_multi_tenant_collection(
-        self, mt_collection_name: str, dimension: int = DEFAULT_DIMENSION
-    ):
-        """
-        Creates a collection with multi-tenancy configuration and payload indexes for tenant_id and metadata fields.
-        """
-        self.client.create_collection(
-            collection_name=mt_collection_name,
-            vectors_config=models.VectorParams(
+    def _collection_config(self, dimension: int) -> dict:
+        return {
+            "vectors_config": models.VectorParams(
                 size=dimension,
                 distance=models.Distance.COSINE,
                 on_disk=self.QDRANT_ON_DISK,
             ),
             # Disable global index building due to multitenancy
             # For more details https://qdrant.tech/documentation/guides/multiple-partitions/#calibrate-performance
-            hnsw_config=models.HnswConfigDiff(
+            "hnsw_config": models.HnswConfigDiff(
                 payload_m=self.QDRANT_HNSW_M,
                 m=0,
             ),
+        }
+
+    def _payload_indexes(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "field_name": TENANT_ID_FIELD,
+                "field_schema": models.KeywordIndexParams(
+                    type=models.KeywordIndexType.KEYWORD,
+                    is_tenant=True,
+                    on_disk=self.QDRANT_ON_DISK,
+                ),
+            },
+            *(
+                {
+                    "field_name": field,
+                    "field_schema": models.KeywordIndexParams(
+                        type=models.KeywordIndexType.KEYWORD,
+                        on_disk=self.QDRANT_ON_DISK,
+                    ),
+                }
+                for field in ("metadata.hash", "metadata.file_id")
+            ),
+        ]
+
+    def _create_multi_tenant_collection(
+        self, mt_collection_name: str, dimension: int = DEFAULT_DIMENSION
+    ):
+        """
+        Creates a collection with multi-tenancy configuration and payload indexes for tenant_id and metadata fields.
+        """
+        self.client.create_collection(
+            collection_name=mt_collection_name, **self._collection_config(dimension)
         )
         log.info(
             f"Multi-tenant collection {mt_collection_name} created with dimension {dimension}!"
         )
 
-        self.client.create_payload_index(
-            collection_name=mt_collection_name,
-            field_name=TENANT_ID_FIELD,
-            field_schema=models.KeywordIndexParams(
-                type=models.KeywordIndexType.KEYWORD,
-                is_tenant=True,
-                on_disk=self.QDRANT_ON_DISK,
-            ),
-        )
-
-        for field in ("metadata.hash", "metadata.file_id"):
+        for payload_index in self._payload_indexes():
             self.client.create_payload_index(
-                collection_name=mt_collection_name,
-                field_name=field,
-                field_schema=models.KeywordIndexParams(
-                    type=models.KeywordIndexType.KEYWORD,
-                    on_disk=self.QDRANT_ON_DISK,
-                ),
+                collection_name=mt_collection_name, **payload_index
             )
 
     def _create_points(
@@ -241,18 +288,9 @@ class QdrantClient(VectorDBBase):
             log.debug(f"Collection {mt_collection} doesn't exist, nothing to delete")
             return None
 
-        must_conditions = [_tenant_filter(tenant_id)]
-        should_conditions = []
-        if ids:
-            should_conditions = [_metadata_filter("id", id_value) for id_value in ids]
-        elif filter:
-            must_conditions += [_metadata_filter(k, v) for k, v in filter.items()]
-
         return self.client.delete(
             collection_name=mt_collection,
-            points_selector=models.FilterSelector(
-                filter=models.Filter(must=must_conditions, should=should_conditions)
-            ),
+            points_selector=_delete_selector(tenant_id, ids, filter),
         )
 
     def search(
@@ -275,13 +313,7 @@ class QdrantClient(VectorDBBase):
             limit=limit,
             query_filter=models.Filter(must=[tenant_filter]),
         )
-        get_result = self._result_to_get_result(query_response.points)
-        return SearchResult(
-            ids=get_result.ids,
-            documents=get_result.documents,
-            metadatas=get_result.metadatas,
-            distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
-        )
+        return self._result_to_search_result(query_response.points)
 
     def query(
         self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
@@ -370,3 +402,132 @@ class QdrantClient(VectorDBBase):
                 filter=models.Filter(must=[_tenant_filter(tenant_id)])
             ),
         )
+
+    async def _aensure_collection(
+        self, mt_collection_name: str, dimension: int = DEFAULT_DIMENSION
+    ):
+        if await self.async_client.collection_exists(
+            collection_name=mt_collection_name
+        ):
+            return
+
+        await self.async_client.create_collection(
+            collection_name=mt_collection_name, **self._collection_config(dimension)
+        )
+        log.info(
+            f"Multi-tenant collection {mt_collection_name} created with dimension {dimension}!"
+        )
+        for payload_index in self._payload_indexes():
+            await self.async_client.create_payload_index(
+                collection_name=mt_collection_name, **payload_index
+            )
+
+    async def ahas_collection(self, collection_name: str) -> bool:
+        mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
+        if not await self.async_client.collection_exists(collection_name=mt_collection):
+            return False
+        count_result = await self.async_client.count(
+            collection_name=mt_collection,
+            count_filter=models.Filter(must=[_tenant_filter(tenant_id)]),
+        )
+        return count_result.count > 0
+
+    async def adelete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict[str, Any]] = None,
+    ):
+        mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
+        if not await self.async_client.collection_exists(collection_name=mt_collection):
+            log.debug(f"Collection {mt_collection} doesn't exist, nothing to delete")
+            return None
+
+        return await self.async_client.delete(
+            collection_name=mt_collection,
+            points_selector=_delete_selector(tenant_id, ids, filter),
+        )
+
+    async def asearch(
+        self, collection_name: str, vectors: List[List[float | int]], limit: int
+    ) -> Optional[SearchResult]:
+        if not vectors:
+            return None
+        mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
+        if not await self.async_client.collection_exists(collection_name=mt_collection):
+            log.debug(f"Collection {mt_collection} doesn't exist, search returns None")
+            return None
+
+        query_response = await self.async_client.query_points(
+            collection_name=mt_collection,
+            query=vectors[0],
+            limit=limit,
+            query_filter=models.Filter(must=[_tenant_filter(tenant_id)]),
+        )
+        return self._result_to_search_result(query_response.points)
+
+    async def aquery(
+        self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
+    ):
+        mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
+        if not await self.async_client.collection_exists(collection_name=mt_collection):
+            log.debug(f"Collection {mt_collection} doesn't exist, query returns None")
+            return None
+        if limit is None:
+            limit = NO_LIMIT
+        field_conditions = [_metadata_filter(k, v) for k, v in filter.items()]
+        points = await self.async_client.scroll(
+            collection_name=mt_collection,
+            scroll_filter=models.Filter(
+                must=[_tenant_filter(tenant_id), *field_conditions]
+            ),
+            limit=limit,
+        )
+        return self._result_to_get_result(points[0])
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
+        if not await self.async_client.collection_exists(collection_name=mt_collection):
+            log.debug(f"Collection {mt_collection} doesn't exist, get returns None")
+            return None
+        points = await self.async_client.scroll(
+            collection_name=mt_collection,
+            scroll_filter=models.Filter(must=[_tenant_filter(tenant_id)]),
+            limit=NO_LIMIT,
+        )
+        return self._result_to_get_result(points[0])
+
+    async def aupsert(self, collection_name: str, items: List[VectorItem]):
+        if not items:
+            return None
+        mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
+        await self._aensure_collection(mt_collection, len(items[0]["vector"]))
+        await self.async_client.upsert(
+            mt_collection, self._create_points(items, tenant_id)
+        )
+        return None
+
+    async def ainsert(self, collection_name: str, items: List[VectorItem]):
+        return await self.aupsert(collection_name, items)
+
+    async def areset(self):
+        for collection in (await self.async_client.get_collections()).collections:
+            if collection.name.startswith(self.collection_prefix):
+                await self.async_client.delete_collection(
+                    collection_name=collection.name
+                )
+
+    async def adelete_collection(self, collection_name: str):
+        mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
+        if not await self.async_client.collection_exists(collection_name=mt_collection):
+            log.debug(f"Collection {mt_collection} doesn't exist, nothing to delete")
+            return None
+        await self.async_client.delete(
+            collection_name=mt_collection,
+            points_selector=models.FilterSelector(
+                filter=models.Filter(must=[_tenant_filter(tenant_id)])
+            ),
+        )
+
+    async def aclose(self):
+        await self.async_client.close()
@@ -1,3 +1,8 @@
+import asyncio
+import logging
+import threading
+from typing import Optional
+
 from open_webui.retrieval.vector.main import VectorDBBase
 from open_webui.retrieval.vector.type import VectorType
 from open_webui.config import (
@@ -5,6 +10,10 @@ from open_webui.config import (
     ENABLE_QDRANT_MULTITENANCY_MODE,
     ENABLE_MILVUS_MULTITENANCY_MODE,
 )
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
 class Vector:
@@ -75,4 +84,44 @@ class Vector:
                 raise ValueError(f"Unsupported vector type: {vector_type}")
 
 
-VECTOR_DB_CLIENT = Vector.get_vector(VECTOR_DB)
+class LazyVectorDBClient:
+    """
+    Creates the vector db client on first use, so importing the routers does
+    not import the client library or connect to the database.
+    """
+
+    def __init__(self, vector_type: str):
+        self.vector_type = vector_type
+        self._client: Optional[VectorDBBase] = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> VectorDBBase:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = Vector.get_vector(self.vector_type)
+        return self._client
+
+    async def apreload(self):
+        """Create the client in a thread, logging rather than raising errors."""
+        try:
+            await asyncio.to_thread(lambda: self.client)
+        except Exception as e:
+            log.error(f"Error creating the vector db client: {e}")
+
+    async def aclose(self):
+        """Close the client's async connections, if it was ever created."""
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception as e:
+                log.error(f"Error closing the vector db client: {e}")
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+
+VECTOR_DB_CLIENT = LazyVectorDBClient(VECTOR_DB)
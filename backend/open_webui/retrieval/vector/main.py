@@ -1,3 +1,4 @@
+import asyncio
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Union
@@ -29,6 +30,11 @@ class VectorDBBase(ABC):
 
     Any custom vector database integration must inherit from this class and
     implement all abstract methods.
+
+    Every method has an async counterpart prefixed with `a`. By default these
+    run the sync method in a worker thread; backends with an async client
+    override them so that queries do not hold a threadpool slot while waiting
+    on the database.
     """
 
     @abstractmethod
@@ -70,6 +76,12 @@ class VectorDBBase(ABC):
         """Retrieve all vectors from a collection."""
         pass
 
+    def get_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        """Retrieve the stored vectors of items by ID, if the backend supports it."""
+        return None
+
     @abstractmethod
     def delete(
         self,
@@ -84,3 +96,48 @@ class VectorDBBase(ABC):
     def reset(self) -> None:
         """Reset the vector database by removing all collections or those matching a condition."""
         pass
+
+    async def ahas_collection(self, collection_name: str) -> bool:
+        return await asyncio.to_thread(self.has_collection, collection_name)
+
+    async def adelete_collection(self, collection_name: str) -> None:
+        return await asyncio.to_thread(self.delete_collection, collection_name)
+
+    async def ainsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        return await asyncio.to_thread(self.insert, collection_name, items)
+
+    async def aupsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        return await asyncio.to_thread(self.upsert, collection_name, items)
+
+    async def asearch(
+        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+    ) -> Optional[SearchResult]:
+        return await asyncio.to_thread(self.search, collection_name, vectors, limit)
+
+    async def aquery(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        return await asyncio.to_thread(self.query, collection_name, filter, limit)
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        return await asyncio.to_thread(self.get, collection_name)
+
+    async def aget_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        return await asyncio.to_thread(self.get_vectors, collection_name, ids)
+
+    async def adelete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        return await asyncio.to_thread(self.delete, collection_name, ids, filter)
+
+    async def areset(self) -> None:
+        return await asyncio.to_thread(self.reset)
+
+    async def aclose(self) -> None:
+        """Close the connections opened by the async methods."""
+        pass
@@ -2,9 +2,11 @@ import asyncio
 import logging
 import socket
 import ssl
+import time
 import urllib.parse
 import urllib.request
-from datetime import datetime, time, timedelta
+from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import (
     Any,
     AsyncIterator,
@@ -17,7 +19,6 @@ from typing import (
     Literal,
 )
 
-from fastapi.concurrency import run_in_threadpool
 import aiohttp
 import certifi
 import validators
@@ -40,6 +41,7 @@ from open_webui.config import (
     EXTERNAL_WEB_LOADER_URL,
     EXTERNAL_WEB_LOADER_API_KEY,
     WEB_FETCH_FILTER_LIST,
+    WEB_FETCH_DNS_CACHE_TTL,
 )
 from open_webui.env import SRC_LOG_LEVELS
 
@@ -48,10 +50,38 @@ log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
-def resolve_hostname(hostname):
-    # Get address information
-    addr_info = socket.getaddrinfo(hostname, None)
+TTL_CACHE_MAX_SIZE = 4096
+
+# hostname -> (expires_at, (ipv4_addresses, ipv6_addresses))
+HOSTNAME_CACHE: dict[str, tuple[float, tuple[list[str], list[str]]]] = {}
+# (hostname, port) -> (expires_at, verified)
+SSL_VERIFICATION_CACHE: dict[tuple[str, int], tuple[float, bool]] = {}
+
+
+def get_ttl_cache_value(cache: dict, key: Any) -> Optional[Any]:
+    entry = cache.get(key)
+    if entry is None:
+        return None
+
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        cache.pop(key, None)
+        return None
+    return value
+
+
+def set_ttl_cache_value(cache: dict, key: Any, value: Any) -> Any:
+    if WEB_FETCH_DNS_CACHE_TTL <= 0:
+        return value
+
+    if key not in cache and len(cache) >= TTL_CACHE_MAX_SIZE:
+        # Dicts keep insertion order, so this evicts the oldest entry
+        cache.pop(next(iter(cache)), None)
+    cache[key] = (time.monotonic() + WEB_FETCH_DNS_CACHE_TTL, value)
+    return value
+
 
+def split_addr_info(addr_info) -> tuple[list[str], list[str]]:
     # Extract IP addresses from address information
     ipv4_addresses = [info[4][0] for info in addr_info if info[0] == socket.AF_INET]
     ipv6_addresses = [info[4][0] for info in addr_info if info[0] == socket.AF_INET6]
@@ -59,6 +89,26 @@ def resolve_hostname(hostname):
     return ipv4_addresses, ipv6_addresses
 
 
+def resolve_hostname(hostname):
+    cached = get_ttl_cache_value(HOSTNAME_CACHE, hostname)
+    if cached is not None:
+        return cached
+
+    # Get address information
+    addr_info = socket.getaddrinfo(hostname, None)
+    return set_ttl_cache_value(HOSTNAME_CACHE, hostname, split_addr_info(addr_info))
+
+
+async def aresolve_hostname(hostname):
+    """Resolve a hostname without blocking the event loop, sharing the TTL cache."""
+    cached = get_ttl_cache_value(HOSTNAME_CACHE, hostname)
+    if cached is not None:
+        return cached
+
+    addr_info = await asyncio.get_running_loop().getaddrinfo(hostname, None)
+    return set_ttl_cache_value(HOSTNAME_CACHE, hostname, split_addr_info(addr_info))
+
+
 def get_allow_block_lists(filter_list):
     allow_list = []
     block_list = []
@@ -92,39 +142,44 @@ def is_string_allowed(string: str, filter_list: Optional[list[str]] = None) -> b
     return True
 
 
-def validate_url(url: Union[str, Sequence[str]]):
-    if isinstance(url, str):
-        if isinstance(validators.url(url), validators.ValidationError):
+def validate_url_format(url: str) -> urllib.parse.ParseResult:
+    if isinstance(validators.url(url), validators.ValidationError):
+        raise ValueError(ERROR_MESSAGES.INVALID_URL)
+
+    parsed_url = urllib.parse.urlparse(url)
+
+    # Protocol validation - only allow http/https
+    if parsed_url.scheme not in ["http", "https"]:
+        log.warning(f"Blocked non-HTTP(S) protocol: {parsed_url.scheme} in URL: {url}")
+        raise ValueError(ERROR_MESSAGES.INVALID_URL)
+
+    # Blocklist check using unified filtering logic
+    if WEB_FETCH_FILTER_LIST:
+        if not is_string_allowed(url, WEB_FETCH_FILTER_LIST):
+            log.warning(f"URL blocked by filter list: {url}")
             raise ValueError(ERROR_MESSAGES.INVALID_URL)
 
-        parsed_url = urllib.parse.urlparse(url)
+    return parsed_url
 
-        # Protocol validation - only allow http/https
-        if parsed_url.scheme not in ["http", "https"]:
-            log.warning(
-                f"Blocked non-HTTP(S) protocol: {parsed_url.scheme} in URL: {url}"
-            )
+
+def validate_resolved_addresses(ipv4_addresses: list[str], ipv6_addresses: list[str]):
+    # Check if any of the resolved addresses are private
+    # This is technically still vulnerable to DNS rebinding attacks, as we don't control WebBaseLoader
+    for ip in ipv4_addresses:
+        if validators.ipv4(ip, private=True):
+            raise ValueError(ERROR_MESSAGES.INVALID_URL)
+    for ip in ipv6_addresses:
+        if validators.ipv6(ip, private=True):
             raise ValueError(ERROR_MESSAGES.INVALID_URL)
 
-        # Blocklist check using unified filtering logic
-        if WEB_FETCH_FILTER_LIST:
-            if not is_string_allowed(url, WEB_FETCH_FILTER_LIST):
-                log.warning(f"URL blocked by filter list: {url}")
-                raise ValueError(ERROR_MESSAGES.INVALID_URL)
+
+def validate_url(url: Union[str, Sequence[str]]):
+    if isinstance(url, str):
+        parsed_url = validate_url_format(url)
 
         if not ENABLE_RAG_LOCAL_WEB_FETCH:
             # Local web fetch is disabled, filter out any URLs that resolve to private IP addresses
-            parsed_url = urllib.parse.urlparse(url)
-            # Get IPv4 and IPv6 addresses
-            ipv4_addresses, ipv6_addresses = resolve_hostname(parsed_url.hostname)
-            # Check if any of the resolved addresses are private
-            # This is technically still vulnerable to DNS rebinding attacks, as we don't control WebBaseLoader
-            for ip in ipv4_addresses:
-                if validators.ipv4(ip, private=True):
-                    raise ValueError(ERROR_MESSAGES.INVALID_URL)
-            for ip in ipv6_addresses:
-                if validators.ipv6(ip, private=True):
-                    raise ValueError(ERROR_MESSAGES.INVALID_URL)
+            validate_resolved_addresses(*resolve_hostname(parsed_url.hostname))
         return True
     elif isinstance(url, Sequence):
         return all(validate_url(u) for u in url)
@@ -132,6 +187,16 @@ def validate_url(url: Union[str, Sequence[str]]):
         return False
 
 
+async def avalidate_url(url: str) -> bool:
+    """Async version of validate_url that resolves hostnames off the event loop."""
+    parsed_url = validate_url_format(url)
+
+    if not ENABLE_RAG_LOCAL_WEB_FETCH:
+        # Local web fetch is disabled, filter out any URLs that resolve to private IP addresses
+        validate_resolved_addresses(*await aresolve_hostname(parsed_url.hostname))
+    return True
+
+
 def safe_validate_urls(url: Sequence[str]) -> Sequence[str]:
     valid_urls = []
     for u in url:
@@ -144,6 +209,22 @@ def safe_validate_urls(url: Sequence[str]) -> Sequence[str]:
     return valid_urls
 
 
+async def asafe_validate_urls(url: Sequence[str]) -> Sequence[str]:
+    """Validate all URLs concurrently, keeping the input order."""
+    results = await asyncio.gather(
+        *[avalidate_url(u) for u in url], return_exceptions=True
+    )
+
+    valid_urls = []
+    for u, result in zip(url, results):
+        if isinstance(result, Exception):
+            log.debug(f"Invalid URL {u}: {str(result)}")
+            continue
+        if result:
+            valid_urls.append(u)
+    return valid_urls
+
+
 def extract_metadata(soup, url):
     metadata = {"source": url}
     if title := soup.find("title"):
@@ -155,19 +236,64 @@ def extract_metadata(soup, url):
     return metadata
 
 
+@lru_cache(maxsize=1)
+def get_ssl_context() -> ssl.SSLContext:
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+def get_ssl_target(url: str) -> Optional[tuple[str, int]]:
+    parsed_url = urllib.parse.urlparse(url)
+    if parsed_url.scheme != "https" or not parsed_url.hostname:
+        return None
+    return parsed_url.hostname, parsed_url.port or 443
+
+
 def verify_ssl_cert(url: str) -> bool:
     """Verify SSL certificate for the given URL."""
-    if not url.startswith("https://"):
+    target = get_ssl_target(url)
+    if target is None:
         return True
 
+    cached = get_ttl_cache_value(SSL_VERIFICATION_CACHE, target)
+    if cached is not None:
+        return cached
+
+    hostname, port = target
     try:
-        hostname = url.split("://")[-1].split("/")[0]
-        context = ssl.create_default_context(cafile=certifi.where())
-        with context.wrap_socket(ssl.socket(), server_hostname=hostname) as s:
-            s.connect((hostname, 443))
-        return True
+        with get_ssl_context().wrap_socket(
+            socket.socket(), server_hostname=hostname
+        ) as s:
+            s.connect((hostname, port))
+        return set_ttl_cache_value(SSL_VERIFICATION_CACHE, target, True)
     except ssl.SSLError:
+        return set_ttl_cache_value(SSL_VERIFICATION_CACHE, target, False)
+    except Exception as e:
+        log.warning(f"SSL verification failed for {url}: {str(e)}")
         return False
+
+
+async def averify_ssl_cert(url: str, timeout: float = 10) -> bool:
+    """Async version of verify_ssl_cert; results are cached per host and port."""
+    target = get_ssl_target(url)
+    if target is None:
+        return True
+
+    cached = get_ttl_cache_value(SSL_VERIFICATION_CACHE, target)
+    if cached is not None:
+        return cached
+
+    hostname, port = target
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                hostname, port, ssl=get_ssl_context(), server_hostname=hostname
+            ),
+            timeout=timeout,
+        )
+        writer.close()
+        return set_ttl_cache_value(SSL_VERIFICATION_CACHE, target, True)
+    except ssl.SSLError:
+        return set_ttl_cache_value(SSL_VERIFICATION_CACHE, target, False)
     except Exception as e:
         log.warning(f"SSL verification failed for {url}: {str(e)}")
         return False
@@ -196,7 +322,7 @@ class RateLimitMixin:
 class URLProcessingMixin:
     async def _verify_ssl_cert(self, url: str) -> bool:
         """Verify SSL certificate for a URL."""
-        return await run_in_threadpool(verify_ssl_cert, url)
+        return await averify_ssl_cert(url)
 
     async def _safe_process_url(self, url: str) -> bool:
         """Perform safety checks before processing a URL."""
@@ -207,7 +333,7 @@ class URLProcessingMixin:
 
     def _safe_process_url_sync(self, url: str) -> bool:
         """Synchronous version of safety checks."""
-        if self.verify_ssl and not self._verify_ssl_cert(url):
+        if self.verify_ssl and not verify_ssl_cert(url):
             raise ValueError(f"SSL certificate verification failed for {url}")
         self._sync_wait_for_rate_limit()
         return True
@@ -531,8 +657,10 @@ class SafePlaywrightURLLoader(PlaywrightURLLoader, RateLimitMixin, URLProcessing
 
             for url in self.urls:
                 try:
-                    self._safe_process_url_sync(url)
-                    page = browser.new_page()
+                    # Certificates are verified by the browser on the actual
+                    # navigation instead of a separate TLS handshake up front
+                    self._sync_wait_for_rate_limit()
+                    page = browser.new_page(ignore_https_errors=not self.verify_ssl)
                     response = page.goto(url, timeout=self.playwright_timeout)
                     if response is None:
                         raise ValueError(f"page.goto() returned None for url {url}")
@@ -562,8 +690,12 @@ class SafePlaywrightURLLoader(PlaywrightURLLoader, RateLimitMixin, URLProcessing
 
             for url in self.urls:
                 try:
-                    await self._safe_process_url(url)
-                    page = await browser.new_page()
+                    # Certificates are verified by the browser on the actual
+                    # navigation instead of a separate TLS handshake up front
+                    await self._wait_for_rate_limit()
+                    page = await browser.new_page(
+                        ignore_https_errors=not self.verify_ssl
+                    )
                     response = await page.goto(url, timeout=self.playwright_timeout)
                     if response is None:
                         raise ValueError(f"page.goto() returned None for url {url}")
@@ -582,14 +714,23 @@ class SafePlaywrightURLLoader(PlaywrightURLLoader, RateLimitMixin, URLProcessing
 class SafeWebBaseLoader(WebBaseLoader):
     """WebBaseLoader with enhanced error handling for URLs."""
 
-    def __init__(self, trust_env: bool = False, *args, **kwargs):
+    def __init__(
+        self,
+        trust_env: bool = False,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        *args,
+        **kwargs,
+    ):
         """Initialize SafeWebBaseLoader
         Args:
             trust_env (bool, optional): set to True if using proxy to make web requests, for example
                 using http(s)_proxy environment variables. Defaults to False.
+            semaphore (asyncio.Semaphore, optional): limits the concurrent fetches, shared
+                by several loaders. Defaults to one of `requests_per_second` for this loader.
         """
         super().__init__(*args, **kwargs)
         self.trust_env = trust_env
+        self.semaphore = semaphore
 
     async def _fetch(
         self, url: str, retries: int = 3, cooldown: int = 2, backoff: float = 1.5
@@ -601,8 +742,8 @@ class SafeWebBaseLoader(WebBaseLoader):
                         headers=self.session.headers,
                         cookies=self.session.cookies.get_dict(),
                     )
-                    if not self.session.verify:
-                        kwargs["ssl"] = False
+                    # The certificate is verified on the fetch connection itself
+                    kwargs["ssl"] = get_ssl_context() if self.session.verify else False
 
                     async with session.get(
                         url,
@@ -664,20 +805,32 @@ class SafeWebBaseLoader(WebBaseLoader):
                 log.exception(f"Error loading {path}: {e}")
 
     async def alazy_load(self) -> AsyncIterator[Document]:
-        """Async lazy load text from the url(s) in web_path."""
-        results = await self.ascrape_all(self.web_paths)
-        for path, soup in zip(self.web_paths, results):
-            text = soup.get_text(**self.bs_get_text_kwargs)
-            metadata = {"source": path}
-            if title := soup.find("title"):
-                metadata["title"] = title.get_text()
-            if description := soup.find("meta", attrs={"name": "description"}):
-                metadata["description"] = description.get(
-                    "content", "No description found."
-                )
-            if html := soup.find("html"):
-                metadata["language"] = html.get("lang", "No language found.")
-            yield Document(page_content=text, metadata=metadata)
+        """Async lazy load text from the url(s) in web_path.
+
+        Pages are fetched concurrently and yielded in completion order, so the
+        first document is available as soon as the fastest page has loaded.
+        """
+        semaphore = self.semaphore or asyncio.Semaphore(self.requests_per_second)
+
+        async def fetch(path: str) -> tuple[str, Any]:
+            return path, await self._fetch_with_rate_limit(path, semaphore)
+
+        tasks = [asyncio.create_task(fetch(path)) for path in self.web_paths]
+        try:
+            for task in asyncio.as_completed(tasks):
+                path, result = await task
+                if not result:
+                    continue
+
+                soup = self._unpack_fetch_results([result], [path])[0]
+                yield self._soup_to_document(path, soup)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _soup_to_document(self, path: str, soup: Any) -> Document:
+        text = soup.get_text(**self.bs_get_text_kwargs)
+        return Document(page_content=text, metadata=extract_metadata(soup, path))
 
     async def aload(self) -> list[Document]:
         """Load data into Document objects."""
@@ -689,10 +842,37 @@ def get_web_loader(
     verify_ssl: bool = True,
     requests_per_second: int = 2,
     trust_env: bool = False,
+    semaphore: Optional[asyncio.Semaphore] = None,
 ):
     # Check if the URLs are valid
     safe_urls = safe_validate_urls([urls] if isinstance(urls, str) else urls)
+    return create_web_loader(
+        urls, safe_urls, verify_ssl, requests_per_second, trust_env, semaphore
+    )
+
 
+async def aget_web_loader(
+    urls: Union[str, Sequence[str]],
+    verify_ssl: bool = True,
+    requests_per_second: int = 2,
+    trust_env: bool = False,
+    semaphore: Optional[asyncio.Semaphore] = None,
+):
+    """Async version of get_web_loader that validates URLs without blocking on DNS."""
+    safe_urls = await asafe_validate_urls([urls] if isinstance(urls, str) else urls)
+    return create_web_loader(
+        urls, safe_urls, verify_ssl, requests_per_second, trust_env, semaphore
+    )
+
+
+def create_web_loader(
+    urls: Union[str, Sequence[str]],
+    safe_urls: Sequence[str],
+    verify_ssl: bool = True,
+    requests_per_second: int = 2,
+    trust_env: bool = False,
+    semaphore: Optional[asyncio.Semaphore] = None,
+):
     if not safe_urls:
         log.warning(f"All provided URLs were blocked or invalid: {urls}")
         raise ValueError(ERROR_MESSAGES.INVALID_URL)
@@ -707,6 +887,7 @@ def get_web_loader(
 
     if WEB_LOADER_ENGINE.value == "" or WEB_LOADER_ENGINE.value == "safe_web":
         WebLoaderClass = SafeWebBaseLoader
+        web_loader_args["semaphore"] = semaphore
     if WEB_LOADER_ENGINE.value == "playwright":
         WebLoaderClass = SafePlaywrightURLLoader
         web_loader_args["playwright_timeout"] = PLAYWRIGHT_TIMEOUT.value
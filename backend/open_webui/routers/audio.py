@@ -1,19 +1,27 @@
+import asyncio
 import hashlib
 import json
 import logging
 import os
+import re
+import subprocess
+import threading
 import uuid
+import wave
 import html
 import base64
 from functools import lru_cache
 from pydub import AudioSegment
 from pydub.silence import split_on_silence
-from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Optional
 
 from fnmatch import fnmatch
 import aiohttp
 import aiofiles
+import numpy as np
 import requests
 import mimetypes
 
@@ -29,12 +37,14 @@ from fastapi import (
     APIRouter,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.headers import include_user_info_headers
+from open_webui.utils.whisper import get_whisper_stats, get_whisper_worker
 from open_webui.config import (
     WHISPER_MODEL_AUTO_UPDATE,
     WHISPER_MODEL_DIR,
@@ -51,6 +61,14 @@ from open_webui.env import (
     SRC_LOG_LEVELS,
     DEVICE_TYPE,
     ENABLE_FORWARD_USER_INFO_HEADERS,
+    ENABLE_TTS_SENTENCE_STREAMING,
+    AUDIO_STT_CHUNK_SECONDS,
+    AUDIO_STT_MAX_WORKERS,
+    SPEECH_CACHE_MAX_SIZE_MB,
+    TTS_SENTENCE_STREAMING_CONCURRENCY,
+    WHISPER_COMPUTE_TYPE,
+    WHISPER_CPU_THREADS,
+    WHISPER_WORKERS,
 )
 
 
@@ -61,6 +79,9 @@ MAX_FILE_SIZE_MB = 20
 MAX_FILE_SIZE = MAX_FILE_SIZE_MB * 1024 * 1024  # Convert MB to bytes
 AZURE_MAX_FILE_SIZE_MB = 200
 AZURE_MAX_FILE_SIZE = AZURE_MAX_FILE_SIZE_MB * 1024 * 1024  # Convert MB to bytes
+SPEECH_CHUNK_SIZE = 16 * 1024
+# Chunks of a sentence's audio buffered ahead of its playback (1 MB)
+SPEECH_SENTENCE_QUEUE_SIZE = 64
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["AUDIO"])
@@ -76,7 +97,17 @@ SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 ##########################################
 
 from pydub import AudioSegment
-from pydub.utils import mediainfo
+from pydub.utils import get_encoder_name, mediainfo
+
+
+async def cleanup_response(
+    response: Optional[aiohttp.ClientResponse],
+    session: Optional[aiohttp.ClientSession],
+):
+    if response:
+        response.close()
+    if session:
+        await session.close()
 
 
 def is_audio_conversion_required(file_path):
@@ -130,7 +161,9 @@ def set_faster_whisper_model(model: str, auto_update: bool = False):
         faster_whisper_kwargs = {
             "model_size_or_path": model,
             "device": DEVICE_TYPE if DEVICE_TYPE and DEVICE_TYPE == "cuda" else "cpu",
-            "compute_type": "int8",
+            "compute_type": WHISPER_COMPUTE_TYPE,
+            "cpu_threads": WHISPER_CPU_THREADS,
+            "num_workers": WHISPER_WORKERS,
             "download_root": WHISPER_MODEL_DIR,
             "local_files_only": not auto_update,
         }
@@ -230,53 +263,62 @@ async def get_audio_config(request: Request, user=Depends(get_admin_user)):
 async def update_audio_config(
     request: Request, form_data: AudioConfigUpdateForm, user=Depends(get_admin_user)
 ):
-    request.app.state.config.TTS_OPENAI_API_BASE_URL = form_data.tts.OPENAI_API_BASE_URL
-    request.app.state.config.TTS_OPENAI_API_KEY = form_data.tts.OPENAI_API_KEY
-    request.app.state.config.TTS_OPENAI_PARAMS = form_data.tts.OPENAI_PARAMS
-    request.app.state.config.TTS_API_KEY = form_data.tts.API_KEY
-    request.app.state.config.TTS_ENGINE = form_data.tts.ENGINE
-    request.app.state.config.TTS_MODEL = form_data.tts.MODEL
-    request.app.state.config.TTS_VOICE = form_data.tts.VOICE
-    request.app.state.config.TTS_SPLIT_ON = form_data.tts.SPLIT_ON
-    request.app.state.config.TTS_AZURE_SPEECH_REGION = form_data.tts.AZURE_SPEECH_REGION
-    request.app.state.config.TTS_AZURE_SPEECH_BASE_URL = (
-        form_data.tts.AZURE_SPEECH_BASE_URL
-    )
-    request.app.state.config.TTS_AZURE_SPEECH_OUTPUT_FORMAT = (
-        form_data.tts.AZURE_SPEECH_OUTPUT_FORMAT
-    )
-
-    request.app.state.config.STT_OPENAI_API_BASE_URL = form_data.stt.OPENAI_API_BASE_URL
-    request.app.state.config.STT_OPENAI_API_KEY = form_data.stt.OPENAI_API_KEY
-    request.app.state.config.STT_ENGINE = form_data.stt.ENGINE
-    request.app.state.config.STT_MODEL = form_data.stt.MODEL
-    request.app.state.config.STT_SUPPORTED_CONTENT_TYPES = (
-        form_data.stt.SUPPORTED_CONTENT_TYPES
-    )
+    with request.app.state.config.transaction():
+        request.app.state.config.TTS_OPENAI_API_BASE_URL = (
+            form_data.tts.OPENAI_API_BASE_URL
+        )
+        request.app.state.config.TTS_OPENAI_API_KEY = form_data.tts.OPENAI_API_KEY
+        request.app.state.config.TTS_OPENAI_PARAMS = form_data.tts.OPENAI_PARAMS
+        request.app.state.config.TTS_API_KEY = form_data.tts.API_KEY
+        request.app.state.config.TTS_ENGINE = form_data.tts.ENGINE
+        request.app.state.config.TTS_MODEL = form_data.tts.MODEL
+        request.app.state.config.TTS_VOICE = form_data.tts.VOICE
+        request.app.state.config.TTS_SPLIT_ON = form_data.tts.SPLIT_ON
+        request.app.state.config.TTS_AZURE_SPEECH_REGION = (
+            form_data.tts.AZURE_SPEECH_REGION
+        )
+        request.app.state.config.TTS_AZURE_SPEECH_BASE_URL = (
+            form_data.tts.AZURE_SPEECH_BASE_URL
+        )
+        request.app.state.config.TTS_AZURE_SPEECH_OUTPUT_FORMAT = (
+            form_data.tts.AZURE_SPEECH_OUTPUT_FORMAT
+        )
 
-    request.app.state.config.WHISPER_MODEL = form_data.stt.WHISPER_MODEL
-    request.app.state.config.DEEPGRAM_API_KEY = form_data.stt.DEEPGRAM_API_KEY
-    request.app.state.config.AUDIO_STT_AZURE_API_KEY = form_data.stt.AZURE_API_KEY
-    request.app.state.config.AUDIO_STT_AZURE_REGION = form_data.stt.AZURE_REGION
-    request.app.state.config.AUDIO_STT_AZURE_LOCALES = form_data.stt.AZURE_LOCALES
-    request.app.state.config.AUDIO_STT_AZURE_BASE_URL = form_data.stt.AZURE_BASE_URL
-    request.app.state.config.AUDIO_STT_AZURE_MAX_SPEAKERS = (
-        form_data.stt.AZURE_MAX_SPEAKERS
-    )
-    request.app.state.config.AUDIO_STT_MISTRAL_API_KEY = form_data.stt.MISTRAL_API_KEY
-    request.app.state.config.AUDIO_STT_MISTRAL_API_BASE_URL = (
-        form_data.stt.MISTRAL_API_BASE_URL
-    )
-    request.app.state.config.AUDIO_STT_MISTRAL_USE_CHAT_COMPLETIONS = (
-        form_data.stt.MISTRAL_USE_CHAT_COMPLETIONS
-    )
+        request.app.state.config.STT_OPENAI_API_BASE_URL = (
+            form_data.stt.OPENAI_API_BASE_URL
+        )
+        request.app.state.config.STT_OPENAI_API_KEY = form_data.stt.OPENAI_API_KEY
+        request.app.state.config.STT_ENGINE = form_data.stt.ENGINE
+        request.app.state.config.STT_MODEL = form_data.stt.MODEL
+        request.app.state.config.STT_SUPPORTED_CONTENT_TYPES = (
+            form_data.stt.SUPPORTED_CONTENT_TYPES
+        )
 
-    if request.app.state.config.STT_ENGINE == "":
-        request.app.state.faster_whisper_model = set_faster_whisper_model(
-            form_data.stt.WHISPER_MODEL, WHISPER_MODEL_AUTO_UPDATE
+        request.app.state.config.WHISPER_MODEL = form_data.stt.WHISPER_MODEL
+        request.app.state.config.DEEPGRAM_API_KEY = form_data.stt.DEEPGRAM_API_KEY
+        request.app.state.config.AUDIO_STT_AZURE_API_KEY = form_data.stt.AZURE_API_KEY
+        request.app.state.config.AUDIO_STT_AZURE_REGION = form_data.stt.AZURE_REGION
+        request.app.state.config.AUDIO_STT_AZURE_LOCALES = form_data.stt.AZURE_LOCALES
+        request.app.state.config.AUDIO_STT_AZURE_BASE_URL = form_data.stt.AZURE_BASE_URL
+        request.app.state.config.AUDIO_STT_AZURE_MAX_SPEAKERS = (
+            form_data.stt.AZURE_MAX_SPEAKERS
+        )
+        request.app.state.config.AUDIO_STT_MISTRAL_API_KEY = (
+            form_data.stt.MISTRAL_API_KEY
+        )
+        request.app.state.config.AUDIO_STT_MISTRAL_API_BASE_URL = (
+            form_data.stt.MISTRAL_API_BASE_URL
+        )
+        request.app.state.config.AUDIO_STT_MISTRAL_USE_CHAT_COMPLETIONS = (
+            form_data.stt.MISTRAL_USE_CHAT_COMPLETIONS
         )
-    else:
-        request.app.state.faster_whisper_model = None
+
+        if request.app.state.config.STT_ENGINE == "":
+            request.app.state.faster_whisper_model = set_faster_whisper_model(
+                form_data.stt.WHISPER_MODEL, WHISPER_MODEL_AUTO_UPDATE
+            )
+        else:
+            request.app.state.faster_whisper_model = None
 
     return {
         "tts": {
@@ -327,211 +369,353 @@ def load_speech_pipeline(request):
         )
 
 
-@router.post("/speech")
-async def speech(request: Request, user=Depends(get_verified_user)):
-    body = await request.body()
-    name = hashlib.sha256(
-        body
-        + str(request.app.state.config.TTS_ENGINE).encode("utf-8")
-        + str(request.app.state.config.TTS_MODEL).encode("utf-8")
-    ).hexdigest()
+##########################################
+#
+# Speech synthesis
+#
+##########################################
 
-    file_path = SPEECH_CACHE_DIR.joinpath(f"{name}.mp3")
-    file_body_path = SPEECH_CACHE_DIR.joinpath(f"{name}.json")
 
-    # Check if the file already exists in the cache
-    if file_path.is_file():
-        return FileResponse(file_path)
+class SpeechCache:
+    """
+    Synthesized speech files keyed by request hash. A hit refreshes the file's
+    modification time, and the least recently used files are removed once the
+    cache grows beyond `max_size` bytes (0 for no limit).
+    """
 
-    payload = None
-    try:
-        payload = json.loads(body.decode("utf-8"))
-    except Exception as e:
-        log.exception(e)
-        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+    def __init__(self, directory: Path, max_size: int = 0):
+        self.directory = directory
+        self.max_size = max_size
+        # Estimated from this process's writes; rescanned when over the limit
+        self.size: Optional[int] = None
 
-    r = None
-    if request.app.state.config.TTS_ENGINE == "openai":
-        payload["model"] = request.app.state.config.TTS_MODEL
+    def get(self, name: str) -> Optional[Path]:
+        file_path = self.directory / f"{name}.mp3"
+        try:
+            os.utime(file_path)
+        except OSError:
+            return None
+        return file_path
 
+    async def write(
+        self, name: str, payload: dict, chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        """Pass the audio through, storing it once it is complete."""
+        part_path = self.directory / f"{name}.{uuid.uuid4().hex}.part"
+        size = 0
         try:
-            timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
-            ) as session:
-                payload = {
-                    **payload,
-                    **(request.app.state.config.TTS_OPENAI_PARAMS or {}),
-                }
+            async with aiofiles.open(part_path, "wb") as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
+                    size += len(chunk)
+                    yield chunk
+
+            async with aiofiles.open(self.directory / f"{name}.json", "w") as f:
+                await f.write(json.dumps(payload))
+            os.replace(part_path, self.directory / f"{name}.mp3")
+        finally:
+            part_path.unlink(missing_ok=True)
+
+        await self.added(size)
+
+    async def added(self, size: int):
+        if not self.max_size:
+            return
+
+        if self.size is not None:
+            self.size += size
+        if self.size is None or self.size > self.max_size:
+            self.size = await run_in_threadpool(self.prune)
+
+    def prune(self) -> int:
+        """Remove the least recently used files until the cache is under 90% of its limit."""
+        entries = {}
+        for path in self.directory.iterdir():
+            if path.suffix not in (".mp3", ".json"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entry = entries.setdefault(path.stem, {"paths": [], "size": 0, "used": 0})
+            entry["paths"].append(path)
+            entry["size"] += stat.st_size
+            entry["used"] = max(entry["used"], stat.st_mtime)
 
-                headers = {
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {request.app.state.config.TTS_OPENAI_API_KEY}",
-                }
-                if ENABLE_FORWARD_USER_INFO_HEADERS:
-                    headers = include_user_info_headers(headers, user)
+        size = sum(entry["size"] for entry in entries.values())
+        if size <= self.max_size:
+            return size
 
-                r = await session.post(
-                    url=f"{request.app.state.config.TTS_OPENAI_API_BASE_URL}/audio/speech",
-                    json=payload,
-                    headers=headers,
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                )
+        for entry in sorted(entries.values(), key=lambda entry: entry["used"]):
+            if size <= self.max_size * 0.9:
+                break
+            for path in entry["paths"]:
+                path.unlink(missing_ok=True)
+            size -= entry["size"]
 
-                r.raise_for_status()
+        log.debug(f"Pruned the speech cache to {size} bytes")
+        return size
 
-                async with aiofiles.open(file_path, "wb") as f:
-                    await f.write(await r.read())
 
-                async with aiofiles.open(file_body_path, "w") as f:
-                    await f.write(json.dumps(payload))
+SPEECH_CACHE = SpeechCache(SPEECH_CACHE_DIR, SPEECH_CACHE_MAX_SIZE_MB * 1024 * 1024)
 
-            return FileResponse(file_path)
 
-        except Exception as e:
-            log.exception(e)
-            detail = None
+def split_speech_sentences(text: str) -> list[str]:
+    """
+    Split text into sentences to synthesize, merging short ones into the next
+    like the frontend does for voice mode.
+    """
+    sentences = []
+    for sentence in re.split(r"(?<=[.!?])\s+", text.strip()):
+        if not sentence:
+            continue
+        if sentences and (len(sentences[-1].split()) < 4 or len(sentences[-1]) < 50):
+            sentences[-1] = f"{sentences[-1]} {sentence}"
+        else:
+            sentences.append(sentence)
+    return sentences
 
-            status_code = 500
-            detail = f"Open WebUI: Server Connection Error"
 
-            if r is not None:
-                status_code = r.status
+def is_speech_concatenable(request: Request, payload: dict) -> bool:
+    """Whether the engine returns MP3 audio, which can be played back to back."""
+    engine = request.app.state.config.TTS_ENGINE
+    if engine == "openai":
+        params = request.app.state.config.TTS_OPENAI_PARAMS or {}
+        return {**payload, **params}.get("response_format", "mp3") == "mp3"
+    if engine == "elevenlabs":
+        return True
+    if engine == "azure":
+        return "mp3" in request.app.state.config.TTS_AZURE_SPEECH_OUTPUT_FORMAT
+    return False
 
-                try:
-                    res = await r.json()
-                    if "error" in res:
-                        detail = f"External: {res['error']}"
-                except Exception:
-                    detail = f"External: {e}"
 
-            raise HTTPException(
-                status_code=status_code,
-                detail=detail,
-            )
+def get_speech_request(request: Request, payload: dict, user) -> tuple[str, dict]:
+    """The URL and request arguments to synthesize `payload` with the TTS engine."""
+    if request.app.state.config.TTS_ENGINE == "openai":
+        payload = {
+            **payload,
+            "model": request.app.state.config.TTS_MODEL,
+            **(request.app.state.config.TTS_OPENAI_PARAMS or {}),
+        }
+
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {request.app.state.config.TTS_OPENAI_API_KEY}",
+        }
+        if ENABLE_FORWARD_USER_INFO_HEADERS:
+            headers = include_user_info_headers(headers, user)
+
+        return (
+            f"{request.app.state.config.TTS_OPENAI_API_BASE_URL}/audio/speech",
+            {"json": payload, "headers": headers},
+        )
 
     elif request.app.state.config.TTS_ENGINE == "elevenlabs":
         voice_id = payload.get("voice", "")
+        return (
+            f"{ELEVENLABS_API_BASE_URL}/v1/text-to-speech/{voice_id}",
+            {
+                "json": {
+                    "text": payload["input"],
+                    "model_id": request.app.state.config.TTS_MODEL,
+                    "voice_settings": {"stability": 0.5, "similarity_boost": 0.5},
+                },
+                "headers": {
+                    "Accept": "audio/mpeg",
+                    "Content-Type": "application/json",
+                    "xi-api-key": request.app.state.config.TTS_API_KEY,
+                },
+            },
+        )
 
-        if voice_id not in get_available_voices(request):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid voice id",
-            )
-
-        try:
-            timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
-            ) as session:
-                async with session.post(
-                    f"{ELEVENLABS_API_BASE_URL}/v1/text-to-speech/{voice_id}",
-                    json={
-                        "text": payload["input"],
-                        "model_id": request.app.state.config.TTS_MODEL,
-                        "voice_settings": {"stability": 0.5, "similarity_boost": 0.5},
-                    },
-                    headers={
-                        "Accept": "audio/mpeg",
-                        "Content-Type": "application/json",
-                        "xi-api-key": request.app.state.config.TTS_API_KEY,
-                    },
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as r:
-                    r.raise_for_status()
+    elif request.app.state.config.TTS_ENGINE == "azure":
+        region = request.app.state.config.TTS_AZURE_SPEECH_REGION or "eastus"
+        base_url = request.app.state.config.TTS_AZURE_SPEECH_BASE_URL
+        language = request.app.state.config.TTS_VOICE
+        locale = "-".join(request.app.state.config.TTS_VOICE.split("-")[:1])
+        output_format = request.app.state.config.TTS_AZURE_SPEECH_OUTPUT_FORMAT
 
-                    async with aiofiles.open(file_path, "wb") as f:
-                        await f.write(await r.read())
+        data = f"""<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="{locale}">
+                <voice name="{language}">{html.escape(payload["input"])}</voice>
+            </speak>"""
+        return (
+            (base_url or f"https://{region}.tts.speech.microsoft.com")
+            + "/cognitiveservices/v1",
+            {
+                "data": data,
+                "headers": {
+                    "Ocp-Apim-Subscription-Key": request.app.state.config.TTS_API_KEY,
+                    "Content-Type": "application/ssml+xml",
+                    "X-Microsoft-OutputFormat": output_format,
+                },
+            },
+        )
 
-                    async with aiofiles.open(file_body_path, "w") as f:
-                        await f.write(json.dumps(payload))
+    raise HTTPException(status_code=400, detail="Unsupported TTS engine")
 
-            return FileResponse(file_path)
 
-        except Exception as e:
-            log.exception(e)
-            detail = None
+async def open_speech_response(
+    request: Request, payload: dict, user
+) -> tuple[aiohttp.ClientResponse, aiohttp.ClientSession]:
+    """
+    Send the synthesis request, returning the response once the engine accepted
+    it; close both with `cleanup_response` after reading the audio.
+    """
+    url, kwargs = get_speech_request(request, payload, user)
 
+    r = None
+    detail = None
+    session = aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT), trust_env=True
+    )
+    try:
+        r = await session.post(url, ssl=AIOHTTP_CLIENT_SESSION_SSL, **kwargs)
+        if not r.ok:
+            # Read the engine's error before `raise_for_status` releases the body
             try:
-                if r.status != 200:
-                    res = await r.json()
-                    if "error" in res:
-                        detail = f"External: {res['error'].get('message', '')}"
+                error = (await r.json()).get("error")
+                if isinstance(error, dict):
+                    error = error.get("message", "")
+                if error:
+                    detail = f"External: {error}"
             except Exception:
-                detail = f"External: {e}"
+                pass
+            r.raise_for_status()
+        return r, session
+    except Exception as e:
+        log.exception(e)
+        await cleanup_response(r, session)
 
-            raise HTTPException(
-                status_code=getattr(r, "status", 500) if r else 500,
-                detail=detail if detail else "Open WebUI: Server Connection Error",
-            )
+        if r is not None and not detail:
+            detail = f"External: {e}"
+        raise HTTPException(
+            status_code=r.status if r is not None else 500,
+            detail=detail if detail else "Open WebUI: Server Connection Error",
+        )
 
-    elif request.app.state.config.TTS_ENGINE == "azure":
+
+async def read_speech_response(
+    r: aiohttp.ClientResponse, session: aiohttp.ClientSession
+) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in r.content.iter_chunked(SPEECH_CHUNK_SIZE):
+            yield chunk
+    finally:
+        await cleanup_response(r, session)
+
+
+async def open_speech_sentences_stream(
+    request: Request, payload: dict, user, sentences: list[str]
+) -> AsyncIterator[bytes]:
+    """
+    Synthesize the sentences concurrently and stream their audio in order; the
+    sentence being played is streamed as it arrives. The first sentence is
+    requested before returning, so engine errors are raised as usual.
+    """
+    semaphore = asyncio.Semaphore(TTS_SENTENCE_STREAMING_CONCURRENCY)
+    queues = [asyncio.Queue(SPEECH_SENTENCE_QUEUE_SIZE) for _ in sentences]
+
+    async def pipe(index: int, response=None):
+        queue = queues[index]
+        # The first sentence's request was sent holding its slot already
+        acquired = response is not None
         try:
-            payload = json.loads(body.decode("utf-8"))
+            if response is None:
+                await semaphore.acquire()
+                acquired = True
+                response = await open_speech_response(
+                    request, {**payload, "input": sentences[index]}, user
+                )
+            async for chunk in read_speech_response(*response):
+                await queue.put(chunk)
         except Exception as e:
-            log.exception(e)
-            raise HTTPException(status_code=400, detail="Invalid JSON payload")
+            await queue.put(e)
+        finally:
+            if acquired:
+                semaphore.release()
+        await queue.put(None)
 
-        region = request.app.state.config.TTS_AZURE_SPEECH_REGION or "eastus"
-        base_url = request.app.state.config.TTS_AZURE_SPEECH_BASE_URL
-        language = request.app.state.config.TTS_VOICE
-        locale = "-".join(request.app.state.config.TTS_VOICE.split("-")[:1])
-        output_format = request.app.state.config.TTS_AZURE_SPEECH_OUTPUT_FORMAT
+    await semaphore.acquire()
+    try:
+        first = await open_speech_response(
+            request, {**payload, "input": sentences[0]}, user
+        )
+    except Exception:
+        semaphore.release()
+        raise
 
+    async def stream():
+        tasks = [asyncio.create_task(pipe(0, first))] + [
+            asyncio.create_task(pipe(index)) for index in range(1, len(sentences))
+        ]
         try:
-            data = f"""<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="{locale}">
-                <voice name="{language}">{html.escape(payload["input"])}</voice>
-            </speak>"""
-            timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
-            ) as session:
-                async with session.post(
-                    (base_url or f"https://{region}.tts.speech.microsoft.com")
-                    + "/cognitiveservices/v1",
-                    headers={
-                        "Ocp-Apim-Subscription-Key": request.app.state.config.TTS_API_KEY,
-                        "Content-Type": "application/ssml+xml",
-                        "X-Microsoft-OutputFormat": output_format,
-                    },
-                    data=data,
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as r:
-                    r.raise_for_status()
+            for index, queue in enumerate(queues):
+                while (chunk := await queue.get()) is not None:
+                    if isinstance(chunk, Exception):
+                        log.error(f"Failed to synthesize sentence {index}: {chunk}")
+                        raise chunk
+                    yield chunk
+        finally:
+            for task in tasks:
+                task.cancel()
 
-                    async with aiofiles.open(file_path, "wb") as f:
-                        await f.write(await r.read())
+    return stream()
 
-                    async with aiofiles.open(file_body_path, "w") as f:
-                        await f.write(json.dumps(payload))
 
-                    return FileResponse(file_path)
+@router.post("/speech")
+async def speech(request: Request, user=Depends(get_verified_user)):
+    body = await request.body()
+    name = hashlib.sha256(
+        body
+        + str(request.app.state.config.TTS_ENGINE).encode("utf-8")
+        + str(request.app.state.config.TTS_MODEL).encode("utf-8")
+    ).hexdigest()
 
-        except Exception as e:
-            log.exception(e)
-            detail = None
+    # Check if the file already exists in the cache
+    file_path = SPEECH_CACHE.get(name)
+    if file_path:
+        return FileResponse(file_path)
 
-            try:
-                if r.status != 200:
-                    res = await r.json()
-                    if "error" in res:
-                        detail = f"External: {res['error'].get('message', '')}"
-            except Exception:
-                detail = f"External: {e}"
+    payload = None
+    try:
+        payload = json.loads(body.decode("utf-8"))
+    except Exception as e:
+        log.exception(e)
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
 
-            raise HTTPException(
-                status_code=getattr(r, "status", 500) if r else 500,
-                detail=detail if detail else "Open WebUI: Server Connection Error",
+    if request.app.state.config.TTS_ENGINE in ("openai", "elevenlabs", "azure"):
+        if request.app.state.config.TTS_ENGINE == "elevenlabs":
+            voice_id = payload.get("voice", "")
+
+            if voice_id not in get_available_voices(request):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Invalid voice id",
+                )
+
+        sentences = (
+            split_speech_sentences(payload.get("input", ""))
+            if ENABLE_TTS_SENTENCE_STREAMING
+            and is_speech_concatenable(request, payload)
+            else []
+        )
+
+        if len(sentences) > 1:
+            chunks = await open_speech_sentences_stream(
+                request, payload, user, sentences
             )
+            media_type = "audio/mpeg"
+        else:
+            r, session = await open_speech_response(request, payload, user)
+            chunks = read_speech_response(r, session)
+            media_type = r.headers.get("Content-Type", "audio/mpeg")
 
-    elif request.app.state.config.TTS_ENGINE == "transformers":
-        payload = None
-        try:
-            payload = json.loads(body.decode("utf-8"))
-        except Exception as e:
-            log.exception(e)
-            raise HTTPException(status_code=400, detail="Invalid JSON payload")
+        # Stream the audio as it is synthesized, caching it once complete
+        return StreamingResponse(
+            SPEECH_CACHE.write(name, payload, chunks), media_type=media_type
+        )
 
+    elif request.app.state.config.TTS_ENGINE == "transformers":
         import torch
         import soundfile as sf
 
@@ -556,11 +740,13 @@ async def speech(request: Request, user=Depends(get_verified_user)):
             forward_params={"speaker_embeddings": speaker_embedding},
         )
 
+        file_path = SPEECH_CACHE_DIR.joinpath(f"{name}.mp3")
         sf.write(file_path, speech["audio"], samplerate=speech["sampling_rate"])
 
-        async with aiofiles.open(file_body_path, "w") as f:
+        async with aiofiles.open(SPEECH_CACHE_DIR.joinpath(f"{name}.json"), "w") as f:
             await f.write(json.dumps(payload))
 
+        await SPEECH_CACHE.added(file_path.stat().st_size)
         return FileResponse(file_path)
 
 
@@ -582,20 +768,14 @@ def transcription_handler(request, file_path, metadata, user=None):
                 request.app.state.config.WHISPER_MODEL
             )
 
-        model = request.app.state.faster_whisper_model
-        segments, info = model.transcribe(
+        # Every request shares the model through one queue, batching short clips
+        worker = get_whisper_worker(request.app.state.faster_whisper_model)
+        transcript = worker.transcribe(
             file_path,
-            beam_size=5,
-            vad_filter=request.app.state.config.WHISPER_VAD_FILTER,
             language=languages[0],
+            vad_filter=request.app.state.config.WHISPER_VAD_FILTER,
         )
-        log.info(
-            "Detected language '%s' with probability %f"
-            % (info.language, info.language_probability)
-        )
-
-        transcript = "".join([segment.text for segment in list(segments)])
-        data = {"text": transcript.strip()}
+        data = {"text": transcript}
 
         # save the transcript to a json file
         transcript_file = f"{file_dir}/{id}.json"
@@ -1025,123 +1205,229 @@ def transcription_handler(request, file_path, metadata, user=None):
             )
 
 
-def transcribe(
-    request: Request, file_path: str, metadata: Optional[dict] = None, user=None
-):
-    log.info(f"transcribe: {file_path} {metadata}")
+##########################################
+#
+# Transcription pipeline
+#
+##########################################
 
-    if is_audio_conversion_required(file_path):
-        file_path = convert_audio_to_mp3(file_path)
+# Audio is decoded to 16 kHz mono 16-bit PCM, as used by speech recognition models
+TRANSCRIPTION_SAMPLE_RATE = 16000
+TRANSCRIPTION_FRAME_MS = 30
 
-    try:
-        file_path = compress_audio(file_path)
-    except Exception as e:
-        log.exception(e)
+# Shared by all requests, so long recordings cannot monopolize the engine
+TRANSCRIPTION_EXECUTOR = ThreadPoolExecutor(
+    max_workers=AUDIO_STT_MAX_WORKERS, thread_name_prefix="transcription"
+)
 
-    # Always produce a list of chunk paths (could be one entry if small)
-    try:
-        chunk_paths = split_audio(file_path, MAX_FILE_SIZE)
-        print(f"Chunk paths: {chunk_paths}")
-    except Exception as e:
-        log.exception(e)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ERROR_MESSAGES.DEFAULT(e),
-        )
 
-    results = []
+def find_silence_cut(pcm: bytes, search_from: int) -> int:
+    """
+    Byte offset of the quietest moment in `pcm[search_from:]`, smoothed over
+    ~300 ms so that pauses win over quiet sounds within a word.
+    """
+    frame = TRANSCRIPTION_SAMPLE_RATE * TRANSCRIPTION_FRAME_MS // 1000
+    samples = np.frombuffer(pcm, dtype=np.int16, offset=search_from)
+    count = len(samples) // frame
+    if count == 0:
+        return len(pcm)
+
+    frames = samples[: count * frame].reshape(count, frame).astype(np.float32)
+    energy = np.sqrt(np.mean(frames**2, axis=1))
+    # Moving average, normalized so the edges are not biased towards silence
+    kernel = np.ones(min(10, count))
+    energy = np.convolve(energy, kernel, mode="same") / np.convolve(
+        np.ones(count), kernel, mode="same"
+    )
+
+    # The latest of equally quiet moments, to keep chunks long
+    quietest = count - 1 - int(np.argmin(energy[::-1]))
+    return search_from + (quietest * frame + frame // 2) * 2
+
+
+def write_wav(file_path: str, pcm: bytes):
+    with wave.open(file_path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(TRANSCRIPTION_SAMPLE_RATE)
+        f.writeframes(pcm)
+
+
+def split_audio_on_silence(
+    file_path: str, max_seconds: int
+) -> Iterator[tuple[str, float, float]]:
+    """
+    Decode the audio with ffmpeg as a stream and write it out as WAV chunks of
+    at most `max_seconds`, each cut at the quietest moment of its last quarter
+    so words are not split. Only one chunk of audio is held in memory.
+
+    Yields (chunk path, start, end), with times in seconds.
+    """
+    bytes_per_second = TRANSCRIPTION_SAMPLE_RATE * 2
+    max_bytes = max_seconds * bytes_per_second
+    search_from = max_bytes - max_bytes // 4
+
+    base, _ = os.path.splitext(file_path)
+    process = subprocess.Popen(
+        [
+            get_encoder_name(),
+            "-nostdin",
+            "-v",
+            "error",
+            "-i",
+            file_path,
+            "-f",
+            "s16le",
+            "-ac",
+            "1",
+            "-ar",
+            str(TRANSCRIPTION_SAMPLE_RATE),
+            "-",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+    buffer = bytearray()
+    offset = 0
+    index = 0
     try:
-        with ThreadPoolExecutor() as executor:
-            # Submit tasks for each chunk_path
-            futures = [
-                executor.submit(
-                    transcription_handler, request, chunk_path, metadata, user
+        while True:
+            data = process.stdout.read(bytes_per_second * 10)
+            buffer += data
+
+            while len(buffer) >= max_bytes or (not data and buffer):
+                cut = (
+                    find_silence_cut(bytes(buffer[:max_bytes]), search_from)
+                    if len(buffer) >= max_bytes
+                    else len(buffer)
                 )
-                for chunk_path in chunk_paths
-            ]
-            # Gather results as they complete
-            for future in futures:
-                try:
-                    results.append(future.result())
-                except Exception as transcribe_exc:
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=f"Error transcribing chunk: {transcribe_exc}",
-                    )
-    finally:
-        # Clean up only the temporary chunks, never the original file
-        for chunk_path in chunk_paths:
-            if chunk_path != file_path and os.path.isfile(chunk_path):
-                try:
-                    os.remove(chunk_path)
-                except Exception:
-                    pass
 
-    return {
-        "text": " ".join([result["text"] for result in results]),
-    }
+                chunk_path = f"{base}_chunk_{index}.wav"
+                write_wav(chunk_path, bytes(buffer[:cut]))
+                yield (
+                    chunk_path,
+                    offset / bytes_per_second,
+                    (offset + cut) / bytes_per_second,
+                )
 
+                del buffer[:cut]
+                offset += cut
+                index += 1
 
-def compress_audio(file_path):
-    if os.path.getsize(file_path) > MAX_FILE_SIZE:
-        id = os.path.splitext(os.path.basename(file_path))[
-            0
-        ]  # Handles names with multiple dots
-        file_dir = os.path.dirname(file_path)
+            if not data:
+                break
 
-        audio = AudioSegment.from_file(file_path)
-        audio = audio.set_frame_rate(16000).set_channels(1)  # Compress audio
+        if process.wait() != 0 and offset == 0:
+            raise Exception(
+                f"Could not decode audio: {process.stderr.read().decode().strip()}"
+            )
+    finally:
+        process.kill()
+        process.wait()
+        process.stdout.close()
+        process.stderr.close()
 
-        compressed_path = os.path.join(file_dir, f"{id}_compressed.mp3")
-        audio.export(compressed_path, format="mp3", bitrate="32k")
-        # log.debug(f"Compressed audio to {compressed_path}")  # Uncomment if log is defined
 
-        return compressed_path
-    else:
-        return file_path
+def remove_chunk_file(chunk_path: str):
+    try:
+        os.remove(chunk_path)
+    except OSError:
+        pass
 
 
-def split_audio(file_path, max_bytes, format="mp3", bitrate="32k"):
+def transcribe_chunks(
+    request: Request, file_path: str, metadata: Optional[dict] = None, user=None
+) -> Iterator[dict]:
     """
-    Splits audio into chunks not exceeding max_bytes.
-    Returns a list of chunk file paths. If audio fits, returns list with original path.
+    Transcribe the audio piece by piece on the shared transcription pool,
+    yielding each piece's result, with its `start` and `end`, in order as soon
+    as it and the pieces before it are done.
     """
-    file_size = os.path.getsize(file_path)
-    if file_size <= max_bytes:
-        return [file_path]  # Nothing to split
+    pending = deque()
+    # Bounds the chunks decoded ahead of the transcription
+    slots = threading.BoundedSemaphore(AUDIO_STT_MAX_WORKERS * 2)
 
-    audio = AudioSegment.from_file(file_path)
-    duration_ms = len(audio)
-    orig_size = file_size
+    def run(chunk_path: str) -> dict:
+        try:
+            return transcription_handler(request, chunk_path, metadata, user)
+        finally:
+            slots.release()
 
-    approx_chunk_ms = max(int(duration_ms * (max_bytes / orig_size)) - 1000, 1000)
-    chunks = []
-    start = 0
-    i = 0
+    def result(future: Future, chunk_path: str, start: float, end: float) -> dict:
+        try:
+            return {**future.result(), "start": start, "end": end}
+        finally:
+            remove_chunk_file(chunk_path)
 
-    base, _ = os.path.splitext(file_path)
+    chunks = split_audio_on_silence(file_path, AUDIO_STT_CHUNK_SECONDS)
+    try:
+        for chunk_path, start, end in chunks:
+            while not slots.acquire(blocking=False):
+                yield result(*pending.popleft())
+
+            future = TRANSCRIPTION_EXECUTOR.submit(run, chunk_path)
+            pending.append((future, chunk_path, start, end))
+
+            while pending and pending[0][0].done():
+                yield result(*pending.popleft())
+
+        while pending:
+            yield result(*pending.popleft())
+    finally:
+        chunks.close()
+
+        # Chunks left behind when stopped early, e.g. by a failure
+        for future, chunk_path, _, _ in pending:
+            if future.cancel():
+                slots.release()
+                remove_chunk_file(chunk_path)
+            else:
+                future.add_done_callback(
+                    lambda _, path=chunk_path: remove_chunk_file(path)
+                )
+
+
+def transcribe(
+    request: Request, file_path: str, metadata: Optional[dict] = None, user=None
+):
+    log.info(f"transcribe: {file_path} {metadata}")
 
-    while start < duration_ms:
-        end = min(start + approx_chunk_ms, duration_ms)
-        chunk = audio[start:end]
-        chunk_path = f"{base}_chunk_{i}.{format}"
-        chunk.export(chunk_path, format=format, bitrate=bitrate)
+    try:
+        results = list(transcribe_chunks(request, file_path, metadata, user))
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.exception(e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error transcribing chunk: {e}",
+        )
 
-        # Reduce chunk duration if still too large
-        while os.path.getsize(chunk_path) > max_bytes and (end - start) > 5000:
-            end = start + ((end - start) // 2)
-            chunk = audio[start:end]
-            chunk.export(chunk_path, format=format, bitrate=bitrate)
+    return {
+        "text": " ".join([result["text"] for result in results if result["text"]]),
+    }
 
-        if os.path.getsize(chunk_path) > max_bytes:
-            os.remove(chunk_path)
-            raise Exception("Audio chunk cannot be reduced below max file size.")
 
-        chunks.append(chunk_path)
-        start = end
-        i += 1
+def stream_transcription(
+    request: Request, file_path: str, metadata: Optional[dict] = None, user=None
+) -> Iterator[str]:
+    texts = []
+    try:
+        for result in transcribe_chunks(request, file_path, metadata, user):
+            texts.append(result["text"])
+            yield f"data: {json.dumps(result)}\n\n"
+    except Exception as e:
+        log.exception(e)
+        yield f"data: {json.dumps({'error': f'Error transcribing chunk: {e}'})}\n\n"
+        return
 
-    return chunks
+    final = {
+        "text": " ".join([text for text in texts if text]),
+        "filename": os.path.basename(file_path),
+        "done": True,
+    }
+    yield f"data: {json.dumps(final)}\n\n"
 
 
 @router.post("/transcriptions")
@@ -1149,6 +1435,7 @@ def transcription(
     request: Request,
     file: UploadFile = File(...),
     language: Optional[str] = Form(None),
+    stream: bool = Form(False),
     user=Depends(get_verified_user),
 ):
     log.info(f"file.content_type: {file.content_type}")
@@ -1191,6 +1478,13 @@ def transcription(
             if language:
                 metadata = {"language": language}
 
+            if stream:
+                # Send each piece's transcript as soon as it is ready
+                return StreamingResponse(
+                    stream_transcription(request, file_path, metadata, user),
+                    media_type="text/event-stream",
+                )
+
             result = transcribe(request, file_path, metadata, user)
 
             return {
@@ -1255,6 +1549,12 @@ def get_available_models(request: Request) -> list[dict]:
     return available_models
 
 
+@router.get("/stt/stats")
+async def get_stt_stats(user=Depends(get_admin_user)):
+    """Queue depth, latency and batching of the local whisper worker."""
+    return {"local": get_whisper_stats()}
+
+
 @router.get("/models")
 async def get_models(request: Request, user=Depends(get_verified_user)):
     return {"models": get_available_models(request)}
@@ -934,47 +934,48 @@ class AdminConfig(BaseModel):
 async def update_admin_config(
     request: Request, form_data: AdminConfig, user=Depends(get_admin_user)
 ):
-    request.app.state.config.SHOW_ADMIN_DETAILS = form_data.SHOW_ADMIN_DETAILS
-    request.app.state.config.WEBUI_URL = form_data.WEBUI_URL
-    request.app.state.config.ENABLE_SIGNUP = form_data.ENABLE_SIGNUP
-
-    request.app.state.config.ENABLE_API_KEYS = form_data.ENABLE_API_KEYS
-    request.app.state.config.ENABLE_API_KEYS_ENDPOINT_RESTRICTIONS = (
-        form_data.ENABLE_API_KEYS_ENDPOINT_RESTRICTIONS
-    )
-    request.app.state.config.API_KEYS_ALLOWED_ENDPOINTS = (
-        form_data.API_KEYS_ALLOWED_ENDPOINTS
-    )
+    with request.app.state.config.transaction():
+        request.app.state.config.SHOW_ADMIN_DETAILS = form_data.SHOW_ADMIN_DETAILS
+        request.app.state.config.WEBUI_URL = form_data.WEBUI_URL
+        request.app.state.config.ENABLE_SIGNUP = form_data.ENABLE_SIGNUP
+
+        request.app.state.config.ENABLE_API_KEYS = form_data.ENABLE_API_KEYS
+        request.app.state.config.ENABLE_API_KEYS_ENDPOINT_RESTRICTIONS = (
+            form_data.ENABLE_API_KEYS_ENDPOINT_RESTRICTIONS
+        )
+        request.app.state.config.API_KEYS_ALLOWED_ENDPOINTS = (
+            form_data.API_KEYS_ALLOWED_ENDPOINTS
+        )
 
-    request.app.state.config.ENABLE_CHANNELS = form_data.ENABLE_CHANNELS
-    request.app.state.config.ENABLE_NOTES = form_data.ENABLE_NOTES
+        request.app.state.config.ENABLE_CHANNELS = form_data.ENABLE_CHANNELS
+        request.app.state.config.ENABLE_NOTES = form_data.ENABLE_NOTES
 
-    if form_data.DEFAULT_USER_ROLE in ["pending", "user", "admin"]:
-        request.app.state.config.DEFAULT_USER_ROLE = form_data.DEFAULT_USER_ROLE
+        if form_data.DEFAULT_USER_ROLE in ["pending", "user", "admin"]:
+            request.app.state.config.DEFAULT_USER_ROLE = form_data.DEFAULT_USER_ROLE
 
-    request.app.state.config.DEFAULT_GROUP_ID = form_data.DEFAULT_GROUP_ID
+        request.app.state.config.DEFAULT_GROUP_ID = form_data.DEFAULT_GROUP_ID
 
-    pattern = r"^(-1|0|(-?\d+(\.\d+)?)(ms|s|m|h|d|w))$"
+        pattern = r"^(-1|0|(-?\d+(\.\d+)?)(ms|s|m|h|d|w))$"
 
-    # Check if the input string matches the pattern
-    if re.match(pattern, form_data.JWT_EXPIRES_IN):
-        request.app.state.config.JWT_EXPIRES_IN = form_data.JWT_EXPIRES_IN
+        # Check if the input string matches the pattern
+        if re.match(pattern, form_data.JWT_EXPIRES_IN):
+            request.app.state.config.JWT_EXPIRES_IN = form_data.JWT_EXPIRES_IN
 
-    request.app.state.config.ENABLE_COMMUNITY_SHARING = (
-        form_data.ENABLE_COMMUNITY_SHARING
-    )
-    request.app.state.config.ENABLE_MESSAGE_RATING = form_data.ENABLE_MESSAGE_RATING
+        request.app.state.config.ENABLE_COMMUNITY_SHARING = (
+            form_data.ENABLE_COMMUNITY_SHARING
+        )
+        request.app.state.config.ENABLE_MESSAGE_RATING = form_data.ENABLE_MESSAGE_RATING
 
-    request.app.state.config.ENABLE_USER_WEBHOOKS = form_data.ENABLE_USER_WEBHOOKS
+        request.app.state.config.ENABLE_USER_WEBHOOKS = form_data.ENABLE_USER_WEBHOOKS
 
-    request.app.state.config.PENDING_USER_OVERLAY_TITLE = (
-        form_data.PENDING_USER_OVERLAY_TITLE
-    )
-    request.app.state.config.PENDING_USER_OVERLAY_CONTENT = (
-        form_data.PENDING_USER_OVERLAY_CONTENT
-    )
+        request.app.state.config.PENDING_USER_OVERLAY_TITLE = (
+            form_data.PENDING_USER_OVERLAY_TITLE
+        )
+        request.app.state.config.PENDING_USER_OVERLAY_CONTENT = (
+            form_data.PENDING_USER_OVERLAY_CONTENT
+        )
 
-    request.app.state.config.RESPONSE_WATERMARK = form_data.RESPONSE_WATERMARK
+        request.app.state.config.RESPONSE_WATERMARK = form_data.RESPONSE_WATERMARK
 
     return {
         "SHOW_ADMIN_DETAILS": request.app.state.config.SHOW_ADMIN_DETAILS,
@@ -1036,35 +1037,36 @@ async def get_ldap_server(request: Request, user=Depends(get_admin_user)):
 async def update_ldap_server(
     request: Request, form_data: LdapServerConfig, user=Depends(get_admin_user)
 ):
-    required_fields = [
-        "label",
-        "host",
-        "attribute_for_mail",
-        "attribute_for_username",
-        "app_dn",
-        "app_dn_password",
-        "search_base",
-    ]
-    for key in required_fields:
-        value = getattr(form_data, key)
-        if not value:
-            raise HTTPException(400, detail=f"Required field {key} is empty")
-
-    request.app.state.config.LDAP_SERVER_LABEL = form_data.label
-    request.app.state.config.LDAP_SERVER_HOST = form_data.host
-    request.app.state.config.LDAP_SERVER_PORT = form_data.port
-    request.app.state.config.LDAP_ATTRIBUTE_FOR_MAIL = form_data.attribute_for_mail
-    request.app.state.config.LDAP_ATTRIBUTE_FOR_USERNAME = (
-        form_data.attribute_for_username
-    )
-    request.app.state.config.LDAP_APP_DN = form_data.app_dn
-    request.app.state.config.LDAP_APP_PASSWORD = form_data.app_dn_password
-    request.app.state.config.LDAP_SEARCH_BASE = form_data.search_base
-    request.app.state.config.LDAP_SEARCH_FILTERS = form_data.search_filters
-    request.app.state.config.LDAP_USE_TLS = form_data.use_tls
-    request.app.state.config.LDAP_CA_CERT_FILE = form_data.certificate_path
-    request.app.state.config.LDAP_VALIDATE_CERT = form_data.validate_cert
-    request.app.state.config.LDAP_CIPHERS = form_data.ciphers
+    with request.app.state.config.transaction():
+        required_fields = [
+            "label",
+            "host",
+            "attribute_for_mail",
+            "attribute_for_username",
+            "app_dn",
+            "app_dn_password",
+            "search_base",
+        ]
+        for key in required_fields:
+            value = getattr(form_data, key)
+            if not value:
+                raise HTTPException(400, detail=f"Required field {key} is empty")
+
+        request.app.state.config.LDAP_SERVER_LABEL = form_data.label
+        request.app.state.config.LDAP_SERVER_HOST = form_data.host
+        request.app.state.config.LDAP_SERVER_PORT = form_data.port
+        request.app.state.config.LDAP_ATTRIBUTE_FOR_MAIL = form_data.attribute_for_mail
+        request.app.state.config.LDAP_ATTRIBUTE_FOR_USERNAME = (
+            form_data.attribute_for_username
+        )
+        request.app.state.config.LDAP_APP_DN = form_data.app_dn
+        request.app.state.config.LDAP_APP_PASSWORD = form_data.app_dn_password
+        request.app.state.config.LDAP_SEARCH_BASE = form_data.search_base
+        request.app.state.config.LDAP_SEARCH_FILTERS = form_data.search_filters
+        request.app.state.config.LDAP_USE_TLS = form_data.use_tls
+        request.app.state.config.LDAP_CA_CERT_FILE = form_data.certificate_path
+        request.app.state.config.LDAP_VALIDATE_CERT = form_data.validate_cert
+        request.app.state.config.LDAP_CIPHERS = form_data.ciphers
 
     return {
         "label": request.app.state.config.LDAP_SERVER_LABEL,
@@ -257,10 +257,7 @@ async def get_chat_list_by_folder_id(
 
 @router.get("/pinned", response_model=list[ChatTitleIdResponse])
 async def get_user_pinned_chats(user=Depends(get_verified_user)):
-    return [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_pinned_chats_by_user_id(user.id)
-    ]
+    return Chats.get_pinned_chat_title_id_list_by_user_id(user.id)
 
 
 ############################
@@ -445,7 +442,10 @@ async def get_chat_by_id(id: str, user=Depends(get_verified_user)):
 
     if chat:
         # Auto-start symposium if it's a symposium chat and not already running
-        if chat.mode == "symposium" and not symposium_manager.is_symposium_active(id):
+        if (
+            chat.mode == "symposium"
+            and not await symposium_manager.is_symposium_active(id)
+        ):
             config = chat.config or {}
             if not config.get("paused", False):
                 await symposium_manager.start_symposium(id)
@@ -472,7 +472,7 @@ async def update_chat_by_id(
         chat = Chats.update_chat_by_id(id, updated_chat)
         
         # Notify symposium of chat update (new user message, etc.)
-        if chat.mode == "symposium" and symposium_manager.is_symposium_active(id):
+        if chat.mode == "symposium" and await symposium_manager.is_symposium_active(id):
             await symposium_manager.notify_update(id)
         
         return ChatResponse(**chat.model_dump())
@@ -626,10 +626,10 @@ async def get_symposium_status(
         )
     
     return {
-        "active": symposium_manager.is_symposium_active(id),
-        "current_speaker": symposium_manager.get_current_speaker(id),
-        "bot_states": symposium_manager.get_all_bot_states(id),
-        "speaking_stats": symposium_manager.get_speaking_stats(id),
+        "active": await symposium_manager.is_symposium_active(id),
+        "current_speaker": await symposium_manager.get_current_speaker(id),
+        "bot_states": await symposium_manager.get_all_bot_states(id),
+        "speaking_stats": await symposium_manager.get_speaking_stats(id),
     }
 
 
@@ -652,7 +652,7 @@ async def resume_symposium(
         )
     
     # Start the symposium if not already running
-    if not symposium_manager.is_symposium_active(id):
+    if not await symposium_manager.is_symposium_active(id):
         await symposium_manager.start_symposium(id)
     
     return True
@@ -767,13 +767,15 @@ async def send_chat_message_event_by_id(
 @router.delete("/{id}", response_model=bool)
 async def delete_chat_by_id(request: Request, id: str, user=Depends(get_verified_user)):
     # Stop symposium if running
-    if symposium_manager.is_symposium_active(id):
+    if await symposium_manager.is_symposium_active(id):
         await symposium_manager.stop_symposium(id)
     
     if user.role == "admin":
         chat = Chats.get_chat_by_id(id)
-        for tag in chat.meta.get("tags", []):
-            if Chats.count_chats_by_tag_name_and_user_id(tag, user.id) == 1:
+        tags = chat.meta.get("tags", [])
+        counts = Chats.count_chats_by_tag_names_and_user_id(tags, user.id)
+        for tag in tags:
+            if counts.get(tag, 0) == 1:
                 Tags.delete_tag_by_name_and_user_id(tag, user.id)
 
         result = Chats.delete_chat_by_id(id)
@@ -789,8 +791,10 @@ async def delete_chat_by_id(request: Request, id: str, user=Depends(get_verified
             )
 
         chat = Chats.get_chat_by_id(id)
-        for tag in chat.meta.get("tags", []):
-            if Chats.count_chats_by_tag_name_and_user_id(tag, user.id) == 1:
+        tags = chat.meta.get("tags", [])
+        counts = Chats.count_chats_by_tag_names_and_user_id(tags, user.id)
+        for tag in tags:
+            if counts.get(tag, 0) == 1:
                 Tags.delete_tag_by_name_and_user_id(tag, user.id)
 
         result = Chats.delete_chat_by_id_and_user_id(id, user.id)
@@ -941,13 +945,15 @@ async def archive_chat_by_id(id: str, user=Depends(get_verified_user)):
         chat = Chats.toggle_chat_archive_by_id(id)
 
         # Stop symposium if chat is being archived
-        if chat.archived and symposium_manager.is_symposium_active(id):
+        if chat.archived and await symposium_manager.is_symposium_active(id):
             await symposium_manager.stop_symposium(id)
 
         # Delete tags if chat is archived
         if chat.archived:
-            for tag_id in chat.meta.get("tags", []):
-                if Chats.count_chats_by_tag_name_and_user_id(tag_id, user.id) == 0:
+            tags = chat.meta.get("tags", [])
+            counts = Chats.count_chats_by_tag_names_and_user_id(tags, user.id)
+            for tag_id in tags:
+                if counts.get(tag_id, 0) == 0:
                     log.debug(f"deleting tag: {tag_id}")
                     Tags.delete_tag_by_name_and_user_id(tag_id, user.id)
         else:
@@ -1138,8 +1144,10 @@ async def delete_all_tags_by_id(id: str, user=Depends(get_verified_user)):
     if chat:
         Chats.delete_all_tags_by_id_and_user_id(id, user.id)
 
-        for tag in chat.meta.get("tags", []):
-            if Chats.count_chats_by_tag_name_and_user_id(tag, user.id) == 0:
+        tags = chat.meta.get("tags", [])
+        counts = Chats.count_chats_by_tag_names_and_user_id(tags, user.id)
+        for tag in tags:
+            if counts.get(tag, 0) == 0:
                 Tags.delete_tag_by_name_and_user_id(tag, user.id)
 
         return True
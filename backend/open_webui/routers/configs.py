@@ -396,48 +396,53 @@ async def set_code_execution_config(
     request: Request, form_data: CodeInterpreterConfigForm, user=Depends(get_admin_user)
 ):
 
-    request.app.state.config.ENABLE_CODE_EXECUTION = form_data.ENABLE_CODE_EXECUTION
+    with request.app.state.config.transaction():
+        request.app.state.config.ENABLE_CODE_EXECUTION = form_data.ENABLE_CODE_EXECUTION
 
-    request.app.state.config.CODE_EXECUTION_ENGINE = form_data.CODE_EXECUTION_ENGINE
-    request.app.state.config.CODE_EXECUTION_JUPYTER_URL = (
-        form_data.CODE_EXECUTION_JUPYTER_URL
-    )
-    request.app.state.config.CODE_EXECUTION_JUPYTER_AUTH = (
-        form_data.CODE_EXECUTION_JUPYTER_AUTH
-    )
-    request.app.state.config.CODE_EXECUTION_JUPYTER_AUTH_TOKEN = (
-        form_data.CODE_EXECUTION_JUPYTER_AUTH_TOKEN
-    )
-    request.app.state.config.CODE_EXECUTION_JUPYTER_AUTH_PASSWORD = (
-        form_data.CODE_EXECUTION_JUPYTER_AUTH_PASSWORD
-    )
-    request.app.state.config.CODE_EXECUTION_JUPYTER_TIMEOUT = (
-        form_data.CODE_EXECUTION_JUPYTER_TIMEOUT
-    )
+        request.app.state.config.CODE_EXECUTION_ENGINE = form_data.CODE_EXECUTION_ENGINE
+        request.app.state.config.CODE_EXECUTION_JUPYTER_URL = (
+            form_data.CODE_EXECUTION_JUPYTER_URL
+        )
+        request.app.state.config.CODE_EXECUTION_JUPYTER_AUTH = (
+            form_data.CODE_EXECUTION_JUPYTER_AUTH
+        )
+        request.app.state.config.CODE_EXECUTION_JUPYTER_AUTH_TOKEN = (
+            form_data.CODE_EXECUTION_JUPYTER_AUTH_TOKEN
+        )
+        request.app.state.config.CODE_EXECUTION_JUPYTER_AUTH_PASSWORD = (
+            form_data.CODE_EXECUTION_JUPYTER_AUTH_PASSWORD
+        )
+        request.app.state.config.CODE_EXECUTION_JUPYTER_TIMEOUT = (
+            form_data.CODE_EXECUTION_JUPYTER_TIMEOUT
+        )
 
-    request.app.state.config.ENABLE_CODE_INTERPRETER = form_data.ENABLE_CODE_INTERPRETER
-    request.app.state.config.CODE_INTERPRETER_ENGINE = form_data.CODE_INTERPRETER_ENGINE
-    request.app.state.config.CODE_INTERPRETER_PROMPT_TEMPLATE = (
-        form_data.CODE_INTERPRETER_PROMPT_TEMPLATE
-    )
+        request.app.state.config.ENABLE_CODE_INTERPRETER = (
+            form_data.ENABLE_CODE_INTERPRETER
+        )
+        request.app.state.config.CODE_INTERPRETER_ENGINE = (
+            form_data.CODE_INTERPRETER_ENGINE
+        )
+        request.app.state.config.CODE_INTERPRETER_PROMPT_TEMPLATE = (
+            form_data.CODE_INTERPRETER_PROMPT_TEMPLATE
+        )
 
-    request.app.state.config.CODE_INTERPRETER_JUPYTER_URL = (
-        form_data.CODE_INTERPRETER_JUPYTER_URL
-    )
+        request.app.state.config.CODE_INTERPRETER_JUPYTER_URL = (
+            form_data.CODE_INTERPRETER_JUPYTER_URL
+        )
 
-    request.app.state.config.CODE_INTERPRETER_JUPYTER_AUTH = (
-        form_data.CODE_INTERPRETER_JUPYTER_AUTH
-    )
+        request.app.state.config.CODE_INTERPRETER_JUPYTER_AUTH = (
+            form_data.CODE_INTERPRETER_JUPYTER_AUTH
+        )
 
-    request.app.state.config.CODE_INTERPRETER_JUPYTER_AUTH_TOKEN = (
-        form_data.CODE_INTERPRETER_JUPYTER_AUTH_TOKEN
-    )
-    request.app.state.config.CODE_INTERPRETER_JUPYTER_AUTH_PASSWORD = (
-        form_data.CODE_INTERPRETER_JUPYTER_AUTH_PASSWORD
-    )
-    request.app.state.config.CODE_INTERPRETER_JUPYTER_TIMEOUT = (
-        form_data.CODE_INTERPRETER_JUPYTER_TIMEOUT
-    )
+        request.app.state.config.CODE_INTERPRETER_JUPYTER_AUTH_TOKEN = (
+            form_data.CODE_INTERPRETER_JUPYTER_AUTH_TOKEN
+        )
+        request.app.state.config.CODE_INTERPRETER_JUPYTER_AUTH_PASSWORD = (
+            form_data.CODE_INTERPRETER_JUPYTER_AUTH_PASSWORD
+        )
+        request.app.state.config.CODE_INTERPRETER_JUPYTER_TIMEOUT = (
+            form_data.CODE_INTERPRETER_JUPYTER_TIMEOUT
+        )
 
     return {
         "ENABLE_CODE_EXECUTION": request.app.state.config.ENABLE_CODE_EXECUTION,
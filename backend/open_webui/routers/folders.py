@@ -48,13 +48,12 @@ router = APIRouter()
 @router.get("/", response_model=list[FolderNameIdResponse])
 async def get_folders(user=Depends(get_verified_user)):
     folders = Folders.get_folders_by_user_id(user.id)
+    folder_ids = {folder.id for folder in folders}
 
     # Verify folder data integrity
     folder_list = []
     for folder in folders:
-        if folder.parent_id and not Folders.get_folder_by_id_and_user_id(
-            folder.parent_id, user.id
-        ):
+        if folder.parent_id and folder.parent_id not in folder_ids:
             folder = Folders.update_folder_parent_id_by_id_and_user_id(
                 folder.id, user.id, None
             )
@@ -77,10 +76,11 @@ async def get_folders(user=Depends(get_verified_user)):
                     else:
                         valid_files.append(file)
 
-                folder.data["files"] = valid_files
-                Folders.update_folder_by_id_and_user_id(
-                    folder.id, user.id, FolderUpdateForm(data=folder.data)
-                )
+                if len(valid_files) != len(folder.data["files"]):
+                    folder.data["files"] = valid_files
+                    Folders.update_folder_by_id_and_user_id(
+                        folder.id, user.id, FolderUpdateForm(data=folder.data)
+                    )
 
         folder_list.append(FolderNameIdResponse(**folder.model_dump()))
 
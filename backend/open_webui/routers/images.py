@@ -185,110 +185,123 @@ async def get_config(request: Request, user=Depends(get_admin_user)):
 async def update_config(
     request: Request, form_data: ImagesConfig, user=Depends(get_admin_user)
 ):
-    request.app.state.config.ENABLE_IMAGE_GENERATION = form_data.ENABLE_IMAGE_GENERATION
-
-    # Create Image
-    request.app.state.config.ENABLE_IMAGE_PROMPT_GENERATION = (
-        form_data.ENABLE_IMAGE_PROMPT_GENERATION
-    )
-
-    request.app.state.config.IMAGE_GENERATION_ENGINE = form_data.IMAGE_GENERATION_ENGINE
-    set_image_model(request, form_data.IMAGE_GENERATION_MODEL)
-    if (
-        form_data.IMAGE_SIZE == "auto"
-        and form_data.IMAGE_GENERATION_MODEL != "gpt-image-1"
-    ):
-        raise HTTPException(
-            status_code=400,
-            detail=ERROR_MESSAGES.INCORRECT_FORMAT(
-                "  (auto is only allowed with gpt-image-1)."
-            ),
+    with request.app.state.config.transaction():
+        request.app.state.config.ENABLE_IMAGE_GENERATION = (
+            form_data.ENABLE_IMAGE_GENERATION
         )
 
-    pattern = r"^\d+x\d+$"
-    if (
-        form_data.IMAGE_SIZE == "auto"
-        or form_data.IMAGE_SIZE == ""
-        or re.match(pattern, form_data.IMAGE_SIZE)
-    ):
-        request.app.state.config.IMAGE_SIZE = form_data.IMAGE_SIZE
-    else:
-        raise HTTPException(
-            status_code=400,
-            detail=ERROR_MESSAGES.INCORRECT_FORMAT("  (e.g., 512x512)."),
+        # Create Image
+        request.app.state.config.ENABLE_IMAGE_PROMPT_GENERATION = (
+            form_data.ENABLE_IMAGE_PROMPT_GENERATION
         )
 
-    if form_data.IMAGE_STEPS >= 0:
-        request.app.state.config.IMAGE_STEPS = form_data.IMAGE_STEPS
-    else:
-        raise HTTPException(
-            status_code=400,
-            detail=ERROR_MESSAGES.INCORRECT_FORMAT("  (e.g., 50)."),
+        request.app.state.config.IMAGE_GENERATION_ENGINE = (
+            form_data.IMAGE_GENERATION_ENGINE
         )
+        set_image_model(request, form_data.IMAGE_GENERATION_MODEL)
+        if (
+            form_data.IMAGE_SIZE == "auto"
+            and form_data.IMAGE_GENERATION_MODEL != "gpt-image-1"
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail=ERROR_MESSAGES.INCORRECT_FORMAT(
+                    "  (auto is only allowed with gpt-image-1)."
+                ),
+            )
 
-    request.app.state.config.IMAGES_OPENAI_API_BASE_URL = (
-        form_data.IMAGES_OPENAI_API_BASE_URL
-    )
-    request.app.state.config.IMAGES_OPENAI_API_KEY = form_data.IMAGES_OPENAI_API_KEY
-    request.app.state.config.IMAGES_OPENAI_API_VERSION = (
-        form_data.IMAGES_OPENAI_API_VERSION
-    )
-    request.app.state.config.IMAGES_OPENAI_API_PARAMS = (
-        form_data.IMAGES_OPENAI_API_PARAMS
-    )
+        pattern = r"^\d+x\d+$"
+        if (
+            form_data.IMAGE_SIZE == "auto"
+            or form_data.IMAGE_SIZE == ""
+            or re.match(pattern, form_data.IMAGE_SIZE)
+        ):
+            request.app.state.config.IMAGE_SIZE = form_data.IMAGE_SIZE
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail=ERROR_MESSAGES.INCORRECT_FORMAT("  (e.g., 512x512)."),
+            )
 
-    request.app.state.config.AUTOMATIC1111_BASE_URL = form_data.AUTOMATIC1111_BASE_URL
-    request.app.state.config.AUTOMATIC1111_API_AUTH = form_data.AUTOMATIC1111_API_AUTH
-    request.app.state.config.AUTOMATIC1111_PARAMS = form_data.AUTOMATIC1111_PARAMS
+        if form_data.IMAGE_STEPS >= 0:
+            request.app.state.config.IMAGE_STEPS = form_data.IMAGE_STEPS
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail=ERROR_MESSAGES.INCORRECT_FORMAT("  (e.g., 50)."),
+            )
 
-    request.app.state.config.COMFYUI_BASE_URL = form_data.COMFYUI_BASE_URL.strip("/")
-    request.app.state.config.COMFYUI_API_KEY = form_data.COMFYUI_API_KEY
-    request.app.state.config.COMFYUI_WORKFLOW = form_data.COMFYUI_WORKFLOW
-    request.app.state.config.COMFYUI_WORKFLOW_NODES = form_data.COMFYUI_WORKFLOW_NODES
+        request.app.state.config.IMAGES_OPENAI_API_BASE_URL = (
+            form_data.IMAGES_OPENAI_API_BASE_URL
+        )
+        request.app.state.config.IMAGES_OPENAI_API_KEY = form_data.IMAGES_OPENAI_API_KEY
+        request.app.state.config.IMAGES_OPENAI_API_VERSION = (
+            form_data.IMAGES_OPENAI_API_VERSION
+        )
+        request.app.state.config.IMAGES_OPENAI_API_PARAMS = (
+            form_data.IMAGES_OPENAI_API_PARAMS
+        )
 
-    request.app.state.config.IMAGES_GEMINI_API_BASE_URL = (
-        form_data.IMAGES_GEMINI_API_BASE_URL
-    )
-    request.app.state.config.IMAGES_GEMINI_API_KEY = form_data.IMAGES_GEMINI_API_KEY
-    request.app.state.config.IMAGES_GEMINI_ENDPOINT_METHOD = (
-        form_data.IMAGES_GEMINI_ENDPOINT_METHOD
-    )
+        request.app.state.config.AUTOMATIC1111_BASE_URL = (
+            form_data.AUTOMATIC1111_BASE_URL
+        )
+        request.app.state.config.AUTOMATIC1111_API_AUTH = (
+            form_data.AUTOMATIC1111_API_AUTH
+        )
+        request.app.state.config.AUTOMATIC1111_PARAMS = form_data.AUTOMATIC1111_PARAMS
 
-    # Edit Image
-    request.app.state.config.ENABLE_IMAGE_EDIT = form_data.ENABLE_IMAGE_EDIT
-    request.app.state.config.IMAGE_EDIT_ENGINE = form_data.IMAGE_EDIT_ENGINE
-    request.app.state.config.IMAGE_EDIT_MODEL = form_data.IMAGE_EDIT_MODEL
-    request.app.state.config.IMAGE_EDIT_SIZE = form_data.IMAGE_EDIT_SIZE
+        request.app.state.config.COMFYUI_BASE_URL = form_data.COMFYUI_BASE_URL.strip(
+            "/"
+        )
+        request.app.state.config.COMFYUI_API_KEY = form_data.COMFYUI_API_KEY
+        request.app.state.config.COMFYUI_WORKFLOW = form_data.COMFYUI_WORKFLOW
+        request.app.state.config.COMFYUI_WORKFLOW_NODES = (
+            form_data.COMFYUI_WORKFLOW_NODES
+        )
 
-    request.app.state.config.IMAGES_EDIT_OPENAI_API_BASE_URL = (
-        form_data.IMAGES_EDIT_OPENAI_API_BASE_URL
-    )
-    request.app.state.config.IMAGES_EDIT_OPENAI_API_KEY = (
-        form_data.IMAGES_EDIT_OPENAI_API_KEY
-    )
-    request.app.state.config.IMAGES_EDIT_OPENAI_API_VERSION = (
-        form_data.IMAGES_EDIT_OPENAI_API_VERSION
-    )
+        request.app.state.config.IMAGES_GEMINI_API_BASE_URL = (
+            form_data.IMAGES_GEMINI_API_BASE_URL
+        )
+        request.app.state.config.IMAGES_GEMINI_API_KEY = form_data.IMAGES_GEMINI_API_KEY
+        request.app.state.config.IMAGES_GEMINI_ENDPOINT_METHOD = (
+            form_data.IMAGES_GEMINI_ENDPOINT_METHOD
+        )
 
-    request.app.state.config.IMAGES_EDIT_GEMINI_API_BASE_URL = (
-        form_data.IMAGES_EDIT_GEMINI_API_BASE_URL
-    )
-    request.app.state.config.IMAGES_EDIT_GEMINI_API_KEY = (
-        form_data.IMAGES_EDIT_GEMINI_API_KEY
-    )
+        # Edit Image
+        request.app.state.config.ENABLE_IMAGE_EDIT = form_data.ENABLE_IMAGE_EDIT
+        request.app.state.config.IMAGE_EDIT_ENGINE = form_data.IMAGE_EDIT_ENGINE
+        request.app.state.config.IMAGE_EDIT_MODEL = form_data.IMAGE_EDIT_MODEL
+        request.app.state.config.IMAGE_EDIT_SIZE = form_data.IMAGE_EDIT_SIZE
 
-    request.app.state.config.IMAGES_EDIT_COMFYUI_BASE_URL = (
-        form_data.IMAGES_EDIT_COMFYUI_BASE_URL.strip("/")
-    )
-    request.app.state.config.IMAGES_EDIT_COMFYUI_API_KEY = (
-        form_data.IMAGES_EDIT_COMFYUI_API_KEY
-    )
-    request.app.state.config.IMAGES_EDIT_COMFYUI_WORKFLOW = (
-        form_data.IMAGES_EDIT_COMFYUI_WORKFLOW
-    )
-    request.app.state.config.IMAGES_EDIT_COMFYUI_WORKFLOW_NODES = (
-        form_data.IMAGES_EDIT_COMFYUI_WORKFLOW_NODES
-    )
+        request.app.state.config.IMAGES_EDIT_OPENAI_API_BASE_URL = (
+            form_data.IMAGES_EDIT_OPENAI_API_BASE_URL
+        )
+        request.app.state.config.IMAGES_EDIT_OPENAI_API_KEY = (
+            form_data.IMAGES_EDIT_OPENAI_API_KEY
+        )
+        request.app.state.config.IMAGES_EDIT_OPENAI_API_VERSION = (
+            form_data.IMAGES_EDIT_OPENAI_API_VERSION
+        )
+
+        request.app.state.config.IMAGES_EDIT_GEMINI_API_BASE_URL = (
+            form_data.IMAGES_EDIT_GEMINI_API_BASE_URL
+        )
+        request.app.state.config.IMAGES_EDIT_GEMINI_API_KEY = (
+            form_data.IMAGES_EDIT_GEMINI_API_KEY
+        )
+
+        request.app.state.config.IMAGES_EDIT_COMFYUI_BASE_URL = (
+            form_data.IMAGES_EDIT_COMFYUI_BASE_URL.strip("/")
+        )
+        request.app.state.config.IMAGES_EDIT_COMFYUI_API_KEY = (
+            form_data.IMAGES_EDIT_COMFYUI_API_KEY
+        )
+        request.app.state.config.IMAGES_EDIT_COMFYUI_WORKFLOW = (
+            form_data.IMAGES_EDIT_COMFYUI_WORKFLOW
+        )
+        request.app.state.config.IMAGES_EDIT_COMFYUI_WORKFLOW_NODES = (
+            form_data.IMAGES_EDIT_COMFYUI_WORKFLOW_NODES
+        )
 
     return {
         "ENABLE_IMAGE_GENERATION": request.app.state.config.ENABLE_IMAGE_GENERATION,
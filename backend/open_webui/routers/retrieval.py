@@ -6,6 +6,7 @@ import shutil
 import asyncio
 
 import re
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
@@ -38,6 +39,7 @@ from open_webui.storage.provider import Storage
 
 
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.bulk import bulk_write
 
 # Document loaders
 from open_webui.retrieval.loaders.main import Loader
@@ -45,7 +47,7 @@ from open_webui.retrieval.loaders.youtube import YoutubeLoader
 
 # Web search engines
 from open_webui.retrieval.web.main import SearchResult
-from open_webui.retrieval.web.utils import get_web_loader
+from open_webui.retrieval.web.utils import aget_web_loader
 from open_webui.retrieval.web.ollama import search_ollama_cloud
 from open_webui.retrieval.web.perplexity_search import search_perplexity_search
 from open_webui.retrieval.web.brave import search_brave
@@ -71,14 +73,21 @@ from open_webui.retrieval.web.sougou import search_sougou
 from open_webui.retrieval.web.firecrawl import search_firecrawl
 from open_webui.retrieval.web.external import search_external
 
+from open_webui.retrieval.embedding_server import (
+    EmbeddingServerClient,
+    load_sentence_transformer,
+)
+from open_webui.retrieval.models.lazy import LazyModel
+from open_webui.retrieval.reranking import RERANK_SCORE_CACHE, RERANK_WORKER
 from open_webui.retrieval.utils import (
     get_content_from_url,
     get_embedding_function,
     get_reranking_function,
     get_model_path,
+    is_colbert_model,
     query_collection,
     query_collection_with_hybrid_search,
-    query_doc,
+    aquery_doc,
     query_doc_with_hybrid_search,
 )
 from open_webui.retrieval.vector.utils import filter_metadata
@@ -91,6 +100,7 @@ from open_webui.config import (
     ENV,
     RAG_EMBEDDING_MODEL_AUTO_UPDATE,
     RAG_EMBEDDING_MODEL_TRUST_REMOTE_CODE,
+    RAG_EMBEDDING_SERVER_URL,
     RAG_RERANKING_MODEL_AUTO_UPDATE,
     RAG_RERANKING_MODEL_TRUST_REMOTE_CODE,
     UPLOAD_DIR,
@@ -102,8 +112,6 @@ from open_webui.env import (
     SRC_LOG_LEVELS,
     DEVICE_TYPE,
     DOCKER,
-    SENTENCE_TRANSFORMERS_BACKEND,
-    SENTENCE_TRANSFORMERS_MODEL_KWARGS,
     SENTENCE_TRANSFORMERS_CROSS_ENCODER_BACKEND,
     SENTENCE_TRANSFORMERS_CROSS_ENCODER_MODEL_KWARGS,
 )
@@ -124,18 +132,23 @@ def get_ef(
     engine: str,
     embedding_model: str,
     auto_update: bool = False,
+    lazy: bool = False,
 ):
     ef = None
     if embedding_model and engine == "":
-        from sentence_transformers import SentenceTransformer
+        if RAG_EMBEDDING_SERVER_URL:
+            # The embedding server holds the model for all workers
+            return EmbeddingServerClient(RAG_EMBEDDING_SERVER_URL, embedding_model)
+        if lazy:
+            return LazyModel(
+                f"embedding model {embedding_model}",
+                lambda: get_ef(engine, embedding_model, auto_update),
+            )
 
         try:
-            ef = SentenceTransformer(
+            ef = load_sentence_transformer(
                 get_model_path(embedding_model, auto_update),
-                device=DEVICE_TYPE,
                 trust_remote_code=RAG_EMBEDDING_MODEL_TRUST_REMOTE_CODE,
-                backend=SENTENCE_TRANSFORMERS_BACKEND,
-                model_kwargs=SENTENCE_TRANSFORMERS_MODEL_KWARGS,
             )
         except Exception as e:
             log.debug(f"Error loading SentenceTransformer: {e}")
@@ -149,10 +162,28 @@ def get_rf(
     external_reranker_url: str = "",
     external_reranker_api_key: str = "",
     auto_update: bool = False,
+    lazy: bool = False,
 ):
     rf = None
+    # External rerankers are only clients, so they are always created right away
+    if (
+        lazy
+        and reranking_model
+        and (is_colbert_model(reranking_model) or engine != "external")
+    ):
+        return LazyModel(
+            f"reranking model {reranking_model}",
+            lambda: get_rf(
+                engine,
+                reranking_model,
+                external_reranker_url,
+                external_reranker_api_key,
+                auto_update,
+            ),
+        )
+
     if reranking_model:
-        if any(model in reranking_model for model in ["jinaai/jina-colbert-v2"]):
+        if is_colbert_model(reranking_model):
             try:
                 from open_webui.retrieval.models.colbert import ColBERT
 
@@ -303,121 +334,163 @@ class EmbeddingModelUpdateForm(BaseModel):
 async def update_embedding_config(
     request: Request, form_data: EmbeddingModelUpdateForm, user=Depends(get_admin_user)
 ):
-    log.info(
-        f"Updating embedding model: {request.app.state.config.RAG_EMBEDDING_MODEL} to {form_data.embedding_model}"
-    )
-    if request.app.state.config.RAG_EMBEDDING_ENGINE == "":
-        # unloads current internal embedding model and clears VRAM cache
-        request.app.state.ef = None
-        request.app.state.EMBEDDING_FUNCTION = None
-        import gc
-
-        gc.collect()
-        if DEVICE_TYPE == "cuda":
-            import torch
-
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-    try:
-        request.app.state.config.RAG_EMBEDDING_ENGINE = form_data.embedding_engine
-        request.app.state.config.RAG_EMBEDDING_MODEL = form_data.embedding_model
-
-        if request.app.state.config.RAG_EMBEDDING_ENGINE in [
-            "ollama",
-            "openai",
-            "azure_openai",
-        ]:
-            if form_data.openai_config is not None:
-                request.app.state.config.RAG_OPENAI_API_BASE_URL = (
-                    form_data.openai_config.url
-                )
-                request.app.state.config.RAG_OPENAI_API_KEY = (
-                    form_data.openai_config.key
-                )
+    with request.app.state.config.transaction():
+        log.info(
+            f"Updating embedding model: {request.app.state.config.RAG_EMBEDDING_MODEL} to {form_data.embedding_model}"
+        )
+        if request.app.state.config.RAG_EMBEDDING_ENGINE == "":
+            # unloads current internal embedding model and clears VRAM cache
+            request.app.state.ef = None
+            request.app.state.EMBEDDING_FUNCTION = None
+            import gc
+
+            gc.collect()
+            if DEVICE_TYPE == "cuda":
+                import torch
+
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+        try:
+            request.app.state.config.RAG_EMBEDDING_ENGINE = form_data.embedding_engine
+            request.app.state.config.RAG_EMBEDDING_MODEL = form_data.embedding_model
+
+            if request.app.state.config.RAG_EMBEDDING_ENGINE in [
+                "ollama",
+                "openai",
+                "azure_openai",
+            ]:
+                if form_data.openai_config is not None:
+                    request.app.state.config.RAG_OPENAI_API_BASE_URL = (
+                        form_data.openai_config.url
+                    )
+                    request.app.state.config.RAG_OPENAI_API_KEY = (
+                        form_data.openai_config.key
+                    )
 
-            if form_data.ollama_config is not None:
-                request.app.state.config.RAG_OLLAMA_BASE_URL = (
-                    form_data.ollama_config.url
-                )
-                request.app.state.config.RAG_OLLAMA_API_KEY = (
-                    form_data.ollama_config.key
-                )
+                if form_data.ollama_config is not None:
+                    request.app.state.config.RAG_OLLAMA_BASE_URL = (
+                        form_data.ollama_config.url
+                    )
+                    request.app.state.config.RAG_OLLAMA_API_KEY = (
+                        form_data.ollama_config.key
+                    )
 
-            if form_data.azure_openai_config is not None:
-                request.app.state.config.RAG_AZURE_OPENAI_BASE_URL = (
-                    form_data.azure_openai_config.url
-                )
-                request.app.state.config.RAG_AZURE_OPENAI_API_KEY = (
-                    form_data.azure_openai_config.key
-                )
-                request.app.state.config.RAG_AZURE_OPENAI_API_VERSION = (
-                    form_data.azure_openai_config.version
+                if form_data.azure_openai_config is not None:
+                    request.app.state.config.RAG_AZURE_OPENAI_BASE_URL = (
+                        form_data.azure_openai_config.url
+                    )
+                    request.app.state.config.RAG_AZURE_OPENAI_API_KEY = (
+                        form_data.azure_openai_config.key
+                    )
+                    request.app.state.config.RAG_AZURE_OPENAI_API_VERSION = (
+                        form_data.azure_openai_config.version
+                    )
+
+                request.app.state.config.RAG_EMBEDDING_BATCH_SIZE = (
+                    form_data.embedding_batch_size
                 )
 
-            request.app.state.config.RAG_EMBEDDING_BATCH_SIZE = (
-                form_data.embedding_batch_size
+            request.app.state.ef = get_ef(
+                request.app.state.config.RAG_EMBEDDING_ENGINE,
+                request.app.state.config.RAG_EMBEDDING_MODEL,
             )
 
-        request.app.state.ef = get_ef(
-            request.app.state.config.RAG_EMBEDDING_ENGINE,
-            request.app.state.config.RAG_EMBEDDING_MODEL,
-        )
+            request.app.state.EMBEDDING_FUNCTION = get_embedding_function(
+                request.app.state.config.RAG_EMBEDDING_ENGINE,
+                request.app.state.config.RAG_EMBEDDING_MODEL,
+                request.app.state.ef,
+                (
+                    request.app.state.config.RAG_OPENAI_API_BASE_URL
+                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+                    else (
+                        request.app.state.config.RAG_OLLAMA_BASE_URL
+                        if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                        else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
+                    )
+                ),
+                (
+                    request.app.state.config.RAG_OPENAI_API_KEY
+                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+                    else (
+                        request.app.state.config.RAG_OLLAMA_API_KEY
+                        if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                        else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
+                    )
+                ),
+                request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+                azure_api_version=(
+                    request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
+                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
+                    else None
+                ),
+            )
 
-        request.app.state.EMBEDDING_FUNCTION = get_embedding_function(
-            request.app.state.config.RAG_EMBEDDING_ENGINE,
-            request.app.state.config.RAG_EMBEDDING_MODEL,
-            request.app.state.ef,
-            (
-                request.app.state.config.RAG_OPENAI_API_BASE_URL
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-                else (
-                    request.app.state.config.RAG_OLLAMA_BASE_URL
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-                    else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
-                )
-            ),
-            (
-                request.app.state.config.RAG_OPENAI_API_KEY
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-                else (
-                    request.app.state.config.RAG_OLLAMA_API_KEY
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-                    else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
-                )
-            ),
-            request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
-            azure_api_version=(
-                request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
-                else None
-            ),
-        )
+            return {
+                "status": True,
+                "embedding_engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+                "embedding_model": request.app.state.config.RAG_EMBEDDING_MODEL,
+                "embedding_batch_size": request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+                "openai_config": {
+                    "url": request.app.state.config.RAG_OPENAI_API_BASE_URL,
+                    "key": request.app.state.config.RAG_OPENAI_API_KEY,
+                },
+                "ollama_config": {
+                    "url": request.app.state.config.RAG_OLLAMA_BASE_URL,
+                    "key": request.app.state.config.RAG_OLLAMA_API_KEY,
+                },
+                "azure_openai_config": {
+                    "url": request.app.state.config.RAG_AZURE_OPENAI_BASE_URL,
+                    "key": request.app.state.config.RAG_AZURE_OPENAI_API_KEY,
+                    "version": request.app.state.config.RAG_AZURE_OPENAI_API_VERSION,
+                },
+            }
+        except Exception as e:
+            log.exception(f"Problem updating embedding model: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=ERROR_MESSAGES.DEFAULT(e),
+            )
+
+
+@router.get("/rerank/stats")
+async def get_rerank_stats(user=Depends(get_admin_user)):
+    """Queue depth, latency and batching of the reranking worker."""
+    return {**RERANK_WORKER.stats(), "cache": RERANK_SCORE_CACHE.stats()}
+
+
+@router.post("/models/warmup")
+async def warmup_models(request: Request, user=Depends(get_admin_user)):
+    """Load the local embedding and reranking models and run one inference each."""
+    ef, rf = request.app.state.ef, request.app.state.rf
+    if request.app.state.config.RAG_RERANKING_ENGINE == "external" and not (
+        is_colbert_model(request.app.state.config.RAG_RERANKING_MODEL)
+    ):
+        rf = None
+
+    async def warmup(model, inference):
+        if model is None:
+            return None
+
+        start = time.monotonic()
+        try:
+            await asyncio.to_thread(inference, model)
+        except Exception as e:
+            log.exception(f"Error warming up model: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=ERROR_MESSAGES.DEFAULT(e),
+            )
 
         return {
-            "status": True,
-            "embedding_engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
-            "embedding_model": request.app.state.config.RAG_EMBEDDING_MODEL,
-            "embedding_batch_size": request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
-            "openai_config": {
-                "url": request.app.state.config.RAG_OPENAI_API_BASE_URL,
-                "key": request.app.state.config.RAG_OPENAI_API_KEY,
-            },
-            "ollama_config": {
-                "url": request.app.state.config.RAG_OLLAMA_BASE_URL,
-                "key": request.app.state.config.RAG_OLLAMA_API_KEY,
-            },
-            "azure_openai_config": {
-                "url": request.app.state.config.RAG_AZURE_OPENAI_BASE_URL,
-                "key": request.app.state.config.RAG_AZURE_OPENAI_API_KEY,
-                "version": request.app.state.config.RAG_AZURE_OPENAI_API_VERSION,
-            },
+            **(model.status() if isinstance(model, LazyModel) else {"loaded": True}),
+            "warmup_time": round(time.monotonic() - start, 2),
         }
-    except Exception as e:
-        log.exception(f"Problem updating embedding model: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=ERROR_MESSAGES.DEFAULT(e),
-        )
+
+    embedding, reranking = await asyncio.gather(
+        warmup(ef, lambda model: model.encode(["warmup"])),
+        warmup(rf, lambda model: model.predict([("warmup", "warmup")])),
+    )
+    return {"embedding": embedding, "reranking": reranking}
 
 
 @router.get("/config")
@@ -500,6 +573,7 @@ async def get_rag_config(request: Request, user=Depends(get_admin_user)):
             "WEB_SEARCH_RESULT_COUNT": request.app.state.config.WEB_SEARCH_RESULT_COUNT,
             "WEB_SEARCH_CONCURRENT_REQUESTS": request.app.state.config.WEB_SEARCH_CONCURRENT_REQUESTS,
             "WEB_LOADER_CONCURRENT_REQUESTS": request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS,
+            "WEB_LOADER_TIMEOUT": request.app.state.config.WEB_LOADER_TIMEOUT,
             "WEB_SEARCH_DOMAIN_FILTER_LIST": request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST,
             "BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL": request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL,
             "BYPASS_WEB_SEARCH_WEB_LOADER": request.app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER,
@@ -558,6 +632,7 @@ class WebConfig(BaseModel):
     WEB_SEARCH_RESULT_COUNT: Optional[int] = None
     WEB_SEARCH_CONCURRENT_REQUESTS: Optional[int] = None
     WEB_LOADER_CONCURRENT_REQUESTS: Optional[int] = None
+    WEB_LOADER_TIMEOUT: Optional[float] = None
     WEB_SEARCH_DOMAIN_FILTER_LIST: Optional[List[str]] = []
     BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL: Optional[bool] = None
     BYPASS_WEB_SEARCH_WEB_LOADER: Optional[bool] = None
@@ -695,471 +770,483 @@ class ConfigForm(BaseModel):
 async def update_rag_config(
     request: Request, form_data: ConfigForm, user=Depends(get_admin_user)
 ):
-    # RAG settings
-    request.app.state.config.RAG_TEMPLATE = (
-        form_data.RAG_TEMPLATE
-        if form_data.RAG_TEMPLATE is not None
-        else request.app.state.config.RAG_TEMPLATE
-    )
-    request.app.state.config.TOP_K = (
-        form_data.TOP_K
-        if form_data.TOP_K is not None
-        else request.app.state.config.TOP_K
-    )
-    request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL = (
-        form_data.BYPASS_EMBEDDING_AND_RETRIEVAL
-        if form_data.BYPASS_EMBEDDING_AND_RETRIEVAL is not None
-        else request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
-    )
-    request.app.state.config.RAG_FULL_CONTEXT = (
-        form_data.RAG_FULL_CONTEXT
-        if form_data.RAG_FULL_CONTEXT is not None
-        else request.app.state.config.RAG_FULL_CONTEXT
-    )
-
-    # Hybrid search settings
-    request.app.state.config.ENABLE_RAG_HYBRID_SEARCH = (
-        form_data.ENABLE_RAG_HYBRID_SEARCH
-        if form_data.ENABLE_RAG_HYBRID_SEARCH is not None
-        else request.app.state.config.ENABLE_RAG_HYBRID_SEARCH
-    )
-    request.app.state.config.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS = (
-        form_data.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS
-        if form_data.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS is not None
-        else request.app.state.config.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS
-    )
-
-    request.app.state.config.TOP_K_RERANKER = (
-        form_data.TOP_K_RERANKER
-        if form_data.TOP_K_RERANKER is not None
-        else request.app.state.config.TOP_K_RERANKER
-    )
-    request.app.state.config.RELEVANCE_THRESHOLD = (
-        form_data.RELEVANCE_THRESHOLD
-        if form_data.RELEVANCE_THRESHOLD is not None
-        else request.app.state.config.RELEVANCE_THRESHOLD
-    )
-    request.app.state.config.HYBRID_BM25_WEIGHT = (
-        form_data.HYBRID_BM25_WEIGHT
-        if form_data.HYBRID_BM25_WEIGHT is not None
-        else request.app.state.config.HYBRID_BM25_WEIGHT
-    )
-
-    # Content extraction settings
-    request.app.state.config.CONTENT_EXTRACTION_ENGINE = (
-        form_data.CONTENT_EXTRACTION_ENGINE
-        if form_data.CONTENT_EXTRACTION_ENGINE is not None
-        else request.app.state.config.CONTENT_EXTRACTION_ENGINE
-    )
-    request.app.state.config.PDF_EXTRACT_IMAGES = (
-        form_data.PDF_EXTRACT_IMAGES
-        if form_data.PDF_EXTRACT_IMAGES is not None
-        else request.app.state.config.PDF_EXTRACT_IMAGES
-    )
-    request.app.state.config.DATALAB_MARKER_API_KEY = (
-        form_data.DATALAB_MARKER_API_KEY
-        if form_data.DATALAB_MARKER_API_KEY is not None
-        else request.app.state.config.DATALAB_MARKER_API_KEY
-    )
-    request.app.state.config.DATALAB_MARKER_API_BASE_URL = (
-        form_data.DATALAB_MARKER_API_BASE_URL
-        if form_data.DATALAB_MARKER_API_BASE_URL is not None
-        else request.app.state.config.DATALAB_MARKER_API_BASE_URL
-    )
-    request.app.state.config.DATALAB_MARKER_ADDITIONAL_CONFIG = (
-        form_data.DATALAB_MARKER_ADDITIONAL_CONFIG
-        if form_data.DATALAB_MARKER_ADDITIONAL_CONFIG is not None
-        else request.app.state.config.DATALAB_MARKER_ADDITIONAL_CONFIG
-    )
-    request.app.state.config.DATALAB_MARKER_SKIP_CACHE = (
-        form_data.DATALAB_MARKER_SKIP_CACHE
-        if form_data.DATALAB_MARKER_SKIP_CACHE is not None
-        else request.app.state.config.DATALAB_MARKER_SKIP_CACHE
-    )
-    request.app.state.config.DATALAB_MARKER_FORCE_OCR = (
-        form_data.DATALAB_MARKER_FORCE_OCR
-        if form_data.DATALAB_MARKER_FORCE_OCR is not None
-        else request.app.state.config.DATALAB_MARKER_FORCE_OCR
-    )
-    request.app.state.config.DATALAB_MARKER_PAGINATE = (
-        form_data.DATALAB_MARKER_PAGINATE
-        if form_data.DATALAB_MARKER_PAGINATE is not None
-        else request.app.state.config.DATALAB_MARKER_PAGINATE
-    )
-    request.app.state.config.DATALAB_MARKER_STRIP_EXISTING_OCR = (
-        form_data.DATALAB_MARKER_STRIP_EXISTING_OCR
-        if form_data.DATALAB_MARKER_STRIP_EXISTING_OCR is not None
-        else request.app.state.config.DATALAB_MARKER_STRIP_EXISTING_OCR
-    )
-    request.app.state.config.DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION = (
-        form_data.DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION
-        if form_data.DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION is not None
-        else request.app.state.config.DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION
-    )
-    request.app.state.config.DATALAB_MARKER_FORMAT_LINES = (
-        form_data.DATALAB_MARKER_FORMAT_LINES
-        if form_data.DATALAB_MARKER_FORMAT_LINES is not None
-        else request.app.state.config.DATALAB_MARKER_FORMAT_LINES
-    )
-    request.app.state.config.DATALAB_MARKER_OUTPUT_FORMAT = (
-        form_data.DATALAB_MARKER_OUTPUT_FORMAT
-        if form_data.DATALAB_MARKER_OUTPUT_FORMAT is not None
-        else request.app.state.config.DATALAB_MARKER_OUTPUT_FORMAT
-    )
-    request.app.state.config.DATALAB_MARKER_USE_LLM = (
-        form_data.DATALAB_MARKER_USE_LLM
-        if form_data.DATALAB_MARKER_USE_LLM is not None
-        else request.app.state.config.DATALAB_MARKER_USE_LLM
-    )
-    request.app.state.config.EXTERNAL_DOCUMENT_LOADER_URL = (
-        form_data.EXTERNAL_DOCUMENT_LOADER_URL
-        if form_data.EXTERNAL_DOCUMENT_LOADER_URL is not None
-        else request.app.state.config.EXTERNAL_DOCUMENT_LOADER_URL
-    )
-    request.app.state.config.EXTERNAL_DOCUMENT_LOADER_API_KEY = (
-        form_data.EXTERNAL_DOCUMENT_LOADER_API_KEY
-        if form_data.EXTERNAL_DOCUMENT_LOADER_API_KEY is not None
-        else request.app.state.config.EXTERNAL_DOCUMENT_LOADER_API_KEY
-    )
-    request.app.state.config.TIKA_SERVER_URL = (
-        form_data.TIKA_SERVER_URL
-        if form_data.TIKA_SERVER_URL is not None
-        else request.app.state.config.TIKA_SERVER_URL
-    )
-    request.app.state.config.DOCLING_SERVER_URL = (
-        form_data.DOCLING_SERVER_URL
-        if form_data.DOCLING_SERVER_URL is not None
-        else request.app.state.config.DOCLING_SERVER_URL
-    )
-    request.app.state.config.DOCLING_PARAMS = (
-        form_data.DOCLING_PARAMS
-        if form_data.DOCLING_PARAMS is not None
-        else request.app.state.config.DOCLING_PARAMS
-    )
-    request.app.state.config.DOCLING_DO_OCR = (
-        form_data.DOCLING_DO_OCR
-        if form_data.DOCLING_DO_OCR is not None
-        else request.app.state.config.DOCLING_DO_OCR
-    )
-    request.app.state.config.DOCLING_FORCE_OCR = (
-        form_data.DOCLING_FORCE_OCR
-        if form_data.DOCLING_FORCE_OCR is not None
-        else request.app.state.config.DOCLING_FORCE_OCR
-    )
-    request.app.state.config.DOCLING_OCR_ENGINE = (
-        form_data.DOCLING_OCR_ENGINE
-        if form_data.DOCLING_OCR_ENGINE is not None
-        else request.app.state.config.DOCLING_OCR_ENGINE
-    )
-    request.app.state.config.DOCLING_OCR_LANG = (
-        form_data.DOCLING_OCR_LANG
-        if form_data.DOCLING_OCR_LANG is not None
-        else request.app.state.config.DOCLING_OCR_LANG
-    )
-    request.app.state.config.DOCLING_PDF_BACKEND = (
-        form_data.DOCLING_PDF_BACKEND
-        if form_data.DOCLING_PDF_BACKEND is not None
-        else request.app.state.config.DOCLING_PDF_BACKEND
-    )
-    request.app.state.config.DOCLING_TABLE_MODE = (
-        form_data.DOCLING_TABLE_MODE
-        if form_data.DOCLING_TABLE_MODE is not None
-        else request.app.state.config.DOCLING_TABLE_MODE
-    )
-    request.app.state.config.DOCLING_PIPELINE = (
-        form_data.DOCLING_PIPELINE
-        if form_data.DOCLING_PIPELINE is not None
-        else request.app.state.config.DOCLING_PIPELINE
-    )
-    request.app.state.config.DOCLING_DO_PICTURE_DESCRIPTION = (
-        form_data.DOCLING_DO_PICTURE_DESCRIPTION
-        if form_data.DOCLING_DO_PICTURE_DESCRIPTION is not None
-        else request.app.state.config.DOCLING_DO_PICTURE_DESCRIPTION
-    )
-
-    request.app.state.config.DOCLING_PICTURE_DESCRIPTION_MODE = (
-        form_data.DOCLING_PICTURE_DESCRIPTION_MODE
-        if form_data.DOCLING_PICTURE_DESCRIPTION_MODE is not None
-        else request.app.state.config.DOCLING_PICTURE_DESCRIPTION_MODE
-    )
-    request.app.state.config.DOCLING_PICTURE_DESCRIPTION_LOCAL = (
-        form_data.DOCLING_PICTURE_DESCRIPTION_LOCAL
-        if form_data.DOCLING_PICTURE_DESCRIPTION_LOCAL is not None
-        else request.app.state.config.DOCLING_PICTURE_DESCRIPTION_LOCAL
-    )
-    request.app.state.config.DOCLING_PICTURE_DESCRIPTION_API = (
-        form_data.DOCLING_PICTURE_DESCRIPTION_API
-        if form_data.DOCLING_PICTURE_DESCRIPTION_API is not None
-        else request.app.state.config.DOCLING_PICTURE_DESCRIPTION_API
-    )
-
-    request.app.state.config.DOCUMENT_INTELLIGENCE_ENDPOINT = (
-        form_data.DOCUMENT_INTELLIGENCE_ENDPOINT
-        if form_data.DOCUMENT_INTELLIGENCE_ENDPOINT is not None
-        else request.app.state.config.DOCUMENT_INTELLIGENCE_ENDPOINT
-    )
-    request.app.state.config.DOCUMENT_INTELLIGENCE_KEY = (
-        form_data.DOCUMENT_INTELLIGENCE_KEY
-        if form_data.DOCUMENT_INTELLIGENCE_KEY is not None
-        else request.app.state.config.DOCUMENT_INTELLIGENCE_KEY
-    )
-
-    request.app.state.config.MISTRAL_OCR_API_BASE_URL = (
-        form_data.MISTRAL_OCR_API_BASE_URL
-        if form_data.MISTRAL_OCR_API_BASE_URL is not None
-        else request.app.state.config.MISTRAL_OCR_API_BASE_URL
-    )
-    request.app.state.config.MISTRAL_OCR_API_KEY = (
-        form_data.MISTRAL_OCR_API_KEY
-        if form_data.MISTRAL_OCR_API_KEY is not None
-        else request.app.state.config.MISTRAL_OCR_API_KEY
-    )
-
-    # MinerU settings
-    request.app.state.config.MINERU_API_MODE = (
-        form_data.MINERU_API_MODE
-        if form_data.MINERU_API_MODE is not None
-        else request.app.state.config.MINERU_API_MODE
-    )
-    request.app.state.config.MINERU_API_URL = (
-        form_data.MINERU_API_URL
-        if form_data.MINERU_API_URL is not None
-        else request.app.state.config.MINERU_API_URL
-    )
-    request.app.state.config.MINERU_API_KEY = (
-        form_data.MINERU_API_KEY
-        if form_data.MINERU_API_KEY is not None
-        else request.app.state.config.MINERU_API_KEY
-    )
-    request.app.state.config.MINERU_PARAMS = (
-        form_data.MINERU_PARAMS
-        if form_data.MINERU_PARAMS is not None
-        else request.app.state.config.MINERU_PARAMS
-    )
-
-    # Reranking settings
-    if request.app.state.config.RAG_RERANKING_ENGINE == "":
-        # Unloading the internal reranker and clear VRAM memory
-        request.app.state.rf = None
-        request.app.state.RERANKING_FUNCTION = None
-        import gc
-
-        gc.collect()
-        if DEVICE_TYPE == "cuda":
-            import torch
-
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-    request.app.state.config.RAG_RERANKING_ENGINE = (
-        form_data.RAG_RERANKING_ENGINE
-        if form_data.RAG_RERANKING_ENGINE is not None
-        else request.app.state.config.RAG_RERANKING_ENGINE
-    )
-
-    request.app.state.config.RAG_EXTERNAL_RERANKER_URL = (
-        form_data.RAG_EXTERNAL_RERANKER_URL
-        if form_data.RAG_EXTERNAL_RERANKER_URL is not None
-        else request.app.state.config.RAG_EXTERNAL_RERANKER_URL
-    )
-
-    request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY = (
-        form_data.RAG_EXTERNAL_RERANKER_API_KEY
-        if form_data.RAG_EXTERNAL_RERANKER_API_KEY is not None
-        else request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY
-    )
-
-    log.info(
-        f"Updating reranking model: {request.app.state.config.RAG_RERANKING_MODEL} to {form_data.RAG_RERANKING_MODEL}"
-    )
-    try:
-        request.app.state.config.RAG_RERANKING_MODEL = (
-            form_data.RAG_RERANKING_MODEL
-            if form_data.RAG_RERANKING_MODEL is not None
-            else request.app.state.config.RAG_RERANKING_MODEL
+    with request.app.state.config.transaction():
+        # RAG settings
+        request.app.state.config.RAG_TEMPLATE = (
+            form_data.RAG_TEMPLATE
+            if form_data.RAG_TEMPLATE is not None
+            else request.app.state.config.RAG_TEMPLATE
         )
-
-        try:
-            if (
-                request.app.state.config.ENABLE_RAG_HYBRID_SEARCH
-                and not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
-            ):
-                request.app.state.rf = get_rf(
-                    request.app.state.config.RAG_RERANKING_ENGINE,
-                    request.app.state.config.RAG_RERANKING_MODEL,
-                    request.app.state.config.RAG_EXTERNAL_RERANKER_URL,
-                    request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY,
-                    True,
-                )
-
-                request.app.state.RERANKING_FUNCTION = get_reranking_function(
-                    request.app.state.config.RAG_RERANKING_ENGINE,
-                    request.app.state.config.RAG_RERANKING_MODEL,
-                    request.app.state.rf,
-                )
-        except Exception as e:
-            log.error(f"Error loading reranking model: {e}")
-            request.app.state.config.ENABLE_RAG_HYBRID_SEARCH = False
-    except Exception as e:
-        log.exception(f"Problem updating reranking model: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=ERROR_MESSAGES.DEFAULT(e),
+        request.app.state.config.TOP_K = (
+            form_data.TOP_K
+            if form_data.TOP_K is not None
+            else request.app.state.config.TOP_K
+        )
+        request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL = (
+            form_data.BYPASS_EMBEDDING_AND_RETRIEVAL
+            if form_data.BYPASS_EMBEDDING_AND_RETRIEVAL is not None
+            else request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
+        )
+        request.app.state.config.RAG_FULL_CONTEXT = (
+            form_data.RAG_FULL_CONTEXT
+            if form_data.RAG_FULL_CONTEXT is not None
+            else request.app.state.config.RAG_FULL_CONTEXT
         )
 
-    # Chunking settings
-    request.app.state.config.TEXT_SPLITTER = (
-        form_data.TEXT_SPLITTER
-        if form_data.TEXT_SPLITTER is not None
-        else request.app.state.config.TEXT_SPLITTER
-    )
-    request.app.state.config.CHUNK_SIZE = (
-        form_data.CHUNK_SIZE
-        if form_data.CHUNK_SIZE is not None
-        else request.app.state.config.CHUNK_SIZE
-    )
-    request.app.state.config.CHUNK_OVERLAP = (
-        form_data.CHUNK_OVERLAP
-        if form_data.CHUNK_OVERLAP is not None
-        else request.app.state.config.CHUNK_OVERLAP
-    )
-
-    # File upload settings
-    request.app.state.config.FILE_MAX_SIZE = form_data.FILE_MAX_SIZE
-    request.app.state.config.FILE_MAX_COUNT = form_data.FILE_MAX_COUNT
-    request.app.state.config.FILE_IMAGE_COMPRESSION_WIDTH = (
-        form_data.FILE_IMAGE_COMPRESSION_WIDTH
-    )
-    request.app.state.config.FILE_IMAGE_COMPRESSION_HEIGHT = (
-        form_data.FILE_IMAGE_COMPRESSION_HEIGHT
-    )
-    request.app.state.config.ALLOWED_FILE_EXTENSIONS = (
-        form_data.ALLOWED_FILE_EXTENSIONS
-        if form_data.ALLOWED_FILE_EXTENSIONS is not None
-        else request.app.state.config.ALLOWED_FILE_EXTENSIONS
-    )
+        # Hybrid search settings
+        request.app.state.config.ENABLE_RAG_HYBRID_SEARCH = (
+            form_data.ENABLE_RAG_HYBRID_SEARCH
+            if form_data.ENABLE_RAG_HYBRID_SEARCH is not None
+            else request.app.state.config.ENABLE_RAG_HYBRID_SEARCH
+        )
+        request.app.state.config.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS = (
+            form_data.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS
+            if form_data.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS is not None
+            else request.app.state.config.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS
+        )
 
-    # Integration settings
-    request.app.state.config.ENABLE_GOOGLE_DRIVE_INTEGRATION = (
-        form_data.ENABLE_GOOGLE_DRIVE_INTEGRATION
-        if form_data.ENABLE_GOOGLE_DRIVE_INTEGRATION is not None
-        else request.app.state.config.ENABLE_GOOGLE_DRIVE_INTEGRATION
-    )
-    request.app.state.config.ENABLE_ONEDRIVE_INTEGRATION = (
-        form_data.ENABLE_ONEDRIVE_INTEGRATION
-        if form_data.ENABLE_ONEDRIVE_INTEGRATION is not None
-        else request.app.state.config.ENABLE_ONEDRIVE_INTEGRATION
-    )
+        request.app.state.config.TOP_K_RERANKER = (
+            form_data.TOP_K_RERANKER
+            if form_data.TOP_K_RERANKER is not None
+            else request.app.state.config.TOP_K_RERANKER
+        )
+        request.app.state.config.RELEVANCE_THRESHOLD = (
+            form_data.RELEVANCE_THRESHOLD
+            if form_data.RELEVANCE_THRESHOLD is not None
+            else request.app.state.config.RELEVANCE_THRESHOLD
+        )
+        request.app.state.config.HYBRID_BM25_WEIGHT = (
+            form_data.HYBRID_BM25_WEIGHT
+            if form_data.HYBRID_BM25_WEIGHT is not None
+            else request.app.state.config.HYBRID_BM25_WEIGHT
+        )
 
-    if form_data.web is not None:
-        # Web search settings
-        request.app.state.config.ENABLE_WEB_SEARCH = form_data.web.ENABLE_WEB_SEARCH
-        request.app.state.config.WEB_SEARCH_ENGINE = form_data.web.WEB_SEARCH_ENGINE
-        request.app.state.config.WEB_SEARCH_TRUST_ENV = (
-            form_data.web.WEB_SEARCH_TRUST_ENV
+        # Content extraction settings
+        request.app.state.config.CONTENT_EXTRACTION_ENGINE = (
+            form_data.CONTENT_EXTRACTION_ENGINE
+            if form_data.CONTENT_EXTRACTION_ENGINE is not None
+            else request.app.state.config.CONTENT_EXTRACTION_ENGINE
+        )
+        request.app.state.config.PDF_EXTRACT_IMAGES = (
+            form_data.PDF_EXTRACT_IMAGES
+            if form_data.PDF_EXTRACT_IMAGES is not None
+            else request.app.state.config.PDF_EXTRACT_IMAGES
+        )
+        request.app.state.config.DATALAB_MARKER_API_KEY = (
+            form_data.DATALAB_MARKER_API_KEY
+            if form_data.DATALAB_MARKER_API_KEY is not None
+            else request.app.state.config.DATALAB_MARKER_API_KEY
+        )
+        request.app.state.config.DATALAB_MARKER_API_BASE_URL = (
+            form_data.DATALAB_MARKER_API_BASE_URL
+            if form_data.DATALAB_MARKER_API_BASE_URL is not None
+            else request.app.state.config.DATALAB_MARKER_API_BASE_URL
+        )
+        request.app.state.config.DATALAB_MARKER_ADDITIONAL_CONFIG = (
+            form_data.DATALAB_MARKER_ADDITIONAL_CONFIG
+            if form_data.DATALAB_MARKER_ADDITIONAL_CONFIG is not None
+            else request.app.state.config.DATALAB_MARKER_ADDITIONAL_CONFIG
+        )
+        request.app.state.config.DATALAB_MARKER_SKIP_CACHE = (
+            form_data.DATALAB_MARKER_SKIP_CACHE
+            if form_data.DATALAB_MARKER_SKIP_CACHE is not None
+            else request.app.state.config.DATALAB_MARKER_SKIP_CACHE
+        )
+        request.app.state.config.DATALAB_MARKER_FORCE_OCR = (
+            form_data.DATALAB_MARKER_FORCE_OCR
+            if form_data.DATALAB_MARKER_FORCE_OCR is not None
+            else request.app.state.config.DATALAB_MARKER_FORCE_OCR
+        )
+        request.app.state.config.DATALAB_MARKER_PAGINATE = (
+            form_data.DATALAB_MARKER_PAGINATE
+            if form_data.DATALAB_MARKER_PAGINATE is not None
+            else request.app.state.config.DATALAB_MARKER_PAGINATE
+        )
+        request.app.state.config.DATALAB_MARKER_STRIP_EXISTING_OCR = (
+            form_data.DATALAB_MARKER_STRIP_EXISTING_OCR
+            if form_data.DATALAB_MARKER_STRIP_EXISTING_OCR is not None
+            else request.app.state.config.DATALAB_MARKER_STRIP_EXISTING_OCR
+        )
+        request.app.state.config.DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION = (
+            form_data.DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION
+            if form_data.DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION is not None
+            else request.app.state.config.DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION
+        )
+        request.app.state.config.DATALAB_MARKER_FORMAT_LINES = (
+            form_data.DATALAB_MARKER_FORMAT_LINES
+            if form_data.DATALAB_MARKER_FORMAT_LINES is not None
+            else request.app.state.config.DATALAB_MARKER_FORMAT_LINES
+        )
+        request.app.state.config.DATALAB_MARKER_OUTPUT_FORMAT = (
+            form_data.DATALAB_MARKER_OUTPUT_FORMAT
+            if form_data.DATALAB_MARKER_OUTPUT_FORMAT is not None
+            else request.app.state.config.DATALAB_MARKER_OUTPUT_FORMAT
+        )
+        request.app.state.config.DATALAB_MARKER_USE_LLM = (
+            form_data.DATALAB_MARKER_USE_LLM
+            if form_data.DATALAB_MARKER_USE_LLM is not None
+            else request.app.state.config.DATALAB_MARKER_USE_LLM
+        )
+        request.app.state.config.EXTERNAL_DOCUMENT_LOADER_URL = (
+            form_data.EXTERNAL_DOCUMENT_LOADER_URL
+            if form_data.EXTERNAL_DOCUMENT_LOADER_URL is not None
+            else request.app.state.config.EXTERNAL_DOCUMENT_LOADER_URL
+        )
+        request.app.state.config.EXTERNAL_DOCUMENT_LOADER_API_KEY = (
+            form_data.EXTERNAL_DOCUMENT_LOADER_API_KEY
+            if form_data.EXTERNAL_DOCUMENT_LOADER_API_KEY is not None
+            else request.app.state.config.EXTERNAL_DOCUMENT_LOADER_API_KEY
+        )
+        request.app.state.config.TIKA_SERVER_URL = (
+            form_data.TIKA_SERVER_URL
+            if form_data.TIKA_SERVER_URL is not None
+            else request.app.state.config.TIKA_SERVER_URL
+        )
+        request.app.state.config.DOCLING_SERVER_URL = (
+            form_data.DOCLING_SERVER_URL
+            if form_data.DOCLING_SERVER_URL is not None
+            else request.app.state.config.DOCLING_SERVER_URL
+        )
+        request.app.state.config.DOCLING_PARAMS = (
+            form_data.DOCLING_PARAMS
+            if form_data.DOCLING_PARAMS is not None
+            else request.app.state.config.DOCLING_PARAMS
+        )
+        request.app.state.config.DOCLING_DO_OCR = (
+            form_data.DOCLING_DO_OCR
+            if form_data.DOCLING_DO_OCR is not None
+            else request.app.state.config.DOCLING_DO_OCR
+        )
+        request.app.state.config.DOCLING_FORCE_OCR = (
+            form_data.DOCLING_FORCE_OCR
+            if form_data.DOCLING_FORCE_OCR is not None
+            else request.app.state.config.DOCLING_FORCE_OCR
         )
-        request.app.state.config.WEB_SEARCH_RESULT_COUNT = (
-            form_data.web.WEB_SEARCH_RESULT_COUNT
+        request.app.state.config.DOCLING_OCR_ENGINE = (
+            form_data.DOCLING_OCR_ENGINE
+            if form_data.DOCLING_OCR_ENGINE is not None
+            else request.app.state.config.DOCLING_OCR_ENGINE
         )
-        request.app.state.config.WEB_SEARCH_CONCURRENT_REQUESTS = (
-            form_data.web.WEB_SEARCH_CONCURRENT_REQUESTS
+        request.app.state.config.DOCLING_OCR_LANG = (
+            form_data.DOCLING_OCR_LANG
+            if form_data.DOCLING_OCR_LANG is not None
+            else request.app.state.config.DOCLING_OCR_LANG
         )
-        request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS = (
-            form_data.web.WEB_LOADER_CONCURRENT_REQUESTS
+        request.app.state.config.DOCLING_PDF_BACKEND = (
+            form_data.DOCLING_PDF_BACKEND
+            if form_data.DOCLING_PDF_BACKEND is not None
+            else request.app.state.config.DOCLING_PDF_BACKEND
         )
-        request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST = (
-            form_data.web.WEB_SEARCH_DOMAIN_FILTER_LIST
+        request.app.state.config.DOCLING_TABLE_MODE = (
+            form_data.DOCLING_TABLE_MODE
+            if form_data.DOCLING_TABLE_MODE is not None
+            else request.app.state.config.DOCLING_TABLE_MODE
         )
-        request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL = (
-            form_data.web.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL
+        request.app.state.config.DOCLING_PIPELINE = (
+            form_data.DOCLING_PIPELINE
+            if form_data.DOCLING_PIPELINE is not None
+            else request.app.state.config.DOCLING_PIPELINE
         )
-        request.app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER = (
-            form_data.web.BYPASS_WEB_SEARCH_WEB_LOADER
+        request.app.state.config.DOCLING_DO_PICTURE_DESCRIPTION = (
+            form_data.DOCLING_DO_PICTURE_DESCRIPTION
+            if form_data.DOCLING_DO_PICTURE_DESCRIPTION is not None
+            else request.app.state.config.DOCLING_DO_PICTURE_DESCRIPTION
         )
-        request.app.state.config.OLLAMA_CLOUD_WEB_SEARCH_API_KEY = (
-            form_data.web.OLLAMA_CLOUD_WEB_SEARCH_API_KEY
+
+        request.app.state.config.DOCLING_PICTURE_DESCRIPTION_MODE = (
+            form_data.DOCLING_PICTURE_DESCRIPTION_MODE
+            if form_data.DOCLING_PICTURE_DESCRIPTION_MODE is not None
+            else request.app.state.config.DOCLING_PICTURE_DESCRIPTION_MODE
+        )
+        request.app.state.config.DOCLING_PICTURE_DESCRIPTION_LOCAL = (
+            form_data.DOCLING_PICTURE_DESCRIPTION_LOCAL
+            if form_data.DOCLING_PICTURE_DESCRIPTION_LOCAL is not None
+            else request.app.state.config.DOCLING_PICTURE_DESCRIPTION_LOCAL
         )
-        request.app.state.config.SEARXNG_QUERY_URL = form_data.web.SEARXNG_QUERY_URL
-        request.app.state.config.YACY_QUERY_URL = form_data.web.YACY_QUERY_URL
-        request.app.state.config.YACY_USERNAME = form_data.web.YACY_USERNAME
-        request.app.state.config.YACY_PASSWORD = form_data.web.YACY_PASSWORD
-        request.app.state.config.GOOGLE_PSE_API_KEY = form_data.web.GOOGLE_PSE_API_KEY
-        request.app.state.config.GOOGLE_PSE_ENGINE_ID = (
-            form_data.web.GOOGLE_PSE_ENGINE_ID
+        request.app.state.config.DOCLING_PICTURE_DESCRIPTION_API = (
+            form_data.DOCLING_PICTURE_DESCRIPTION_API
+            if form_data.DOCLING_PICTURE_DESCRIPTION_API is not None
+            else request.app.state.config.DOCLING_PICTURE_DESCRIPTION_API
         )
-        request.app.state.config.BRAVE_SEARCH_API_KEY = (
-            form_data.web.BRAVE_SEARCH_API_KEY
+
+        request.app.state.config.DOCUMENT_INTELLIGENCE_ENDPOINT = (
+            form_data.DOCUMENT_INTELLIGENCE_ENDPOINT
+            if form_data.DOCUMENT_INTELLIGENCE_ENDPOINT is not None
+            else request.app.state.config.DOCUMENT_INTELLIGENCE_ENDPOINT
         )
-        request.app.state.config.KAGI_SEARCH_API_KEY = form_data.web.KAGI_SEARCH_API_KEY
-        request.app.state.config.MOJEEK_SEARCH_API_KEY = (
-            form_data.web.MOJEEK_SEARCH_API_KEY
+        request.app.state.config.DOCUMENT_INTELLIGENCE_KEY = (
+            form_data.DOCUMENT_INTELLIGENCE_KEY
+            if form_data.DOCUMENT_INTELLIGENCE_KEY is not None
+            else request.app.state.config.DOCUMENT_INTELLIGENCE_KEY
         )
-        request.app.state.config.BOCHA_SEARCH_API_KEY = (
-            form_data.web.BOCHA_SEARCH_API_KEY
+
+        request.app.state.config.MISTRAL_OCR_API_BASE_URL = (
+            form_data.MISTRAL_OCR_API_BASE_URL
+            if form_data.MISTRAL_OCR_API_BASE_URL is not None
+            else request.app.state.config.MISTRAL_OCR_API_BASE_URL
         )
-        request.app.state.config.SERPSTACK_API_KEY = form_data.web.SERPSTACK_API_KEY
-        request.app.state.config.SERPSTACK_HTTPS = form_data.web.SERPSTACK_HTTPS
-        request.app.state.config.SERPER_API_KEY = form_data.web.SERPER_API_KEY
-        request.app.state.config.SERPLY_API_KEY = form_data.web.SERPLY_API_KEY
-        request.app.state.config.TAVILY_API_KEY = form_data.web.TAVILY_API_KEY
-        request.app.state.config.SEARCHAPI_API_KEY = form_data.web.SEARCHAPI_API_KEY
-        request.app.state.config.SEARCHAPI_ENGINE = form_data.web.SEARCHAPI_ENGINE
-        request.app.state.config.SERPAPI_API_KEY = form_data.web.SERPAPI_API_KEY
-        request.app.state.config.SERPAPI_ENGINE = form_data.web.SERPAPI_ENGINE
-        request.app.state.config.JINA_API_KEY = form_data.web.JINA_API_KEY
-        request.app.state.config.BING_SEARCH_V7_ENDPOINT = (
-            form_data.web.BING_SEARCH_V7_ENDPOINT
+        request.app.state.config.MISTRAL_OCR_API_KEY = (
+            form_data.MISTRAL_OCR_API_KEY
+            if form_data.MISTRAL_OCR_API_KEY is not None
+            else request.app.state.config.MISTRAL_OCR_API_KEY
         )
-        request.app.state.config.BING_SEARCH_V7_SUBSCRIPTION_KEY = (
-            form_data.web.BING_SEARCH_V7_SUBSCRIPTION_KEY
+
+        # MinerU settings
+        request.app.state.config.MINERU_API_MODE = (
+            form_data.MINERU_API_MODE
+            if form_data.MINERU_API_MODE is not None
+            else request.app.state.config.MINERU_API_MODE
         )
-        request.app.state.config.EXA_API_KEY = form_data.web.EXA_API_KEY
-        request.app.state.config.PERPLEXITY_API_KEY = form_data.web.PERPLEXITY_API_KEY
-        request.app.state.config.PERPLEXITY_MODEL = form_data.web.PERPLEXITY_MODEL
-        request.app.state.config.PERPLEXITY_SEARCH_CONTEXT_USAGE = (
-            form_data.web.PERPLEXITY_SEARCH_CONTEXT_USAGE
+        request.app.state.config.MINERU_API_URL = (
+            form_data.MINERU_API_URL
+            if form_data.MINERU_API_URL is not None
+            else request.app.state.config.MINERU_API_URL
         )
-        request.app.state.config.PERPLEXITY_SEARCH_API_URL = (
-            form_data.web.PERPLEXITY_SEARCH_API_URL
+        request.app.state.config.MINERU_API_KEY = (
+            form_data.MINERU_API_KEY
+            if form_data.MINERU_API_KEY is not None
+            else request.app.state.config.MINERU_API_KEY
+        )
+        request.app.state.config.MINERU_PARAMS = (
+            form_data.MINERU_PARAMS
+            if form_data.MINERU_PARAMS is not None
+            else request.app.state.config.MINERU_PARAMS
         )
-        request.app.state.config.SOUGOU_API_SID = form_data.web.SOUGOU_API_SID
-        request.app.state.config.SOUGOU_API_SK = form_data.web.SOUGOU_API_SK
 
-        # Web loader settings
-        request.app.state.config.WEB_LOADER_ENGINE = form_data.web.WEB_LOADER_ENGINE
-        request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION = (
-            form_data.web.ENABLE_WEB_LOADER_SSL_VERIFICATION
+        # Reranking settings
+        if request.app.state.config.RAG_RERANKING_ENGINE == "":
+            # Unloading the internal reranker and clear VRAM memory
+            request.app.state.rf = None
+            request.app.state.RERANKING_FUNCTION = None
+            import gc
+
+            gc.collect()
+            if DEVICE_TYPE == "cuda":
+                import torch
+
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+        request.app.state.config.RAG_RERANKING_ENGINE = (
+            form_data.RAG_RERANKING_ENGINE
+            if form_data.RAG_RERANKING_ENGINE is not None
+            else request.app.state.config.RAG_RERANKING_ENGINE
         )
-        request.app.state.config.PLAYWRIGHT_WS_URL = form_data.web.PLAYWRIGHT_WS_URL
-        request.app.state.config.PLAYWRIGHT_TIMEOUT = form_data.web.PLAYWRIGHT_TIMEOUT
-        request.app.state.config.FIRECRAWL_API_KEY = form_data.web.FIRECRAWL_API_KEY
-        request.app.state.config.FIRECRAWL_API_BASE_URL = (
-            form_data.web.FIRECRAWL_API_BASE_URL
+
+        request.app.state.config.RAG_EXTERNAL_RERANKER_URL = (
+            form_data.RAG_EXTERNAL_RERANKER_URL
+            if form_data.RAG_EXTERNAL_RERANKER_URL is not None
+            else request.app.state.config.RAG_EXTERNAL_RERANKER_URL
+        )
+
+        request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY = (
+            form_data.RAG_EXTERNAL_RERANKER_API_KEY
+            if form_data.RAG_EXTERNAL_RERANKER_API_KEY is not None
+            else request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY
         )
-        request.app.state.config.EXTERNAL_WEB_SEARCH_URL = (
-            form_data.web.EXTERNAL_WEB_SEARCH_URL
+
+        log.info(
+            f"Updating reranking model: {request.app.state.config.RAG_RERANKING_MODEL} to {form_data.RAG_RERANKING_MODEL}"
+        )
+        try:
+            request.app.state.config.RAG_RERANKING_MODEL = (
+                form_data.RAG_RERANKING_MODEL
+                if form_data.RAG_RERANKING_MODEL is not None
+                else request.app.state.config.RAG_RERANKING_MODEL
+            )
+
+            try:
+                if (
+                    request.app.state.config.ENABLE_RAG_HYBRID_SEARCH
+                    and not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
+                ):
+                    request.app.state.rf = get_rf(
+                        request.app.state.config.RAG_RERANKING_ENGINE,
+                        request.app.state.config.RAG_RERANKING_MODEL,
+                        request.app.state.config.RAG_EXTERNAL_RERANKER_URL,
+                        request.app.state.config.RAG_EXTERNAL_RERANKER_API_KEY,
+                        True,
+                    )
+
+                    request.app.state.RERANKING_FUNCTION = get_reranking_function(
+                        request.app.state.config.RAG_RERANKING_ENGINE,
+                        request.app.state.config.RAG_RERANKING_MODEL,
+                        request.app.state.rf,
+                    )
+            except Exception as e:
+                log.error(f"Error loading reranking model: {e}")
+                request.app.state.config.ENABLE_RAG_HYBRID_SEARCH = False
+        except Exception as e:
+            log.exception(f"Problem updating reranking model: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=ERROR_MESSAGES.DEFAULT(e),
+            )
+
+        # Chunking settings
+        request.app.state.config.TEXT_SPLITTER = (
+            form_data.TEXT_SPLITTER
+            if form_data.TEXT_SPLITTER is not None
+            else request.app.state.config.TEXT_SPLITTER
         )
-        request.app.state.config.EXTERNAL_WEB_SEARCH_API_KEY = (
-            form_data.web.EXTERNAL_WEB_SEARCH_API_KEY
+        request.app.state.config.CHUNK_SIZE = (
+            form_data.CHUNK_SIZE
+            if form_data.CHUNK_SIZE is not None
+            else request.app.state.config.CHUNK_SIZE
         )
-        request.app.state.config.EXTERNAL_WEB_LOADER_URL = (
-            form_data.web.EXTERNAL_WEB_LOADER_URL
+        request.app.state.config.CHUNK_OVERLAP = (
+            form_data.CHUNK_OVERLAP
+            if form_data.CHUNK_OVERLAP is not None
+            else request.app.state.config.CHUNK_OVERLAP
         )
-        request.app.state.config.EXTERNAL_WEB_LOADER_API_KEY = (
-            form_data.web.EXTERNAL_WEB_LOADER_API_KEY
+
+        # File upload settings
+        request.app.state.config.FILE_MAX_SIZE = form_data.FILE_MAX_SIZE
+        request.app.state.config.FILE_MAX_COUNT = form_data.FILE_MAX_COUNT
+        request.app.state.config.FILE_IMAGE_COMPRESSION_WIDTH = (
+            form_data.FILE_IMAGE_COMPRESSION_WIDTH
         )
-        request.app.state.config.TAVILY_EXTRACT_DEPTH = (
-            form_data.web.TAVILY_EXTRACT_DEPTH
+        request.app.state.config.FILE_IMAGE_COMPRESSION_HEIGHT = (
+            form_data.FILE_IMAGE_COMPRESSION_HEIGHT
         )
-        request.app.state.config.YOUTUBE_LOADER_LANGUAGE = (
-            form_data.web.YOUTUBE_LOADER_LANGUAGE
+        request.app.state.config.ALLOWED_FILE_EXTENSIONS = (
+            form_data.ALLOWED_FILE_EXTENSIONS
+            if form_data.ALLOWED_FILE_EXTENSIONS is not None
+            else request.app.state.config.ALLOWED_FILE_EXTENSIONS
         )
-        request.app.state.config.YOUTUBE_LOADER_PROXY_URL = (
-            form_data.web.YOUTUBE_LOADER_PROXY_URL
+
+        # Integration settings
+        request.app.state.config.ENABLE_GOOGLE_DRIVE_INTEGRATION = (
+            form_data.ENABLE_GOOGLE_DRIVE_INTEGRATION
+            if form_data.ENABLE_GOOGLE_DRIVE_INTEGRATION is not None
+            else request.app.state.config.ENABLE_GOOGLE_DRIVE_INTEGRATION
         )
-        request.app.state.YOUTUBE_LOADER_TRANSLATION = (
-            form_data.web.YOUTUBE_LOADER_TRANSLATION
+        request.app.state.config.ENABLE_ONEDRIVE_INTEGRATION = (
+            form_data.ENABLE_ONEDRIVE_INTEGRATION
+            if form_data.ENABLE_ONEDRIVE_INTEGRATION is not None
+            else request.app.state.config.ENABLE_ONEDRIVE_INTEGRATION
         )
 
+        if form_data.web is not None:
+            # Web search settings
+            request.app.state.config.ENABLE_WEB_SEARCH = form_data.web.ENABLE_WEB_SEARCH
+            request.app.state.config.WEB_SEARCH_ENGINE = form_data.web.WEB_SEARCH_ENGINE
+            request.app.state.config.WEB_SEARCH_TRUST_ENV = (
+                form_data.web.WEB_SEARCH_TRUST_ENV
+            )
+            request.app.state.config.WEB_SEARCH_RESULT_COUNT = (
+                form_data.web.WEB_SEARCH_RESULT_COUNT
+            )
+            request.app.state.config.WEB_SEARCH_CONCURRENT_REQUESTS = (
+                form_data.web.WEB_SEARCH_CONCURRENT_REQUESTS
+            )
+            request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS = (
+                form_data.web.WEB_LOADER_CONCURRENT_REQUESTS
+            )
+            request.app.state.config.WEB_LOADER_TIMEOUT = (
+                form_data.web.WEB_LOADER_TIMEOUT or 0
+            )
+            request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST = (
+                form_data.web.WEB_SEARCH_DOMAIN_FILTER_LIST
+            )
+            request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL = (
+                form_data.web.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL
+            )
+            request.app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER = (
+                form_data.web.BYPASS_WEB_SEARCH_WEB_LOADER
+            )
+            request.app.state.config.OLLAMA_CLOUD_WEB_SEARCH_API_KEY = (
+                form_data.web.OLLAMA_CLOUD_WEB_SEARCH_API_KEY
+            )
+            request.app.state.config.SEARXNG_QUERY_URL = form_data.web.SEARXNG_QUERY_URL
+            request.app.state.config.YACY_QUERY_URL = form_data.web.YACY_QUERY_URL
+            request.app.state.config.YACY_USERNAME = form_data.web.YACY_USERNAME
+            request.app.state.config.YACY_PASSWORD = form_data.web.YACY_PASSWORD
+            request.app.state.config.GOOGLE_PSE_API_KEY = (
+                form_data.web.GOOGLE_PSE_API_KEY
+            )
+            request.app.state.config.GOOGLE_PSE_ENGINE_ID = (
+                form_data.web.GOOGLE_PSE_ENGINE_ID
+            )
+            request.app.state.config.BRAVE_SEARCH_API_KEY = (
+                form_data.web.BRAVE_SEARCH_API_KEY
+            )
+            request.app.state.config.KAGI_SEARCH_API_KEY = (
+                form_data.web.KAGI_SEARCH_API_KEY
+            )
+            request.app.state.config.MOJEEK_SEARCH_API_KEY = (
+                form_data.web.MOJEEK_SEARCH_API_KEY
+            )
+            request.app.state.config.BOCHA_SEARCH_API_KEY = (
+                form_data.web.BOCHA_SEARCH_API_KEY
+            )
+            request.app.state.config.SERPSTACK_API_KEY = form_data.web.SERPSTACK_API_KEY
+            request.app.state.config.SERPSTACK_HTTPS = form_data.web.SERPSTACK_HTTPS
+            request.app.state.config.SERPER_API_KEY = form_data.web.SERPER_API_KEY
+            request.app.state.config.SERPLY_API_KEY = form_data.web.SERPLY_API_KEY
+            request.app.state.config.TAVILY_API_KEY = form_data.web.TAVILY_API_KEY
+            request.app.state.config.SEARCHAPI_API_KEY = form_data.web.SEARCHAPI_API_KEY
+            request.app.state.config.SEARCHAPI_ENGINE = form_data.web.SEARCHAPI_ENGINE
+            request.app.state.config.SERPAPI_API_KEY = form_data.web.SERPAPI_API_KEY
+            request.app.state.config.SERPAPI_ENGINE = form_data.web.SERPAPI_ENGINE
+            request.app.state.config.JINA_API_KEY = form_data.web.JINA_API_KEY
+            request.app.state.config.BING_SEARCH_V7_ENDPOINT = (
+                form_data.web.BING_SEARCH_V7_ENDPOINT
+            )
+            request.app.state.config.BING_SEARCH_V7_SUBSCRIPTION_KEY = (
+                form_data.web.BING_SEARCH_V7_SUBSCRIPTION_KEY
+            )
+            request.app.state.config.EXA_API_KEY = form_data.web.EXA_API_KEY
+            request.app.state.config.PERPLEXITY_API_KEY = (
+                form_data.web.PERPLEXITY_API_KEY
+            )
+            request.app.state.config.PERPLEXITY_MODEL = form_data.web.PERPLEXITY_MODEL
+            request.app.state.config.PERPLEXITY_SEARCH_CONTEXT_USAGE = (
+                form_data.web.PERPLEXITY_SEARCH_CONTEXT_USAGE
+            )
+            request.app.state.config.PERPLEXITY_SEARCH_API_URL = (
+                form_data.web.PERPLEXITY_SEARCH_API_URL
+            )
+            request.app.state.config.SOUGOU_API_SID = form_data.web.SOUGOU_API_SID
+            request.app.state.config.SOUGOU_API_SK = form_data.web.SOUGOU_API_SK
+
+            # Web loader settings
+            request.app.state.config.WEB_LOADER_ENGINE = form_data.web.WEB_LOADER_ENGINE
+            request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION = (
+                form_data.web.ENABLE_WEB_LOADER_SSL_VERIFICATION
+            )
+            request.app.state.config.PLAYWRIGHT_WS_URL = form_data.web.PLAYWRIGHT_WS_URL
+            request.app.state.config.PLAYWRIGHT_TIMEOUT = (
+                form_data.web.PLAYWRIGHT_TIMEOUT
+            )
+            request.app.state.config.FIRECRAWL_API_KEY = form_data.web.FIRECRAWL_API_KEY
+            request.app.state.config.FIRECRAWL_API_BASE_URL = (
+                form_data.web.FIRECRAWL_API_BASE_URL
+            )
+            request.app.state.config.EXTERNAL_WEB_SEARCH_URL = (
+                form_data.web.EXTERNAL_WEB_SEARCH_URL
+            )
+            request.app.state.config.EXTERNAL_WEB_SEARCH_API_KEY = (
+                form_data.web.EXTERNAL_WEB_SEARCH_API_KEY
+            )
+            request.app.state.config.EXTERNAL_WEB_LOADER_URL = (
+                form_data.web.EXTERNAL_WEB_LOADER_URL
+            )
+            request.app.state.config.EXTERNAL_WEB_LOADER_API_KEY = (
+                form_data.web.EXTERNAL_WEB_LOADER_API_KEY
+            )
+            request.app.state.config.TAVILY_EXTRACT_DEPTH = (
+                form_data.web.TAVILY_EXTRACT_DEPTH
+            )
+            request.app.state.config.YOUTUBE_LOADER_LANGUAGE = (
+                form_data.web.YOUTUBE_LOADER_LANGUAGE
+            )
+            request.app.state.config.YOUTUBE_LOADER_PROXY_URL = (
+                form_data.web.YOUTUBE_LOADER_PROXY_URL
+            )
+            request.app.state.YOUTUBE_LOADER_TRANSLATION = (
+                form_data.web.YOUTUBE_LOADER_TRANSLATION
+            )
+
     return {
         "status": True,
         # RAG settings
@@ -1236,6 +1323,7 @@ async def update_rag_config(
             "WEB_SEARCH_RESULT_COUNT": request.app.state.config.WEB_SEARCH_RESULT_COUNT,
             "WEB_SEARCH_CONCURRENT_REQUESTS": request.app.state.config.WEB_SEARCH_CONCURRENT_REQUESTS,
             "WEB_LOADER_CONCURRENT_REQUESTS": request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS,
+            "WEB_LOADER_TIMEOUT": request.app.state.config.WEB_LOADER_TIMEOUT,
             "WEB_SEARCH_DOMAIN_FILTER_LIST": request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST,
             "BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL": request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL,
             "BYPASS_WEB_SEARCH_WEB_LOADER": request.app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER,
@@ -1488,12 +1576,16 @@ def save_docs_to_vector_db(
         ]
 
         log.info(f"adding to collection {collection_name}")
-        VECTOR_DB_CLIENT.insert(
-            collection_name=collection_name,
-            items=items,
+        written = bulk_write(
+            VECTOR_DB_CLIENT,
+            collection_name,
+            items,
+            progress=lambda written, total: log.debug(
+                f"added {written}/{total} items to collection {collection_name}"
+            ),
         )
 
-        log.info(f"added {len(items)} items to collection {collection_name}")
+        log.info(f"added {written} items to collection {collection_name}")
         return True
     except Exception as e:
         log.exception(e)
@@ -2120,41 +2212,158 @@ def search_web(
         raise Exception("No search engine API key found in environment variables")
 
 
+async def search_and_load_web_documents(
+    request: Request,
+    queries: list[str],
+    user,
+    event_emitter=None,
+) -> tuple[list[SearchResult], list[Document]]:
+    """Run the search queries concurrently and start loading the pages of each
+    query as soon as its results arrive, instead of waiting for every search.
+
+    The page loads of all queries share WEB_LOADER_CONCURRENT_REQUESTS
+    concurrent fetches. Loaded pages are reported through `event_emitter` as
+    they come in. Once WEB_LOADER_TIMEOUT has passed since the first fetch and
+    at least one page is loaded, pages still in flight are dropped. Documents
+    are returned in search rank order.
+    """
+    engine = request.app.state.config.WEB_SEARCH_ENGINE
+    timeout = request.app.state.config.WEB_LOADER_TIMEOUT or 0
+    requests_per_second = request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS
+
+    result_items: list[SearchResult] = []
+    url_ranks: dict[str, int] = {}
+    docs: list[Document] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(max(requests_per_second or 1, 1))
+
+    loop = asyncio.get_running_loop()
+    deadline = None
+
+    async def load_urls(urls: list[str]):
+        nonlocal deadline
+        try:
+            loader = await aget_web_loader(
+                urls,
+                verify_ssl=request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION,
+                requests_per_second=requests_per_second,
+                trust_env=request.app.state.config.WEB_SEARCH_TRUST_ENV,
+                semaphore=semaphore,
+            )
+            if deadline is None and timeout > 0:
+                deadline = loop.time() + timeout
+            async for doc in loader.alazy_load():
+                queue.put_nowait(doc)
+        except Exception as e:
+            log.warning(f"Error loading web search results {urls}: {e}")
+
+    async def search(query: str):
+        results = await run_in_threadpool(search_web, request, engine, query, user)
+
+        new_items = []
+        for item in results or []:
+            if item and item.link:
+                result_items.append(item)
+                if item.link not in url_ranks:
+                    url_ranks[item.link] = len(url_ranks)
+                    new_items.append(item)
+
+        if request.app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER:
+            for item in new_items:
+                if item.snippet is not None:
+                    queue.put_nowait(
+                        Document(
+                            page_content=item.snippet,
+                            metadata={
+                                "source": item.link,
+                                "title": item.title,
+                                "snippet": item.snippet,
+                                "link": item.link,
+                            },
+                        )
+                    )
+        elif new_items:
+            await load_urls([item.link for item in new_items])
+
+    tasks = [asyncio.create_task(search(query)) for query in queries]
+    for task in tasks:
+        # A None sentinel marks the end of one query's search and page loads
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+
+    try:
+        pending = len(tasks)
+        while pending:
+            wait = None
+            if deadline is not None and docs:
+                wait = deadline - loop.time()
+                if wait <= 0:
+                    break
+
+            try:
+                doc = await asyncio.wait_for(queue.get(), wait)
+            except asyncio.TimeoutError:
+                break
+
+            if doc is None:
+                pending -= 1
+                continue
+
+            docs.append(doc)
+            if event_emitter:
+                await event_emitter(
+                    {
+                        "type": "status",
+                        "data": {
+                            "action": "web_search",
+                            "description": "Searched {{count}} sites",
+                            "urls": [d.metadata.get("source") for d in docs],
+                            "done": False,
+                        },
+                    }
+                )
+
+        if pending:
+            log.info(
+                f"web search loader timeout reached, using {len(docs)} loaded pages"
+            )
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    errors = [
+        task.exception()
+        for task in tasks
+        if task.done() and not task.cancelled() and task.exception()
+    ]
+    for error in errors:
+        log.warning(f"Web search query failed: {error}")
+    if errors and len(errors) == len(tasks):
+        raise errors[0]
+
+    docs.sort(key=lambda doc: url_ranks.get(doc.metadata.get("source"), len(url_ranks)))
+    return result_items, docs
+
+
 @router.post("/process/web/search")
 async def process_web_search(
     request: Request, form_data: SearchForm, user=Depends(get_verified_user)
 ):
+    return await run_web_search(request, form_data, user)
 
-    urls = []
-    result_items = []
 
+async def run_web_search(
+    request: Request, form_data: SearchForm, user, event_emitter=None
+):
     try:
         logging.debug(
             f"trying to web search with {request.app.state.config.WEB_SEARCH_ENGINE, form_data.queries}"
         )
 
-        search_tasks = [
-            run_in_threadpool(
-                search_web,
-                request,
-                request.app.state.config.WEB_SEARCH_ENGINE,
-                query,
-                user,
-            )
-            for query in form_data.queries
-        ]
-
-        search_results = await asyncio.gather(*search_tasks)
-
-        for result in search_results:
-            if result:
-                for item in result:
-                    if item and item.link:
-                        result_items.append(item)
-                        urls.append(item.link)
-
-        urls = list(dict.fromkeys(urls))
-        log.debug(f"urls: {urls}")
+        result_items, docs = await search_and_load_web_documents(
+            request, form_data.queries, user, event_emitter=event_emitter
+        )
+        log.debug(f"urls: {list(dict.fromkeys(item.link for item in result_items))}")
 
     except Exception as e:
         log.exception(e)
@@ -2164,43 +2373,18 @@ async def process_web_search(
             detail=ERROR_MESSAGES.WEB_SEARCH_ERROR(e),
         )
 
-    if len(urls) == 0:
+    if len(result_items) == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=ERROR_MESSAGES.DEFAULT("No results found from web search"),
         )
 
     try:
-        if request.app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER:
-            search_results = [
-                item for result in search_results for item in result if result
-            ]
-
-            docs = [
-                Document(
-                    page_content=result.snippet,
-                    metadata={
-                        "source": result.link,
-                        "title": result.title,
-                        "snippet": result.snippet,
-                        "link": result.link,
-                    },
-                )
-                for result in search_results
-                if hasattr(result, "snippet") and result.snippet is not None
-            ]
-        else:
-            loader = get_web_loader(
-                urls,
-                verify_ssl=request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION,
-                requests_per_second=request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS,
-                trust_env=request.app.state.config.WEB_SEARCH_TRUST_ENV,
+        urls = list(
+            dict.fromkeys(
+                doc.metadata.get("source") for doc in docs if doc.metadata.get("source")
             )
-            docs = await loader.aload()
-
-        urls = [
-            doc.metadata.get("source") for doc in docs if doc.metadata.get("source")
-        ]  # only keep the urls returned by the loader
+        )  # only keep the urls returned by the loader
         result_items = [
             dict(item) for item in result_items if item.link in urls
         ]  # only keep the search results that have been loaded
@@ -2275,7 +2459,7 @@ async def query_doc_handler(
             form_data.hybrid is None or form_data.hybrid
         ):
             collection_results = {}
-            collection_results[form_data.collection_name] = VECTOR_DB_CLIENT.get(
+            collection_results[form_data.collection_name] = await VECTOR_DB_CLIENT.aget(
                 collection_name=form_data.collection_name
             )
             return await query_doc_with_hybrid_search(
@@ -2313,7 +2497,7 @@ async def query_doc_handler(
             query_embedding = await request.app.state.EMBEDDING_FUNCTION(
                 form_data.query, prefix=RAG_EMBEDDING_QUERY_PREFIX, user=user
             )
-            return query_doc(
+            return await aquery_doc(
                 collection_name=form_data.collection_name,
                 query_embedding=query_embedding,
                 k=form_data.k if form_data.k else request.app.state.config.TOP_K,
@@ -96,52 +96,57 @@ class TaskConfigForm(BaseModel):
 async def update_task_config(
     request: Request, form_data: TaskConfigForm, user=Depends(get_admin_user)
 ):
-    request.app.state.config.TASK_MODEL = form_data.TASK_MODEL
-    request.app.state.config.TASK_MODEL_EXTERNAL = form_data.TASK_MODEL_EXTERNAL
-    request.app.state.config.ENABLE_TITLE_GENERATION = form_data.ENABLE_TITLE_GENERATION
-    request.app.state.config.TITLE_GENERATION_PROMPT_TEMPLATE = (
-        form_data.TITLE_GENERATION_PROMPT_TEMPLATE
-    )
+    with request.app.state.config.transaction():
+        request.app.state.config.TASK_MODEL = form_data.TASK_MODEL
+        request.app.state.config.TASK_MODEL_EXTERNAL = form_data.TASK_MODEL_EXTERNAL
+        request.app.state.config.ENABLE_TITLE_GENERATION = (
+            form_data.ENABLE_TITLE_GENERATION
+        )
+        request.app.state.config.TITLE_GENERATION_PROMPT_TEMPLATE = (
+            form_data.TITLE_GENERATION_PROMPT_TEMPLATE
+        )
 
-    request.app.state.config.ENABLE_FOLLOW_UP_GENERATION = (
-        form_data.ENABLE_FOLLOW_UP_GENERATION
-    )
-    request.app.state.config.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE = (
-        form_data.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE
-    )
+        request.app.state.config.ENABLE_FOLLOW_UP_GENERATION = (
+            form_data.ENABLE_FOLLOW_UP_GENERATION
+        )
+        request.app.state.config.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE = (
+            form_data.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE
+        )
 
-    request.app.state.config.IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE = (
-        form_data.IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE
-    )
+        request.app.state.config.IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE = (
+            form_data.IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE
+        )
 
-    request.app.state.config.ENABLE_AUTOCOMPLETE_GENERATION = (
-        form_data.ENABLE_AUTOCOMPLETE_GENERATION
-    )
-    request.app.state.config.AUTOCOMPLETE_GENERATION_INPUT_MAX_LENGTH = (
-        form_data.AUTOCOMPLETE_GENERATION_INPUT_MAX_LENGTH
-    )
+        request.app.state.config.ENABLE_AUTOCOMPLETE_GENERATION = (
+            form_data.ENABLE_AUTOCOMPLETE_GENERATION
+        )
+        request.app.state.config.AUTOCOMPLETE_GENERATION_INPUT_MAX_LENGTH = (
+            form_data.AUTOCOMPLETE_GENERATION_INPUT_MAX_LENGTH
+        )
 
-    request.app.state.config.TAGS_GENERATION_PROMPT_TEMPLATE = (
-        form_data.TAGS_GENERATION_PROMPT_TEMPLATE
-    )
-    request.app.state.config.ENABLE_TAGS_GENERATION = form_data.ENABLE_TAGS_GENERATION
-    request.app.state.config.ENABLE_SEARCH_QUERY_GENERATION = (
-        form_data.ENABLE_SEARCH_QUERY_GENERATION
-    )
-    request.app.state.config.ENABLE_RETRIEVAL_QUERY_GENERATION = (
-        form_data.ENABLE_RETRIEVAL_QUERY_GENERATION
-    )
+        request.app.state.config.TAGS_GENERATION_PROMPT_TEMPLATE = (
+            form_data.TAGS_GENERATION_PROMPT_TEMPLATE
+        )
+        request.app.state.config.ENABLE_TAGS_GENERATION = (
+            form_data.ENABLE_TAGS_GENERATION
+        )
+        request.app.state.config.ENABLE_SEARCH_QUERY_GENERATION = (
+            form_data.ENABLE_SEARCH_QUERY_GENERATION
+        )
+        request.app.state.config.ENABLE_RETRIEVAL_QUERY_GENERATION = (
+            form_data.ENABLE_RETRIEVAL_QUERY_GENERATION
+        )
 
-    request.app.state.config.QUERY_GENERATION_PROMPT_TEMPLATE = (
-        form_data.QUERY_GENERATION_PROMPT_TEMPLATE
-    )
-    request.app.state.config.TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE = (
-        form_data.TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE
-    )
+        request.app.state.config.QUERY_GENERATION_PROMPT_TEMPLATE = (
+            form_data.QUERY_GENERATION_PROMPT_TEMPLATE
+        )
+        request.app.state.config.TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE = (
+            form_data.TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE
+        )
 
-    request.app.state.config.VOICE_MODE_PROMPT_TEMPLATE = (
-        form_data.VOICE_MODE_PROMPT_TEMPLATE
-    )
+        request.app.state.config.VOICE_MODE_PROMPT_TEMPLATE = (
+            form_data.VOICE_MODE_PROMPT_TEMPLATE
+        )
 
     return {
         "TASK_MODEL": request.app.state.config.TASK_MODEL,
@@ -1,5 +1,6 @@
 import json
 import uuid
+import redis as redis_lib
 from open_webui.utils.redis import get_redis_connection
 from open_webui.env import REDIS_KEY_PREFIX
 from typing import Optional, List, Tuple
@@ -14,13 +15,15 @@ class RedisLock:
         timeout_secs,
         redis_sentinels=[],
         redis_cluster=False,
+        redis=None,
     ):
+        # Pass an async `redis` client to use the a-prefixed methods
 
         self.lock_name = lock_name
         self.lock_id = str(uuid.uuid4())
         self.timeout_secs = timeout_secs
         self.lock_obtained = False
-        self.redis = get_redis_connection(
+        self.redis = redis or get_redis_connection(
             redis_url,
             redis_sentinels,
             redis_cluster=redis_cluster,
@@ -45,6 +48,38 @@ class RedisLock:
         if lock_value and lock_value == self.lock_id:
             self.redis.delete(self.lock_name)
 
+    async def aacquire_lock(self):
+        self.lock_obtained = bool(
+            await self.redis.set(
+                self.lock_name, self.lock_id, nx=True, ex=self.timeout_secs
+            )
+        )
+        return self.lock_obtained
+
+    async def arenew_lock(self):
+        # Unlike renew_lock, only extends the lock while this instance holds it
+        return await self._aif_held(
+            lambda pipe: pipe.expire(self.lock_name, self.timeout_secs)
+        )
+
+    async def arelease_lock(self):
+        released = await self._aif_held(lambda pipe: pipe.delete(self.lock_name))
+        self.lock_obtained = False
+        return released
+
+    async def _aif_held(self, command):
+        async with self.redis.pipeline() as pipe:
+            try:
+                await pipe.watch(self.lock_name)
+                if await pipe.get(self.lock_name) != self.lock_id:
+                    return False
+                pipe.multi()
+                command(pipe)
+                await pipe.execute()
+                return True
+            except redis_lib.WatchError:
+                return False
+
 
 class RedisDict:
     def __init__(self, name, redis_url, redis_sentinels=[], redis_cluster=False):
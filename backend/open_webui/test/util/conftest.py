@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+# Benchmarks time their runs and assert on wall-clock budgets, so they only
+# run when asked for, e.g. `RUN_BENCHMARKS=1 pytest -s -m benchmark`
+RUN_BENCHMARKS = os.environ.get("RUN_BENCHMARKS", "False").lower() in ("true", "1")
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: timed benchmark, only run with RUN_BENCHMARKS=1"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if RUN_BENCHMARKS:
+        return
+
+    skip = pytest.mark.skip(reason="benchmark, set RUN_BENCHMARKS=1 to run it")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
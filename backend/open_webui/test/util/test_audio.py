@@ -0,0 +1,340 @@
+import asyncio
+import os
+import shutil
+import threading
+import time
+import wave
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from pydub.utils import get_encoder_name
+
+from open_webui.routers import audio
+from open_webui.routers.audio import (
+    SPEECH_SENTENCE_QUEUE_SIZE,
+    TRANSCRIPTION_SAMPLE_RATE,
+    SpeechCache,
+    find_silence_cut,
+    open_speech_sentences_stream,
+    split_audio_on_silence,
+    transcribe_chunks,
+    write_wav,
+)
+
+requires_ffmpeg = pytest.mark.skipif(
+    shutil.which(get_encoder_name()) is None, reason="ffmpeg is not installed"
+)
+
+
+def speech(seconds: float, silences: list[tuple[float, float]] = ()) -> bytes:
+    """16-bit PCM of loud noise, quiet over the `(start, end)` silences."""
+    rng = np.random.default_rng(0)
+    samples = (
+        rng.standard_normal(int(seconds * TRANSCRIPTION_SAMPLE_RATE)) * 8000
+    ).clip(-32768, 32767)
+    for start, end in silences:
+        samples[
+            int(start * TRANSCRIPTION_SAMPLE_RATE) : int(
+                end * TRANSCRIPTION_SAMPLE_RATE
+            )
+        ] = 0
+    return samples.astype(np.int16).tobytes()
+
+
+def seconds_at(offset: int) -> float:
+    return offset / 2 / TRANSCRIPTION_SAMPLE_RATE
+
+
+def wav_seconds(path: str) -> float:
+    with wave.open(path, "rb") as f:
+        return f.getnframes() / f.getframerate()
+
+
+def chunk_files(tmp_path) -> list:
+    return sorted(tmp_path.glob("*_chunk_*.wav"))
+
+
+class TestFindSilenceCut:
+    def test_cuts_in_the_pause(self):
+        pcm = speech(10, silences=[(8.4, 8.9)])
+        cut = find_silence_cut(pcm, len(pcm) * 3 // 4)
+        assert 8.4 <= seconds_at(cut) <= 8.9
+        # On a sample boundary
+        assert cut % 2 == 0
+
+    def test_prefers_a_pause_over_a_quiet_sound(self):
+        pcm = bytearray(speech(10, silences=[(9.0, 9.5)]))
+        # A single quiet frame within a word, earlier in the search window
+        quiet = int(8.0 * TRANSCRIPTION_SAMPLE_RATE) * 2
+        pcm[quiet : quiet + 960] = bytes(960)
+        cut = find_silence_cut(bytes(pcm), len(pcm) * 3 // 4)
+        assert 9.0 <= seconds_at(cut) <= 9.5
+
+    def test_too_short_to_search(self):
+        pcm = speech(1)
+        assert find_silence_cut(pcm, len(pcm) - 10) == len(pcm)
+
+
+@requires_ffmpeg
+class TestSplitAudioOnSilence:
+    def test_chunks(self, tmp_path):
+        """Test that chunks cut in the pauses and end with a shorter last chunk"""
+        file_path = str(tmp_path / "speech.wav")
+        write_wav(file_path, speech(25, silences=[(8.5, 9.0), (17.0, 17.5)]))
+
+        chunks = list(split_audio_on_silence(file_path, 10))
+        assert [path for path, _, _ in chunks] == [
+            str(tmp_path / f"speech_chunk_{i}.wav") for i in range(3)
+        ]
+
+        (_, start_0, end_0), (_, start_1, end_1), (_, start_2, end_2) = chunks
+        assert start_0 == 0 and 8.5 <= end_0 <= 9.0
+        assert start_1 == end_0 and 17.0 <= end_1 <= 17.5
+        # The rest of the audio, shorter than a full chunk
+        assert start_2 == end_1 and end_2 == 25
+        for path, start, end in chunks:
+            assert wav_seconds(path) == pytest.approx(end - start)
+
+    def test_ffmpeg_failure(self, tmp_path):
+        file_path = tmp_path / "broken.wav"
+        file_path.write_bytes(b"not audio")
+
+        with pytest.raises(Exception, match="Could not decode audio"):
+            list(split_audio_on_silence(str(file_path), 10))
+        assert chunk_files(tmp_path) == []
+
+
+@requires_ffmpeg
+class TestTranscribeChunks:
+    @pytest.fixture
+    def recording(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(audio, "AUDIO_STT_CHUNK_SECONDS", 2)
+        file_path = str(tmp_path / "speech.wav")
+        write_wav(file_path, speech(9))
+        return file_path
+
+    def test_results_are_in_order(self, recording, tmp_path, monkeypatch):
+        def transcription_handler(request, file_path, metadata, user=None):
+            # Later chunks finish first
+            index = int(file_path.rsplit("_", 1)[1].split(".")[0])
+            time.sleep(0.02 * max(6 - index, 0))
+            return {"text": f"chunk {index}"}
+
+        monkeypatch.setattr(audio, "transcription_handler", transcription_handler)
+        results = list(transcribe_chunks(None, recording))
+
+        assert len(results) >= 5
+        assert [result["text"] for result in results] == [
+            f"chunk {i}" for i in range(len(results))
+        ]
+        # Contiguous pieces of at most 2 seconds, covering the whole recording
+        assert results[0]["start"] == 0 and results[-1]["end"] == 9
+        for previous, result in zip(results, results[1:]):
+            assert result["start"] == previous["end"]
+        assert all(0 < result["end"] - result["start"] <= 2 for result in results)
+        assert chunk_files(tmp_path) == []
+
+    def test_chunks_are_removed_on_failure(self, recording, tmp_path, monkeypatch):
+        release = threading.Event()
+
+        def transcription_handler(request, file_path, metadata, user=None):
+            if file_path.endswith("_chunk_0.wav"):
+                raise RuntimeError("engine failed")
+            # Still running when the failure stops the transcription
+            release.wait(5)
+            return {"text": ""}
+
+        monkeypatch.setattr(audio, "transcription_handler", transcription_handler)
+        with pytest.raises(RuntimeError, match="engine failed"):
+            list(transcribe_chunks(None, recording))
+
+        release.set()
+        # Running chunks are removed once their transcription finishes
+        deadline = time.monotonic() + 5
+        while chunk_files(tmp_path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert chunk_files(tmp_path) == []
+
+    def test_chunks_are_removed_when_stopped_early(
+        self, recording, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(
+            audio, "transcription_handler", lambda *args, **kwargs: {"text": ""}
+        )
+        results = transcribe_chunks(None, recording)
+        next(results)
+        results.close()
+
+        deadline = time.monotonic() + 5
+        while chunk_files(tmp_path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert chunk_files(tmp_path) == []
+
+
+async def audio_chunks(*chunks: bytes):
+    for chunk in chunks:
+        await asyncio.sleep(0)
+        yield chunk
+
+
+def cache_files(directory) -> list[str]:
+    return sorted(path.name for path in directory.iterdir())
+
+
+class TestSpeechCache:
+    def test_write(self, tmp_path):
+        """Test that the audio is stored under its name only once complete"""
+        cache = SpeechCache(tmp_path)
+
+        async def main():
+            stream = cache.write("a", {"input": "hi"}, audio_chunks(b"ab", b"cd"))
+            assert await stream.__anext__() == b"ab"
+            # Written to a .part file while streaming
+            assert cache.get("a") is None
+            assert [name.endswith(".part") for name in cache_files(tmp_path)] == [True]
+
+            assert [chunk async for chunk in stream] == [b"cd"]
+
+        asyncio.run(main())
+        assert cache_files(tmp_path) == ["a.json", "a.mp3"]
+        assert cache.get("a").read_bytes() == b"abcd"
+
+    def test_interrupted_write(self, tmp_path):
+        cache = SpeechCache(tmp_path)
+
+        async def main():
+            stream = cache.write("a", {}, audio_chunks(b"ab", b"cd"))
+            await stream.__anext__()
+            await stream.aclose()
+
+        asyncio.run(main())
+        assert cache_files(tmp_path) == []
+        assert cache.get("a") is None
+
+    def test_least_recently_used_files_are_pruned(self, tmp_path):
+        cache = SpeechCache(tmp_path, max_size=2500)
+        for age, name in enumerate(["c", "b", "a"]):
+            (tmp_path / f"{name}.mp3").write_bytes(bytes(1000))
+            (tmp_path / f"{name}.json").write_text("{}")
+            used = time.time() - 100 * (age + 1)
+            os.utime(tmp_path / f"{name}.mp3", (used, used))
+            os.utime(tmp_path / f"{name}.json", (used, used))
+
+        # A hit marks "a", the oldest, as recently used
+        assert cache.get("a")
+        asyncio.run(cache.added(0))
+
+        # Pruned to under 90% of the limit, oldest first
+        assert cache_files(tmp_path) == ["a.json", "a.mp3", "c.json", "c.mp3"]
+        assert cache.size == 2004
+
+    def test_size_limit(self, tmp_path):
+        cache = SpeechCache(tmp_path, max_size=1000)
+
+        async def write(name: str):
+            async for _ in cache.write(name, {}, audio_chunks(bytes(400))):
+                pass
+
+        async def main():
+            await write("a")
+            await write("b")
+            # The audio written since the first scan, which counted a.json
+            assert cache.size == 802
+            # Over the limit: the oldest entry goes
+            os.utime(tmp_path / "a.mp3", (1, 1))
+            await write("c")
+
+        asyncio.run(main())
+        assert cache_files(tmp_path) == ["b.json", "b.mp3", "c.json", "c.mp3"]
+
+    def test_no_limit(self, tmp_path):
+        cache = SpeechCache(tmp_path, max_size=0)
+        (tmp_path / "a.mp3").write_bytes(bytes(1000))
+        asyncio.run(cache.added(1000))
+        assert cache_files(tmp_path) == ["a.mp3"] and cache.size is None
+
+
+class CountingSemaphore(asyncio.Semaphore):
+    """Fails a test that releases more slots than it acquired."""
+
+    acquired = 0
+    released = 0
+
+    async def acquire(self):
+        await super().acquire()
+        CountingSemaphore.acquired += 1
+        return True
+
+    def release(self):
+        CountingSemaphore.released += 1
+        assert CountingSemaphore.released <= CountingSemaphore.acquired
+        super().release()
+
+
+class TestSpeechSentencesStream:
+    @pytest.fixture
+    def engine(self, monkeypatch):
+        """A fake TTS engine whose audio is the sentence, one byte per chunk."""
+        engine = SimpleNamespace(running=0, max_running=0, read=[], closed=[])
+
+        async def open_speech_response(request, payload, user):
+            return payload["input"], None
+
+        async def read_speech_response(sentence, session):
+            engine.running += 1
+            engine.max_running = max(engine.max_running, engine.running)
+            try:
+                for char in sentence:
+                    await asyncio.sleep(0.001)
+                    engine.read.append(char)
+                    yield char.encode()
+            finally:
+                engine.running -= 1
+                engine.closed.append(sentence)
+
+        CountingSemaphore.acquired = CountingSemaphore.released = 0
+        monkeypatch.setattr(audio, "TTS_SENTENCE_STREAMING_CONCURRENCY", 2)
+        monkeypatch.setattr(audio.asyncio, "Semaphore", CountingSemaphore)
+        monkeypatch.setattr(audio, "open_speech_response", open_speech_response)
+        monkeypatch.setattr(audio, "read_speech_response", read_speech_response)
+        return engine
+
+    def test_sentences_are_streamed_in_order(self, engine):
+        sentences = ["one.", "two two.", "three.", "four four four."]
+
+        async def main():
+            stream = await open_speech_sentences_stream(None, {}, None, sentences)
+            return b"".join([chunk async for chunk in stream])
+
+        assert asyncio.run(main()) == "".join(sentences).encode()
+        assert engine.max_running == 2
+        assert CountingSemaphore.acquired == CountingSemaphore.released == 4
+
+    def test_read_ahead_is_bounded(self, engine):
+        sentences = ["a" * 10, "b" * (SPEECH_SENTENCE_QUEUE_SIZE * 4)]
+
+        async def main():
+            stream = await open_speech_sentences_stream(None, {}, None, sentences)
+            assert await stream.__anext__() == b"a"
+            await asyncio.sleep(0.5)
+            # The second sentence waits for its audio to be played
+            assert engine.read.count("b") <= SPEECH_SENTENCE_QUEUE_SIZE + 1
+            await stream.aclose()
+
+        asyncio.run(main())
+
+    def test_stopping_early_releases_only_acquired_slots(self, engine):
+        """Test that sentences cancelled while waiting for a slot release none"""
+        sentences = [f"sentence {i}." for i in range(6)]
+
+        async def main():
+            stream = await open_speech_sentences_stream(None, {}, None, sentences)
+            assert await stream.__anext__() == b"s"
+            await stream.aclose()
+            await asyncio.sleep(0.05)
+
+        asyncio.run(main())
+        assert CountingSemaphore.released == CountingSemaphore.acquired
+        assert engine.running == 0
@@ -0,0 +1,71 @@
+import time
+
+from open_webui.utils import chat_index
+from open_webui.utils.chat_index import ChatIndex, get_chat_index
+
+
+class TestChatIndex:
+    """Test the in-process chat index used when Redis is not configured"""
+
+    def setup_method(self):
+        self.index = ChatIndex(redis=None)
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return [{"id": "a", "title": "A"}, {"id": "b", "title": "B"}]
+
+    def test_get_builds_once(self):
+        """Test that the loader only runs on the first read"""
+        assert len(self.index.get("chats", "u1", self.load)) == 2
+        assert len(self.index.get("chats", "u1", self.load)) == 2
+        assert self.loads == 1
+
+    def test_write_through(self):
+        """Test that upserts and removals update a loaded index"""
+        self.index.get("chats", "u1", self.load)
+        self.index.upsert("chats", "u1", {"id": "a", "title": "A2"})
+        self.index.upsert("chats", "u1", {"id": "c", "title": "C"})
+        self.index.remove("chats", "u1", ["b"])
+
+        entries = self.index.get("chats", "u1", self.load)
+        assert {e["id"]: e["title"] for e in entries} == {"a": "A2", "c": "C"}
+        assert self.loads == 1
+
+    def test_invalidate_rebuilds(self):
+        """Test that invalidation makes the next read hit the loader"""
+        self.index.get("chats", "u1", self.load)
+        self.index.invalidate("u1")
+        self.index.get("chats", "u1", self.load)
+        assert self.loads == 2
+
+    def test_concurrent_write_discards_rebuild(self):
+        """Test that a rebuild racing with a write is not stored"""
+
+        def load_with_write():
+            self.index.upsert("chats", "u1", {"id": "c", "title": "C"})
+            return self.load()
+
+        self.index.get("chats", "u1", load_with_write)
+        self.index.get("chats", "u1", self.load)
+        assert self.loads == 2
+
+    def test_ttl(self):
+        """Test that an expired index is rebuilt"""
+        self.index = ChatIndex(redis=None, ttl=0.05)
+        self.index.get("chats", "u1", self.load)
+        time.sleep(0.1)
+        self.index.get("chats", "u1", self.load)
+        assert self.loads == 2
+
+    def test_short_ttl_on_several_workers(self, monkeypatch):
+        """Test that without Redis, several workers keep the index briefly"""
+        monkeypatch.setattr(chat_index, "ENABLE_CHAT_INDEX_CACHE", True)
+        monkeypatch.setattr(chat_index, "REDIS_URL", "")
+        monkeypatch.setattr(chat_index, "CHAT_INDEX_LOCAL_CACHE_TTL", 10)
+
+        monkeypatch.setattr(chat_index, "UVICORN_WORKERS", 1)
+        assert get_chat_index()._ttl == chat_index.CHAT_INDEX_CACHE_TTL
+
+        monkeypatch.setattr(chat_index, "UVICORN_WORKERS", 4)
+        assert get_chat_index()._ttl == 10
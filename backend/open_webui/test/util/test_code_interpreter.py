@@ -0,0 +1,338 @@
+import asyncio
+import os
+import time
+import uuid
+
+import pytest
+import requests
+
+from open_webui.utils.code_interpreter import JupyterKernelPool
+
+# A local Jupyter server to run the kernel pool against, e.g. started with
+#   jupyter server --IdentityProvider.token=test --port 8888
+JUPYTER_TEST_URL = os.environ.get("JUPYTER_TEST_URL", "http://localhost:8888")
+JUPYTER_TEST_TOKEN = os.environ.get("JUPYTER_TEST_TOKEN", "")
+
+
+class FakeJupyterServer:
+    """Answers the kernel REST calls of the pool, keeping kernels in memory."""
+
+    def __init__(self):
+        self.kernels: dict[str, str] = {}
+        self.started = 0
+        self.restarted = []
+        self.shut_down = []
+        self.fail_restarts = False
+
+    async def api(self, method: str, path: str):
+        await asyncio.sleep(0)
+        parts = path.split("/")
+        if method == "POST" and path == "api/kernels":
+            self.started += 1
+            kernel_id = uuid.uuid4().hex
+            self.kernels[kernel_id] = "idle"
+            return {"id": kernel_id, "execution_state": "idle"}
+        if method == "GET" and path == "api/kernels":
+            return [
+                {"id": kernel_id, "execution_state": state}
+                for kernel_id, state in self.kernels.items()
+            ]
+
+        kernel_id = parts[2]
+        if kernel_id not in self.kernels:
+            raise Exception(f"404: kernel {kernel_id} not found")
+        if method == "GET":
+            return {"id": kernel_id, "execution_state": self.kernels[kernel_id]}
+        if method == "DELETE":
+            del self.kernels[kernel_id]
+            self.shut_down.append(kernel_id)
+            return None
+        if parts[3] == "restart":
+            if self.fail_restarts:
+                raise Exception("500: restart failed")
+            self.restarted.append(kernel_id)
+        return {"id": kernel_id, "execution_state": self.kernels[kernel_id]}
+
+
+@pytest.fixture
+def server(monkeypatch) -> FakeJupyterServer:
+    server = FakeJupyterServer()
+    monkeypatch.setattr(JupyterKernelPool, "_api", server.api)
+    return server
+
+
+@pytest.fixture(scope="module")
+def jupyter_server():
+    try:
+        requests.get(f"{JUPYTER_TEST_URL.rstrip('/')}/api/status", timeout=2)
+    except requests.ConnectionError:
+        pytest.skip(f"no Jupyter server is reachable at {JUPYTER_TEST_URL}")
+
+
+def build_pool(**kwargs) -> JupyterKernelPool:
+    return JupyterKernelPool(
+        JUPYTER_TEST_URL,
+        token=JUPYTER_TEST_TOKEN,
+        **{"max_size": 2, "min_idle": 0, "idle_timeout": 0, **kwargs},
+    )
+
+
+async def settle(pool: JupyterKernelPool):
+    """Wait for the background restarts and kernel starts."""
+    while pool._tasks:
+        await asyncio.gather(*pool._tasks, return_exceptions=True)
+
+
+def running_kernels() -> set[str]:
+    r = requests.get(
+        f"{JUPYTER_TEST_URL.rstrip('/')}/api/kernels",
+        params={"token": JUPYTER_TEST_TOKEN} if JUPYTER_TEST_TOKEN else {},
+        timeout=5,
+    )
+    r.raise_for_status()
+    return {kernel["id"] for kernel in r.json()}
+
+
+class TestJupyterKernelPool:
+    def test_kernels_are_restarted_and_reused(self, server):
+        async def main():
+            pool = build_pool()
+            try:
+                kernel = await pool.acquire()
+                await pool.release(kernel)
+                await settle(pool)
+                assert server.restarted == [kernel.id]
+
+                again = await pool.acquire()
+                assert again is kernel
+                assert server.started == 1
+                await pool.release(again)
+                await settle(pool)
+            finally:
+                await pool.close()
+            assert server.kernels == {}
+
+        asyncio.run(main())
+
+    def test_ready_kernels_are_kept(self, server):
+        async def main():
+            pool = build_pool(max_size=3, min_idle=2)
+            try:
+                kernel = await pool.acquire()
+                await settle(pool)
+                # One in use, and two started ahead for the next executions
+                assert server.started == 3 and len(pool._idle) == 2
+
+                await pool.release(kernel)
+                await settle(pool)
+                assert len(pool._idle) == 3 and server.started == 3
+            finally:
+                await pool.close()
+
+        asyncio.run(main())
+
+    def test_chat_kernels_are_isolated(self, server):
+        async def main():
+            pool = build_pool(max_size=3, chat_kernels=True)
+            try:
+                first = await pool.acquire("a")
+                await pool.release(first)
+                other = await pool.acquire("b")
+                assert other is not first
+                await pool.release(other)
+
+                # A chat gets its own kernel back, with its state kept
+                again = await pool.acquire("a")
+                assert again is first
+                assert server.restarted == []
+
+                # Executions in one chat wait for each other
+                waiting = asyncio.create_task(pool.acquire("a"))
+                await asyncio.sleep(0.05)
+                assert not waiting.done()
+                await pool.release(again)
+                assert await asyncio.wait_for(waiting, 1) is first
+                await pool.release(first)
+            finally:
+                await pool.close()
+
+        asyncio.run(main())
+
+    def test_least_recently_used_chat_kernel_is_evicted(self, server):
+        async def main():
+            pool = build_pool(max_size=2, chat_kernels=True)
+            try:
+                kernels = {}
+                for chat_id in ["a", "b", "a"]:
+                    kernels[chat_id] = await pool.acquire(chat_id)
+                    await pool.release(kernels[chat_id])
+
+                # The pool is full, so chat "b", used longest ago, makes room
+                kernel = await pool.acquire("c")
+                await pool.release(kernel)
+                await settle(pool)
+                assert server.shut_down == [kernels["b"].id]
+                assert set(pool._chat_kernels) == {"a", "c"}
+            finally:
+                await pool.close()
+
+        asyncio.run(main())
+
+    def test_dead_kernels_are_replaced(self, server):
+        async def main():
+            pool = build_pool()
+            try:
+                kernel = await pool.acquire()
+                await pool.release(kernel)
+                await settle(pool)
+
+                server.kernels[kernel.id] = "dead"
+                replacement = await pool.acquire()
+                assert replacement is not kernel
+                await settle(pool)
+                assert kernel.id not in server.kernels
+                assert list(pool._kernels) == [replacement.id]
+                await pool.release(replacement)
+            finally:
+                await pool.close()
+
+        asyncio.run(main())
+
+    def test_kernels_failing_to_restart_are_dropped(self, server):
+        async def main():
+            pool = build_pool()
+            try:
+                kernel = await pool.acquire()
+                server.fail_restarts = True
+                await pool.release(kernel)
+                await settle(pool)
+                assert not pool._kernels and server.shut_down == [kernel.id]
+
+                # The next execution starts a fresh kernel
+                server.fail_restarts = False
+                assert (await pool.acquire()).id != kernel.id
+            finally:
+                await pool.close()
+
+        asyncio.run(main())
+
+    def test_reap(self, server):
+        async def main():
+            pool = build_pool(max_size=3, min_idle=1, idle_timeout=60)
+            try:
+                kernels = [await pool.acquire() for _ in range(3)]
+                for kernel in kernels:
+                    await pool.release(kernel)
+                await settle(pool)
+
+                # A kernel stopped on the server is dropped
+                del server.kernels[kernels[0].id]
+                for kernel in kernels:
+                    kernel.started_at -= 1
+                await pool.reap()
+                assert kernels[0].id not in pool._kernels
+
+                # Idle kernels are shut down, keeping min_idle ready
+                for kernel in kernels:
+                    kernel.last_used_at -= 120
+                await pool.reap()
+                await settle(pool)
+                assert len(pool._kernels) == 1 and not pool.closed
+
+                # A pool left unused closes itself
+                pool.last_used_at -= 120
+                await pool.reap()
+                assert pool.closed and server.kernels == {}
+            finally:
+                if not pool.closed:
+                    await pool.close()
+
+        asyncio.run(main())
+
+
+@pytest.mark.usefixtures("jupyter_server")
+class TestJupyterKernelPoolLive:
+    def test_kernels_are_reused(self):
+        """Test that a released kernel is handed out again, without a new start"""
+
+        async def main():
+            pool = build_pool()
+            try:
+                kernel = await pool.acquire()
+                await pool.release(kernel)
+                await settle(pool)
+
+                again = await pool.acquire()
+                assert again.id == kernel.id
+                assert list(pool._kernels) == [kernel.id]
+                await pool.release(again)
+                await settle(pool)
+            finally:
+                await pool.close()
+            assert kernel.id not in running_kernels()
+
+        asyncio.run(main())
+
+    def test_kernels_are_reset_between_executions(self):
+        async def main():
+            pool = build_pool(max_size=1)
+            try:
+                result = await pool.execute("x = 41\nprint(x + 1)")
+                assert result.stdout.strip() == "42"
+                await settle(pool)
+
+                # Same kernel, restarted: the variable is gone
+                result = await pool.execute("print(x)")
+                assert "NameError" in result.stderr
+                assert len(pool._kernels) == 1
+            finally:
+                await pool.close()
+
+        asyncio.run(main())
+
+    def test_chat_kernels_keep_state(self):
+        async def main():
+            pool = build_pool(chat_kernels=True)
+            try:
+                await pool.execute("x = 41", chat_id="chat")
+                result = await pool.execute("print(x + 1)", chat_id="chat")
+                assert result.stdout.strip() == "42"
+
+                result = await pool.execute("print(x)", chat_id="other")
+                assert "NameError" in result.stderr
+            finally:
+                await pool.close()
+
+        asyncio.run(main())
+
+    def test_idle_kernels_are_reaped(self):
+        async def main():
+            pool = build_pool(idle_timeout=60, chat_kernels=True)
+            try:
+                await pool.execute("print(1)")
+                await pool.execute("print(2)", chat_id="chat")
+                await settle(pool)
+                kernels = set(pool._kernels)
+                assert len(kernels) == 2
+
+                # Used recently: kept
+                await pool.reap()
+                assert set(pool._kernels) == kernels
+
+                pool.last_used_at = time.monotonic()
+                for kernel in pool._kernels.values():
+                    kernel.last_used_at -= 120
+                await pool.reap()
+                await settle(pool)
+                assert not pool._kernels and not pool.closed
+                assert not kernels & running_kernels()
+
+                # A pool left unused closes itself
+                pool.last_used_at -= 120
+                await pool.reap()
+                assert pool.closed
+            finally:
+                if not pool.closed:
+                    await pool.close()
+
+        asyncio.run(main())
@@ -0,0 +1,207 @@
+import json
+import time
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import open_webui.config
+from open_webui.config import (
+    AppConfig,
+    Config,
+    ConfigConflictError,
+    PersistentConfig,
+    get_config,
+)
+
+# Round trip of a Redis command on a local network
+REDIS_LATENCY = 0.0002
+
+
+@pytest.fixture(autouse=True)
+def config_db(monkeypatch, tmp_path):
+    """Saves the test values to a temporary database instead of the app's."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'config.db'}")
+    Config.__table__.create(engine)
+    session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    @contextmanager
+    def get_db():
+        db = session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setattr(open_webui.config, "get_db", get_db)
+    monkeypatch.setattr(open_webui.config, "CONFIG_DATA", open_webui.config.CONFIG_DATA)
+
+
+def build_config(keys: int = 30) -> tuple[AppConfig, MagicMock]:
+    redis = MagicMock()
+    redis.hgetall.return_value = {"_version": "1"}
+    redis.pipeline.return_value.execute.return_value = [1, 2]
+
+    config = AppConfig()
+    config._redis = redis
+    config._redis_key_prefix = "test"
+    # As if the update listener is subscribed
+    config._listening = True
+
+    for index in range(keys):
+        key = f"TEST_CONFIG_{index}"
+        setattr(config, key, PersistentConfig(key, f"test.config_{index}", index))
+    return config, redis
+
+
+class TestAppConfig:
+    def test_reads_are_local(self):
+        """Test that reads load the shared values once, then stay in memory"""
+        config, redis = build_config()
+        redis.hgetall.return_value = {"_version": "3", "TEST_CONFIG_0": "42"}
+
+        assert config.TEST_CONFIG_0 == 42
+        for _ in range(100):
+            assert config.TEST_CONFIG_1 == 1
+        assert redis.hgetall.call_count == 1
+        assert not redis.get.called and not redis.hget.called
+
+    def test_update_from_other_worker(self):
+        """Test that an announced update is picked up on the next read"""
+        config, redis = build_config()
+        assert config.TEST_CONFIG_0 == 0
+
+        redis.hgetall.return_value = {"_version": "2", "TEST_CONFIG_0": '"new"'}
+        config._stale = True
+        assert config.TEST_CONFIG_0 == "new"
+        assert config._version == 2
+
+    def test_version_check_without_listener(self):
+        """Test that reads compare the version while the listener is down"""
+        config, redis = build_config()
+        config._listening = False
+        redis.hget.return_value = "1"
+
+        assert config.TEST_CONFIG_0 == 0
+        assert config.TEST_CONFIG_0 == 0
+        assert redis.hgetall.call_count == 1
+        assert redis.hget.call_count == 2
+
+    def test_transaction(self):
+        """Test that changed keys are saved with one write and one publish"""
+        config, redis = build_config(5)
+        with patch.object(
+            open_webui.config,
+            "update_config_values",
+            wraps=open_webui.config.update_config_values,
+        ) as update:
+            with config.transaction():
+                config.TEST_CONFIG_0 = 0
+                for index in range(1, 5):
+                    setattr(config, f"TEST_CONFIG_{index}", index * 10)
+                assert config.TEST_CONFIG_4 == 40
+
+        update.assert_called_once_with(
+            {f"test.config_{index}": index * 10 for index in range(1, 5)}
+        )
+        assert redis.pipeline.return_value.execute.call_count == 1
+        assert get_config()["test"]["config_4"] == 40
+
+    def test_transaction_rollback(self):
+        """Test that a failed transaction restores the values and saves nothing"""
+        config, redis = build_config(2)
+        config.TEST_CONFIG_1 = [1]
+        saved = get_config()
+
+        try:
+            with config.transaction():
+                config.TEST_CONFIG_0 = "changed"
+                config.TEST_CONFIG_1 += [2]
+                raise ValueError()
+        except ValueError:
+            pass
+
+        assert config.TEST_CONFIG_0 == 0
+        assert config.TEST_CONFIG_1 == [1]
+        assert get_config() == saved
+
+    def test_transaction_keeps_changes_over_sync(self):
+        """Test that a reload during a transaction keeps the keys it has set"""
+        config, redis = build_config(2)
+        assert config.TEST_CONFIG_0 == 0
+
+        with config.transaction():
+            config.TEST_CONFIG_0 = "mine"
+            # Another worker publishes while the block is running
+            redis.hgetall.return_value = {
+                "_version": "2",
+                "TEST_CONFIG_0": '"theirs"',
+                "TEST_CONFIG_1": '"theirs"',
+            }
+            config._stale = True
+            assert config.TEST_CONFIG_1 == "theirs"
+            assert config.TEST_CONFIG_0 == "mine"
+
+        assert config.TEST_CONFIG_0 == "mine"
+        assert get_config()["test"]["config_0"] == "mine"
+
+    def test_transaction_failed_save(self):
+        """Test that values are restored when saving the transaction fails"""
+        config, redis = build_config(2)
+        assert config.TEST_CONFIG_0 == 0
+
+        with patch.object(
+            open_webui.config,
+            "update_config_values",
+            side_effect=ConfigConflictError(),
+        ):
+            with pytest.raises(ConfigConflictError):
+                with config.transaction():
+                    config.TEST_CONFIG_0 = "changed"
+
+        assert config.TEST_CONFIG_0 == 0
+        assert not redis.pipeline.return_value.execute.called
+        assert "test" not in get_config()
+
+    def test_delta_write(self):
+        """Test that a write keeps values saved meanwhile by another worker"""
+        open_webui.config.update_config_values({"test.other": "worker"})
+        open_webui.config.update_config_values({"test.mine": 1})
+
+        saved = get_config()["test"]
+        assert saved["other"] == "worker" and saved["mine"] == 1
+
+    @pytest.mark.benchmark
+    def test_benchmark_config_reads_per_request(self):
+        """Microbenchmark: 30 config reads per request, per-key GETs vs. the local snapshot"""
+        keys, requests = 30, 50
+        config, redis = build_config(keys)
+
+        def get(key):
+            time.sleep(REDIS_LATENCY)
+            return json.dumps(int(key.rsplit("_", 1)[-1]))
+
+        redis.get.side_effect = get
+
+        # Previous behavior: one GET and a json.loads per attribute read
+        start = time.perf_counter()
+        for _ in range(requests):
+            for index in range(keys):
+                json.loads(redis.get(f"test:config:TEST_CONFIG_{index}"))
+        per_key = (time.perf_counter() - start) / requests
+
+        start = time.perf_counter()
+        for _ in range(requests):
+            for index in range(keys):
+                getattr(config, f"TEST_CONFIG_{index}")
+        snapshot = (time.perf_counter() - start) / requests
+
+        print(
+            f"config reads: {keys} keys per request in {per_key * 1000:.3f} ms with "
+            f"per-key GETs, {snapshot * 1000:.3f} ms from the snapshot "
+            f"({redis.hgetall.call_count} Redis reads in total)"
+        )
+        assert redis.hgetall.call_count == 1
+        assert snapshot < per_key
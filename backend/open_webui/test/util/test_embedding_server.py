@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from open_webui.retrieval.embedding_server import (
+    EmbeddingPool,
+    benchmark,
+    create_app,
+    parse_embeddings,
+)
+
+# Fixed cost of a model call and cost per encoded text, in seconds
+CALL_OVERHEAD = 0.005
+TEXT_COST = 0.0001
+
+
+class FakeModel:
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, prompt=None):
+        time.sleep(CALL_OVERHEAD + TEXT_COST * len(texts))
+        return np.array([[len(text), len(prompt or "")] for text in texts])
+
+
+def load_fake_model(model_path, trust_remote_code=False):
+    return FakeModel()
+
+
+def build_pool(**kwargs) -> EmbeddingPool:
+    return EmbeddingPool(loader=load_fake_model, **{"processes": 1, **kwargs})
+
+
+class TestEmbeddingPool:
+    def test_requests_are_batched(self):
+        """Test that concurrent requests share model calls and keep their order"""
+        pool = build_pool(batch_size=64, batch_wait=0.05)
+        pool.start()
+        try:
+
+            async def encode():
+                return await asyncio.gather(
+                    *(pool.aencode("model", ["x" * i]) for i in range(1, 21)),
+                    pool.aencode("model", ["a"] * 150, prompt="query: "),
+                )
+
+            *single, large = asyncio.run(encode())
+        finally:
+            pool.close()
+
+        assert [embedding.tolist() for embedding in single] == [
+            [[i, 0]] for i in range(1, 21)
+        ]
+        assert large.shape == (150, 2) and (large[:, 1] == 7).all()
+
+        stats = pool.stats()
+        assert stats["completed"] == 23 and stats["failed"] == 0
+        # 150 texts are at least 3 calls of up to 64 texts
+        assert stats["batches"] < 23
+
+    def test_http(self):
+        pool = build_pool()
+        paths = []
+        models = {"model"}
+        app = create_app(
+            pool, lambda model: paths.append(model) or model, lambda: models
+        )
+        with TestClient(app) as client:
+            r = client.post("/embed", json={"model": "model", "texts": ["a", "bb"]})
+            embeddings = parse_embeddings(r.content, r.headers["X-Embedding-Shape"])
+            assert embeddings.tolist() == [[1, 0], [2, 0]]
+            assert client.get("/stats").json()["completed"] == 1
+
+            # Other models are neither downloaded nor loaded
+            r = client.post("/embed", json={"model": "other/model", "texts": ["a"]})
+            assert r.status_code == 400
+            assert paths == ["model"]
+            assert client.get("/stats").json()["completed"] == 1
+
+            # A model selected in the settings is served without a restart
+            models = {"model", "other/model"}
+            r = client.post("/embed", json={"model": "other/model", "texts": ["a"]})
+            assert r.status_code == 200
+            assert paths == ["model", "other/model"]
+
+    @pytest.mark.benchmark
+    def test_benchmark_throughput(self):
+        """Benchmark: sentences per second of single-sentence requests by batch size"""
+        pool = build_pool(processes=2, batch_wait=0.005)
+        pool.start()
+        try:
+            results = benchmark(pool, "model", batch_sizes=(1, 16, 64), sentences=256)
+        finally:
+            pool.close()
+
+        for result in results:
+            print(
+                f"batch size {result['batch_size']:>4}: "
+                f"{result['sentences_per_second']:>8.1f} sentences/s"
+            )
+        throughput = [result["sentences_per_second"] for result in results]
+        assert throughput[-1] > throughput[0] * 2
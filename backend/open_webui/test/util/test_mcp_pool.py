@@ -0,0 +1,132 @@
+import asyncio
+
+import anyio
+import pytest
+
+from open_webui.utils.mcp import pool as mcp_pool
+from open_webui.utils.mcp.pool import MCPClientPool
+
+
+class FakeMCPClient:
+    """Stands in for MCPClient; a broken client fails like a dropped transport."""
+
+    instances = []
+
+    def __init__(self):
+        self.session = None
+        self.broken = False
+        self.list_calls = 0
+        FakeMCPClient.instances.append(self)
+
+    async def connect(self, url, headers=None, message_handler=None):
+        self.session = object()
+
+    async def disconnect(self):
+        self.session = None
+
+    async def list_tool_specs(self):
+        if self.broken:
+            raise anyio.ClosedResourceError()
+        self.list_calls += 1
+        return [{"name": "echo"}]
+
+    async def call_tool(self, function_name, function_args):
+        if self.broken:
+            raise anyio.ClosedResourceError()
+        return {"name": function_name, **function_args}
+
+
+@pytest.fixture(autouse=True)
+def fake_client(monkeypatch):
+    FakeMCPClient.instances = []
+    monkeypatch.setattr(mcp_pool, "MCPClient", FakeMCPClient)
+
+
+class TestMCPClientPool:
+    def test_sessions_are_reused(self):
+        async def main():
+            pool = MCPClientPool(max_size=4, idle_timeout=300)
+            first = await pool.acquire("http://mcp", {"Authorization": "a"})
+            await first.list_tool_specs()
+            await pool.release(first)
+
+            second = await pool.acquire("http://mcp", {"Authorization": "a"})
+            assert second is first
+            assert await second.list_tool_specs() == [{"name": "echo"}]
+            await pool.release(second)
+
+            # Other credentials get their own session
+            other = await pool.acquire("http://mcp", {"Authorization": "b"})
+            assert other is not first
+            await pool.release(other)
+
+            await pool.close()
+            assert first.client is None and other.client is None
+
+        asyncio.run(main())
+        assert len(FakeMCPClient.instances) == 2
+        # The tool list is cached between requests
+        assert FakeMCPClient.instances[0].list_calls == 1
+
+    def test_reconnect_after_broken_session(self):
+        async def main():
+            pool = MCPClientPool()
+            connection = await pool.acquire("http://mcp")
+            assert await connection.call_tool("echo", {"x": 1}) == {
+                "name": "echo",
+                "x": 1,
+            }
+
+            broken = connection.client
+            broken.broken = True
+            assert await connection.call_tool("echo", {"x": 2}) == {
+                "name": "echo",
+                "x": 2,
+            }
+            assert connection.client is not broken and connection.connected
+            assert broken.session is None
+
+            await pool.release(connection)
+            await pool.close()
+
+        asyncio.run(main())
+        assert len(FakeMCPClient.instances) == 2
+
+    def test_eviction_over_max_size(self):
+        async def main():
+            pool = MCPClientPool(max_size=2, idle_timeout=300)
+            connections = []
+            for url in ["http://a", "http://b", "http://c"]:
+                connection = await pool.acquire(url)
+                await pool.release(connection)
+                connections.append(connection)
+
+            # The least recently used session made room for the new one
+            assert not connections[0].connected
+            assert all(connection.connected for connection in connections[1:])
+            assert len(pool._connections) == 2
+            await pool.close()
+
+        asyncio.run(main())
+
+    def test_idle_sessions_are_reaped(self):
+        async def main():
+            pool = MCPClientPool(max_size=4, idle_timeout=0.1)
+            idle = await pool.acquire("http://idle")
+            await pool.release(idle)
+            busy = await pool.acquire("http://busy")
+
+            reaper = asyncio.create_task(pool.reap(interval=0.05))
+            try:
+                await asyncio.sleep(0.3)
+            finally:
+                reaper.cancel()
+
+            # Only sessions not in use are closed
+            assert not idle.connected and busy.connected
+            assert list(pool._connections.values()) == [busy]
+
+            await pool.release(busy)
+            await pool.close()
+
+        asyncio.run(main())
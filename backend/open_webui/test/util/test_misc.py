@@ -0,0 +1,102 @@
+import time
+
+import pytest
+
+from open_webui.utils.misc import get_message_list
+
+
+def build_branching_history(
+    count: int = 5000, branch_every: int = 10
+) -> tuple[dict, str]:
+    """
+    Build a messages map with `count` messages: a main thread of alternating
+    user/assistant messages, plus a regenerated sibling every `branch_every`
+    messages. Returns the map and the id of the last message of the thread.
+    """
+    messages = {}
+    parent_id = None
+    index = 0
+    while len(messages) < count:
+        message_id = f"m{index}"
+        messages[message_id] = {
+            "id": message_id,
+            "parentId": parent_id,
+            "childrenIds": [],
+            "role": "user" if index % 2 == 0 else "assistant",
+            "content": f"message {index}",
+        }
+        if parent_id:
+            messages[parent_id]["childrenIds"].append(message_id)
+
+        if index % branch_every == 0 and parent_id and len(messages) < count:
+            sibling_id = f"{message_id}-alt"
+            messages[sibling_id] = {
+                **messages[message_id],
+                "id": sibling_id,
+                "childrenIds": [],
+            }
+            messages[parent_id]["childrenIds"].append(sibling_id)
+
+        parent_id = message_id
+        index += 1
+
+    return messages, parent_id
+
+
+class TestGetMessageList:
+    def test_empty(self):
+        assert get_message_list({}, "m0") == []
+        assert get_message_list(None, "m0") == []
+        assert get_message_list({"m0": {"id": "m0"}}, "missing") == []
+
+    def test_branch_path(self):
+        """Test that only the ancestors of the requested message are returned"""
+        messages, leaf_id = build_branching_history(50)
+
+        message_list = get_message_list(messages, leaf_id)
+        assert message_list[0]["parentId"] is None
+        assert message_list[-1]["id"] == leaf_id
+        assert not any(m["id"].endswith("-alt") for m in message_list)
+
+        branch = get_message_list(messages, "m10-alt")
+        assert [m["id"] for m in branch[-2:]] == ["m9", "m10-alt"]
+
+    def test_returns_stored_messages(self):
+        """Test that messages are returned without being copied"""
+        messages, leaf_id = build_branching_history(50)
+        message_list = get_message_list(messages, leaf_id)
+        assert all(m is messages[m["id"]] for m in message_list)
+
+    def test_cycle(self):
+        """Test that a parentId cycle terminates"""
+        messages = {
+            "a": {"id": "a", "parentId": "b"},
+            "b": {"id": "b", "parentId": "a"},
+        }
+        assert len(get_message_list(messages, "a")) <= 3
+
+    def test_deep_history(self):
+        """Test that a 5k-message chat is walked without recursion limits"""
+        messages, leaf_id = build_branching_history(5000)
+        message_list = get_message_list(messages, leaf_id)
+        assert message_list[0]["parentId"] is None
+        assert message_list[-1]["id"] == leaf_id
+
+    @pytest.mark.benchmark
+    def test_benchmark_5k_branching(self):
+        """Microbenchmark: 5k-message branching chat, walked from the deepest leaf"""
+        messages, leaf_id = build_branching_history(5000)
+
+        runs = 100
+        start = time.perf_counter()
+        for _ in range(runs):
+            message_list = get_message_list(messages, leaf_id)
+        elapsed = (time.perf_counter() - start) / runs
+
+        print(
+            f"get_message_list: {len(message_list)} of {len(messages)} messages "
+            f"in {elapsed * 1000:.3f} ms"
+        )
+        assert message_list[-1]["id"] == leaf_id
+        # Linear in depth; a quadratic walk takes several times longer
+        assert elapsed < 0.05
@@ -0,0 +1,164 @@
+import asyncio
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from open_webui.retrieval import utils as retrieval_utils
+from open_webui.retrieval.utils import RerankCompressor, cosine_similarity
+
+
+class FakeVectorDB:
+    """Stored vectors by id; `vectors=None` is a backend without get_vectors."""
+
+    def __init__(self, vectors=None, error: Exception = None):
+        self.vectors = vectors
+        self.error = error
+        self.calls = []
+
+    async def aget_vectors(self, collection_name, ids):
+        self.calls.append((collection_name, list(ids)))
+        if self.error:
+            raise self.error
+        if self.vectors is None:
+            return None
+        return {id: self.vectors[id] for id in ids if id in self.vectors}
+
+
+class FakeEmbeddings:
+    """Embeds a text as [its length, 1, 0], recording the texts embedded."""
+
+    def __init__(self):
+        self.texts = []
+
+    async def __call__(self, texts, prefix=None):
+        if isinstance(texts, str):
+            return [float(len(texts)), 1.0, 0.0]
+        self.texts.extend(texts)
+        return [[float(len(text)), 1.0, 0.0] for text in texts]
+
+
+def documents() -> list[Document]:
+    return [
+        Document(id="a", page_content="stored"),
+        Document(id="b", page_content="old model"),
+        Document(id="c", page_content="not stored"),
+        Document(page_content="no id"),
+    ]
+
+
+def build_compressor(embeddings: FakeEmbeddings, **kwargs) -> RerankCompressor:
+    return RerankCompressor(
+        **{
+            "collection_name": "file-1",
+            "embedding_function": embeddings,
+            "top_n": 3,
+            "reranking_function": None,
+            "r_score": 0.0,
+            **kwargs,
+        }
+    )
+
+
+@pytest.fixture
+def vector_db(monkeypatch):
+    def set_vector_db(client: FakeVectorDB) -> FakeVectorDB:
+        monkeypatch.setattr(retrieval_utils, "VECTOR_DB_CLIENT", client)
+        return client
+
+    return set_vector_db
+
+
+class TestCosineSimilarity:
+    def test_scores(self):
+        scores = cosine_similarity([1, 0], [[2, 0], [0, 3], [1, 1], [-1, 0]])
+        assert scores == pytest.approx([1.0, 0.0, 2**-0.5, -1.0])
+
+    def test_zero_vectors(self):
+        assert cosine_similarity([0, 0], [[1, 0]]) == [0.0]
+        assert cosine_similarity([1, 0], [[0, 0]]) == [0.0]
+
+    def test_matches_numpy(self):
+        rng = np.random.default_rng(0)
+        query, matrix = rng.standard_normal(8), rng.standard_normal((5, 8))
+        expected = [
+            float(np.dot(row, query) / (np.linalg.norm(row) * np.linalg.norm(query)))
+            for row in matrix
+        ]
+        assert cosine_similarity(query.tolist(), matrix.tolist()) == pytest.approx(
+            expected, rel=1e-5
+        )
+
+
+class TestDocumentEmbeddings:
+    def test_only_missing_vectors_are_embedded(self, vector_db):
+        """Test that stored vectors are reused and mismatched ones re-embedded"""
+        client = vector_db(
+            FakeVectorDB(
+                {
+                    "a": [6.0, 1.0, 0.0],
+                    # Stored by a previous model with another dimension
+                    "b": [1.0, 2.0],
+                }
+            )
+        )
+        embeddings = FakeEmbeddings()
+        compressor = build_compressor(embeddings)
+
+        result = asyncio.run(compressor.aget_document_embeddings(documents(), 3))
+
+        assert client.calls == [("file-1", ["a", "b", "c"])]
+        assert embeddings.texts == ["old model", "not stored", "no id"]
+        assert result == [
+            [6.0, 1.0, 0.0],
+            [9.0, 1.0, 0.0],
+            [10.0, 1.0, 0.0],
+            [5.0, 1.0, 0.0],
+        ]
+
+    def test_all_stored(self, vector_db):
+        vector_db(FakeVectorDB({"a": [1.0, 0.0, 0.0], "b": [0.0, 1.0, 0.0]}))
+        embeddings = FakeEmbeddings()
+        compressor = build_compressor(embeddings)
+
+        result = asyncio.run(compressor.aget_document_embeddings(documents()[:2], 3))
+        assert result == [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]
+        assert embeddings.texts == []
+
+    @pytest.mark.parametrize(
+        "client",
+        [FakeVectorDB(None), FakeVectorDB({}, error=RuntimeError("unavailable"))],
+        ids=["no get_vectors", "failing"],
+    )
+    def test_backend_without_vectors(self, vector_db, client):
+        vector_db(client)
+        embeddings = FakeEmbeddings()
+        compressor = build_compressor(embeddings)
+
+        result = asyncio.run(compressor.aget_document_embeddings(documents(), 3))
+        assert embeddings.texts == [doc.page_content for doc in documents()]
+        assert len(result) == 4
+
+    def test_without_collection(self, vector_db):
+        client = vector_db(FakeVectorDB({"a": [1.0, 0.0, 0.0]}))
+        embeddings = FakeEmbeddings()
+        compressor = build_compressor(embeddings, collection_name=None)
+
+        asyncio.run(compressor.aget_document_embeddings(documents(), 3))
+        assert client.calls == []
+        assert len(embeddings.texts) == 4
+
+    def test_compress_ranks_by_similarity(self, vector_db):
+        # The query "abc" embeds as [3, 1, 0]
+        vector_db(
+            FakeVectorDB(
+                {"a": [3.0, 1.0, 0.0], "b": [0.0, 0.0, 1.0], "c": [-3.0, -1.0, 0.0]}
+            )
+        )
+        embeddings = FakeEmbeddings()
+        compressor = build_compressor(embeddings, top_n=2)
+
+        result = asyncio.run(compressor.acompress_documents(documents()[:3], "abc"))
+        assert [doc.page_content for doc in result] == ["stored", "old model"]
+        assert result[0].metadata["score"] == pytest.approx(1.0)
+        assert embeddings.texts == []
@@ -0,0 +1,236 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+from langchain_core.documents import Document
+
+from open_webui.retrieval.models.lazy import LazyModel
+from open_webui.retrieval.reranking import (
+    RERANK_SCORE_CACHE,
+    RerankScoreCache,
+    RerankWorker,
+    arerank,
+)
+from open_webui.retrieval.utils import get_reranking_function
+
+
+class CountingReranker:
+    def __init__(self):
+        self.pairs = []
+
+    def predict(self, pairs):
+        self.pairs.extend(pairs)
+        return [float(len(document)) for _, document in pairs]
+
+
+class SlowReranker:
+    """
+    Scores a pair by its document length, as a numpy array like
+    CrossEncoder.predict; `hold` blocks calls until it is set.
+    """
+
+    def __init__(self, latency: float = 0.0, error: Exception = None):
+        self.latency = latency
+        self.error = error
+        self.calls = []
+        self.hold = threading.Event()
+        self.hold.set()
+
+    def predict(self, pairs, **kwargs):
+        self.calls.append([document for _, document in pairs])
+        self.hold.wait(5)
+        time.sleep(self.latency)
+        if self.error:
+            raise self.error
+        return np.array([float(len(document)) for _, document in pairs])
+
+
+def pairs_of(*documents: str) -> list[tuple[str, str]]:
+    return [("q", document) for document in documents]
+
+
+class TestRerankWorker:
+    def test_requests_are_batched(self):
+        """Test that concurrent requests share a call and get their own scores"""
+        model = SlowReranker()
+        worker = RerankWorker(workers=1, batch_size=64, batch_wait=0.05, timeout=5)
+
+        async def main():
+            return await asyncio.gather(
+                worker.arerank(model, pairs_of("a", "bb"), batchable=True),
+                worker.arerank(model, pairs_of("ccc"), batchable=True),
+                worker.arerank(model, pairs_of("dddd", "e", "ff"), batchable=True),
+            )
+
+        assert asyncio.run(main()) == [[1.0, 2.0], [3.0], [4.0, 1.0, 2.0]]
+        assert model.calls == [["a", "bb", "ccc", "dddd", "e", "ff"]]
+
+        stats = worker.stats()
+        assert stats["completed"] == 3 and stats["batches"] == 1
+        assert stats["avg_batch_pairs"] == 6
+
+    def test_batches_are_split(self):
+        """Test that other models, unbatchable requests and full batches run apart"""
+        model, other = SlowReranker(), SlowReranker()
+        worker = RerankWorker(workers=1, batch_size=3, batch_wait=0.05, timeout=5)
+
+        async def main():
+            return await asyncio.gather(
+                worker.arerank(model, pairs_of("a", "bb"), batchable=True),
+                worker.arerank(other, pairs_of("ccc"), batchable=True),
+                worker.arerank(model, pairs_of("dddd"), batchable=True),
+                worker.arerank(model, pairs_of("e"), batchable=False),
+                worker.arerank(model, pairs_of("ff"), batchable=True),
+            )
+
+        assert asyncio.run(main()) == [[1.0, 2.0], [3.0], [4.0], [1.0], [2.0]]
+        # The batch is full at 3 pairs; the rest run one by one after it
+        assert model.calls == [["a", "bb", "dddd"], ["e"], ["ff"]]
+        assert other.calls == [["ccc"]]
+
+    def test_cancelled_requests_are_skipped(self):
+        model = SlowReranker()
+        model.hold.clear()
+        worker = RerankWorker(workers=1, batch_size=64, batch_wait=0, timeout=5)
+
+        async def main():
+            busy = asyncio.create_task(worker.arerank(model, pairs_of("a")))
+            while not model.calls:
+                await asyncio.sleep(0.01)
+
+            # Queued behind the running call, then abandoned by its caller
+            cancelled = asyncio.create_task(worker.arerank(model, pairs_of("bb")))
+            waiting = asyncio.create_task(worker.arerank(model, pairs_of("ccc")))
+            await asyncio.sleep(0.05)
+            cancelled.cancel()
+            # Let the cancellation reach the queued job
+            await asyncio.sleep(0.01)
+
+            model.hold.set()
+            return await busy, await waiting, cancelled
+
+        busy, waiting, cancelled = asyncio.run(main())
+        assert busy == [1.0] and waiting == [3.0] and cancelled.cancelled()
+        assert model.calls == [["a"], ["ccc"]]
+
+    def test_timeout(self):
+        """Test that a request not scored in time gets no scores"""
+        model = SlowReranker(latency=0.5)
+        worker = RerankWorker(workers=1, batch_size=64, batch_wait=0, timeout=0.1)
+
+        async def main():
+            start = time.monotonic()
+            scores = await asyncio.gather(
+                worker.arerank(model, pairs_of("a")),
+                # Still queued when it times out, so it is never scored
+                worker.arerank(model, pairs_of("bb")),
+            )
+            return scores, time.monotonic() - start
+
+        scores, elapsed = asyncio.run(main())
+        assert scores == [None, None] and elapsed < 0.4
+        time.sleep(0.6)
+        assert model.calls == [["a"]]
+        assert worker.stats()["timed_out"] == 2
+
+    def test_failed_predict(self):
+        model = SlowReranker(error=RuntimeError("out of memory"))
+        worker = RerankWorker(workers=1, batch_size=64, batch_wait=0.05, timeout=5)
+
+        async def main():
+            return await asyncio.gather(
+                worker.arerank(model, pairs_of("a"), batchable=True),
+                worker.arerank(model, pairs_of("bb"), batchable=True),
+            )
+
+        # Both requests of the failed batch fall back to the retrieval order
+        assert asyncio.run(main()) == [None, None]
+        assert worker.stats()["failed"] == 2
+
+        # The worker keeps serving
+        model.error = None
+        assert asyncio.run(worker.arerank(model, pairs_of("ccc"))) == [3.0]
+
+
+class TestRerankScoreCache:
+    def setup_method(self):
+        RERANK_SCORE_CACHE._scores.clear()
+
+    def test_lru_and_ttl(self):
+        cache = RerankScoreCache(max_size=2, ttl=0)
+        cache.set(("m", "q", "a"), 1.0)
+        cache.set(("m", "q", "b"), 2.0)
+        assert cache.get(("m", "q", "a")) == 1.0
+
+        # "b" is now the least recently used
+        cache.set(("m", "q", "c"), 3.0)
+        assert cache.get(("m", "q", "b")) is None
+        assert cache.get(("m", "q", "a")) == 1.0
+
+        cache = RerankScoreCache(max_size=2, ttl=0.01)
+        cache.set(("m", "q", "a"), 1.0)
+        time.sleep(0.02)
+        assert cache.get(("m", "q", "a")) is None
+
+    def test_only_misses_are_scored(self):
+        """Test that a follow-up query only scores the new chunks"""
+        model = CountingReranker()
+        pairs = [("What is X?", f"chunk {i}" * i) for i in range(5)]
+
+        scores = asyncio.run(arerank(model, "ce:m", pairs, batchable=True))
+        assert len(model.pairs) == 5
+
+        # Same query with other spacing and case, plus one new chunk
+        followup = [("what is  X? ", document) for _, document in pairs]
+        followup.append(("what is  X? ", "new chunk"))
+        followup_scores = asyncio.run(arerank(model, "ce:m", followup, batchable=True))
+
+        assert followup_scores[:5] == scores
+        assert model.pairs[5:] == [("what is  X? ", "new chunk")]
+
+        # Scores are kept per model
+        asyncio.run(arerank(model, "ce:other", pairs[:1], batchable=True))
+        assert len(model.pairs) == 7
+
+    def test_not_pairwise(self):
+        """Test that set-normalized scores are only reused for the same chunks"""
+        model = CountingReranker()
+        pairs = [("q", "a"), ("q", "bb")]
+
+        asyncio.run(arerank(model, "colbert:m", pairs, pairwise=False))
+        asyncio.run(arerank(model, "colbert:m", pairs, pairwise=False))
+        assert len(model.pairs) == 2
+
+        asyncio.run(arerank(model, "colbert:m", pairs[:1], pairwise=False))
+        assert len(model.pairs) == 3
+
+
+class TestLazyModel:
+    def test_loaded_on_first_use(self):
+        """Test that a reranker is loaded once, by its first reranking call"""
+        RERANK_SCORE_CACHE._scores.clear()
+        loads = []
+        model = LazyModel(
+            "reranking model", lambda: loads.append(1) or CountingReranker()
+        )
+
+        rerank = get_reranking_function("", "cross-encoder/test", model)
+        assert not model.loaded
+
+        async def search():
+            documents = [Document(page_content=text) for text in ("a", "bb")]
+            return await asyncio.gather(*(rerank("q", documents) for _ in range(3)))
+
+        assert asyncio.run(search()) == [[1.0, 2.0]] * 3
+        assert model.loaded and len(loads) == 1
+
+    def test_failed_load(self):
+        model = LazyModel("reranking model", lambda: None)
+        for _ in range(2):
+            try:
+                model.predict([("q", "a")])
+                assert False
+            except Exception as e:
+                assert str(e) == "Failed to load reranking model"
+        assert model.status()["error"] is not None
@@ -0,0 +1,102 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Runs the database migrations, so that they are not part of the measurement
+import open_webui.config
+
+BACKEND_DIR = Path(open_webui.config.__file__).parent.parent
+
+# Import time of `open_webui.main` allowed on a CI runner, in seconds
+STARTUP_BUDGET = float(os.environ.get("STARTUP_BUDGET", "15"))
+# When set, each run appends its report as a JSON line, to track it over time
+STARTUP_REPORT_FILE = os.environ.get("STARTUP_REPORT_FILE", "")
+
+# Optional subsystems that must only be imported when they are used
+DEFERRED_MODULES = [
+    "azure.identity",
+    "azure.storage.blob",
+    "boto3",
+    "chromadb",
+    "ftfy",
+    "google.cloud.storage",
+    "huggingface_hub",
+    "sentence_transformers",
+]
+
+
+def parse_importtime(output: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per module, from `-X importtime`."""
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        modules[module.strip()] = int(cumulative)
+    return modules
+
+
+def import_main(*args: str) -> subprocess.CompletedProcess:
+    """Import `open_webui.main` in a fresh interpreter, printing the deferred modules it imported."""
+    script = (
+        "import json, sys\n"
+        "import open_webui.main\n"
+        f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, *args, "-c", script],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "PYTHONPATH": str(BACKEND_DIR)},
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    return result
+
+
+def test_optional_modules_are_deferred():
+    result = import_main()
+    imported = json.loads(result.stdout.strip().splitlines()[-1])
+    assert imported == [], f"Imported at startup: {imported}"
+
+
+@pytest.mark.benchmark
+def test_startup_import_budget():
+    """Benchmark: import `open_webui.main` in a fresh interpreter with -X importtime"""
+    start = time.perf_counter()
+    result = import_main("-X", "importtime")
+    wall_time = time.perf_counter() - start
+
+    modules = parse_importtime(result.stderr)
+    total = modules["open_webui.main"] / 1_000_000
+    top = sorted(
+        (
+            (module, cumulative)
+            for module, cumulative in modules.items()
+            if module.startswith("open_webui.") and module != "open_webui.main"
+        ),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:10]
+
+    print(f"open_webui.main imported in {total:.2f}s ({wall_time:.2f}s wall time)")
+    for module, cumulative in top:
+        print(f"  {cumulative / 1000:8.1f} ms  {module}")
+
+    if STARTUP_REPORT_FILE:
+        with open(STARTUP_REPORT_FILE, "a") as file:
+            report = {
+                "timestamp": int(time.time()),
+                "import_time": round(total, 3),
+                "wall_time": round(wall_time, 3),
+                "modules": {module: cumulative for module, cumulative in top},
+            }
+            file.write(json.dumps(report) + "\n")
+
+    assert total < STARTUP_BUDGET
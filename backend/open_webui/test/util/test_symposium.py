@@ -0,0 +1,95 @@
+import time
+
+import pytest
+
+from open_webui.core.symposium import SymposiumManager, build_context_window
+
+
+def build_symposium_history(turns: int, models: tuple = ("a", "b", "c")) -> dict:
+    """Build a messages map of `turns` messages, several of them per second."""
+    messages = {}
+    parent_id = None
+    for index in range(turns):
+        message_id = f"m{index}"
+        messages[message_id] = {
+            "id": message_id,
+            "parentId": parent_id,
+            "childrenIds": [],
+            "role": "assistant",
+            "content": f"message {index}",
+            "model": models[index % len(models)],
+            "timestamp": 1700000000 + index // 4,
+        }
+        parent_id = message_id
+    return messages
+
+
+class TestSymposiumContext:
+    def setup_method(self):
+        self.manager = SymposiumManager()
+
+    def test_window_order(self):
+        """Test that the window holds the latest messages, oldest first"""
+        messages = build_symposium_history(100)
+        window = build_context_window(messages, 20)
+        assert [m["id"] for m in window] == [f"m{i}" for i in range(80, 100)]
+
+        assert len(build_context_window(messages, 500)) == 100
+        assert list(build_context_window({}, 20)) == []
+
+    def test_update_context(self):
+        """Test that new messages roll the window and updates replace in place"""
+        self.manager.contexts["c"] = build_context_window(
+            build_symposium_history(30), 20
+        )
+
+        self.manager.update_context("c", {"id": "new", "content": ""})
+        self.manager.update_context("c", {"id": "new", "content": "done"})
+
+        context = self.manager.contexts["c"]
+        assert len(context) == 20
+        assert context[0]["id"] == "m11"
+        assert context[-1] == {"id": "new", "content": "done"}
+
+        # Symposia without a window are rebuilt from the chat instead
+        self.manager.update_context("other", {"id": "x"})
+        assert "other" not in self.manager.contexts
+
+    def test_long_symposium(self):
+        """Test that the window keeps the latest turns over a long symposium"""
+        self.manager.contexts["c"] = build_context_window({}, 20)
+        for message in build_symposium_history(10000).values():
+            self.manager.update_context("c", message)
+
+        assert [m["id"] for m in self.manager.contexts["c"]] == [
+            f"m{i}" for i in range(9980, 10000)
+        ]
+
+    @pytest.mark.benchmark
+    def test_benchmark_10k_turns(self):
+        """Microbenchmark: 10k turns through the rolling window vs. re-sorting the chat"""
+        turns = build_symposium_history(10000)
+        context_limit = 20
+
+        self.manager.contexts["c"] = build_context_window({}, context_limit)
+        start = time.perf_counter()
+        for message in turns.values():
+            self.manager.update_context("c", message)
+            recent = list(self.manager.contexts["c"])
+        rolling = time.perf_counter() - start
+
+        # The previous loop sorted the whole history every turn
+        history = {}
+        start = time.perf_counter()
+        for message in list(turns.values())[:2000]:
+            history[message["id"]] = message
+            sorted(history.values(), key=lambda x: x.get("timestamp", 0))
+        resorting = time.perf_counter() - start
+
+        print(
+            f"symposium context: 10k turns with the rolling window in "
+            f"{rolling * 1000:.1f} ms, first 2k turns re-sorting the history in "
+            f"{resorting * 1000:.1f} ms"
+        )
+        assert [m["id"] for m in recent] == [f"m{i}" for i in range(9980, 10000)]
+        assert rolling < 0.5
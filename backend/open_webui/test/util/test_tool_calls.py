@@ -0,0 +1,112 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from open_webui.utils.middleware import run_tool_calls
+
+
+def tool_call(tool_call_id: str, name: str, latency: float) -> dict:
+    return {
+        "id": tool_call_id,
+        "function": {"name": name, "arguments": f'{{"latency": {latency}}}'},
+    }
+
+
+class FakeTools:
+    """Fake async tools that sleep for the latency given in their arguments."""
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.cancelled = []
+
+    async def execute(self, tool_call: dict):
+        name = tool_call["function"]["name"]
+        latency = json.loads(tool_call["function"]["arguments"])["latency"]
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(latency)
+        except asyncio.CancelledError:
+            self.cancelled.append(name)
+            raise
+        finally:
+            self.running -= 1
+        return tool_call["id"], name, f"result of {name}", "fake", False
+
+
+def run(tool_calls, tools, **kwargs) -> list:
+    finished = []
+
+    async def on_result(index, result):
+        finished.append((index, result))
+
+    asyncio.run(run_tool_calls(tool_calls, tools.execute, on_result, **kwargs))
+    return finished
+
+
+class TestRunToolCalls:
+    def test_concurrency_and_order(self):
+        """Test that results carry the index of their call, whatever their ids"""
+        tools = FakeTools()
+        # Empty and repeated ids, as some models send them
+        tool_calls = [
+            tool_call("", "slow", 0.3),
+            tool_call("call", "fast", 0.0),
+            tool_call("call", "medium", 0.1),
+            tool_call("", "faster", 0.05),
+        ]
+        start = time.monotonic()
+        finished = run(tool_calls, tools, concurrency=2, timeout=None)
+        elapsed = time.monotonic() - start
+
+        assert tools.max_running == 2
+        # "slow" runs alongside the three others, one after the other
+        assert elapsed < 0.45
+        assert [result[1] for _, result in finished] == [
+            "fast",
+            "medium",
+            "faster",
+            "slow",
+        ]
+        assert [result[1] for _, result in sorted(finished)] == [
+            "slow",
+            "fast",
+            "medium",
+            "faster",
+        ]
+
+    def test_timeout(self):
+        tools = FakeTools()
+        tool_calls = [tool_call("a", "hangs", 10), tool_call("b", "fast", 0.0)]
+        start = time.monotonic()
+        finished = dict(run(tool_calls, tools, concurrency=5, timeout=0.1))
+
+        assert time.monotonic() - start < 1
+        assert finished[0] == (
+            "a",
+            "hangs",
+            "Tool call timed out after 0.1 seconds",
+            None,
+            False,
+        )
+        assert finished[1] == ("b", "fast", "result of fast", "fake", False)
+        assert tools.cancelled == ["hangs"]
+
+    def test_failed_result_handler_cancels_the_other_calls(self):
+        tools = FakeTools()
+        tool_calls = [tool_call("a", "fast", 0.0), tool_call("b", "slow", 10)]
+
+        async def on_result(index, result):
+            raise RuntimeError("client disconnected")
+
+        async def main():
+            with pytest.raises(RuntimeError):
+                await run_tool_calls(tool_calls, tools.execute, on_result)
+            # Let the cancelled call unwind
+            await asyncio.sleep(0)
+
+        asyncio.run(main())
+        assert tools.cancelled == ["slow"]
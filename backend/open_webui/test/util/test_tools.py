@@ -0,0 +1,207 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+
+from open_webui.utils import tools
+from open_webui.utils.tools import (
+    TOOL_SERVER_PAYLOAD_CACHE,
+    TOOL_SERVER_SPEC_CACHE,
+    get_tool_server_data,
+    get_tool_servers,
+    get_tool_servers_data,
+    refresh_tool_servers,
+)
+
+
+def openapi_spec(title: str = "Tools", operation: str = "echo") -> dict:
+    return {
+        "openapi": "3.1.0",
+        "info": {"title": title},
+        "paths": {
+            f"/{operation}": {
+                "post": {
+                    "operationId": operation,
+                    "description": f"{operation} the text",
+                    "requestBody": {
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "object",
+                                    "properties": {"text": {"type": "string"}},
+                                }
+                            }
+                        }
+                    },
+                }
+            }
+        },
+    }
+
+
+def json_server(spec: dict, server_id: str = "tools") -> dict:
+    return {
+        "url": "http://tools",
+        "spec_type": "json",
+        "spec": json.dumps(spec),
+        "config": {"enable": True},
+        "info": {"id": server_id},
+    }
+
+
+class FakeRedis:
+    """The get/set subset of redis.asyncio used for the snapshot."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value):
+        self.values[key] = value
+
+
+def build_app(connections: list, redis=None) -> SimpleNamespace:
+    """A worker's app, with the state the tool server snapshot uses."""
+    return SimpleNamespace(
+        state=SimpleNamespace(
+            config=SimpleNamespace(TOOL_SERVER_CONNECTIONS=connections),
+            redis=redis,
+        )
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    TOOL_SERVER_SPEC_CACHE.clear()
+    TOOL_SERVER_PAYLOAD_CACHE.clear()
+    yield
+    TOOL_SERVER_SPEC_CACHE.clear()
+    TOOL_SERVER_PAYLOAD_CACHE.clear()
+
+
+@pytest.fixture
+def conversions(monkeypatch) -> list:
+    """Count the spec conversions."""
+    conversions = []
+    convert = tools.convert_openapi_to_tool_payload
+
+    def counting_convert(spec):
+        conversions.append(spec["info"]["title"])
+        return convert(spec)
+
+    monkeypatch.setattr(tools, "convert_openapi_to_tool_payload", counting_convert)
+    return conversions
+
+
+class TestToolServerSpecCache:
+    def test_etag(self):
+        """Test that a spec is refetched conditionally and reused when unchanged"""
+        requests = []
+        spec = {"etag": '"v1"', "data": openapi_spec()}
+
+        async def handler(request):
+            requests.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == spec["etag"]:
+                return web.Response(status=304)
+            return web.json_response(spec["data"], headers={"ETag": spec["etag"]})
+
+        async def main():
+            app = web.Application()
+            app.router.add_get("/openapi.json", handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            url = f"http://127.0.0.1:{port}/openapi.json"
+            try:
+                first = await get_tool_server_data(url, None)
+                second = await get_tool_server_data(url, None)
+                assert first == second == openapi_spec()
+
+                spec.update(etag='"v2"', data=openapi_spec("Changed"))
+                third = await get_tool_server_data(url, None)
+                assert third == openapi_spec("Changed")
+
+                # Other credentials do not share the cached spec
+                await get_tool_server_data(url, {"Authorization": "Bearer b"})
+            finally:
+                await runner.cleanup()
+
+        asyncio.run(main())
+        assert requests == [None, '"v1"', '"v1"', None]
+
+    def test_payload_is_converted_once_per_spec(self, conversions):
+        async def main():
+            spec = openapi_spec()
+            first = await get_tool_servers_data([json_server(spec)])
+            second = await get_tool_servers_data([json_server(spec)])
+            assert conversions == ["Tools"]
+            assert first == second
+            assert [tool["name"] for tool in second[0]["specs"]] == ["echo"]
+
+            changed = openapi_spec("Changed", "shout")
+            third = await get_tool_servers_data([json_server(changed)])
+            assert conversions == ["Tools", "Changed"]
+            assert [tool["name"] for tool in third[0]["specs"]] == ["shout"]
+            # Payloads of specs no longer configured are dropped
+            assert len(TOOL_SERVER_PAYLOAD_CACHE) == 1
+
+        asyncio.run(main())
+
+
+class TestToolServersSnapshot:
+    def test_workers_reload_on_a_new_version(self, conversions):
+        """Test that a refresh on one worker reaches the others through Redis"""
+
+        async def main():
+            redis = FakeRedis()
+            connections = [json_server(openapi_spec())]
+            worker_a = build_app(connections, redis)
+            worker_b = build_app(connections, redis)
+
+            await refresh_tool_servers(worker_a)
+            servers = await get_tool_servers(SimpleNamespace(app=worker_b))
+            assert servers == worker_a.state.TOOL_SERVERS
+            # Worker b loaded the snapshot without fetching or converting
+            assert conversions == ["Tools"]
+
+            # Unchanged version: the loaded snapshot is kept
+            again = await get_tool_servers(SimpleNamespace(app=worker_b))
+            assert again is servers
+
+            connections[0] = json_server(openapi_spec("Changed", "shout"))
+            await refresh_tool_servers(worker_a)
+            servers = await get_tool_servers(SimpleNamespace(app=worker_b))
+            assert [tool["name"] for tool in servers[0]["specs"]] == ["shout"]
+            assert conversions == ["Tools", "Changed"]
+
+        asyncio.run(main())
+
+    def test_short_ttl_without_redis(self, conversions, monkeypatch):
+        monkeypatch.setattr(tools, "TOOL_SERVER_SPEC_LOCAL_CACHE_TTL", 10)
+
+        async def main():
+            connections = [json_server(openapi_spec())]
+            app = build_app(connections)
+            request = SimpleNamespace(app=app)
+
+            servers = await get_tool_servers(request)
+            # Another worker changed the connections; fresh snapshots are kept
+            connections[0] = json_server(openapi_spec("Changed", "shout"))
+            assert await get_tool_servers(request) is servers
+
+            app.state.TOOL_SERVERS_UPDATED_AT -= 11
+            servers, *others = await asyncio.gather(
+                *(get_tool_servers(request) for _ in range(3))
+            )
+            assert [tool["name"] for tool in servers[0]["specs"]] == ["shout"]
+            # Concurrent requests share one refresh
+            assert all(other is servers for other in others)
+            assert conversions == ["Tools", "Changed"]
+
+        asyncio.run(main())
@@ -0,0 +1,431 @@
+import asyncio
+import os
+import shutil
+import socket
+import random
+import subprocess
+import threading
+import time
+import uuid
+
+import pytest
+import requests
+
+from open_webui.retrieval.vector import bulk
+from open_webui.retrieval.vector.bulk import bulk_write
+from open_webui.retrieval.vector.main import VectorDBBase
+
+# Conformance tests for the async vector db interface. The embedded chroma
+# client always runs; a local chroma server is started when the `chroma` CLI
+# is installed, and the other backends run against the stand-ins given by:
+#   PGVECTOR_TEST_DB_URL  e.g. postgresql://postgres@localhost:5432/postgres
+#   QDRANT_TEST_URI       e.g. http://localhost:6333
+#   OPENSEARCH_TEST_URI   e.g. http://localhost:9200
+PGVECTOR_TEST_DB_URL = os.environ.get("PGVECTOR_TEST_DB_URL", "")
+QDRANT_TEST_URI = os.environ.get("QDRANT_TEST_URI", "")
+OPENSEARCH_TEST_URI = os.environ.get("OPENSEARCH_TEST_URI", "")
+# Chunks written by the bulk write benchmark, 100000 for the full run
+VECTOR_DB_BENCHMARK_CHUNKS = int(os.environ.get("VECTOR_DB_BENCHMARK_CHUNKS", "2000"))
+
+# Backends whose async methods must not fall back to worker threads
+NATIVE_BACKENDS = {
+    "chroma-http",
+    "pgvector",
+    "qdrant",
+    "qdrant-multitenancy",
+    "opensearch",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def chroma_server(tmp_path_factory):
+    if shutil.which("chroma") is None:
+        pytest.skip("the chroma CLI is not installed")
+
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            "chroma",
+            "run",
+            "--path",
+            str(tmp_path_factory.mktemp("chroma-server")),
+            "--port",
+            str(port),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                requests.get(f"http://127.0.0.1:{port}/api/v2/heartbeat", timeout=1)
+                break
+            except requests.ConnectionError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    pytest.skip("the chroma server did not start")
+                time.sleep(0.2)
+        yield port
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+@pytest.fixture(
+    params=[
+        "chroma",
+        "chroma-http",
+        "pgvector",
+        "qdrant",
+        "qdrant-multitenancy",
+        "opensearch",
+    ]
+)
+def vector_db(request, monkeypatch, tmp_path):
+    backend = request.param
+    match backend:
+        case "chroma":
+            from open_webui.retrieval.vector.dbs import chroma
+
+            monkeypatch.setattr(chroma, "CHROMA_DATA_PATH", str(tmp_path))
+            client = chroma.ChromaClient()
+        case "chroma-http":
+            from open_webui.retrieval.vector.dbs import chroma
+
+            port = request.getfixturevalue("chroma_server")
+            monkeypatch.setattr(chroma, "CHROMA_HTTP_HOST", "127.0.0.1")
+            monkeypatch.setattr(chroma, "CHROMA_HTTP_PORT", port)
+            client = chroma.ChromaClient()
+        case "pgvector":
+            if not PGVECTOR_TEST_DB_URL:
+                pytest.skip("PGVECTOR_TEST_DB_URL is not set")
+            from open_webui.retrieval.vector.dbs import pgvector
+
+            monkeypatch.setattr(pgvector, "PGVECTOR_DB_URL", PGVECTOR_TEST_DB_URL)
+            client = pgvector.PgvectorClient()
+        case "qdrant" | "qdrant-multitenancy":
+            if not QDRANT_TEST_URI:
+                pytest.skip("QDRANT_TEST_URI is not set")
+            if backend == "qdrant":
+                from open_webui.retrieval.vector.dbs import qdrant
+            else:
+                from open_webui.retrieval.vector.dbs import (
+                    qdrant_multitenancy as qdrant,
+                )
+
+            monkeypatch.setattr(qdrant, "QDRANT_URI", QDRANT_TEST_URI)
+            monkeypatch.setattr(qdrant, "QDRANT_COLLECTION_PREFIX", "conformance")
+            client = qdrant.QdrantClient()
+        case "opensearch":
+            if not OPENSEARCH_TEST_URI:
+                pytest.skip("OPENSEARCH_TEST_URI is not set")
+            from open_webui.retrieval.vector.dbs import opensearch
+
+            monkeypatch.setattr(opensearch, "OPENSEARCH_URI", OPENSEARCH_TEST_URI)
+            client = opensearch.OpenSearchClient()
+
+    client.backend = backend
+    return client
+
+
+def make_items() -> list[dict]:
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "text": text,
+            "vector": vector,
+            "metadata": {"file_id": file_id, "hash": f"hash-{text}"},
+        }
+        for text, vector, file_id in [
+            ("apple", [1.0, 0.0, 0.0, 0.0], "a"),
+            ("banana", [0.0, 1.0, 0.0, 0.0], "a"),
+            ("cherry", [0.0, 0.0, 1.0, 0.0], "b"),
+        ]
+    ]
+
+
+def run(vector_db, scenario):
+    """Run `scenario(collection_name, items)` on a new collection in one event loop."""
+    collection_name = f"conformance-{uuid.uuid4().hex[:12]}"
+    items = make_items()
+
+    async def main():
+        try:
+            await vector_db.aupsert(collection_name, items)
+            return await scenario(collection_name, items)
+        finally:
+            try:
+                if await vector_db.ahas_collection(collection_name):
+                    await vector_db.adelete_collection(collection_name)
+            finally:
+                await vector_db.aclose()
+
+    return asyncio.run(main())
+
+
+def texts(result) -> list[str]:
+    return sorted(result.documents[0])
+
+
+class TestVectorDBConformance:
+    def test_upsert_and_get(self, vector_db):
+        async def scenario(collection_name, items):
+            assert await vector_db.ahas_collection(collection_name)
+
+            result = await vector_db.aget(collection_name)
+            assert sorted(result.ids[0]) == sorted(item["id"] for item in items)
+            assert texts(result) == ["apple", "banana", "cherry"]
+            assert {metadata["file_id"] for metadata in result.metadatas[0]} == {
+                "a",
+                "b",
+            }
+
+        run(vector_db, scenario)
+
+    def test_search(self, vector_db):
+        async def scenario(collection_name, items):
+            result = await vector_db.asearch(
+                collection_name, [[1.0, 0.1, 0.0, 0.0]], limit=2
+            )
+            assert result.documents[0] == ["apple", "banana"]
+            assert result.ids[0][0] == items[0]["id"]
+            distances = result.distances[0]
+            assert 1.0 >= distances[0] > distances[1] >= 0.0
+
+            # The sync and async interfaces agree
+            sync_result = await asyncio.to_thread(
+                vector_db.search, collection_name, [[1.0, 0.1, 0.0, 0.0]], 2
+            )
+            assert sync_result.ids == result.ids
+
+        run(vector_db, scenario)
+
+    def test_query_by_metadata(self, vector_db):
+        async def scenario(collection_name, items):
+            result = await vector_db.aquery(collection_name, {"file_id": "a"})
+            assert texts(result) == ["apple", "banana"]
+
+            result = await vector_db.aquery(collection_name, {"hash": "hash-cherry"})
+            assert texts(result) == ["cherry"]
+
+        run(vector_db, scenario)
+
+    def test_upsert_replaces_items(self, vector_db):
+        async def scenario(collection_name, items):
+            await vector_db.aupsert(collection_name, [{**items[0], "text": "apricot"}])
+            result = await vector_db.aget(collection_name)
+            assert texts(result) == ["apricot", "banana", "cherry"]
+
+        run(vector_db, scenario)
+
+    def test_get_vectors(self, vector_db):
+        async def scenario(collection_name, items):
+            vectors = await vector_db.aget_vectors(
+                collection_name, [item["id"] for item in items[:2]]
+            )
+            if vectors is None:
+                pytest.skip(f"{vector_db.backend} does not return stored vectors")
+
+            assert set(vectors) == {item["id"] for item in items[:2]}
+            for item in items[:2]:
+                # pgvector pads vectors to its configured length
+                stored = [float(value) for value in vectors[item["id"]]]
+                assert stored[:4] == pytest.approx(item["vector"][:4])
+
+        run(vector_db, scenario)
+
+    def test_delete(self, vector_db):
+        async def scenario(collection_name, items):
+            await vector_db.adelete(collection_name, filter={"file_id": "b"})
+            assert texts(await vector_db.aget(collection_name)) == [
+                "apple",
+                "banana",
+            ]
+
+            await vector_db.adelete_collection(collection_name)
+            assert not await vector_db.ahas_collection(collection_name)
+
+        run(vector_db, scenario)
+
+    def test_queries_do_not_use_threads(self, vector_db):
+        """Test that the native async backends query without a worker thread"""
+        if vector_db.backend not in NATIVE_BACKENDS:
+            pytest.skip(f"{vector_db.backend} runs its queries in threads")
+
+        async def no_thread(*args, **kwargs):
+            raise AssertionError("a worker thread was used")
+
+        async def scenario(collection_name, items):
+            to_thread = asyncio.to_thread
+            asyncio.to_thread = no_thread
+            try:
+                results = await asyncio.gather(
+                    *(
+                        vector_db.asearch(collection_name, [item["vector"]], limit=1)
+                        for item in items
+                    ),
+                    vector_db.aquery(collection_name, {"file_id": "a"}),
+                    vector_db.aget(collection_name),
+                )
+            finally:
+                asyncio.to_thread = to_thread
+            # Failed queries return None rather than raising
+            assert None not in results
+
+        run(vector_db, scenario)
+
+
+class MemoryVectorDB(VectorDBBase):
+    """Records the batches it is given, failing the first `failures` writes."""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.batches = []
+        self.methods = []
+        self.items = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def write(self, method, items):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.01)
+            with self.lock:
+                if self.failures:
+                    self.failures -= 1
+                    raise ConnectionError("connection reset")
+                self.batches.append(len(items))
+                self.methods.append(method)
+                self.items.update({item["id"]: item for item in items})
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def insert(self, collection_name, items):
+        self.write("insert", items)
+
+    def upsert(self, collection_name, items):
+        self.write("upsert", items)
+
+    has_collection = delete_collection = search = query = get = delete = reset = (
+        lambda self, *args, **kwargs: None
+    )
+
+
+def make_chunks(count: int, dimension: int = 384) -> list[dict]:
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "text": f"chunk {index}",
+            "vector": [random.random() for _ in range(dimension)],
+            "metadata": {"file_id": f"file-{index % 10}"},
+        }
+        for index in range(count)
+    ]
+
+
+class TestBulkWrite:
+    def test_writes_in_batches(self):
+        client = MemoryVectorDB()
+        items = make_chunks(25, dimension=4)
+        progress = []
+
+        written = bulk_write(
+            client,
+            "bulk",
+            items,
+            batch_size=10,
+            concurrency=2,
+            progress=lambda written, total: progress.append((written, total)),
+        )
+
+        assert written == 25
+        assert sorted(client.batches) == [5, 10, 10]
+        assert set(client.methods) == {"insert"}
+        assert client.items.keys() == {item["id"] for item in items}
+        assert [total for _, total in progress] == [25, 25, 25]
+        assert progress[-1][0] == 25
+
+    def test_limits_batches_in_flight(self):
+        client = MemoryVectorDB()
+
+        # A generator is consumed lazily, without a known total
+        progress = []
+        written = bulk_write(
+            client,
+            "bulk",
+            iter(make_chunks(100, dimension=4)),
+            batch_size=5,
+            concurrency=3,
+            progress=lambda written, total: progress.append(total),
+        )
+
+        assert written == 100
+        assert 1 < client.max_in_flight <= 3
+        assert set(progress) == {None}
+
+    def test_retries_failed_batches(self, monkeypatch):
+        monkeypatch.setattr(bulk, "RETRY_DELAY", 0)
+        client = MemoryVectorDB(failures=2)
+        items = make_chunks(20, dimension=4)
+
+        assert bulk_write(client, "bulk", items, batch_size=10, retries=2) == 20
+        assert client.items.keys() == {item["id"] for item in items}
+        # Retried batches are upserted, as the failed write may have been partial
+        assert "upsert" in client.methods
+
+    def test_raises_when_retries_are_exhausted(self, monkeypatch):
+        monkeypatch.setattr(bulk, "RETRY_DELAY", 0)
+        client = MemoryVectorDB(failures=3)
+
+        with pytest.raises(ConnectionError):
+            bulk_write(client, "bulk", make_chunks(20, dimension=4), retries=2)
+
+    @pytest.mark.benchmark
+    def test_throughput(self, vector_db):
+        """Benchmark: one insert call against bulk_write, on the same chunks"""
+        items = make_chunks(VECTOR_DB_BENCHMARK_CHUNKS)
+        collections = []
+
+        def measure(name, write):
+            collection_name = f"benchmark-{uuid.uuid4().hex[:12]}"
+            collections.append(collection_name)
+            chunks = [{**item, "id": str(uuid.uuid4())} for item in items]
+            start = time.perf_counter()
+            write(collection_name, chunks)
+            elapsed = time.perf_counter() - start
+
+            result = vector_db.get(collection_name)
+            assert len(result.ids[0]) == len(items)
+            print(
+                f"{vector_db.backend} {name}: {len(items)} chunks in {elapsed:.2f}s "
+                f"({len(items) / elapsed:.0f} chunks/s)"
+            )
+
+        try:
+            measure(
+                "insert",
+                lambda collection_name, chunks: vector_db.insert(
+                    collection_name, chunks
+                ),
+            )
+            measure(
+                "bulk_write",
+                lambda collection_name, chunks: bulk_write(
+                    vector_db, collection_name, chunks
+                ),
+            )
+        finally:
+            for collection_name in collections:
+                if vector_db.has_collection(collection_name):
+                    vector_db.delete_collection(collection_name)
+            asyncio.run(vector_db.aclose())
@@ -0,0 +1,96 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.retrieval.web import utils as web_utils
+from open_webui.retrieval.web.main import SearchResult
+from open_webui.retrieval.web.utils import SafeWebBaseLoader
+from open_webui.routers import retrieval
+
+# Seconds a search and a page fetch take
+SEARCH_TIME = 0.1
+FETCH_TIME = 0.1
+
+
+def build_request(**config) -> SimpleNamespace:
+    config = {
+        "WEB_SEARCH_ENGINE": "fake",
+        "WEB_LOADER_TIMEOUT": 0,
+        "WEB_LOADER_CONCURRENT_REQUESTS": 2,
+        "ENABLE_WEB_LOADER_SSL_VERIFICATION": True,
+        "WEB_SEARCH_TRUST_ENV": False,
+        "BYPASS_WEB_SEARCH_WEB_LOADER": False,
+        **config,
+    }
+    return SimpleNamespace(
+        app=SimpleNamespace(state=SimpleNamespace(config=SimpleNamespace(**config)))
+    )
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    """Fake searches with three results each and fake page fetches."""
+    fetches = SimpleNamespace(running=0, max_running=0, started=[])
+
+    def search_web(request, engine, query, user=None):
+        time.sleep(SEARCH_TIME)
+        return [
+            SearchResult(
+                link=f"https://{query}.example.com/{i}", title=None, snippet=None
+            )
+            for i in range(3)
+        ]
+
+    async def validate_urls(urls):
+        return urls
+
+    async def fetch(self, url, *args, **kwargs):
+        fetches.started.append(time.monotonic())
+        fetches.running += 1
+        fetches.max_running = max(fetches.max_running, fetches.running)
+        try:
+            await asyncio.sleep(FETCH_TIME)
+        finally:
+            fetches.running -= 1
+        return f"<html><title>{url}</title><body>{url}</body></html>"
+
+    monkeypatch.setattr(retrieval, "search_web", search_web)
+    monkeypatch.setattr(web_utils, "asafe_validate_urls", validate_urls)
+    monkeypatch.setattr(SafeWebBaseLoader, "_fetch", fetch)
+    return fetches
+
+
+class TestSearchAndLoadWebDocuments:
+    def test_queries_share_the_fetch_limit(self, fetches):
+        """Test that the pages of all queries load at most 2 at a time"""
+        request = build_request()
+        queries = ["a", "b", "c"]
+        results, docs = asyncio.run(
+            retrieval.search_and_load_web_documents(request, queries, None)
+        )
+
+        assert len(results) == len(docs) == 9
+        assert fetches.max_running == 2
+        # Documents come back in search rank order
+        for query in queries:
+            assert [
+                doc.metadata["source"]
+                for doc in docs
+                if doc.metadata["source"].startswith(f"https://{query}.")
+            ] == [f"https://{query}.example.com/{i}" for i in range(3)]
+
+    def test_timeout_starts_at_the_first_fetch(self, fetches):
+        """Test that the search time does not count against WEB_LOADER_TIMEOUT"""
+        request = build_request(WEB_LOADER_TIMEOUT=FETCH_TIME * 2.5)
+        start = time.monotonic()
+        _, docs = asyncio.run(
+            retrieval.search_and_load_web_documents(request, ["a", "b", "c"], None)
+        )
+        elapsed = time.monotonic() - start
+
+        # With 2 fetches at a time, only the first 4 pages load in time
+        assert len(docs) == 4
+        assert fetches.started[0] - start >= SEARCH_TIME
+        assert elapsed < SEARCH_TIME + FETCH_TIME * 4
@@ -0,0 +1,153 @@
+import threading
+from types import SimpleNamespace
+
+import faster_whisper
+import numpy as np
+import pytest
+
+from open_webui.utils.whisper import SAMPLE_RATE, WhisperWorker
+
+
+def clip(job_id: int, samples: int) -> np.ndarray:
+    """Audio whose samples all hold `job_id`, so a transcript names its clip."""
+    return np.full(samples, job_id, dtype=np.float32)
+
+
+class FakeModel:
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def transcribe(self, audio, language=None, **kwargs):
+        with self.lock:
+            self.calls.append((len(audio), language, kwargs.get("vad_filter")))
+        if self.error:
+            raise self.error
+        segment = SimpleNamespace(text=f" job {int(audio[0])}")
+        return [segment], SimpleNamespace(language="en", language_probability=1.0)
+
+
+class FakeBatchedPipeline:
+    """Times segments like faster-whisper 1.1.1's BatchedInferencePipeline."""
+
+    calls = []
+    error = None
+
+    def __init__(self, model):
+        self.model = model
+
+    def transcribe(self, audio, language=None, clip_timestamps=None, **kwargs):
+        FakeBatchedPipeline.calls.append((len(clip_timestamps), language))
+        if FakeBatchedPipeline.error:
+            raise FakeBatchedPipeline.error
+
+        def segments():
+            for chunk in clip_timestamps:
+                start_time = chunk["start"] / SAMPLE_RATE
+                duration = (chunk["end"] - chunk["start"]) / SAMPLE_RATE
+                job_id = int(audio[chunk["start"]])
+                # Two segments per clip, the second one at its middle
+                for offset, text in [(0, "first"), (duration / 2, "second")]:
+                    yield SimpleNamespace(
+                        seek=int(start_time * 100),
+                        start=round(start_time + round(offset / 0.02) * 0.02, 3),
+                        end=round(start_time + duration, 3),
+                        text=f" {text} {job_id}",
+                    )
+
+        return segments(), SimpleNamespace(language=language or "en")
+
+
+@pytest.fixture
+def batched_pipeline(monkeypatch):
+    FakeBatchedPipeline.calls = []
+    FakeBatchedPipeline.error = None
+    monkeypatch.setattr(faster_whisper, "BatchedInferencePipeline", FakeBatchedPipeline)
+    return FakeBatchedPipeline
+
+
+class TestWhisperWorker:
+    def test_transcribe(self):
+        model = FakeModel()
+        worker = WhisperWorker(model, workers=2, batch_size=1)
+        try:
+            futures = [worker.submit(clip(i, SAMPLE_RATE)) for i in range(4)]
+            assert [future.result(timeout=5) for future in futures] == [
+                f"job {i}" for i in range(4)
+            ]
+            assert worker.submit(np.array([], dtype=np.float32)).result() == ""
+        finally:
+            worker.close()
+
+        stats = worker.stats()
+        assert stats["completed"] == 4 and stats["avg_batch_size"] == 1
+        assert len(model.calls) == 4
+
+    def test_batch_assigns_segments_to_their_clips(self, batched_pipeline):
+        """Test that each job of a batch gets only the text of its own clip"""
+        model = FakeModel()
+        worker = WhisperWorker(model, workers=1, batch_size=8, batch_wait=0.5)
+        # These lengths put clip starts where `start * 100 / 16000` and the
+        # library's `start / 16000 * 100` round to different frames (4640)
+        lengths = [4640, 16000, 3200, 47360, 8000, 4640]
+        try:
+            futures = [
+                worker.submit(clip(i, length)) for i, length in enumerate(lengths)
+            ]
+            results = [future.result(timeout=5) for future in futures]
+        finally:
+            worker.close()
+
+        assert results == [f"first {i} second {i}" for i in range(len(lengths))]
+        assert batched_pipeline.calls == [(len(lengths), None)]
+        assert model.calls == []
+        assert worker.stats()["avg_batch_size"] == len(lengths)
+
+    def test_batch_groups_languages_and_skips_vad(self, batched_pipeline):
+        model = FakeModel()
+        worker = WhisperWorker(model, workers=1, batch_size=8, batch_wait=0.5)
+        try:
+            futures = [
+                worker.submit(clip(0, 8000), "en"),
+                worker.submit(clip(1, 8000), "de"),
+                worker.submit(clip(2, 8000), "en"),
+                worker.submit(clip(3, 8000), "de", vad_filter=True),
+                worker.submit(clip(4, 31 * SAMPLE_RATE)),
+            ]
+            results = [future.result(timeout=5) for future in futures]
+        finally:
+            worker.close()
+
+        assert results[:3] == [f"first {i} second {i}" for i in range(3)]
+        assert results[3:] == ["job 3", "job 4"]
+        assert sorted(batched_pipeline.calls) == [(1, "de"), (2, "en")]
+        # Clips with the VAD filter or over 30 seconds run on their own
+        assert sorted(model.calls) == [
+            (8000, "de", True),
+            (31 * SAMPLE_RATE, None, False),
+        ]
+
+    def test_errors(self, batched_pipeline):
+        worker = WhisperWorker(
+            FakeModel(RuntimeError("model failed")), workers=1, batch_size=1
+        )
+        try:
+            with pytest.raises(RuntimeError, match="model failed"):
+                worker.submit(clip(0, 8000)).result(timeout=5)
+        finally:
+            worker.close()
+
+        batched_pipeline.error = RuntimeError("batch failed")
+        worker = WhisperWorker(FakeModel(), workers=1, batch_size=8, batch_wait=0.5)
+        try:
+            futures = [worker.submit(clip(i, 8000)) for i in range(3)]
+            for future in futures:
+                with pytest.raises(RuntimeError, match="batch failed"):
+                    future.result(timeout=5)
+
+            # The worker keeps serving after a failed batch
+            batched_pipeline.error = None
+            assert worker.submit(clip(7, 8000)).result(timeout=5) == "job 7"
+        finally:
+            worker.close()
@@ -0,0 +1,225 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import redis
+
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+from open_webui.env import (
+    CHAT_INDEX_CACHE_TTL,
+    CHAT_INDEX_LOCAL_CACHE_TTL,
+    ENABLE_CHAT_INDEX_CACHE,
+    REDIS_CLUSTER,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    REDIS_URL,
+    SRC_LOG_LEVELS,
+    UVICORN_WORKERS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+# Marks a fully loaded index, so a hash only partially written by a concurrent
+# write-through is never mistaken for the complete listing
+LOADED_FIELD = "__loaded__"
+
+# Number of user indexes kept in memory when Redis is not configured
+LOCAL_MAX_USERS = 1000
+
+
+class ChatIndex:
+    """
+    Per-user index of lightweight chat and folder entries (ids, titles,
+    timestamps, folder, pinned/archived flags, tags) used for sidebar listings.
+
+    Indexes are stored as Redis hashes when Redis is configured, or in process
+    memory otherwise. An index is built from the database with a single query on
+    first read; table mutations then write through to it. Bulk mutations drop
+    the index so the next read rebuilds it.
+
+    Every write bumps a per-user version, and a rebuild is only stored if the
+    version did not change while it was reading, so a rebuild racing with a
+    write can never store a stale listing.
+    """
+
+    def __init__(
+        self,
+        redis=None,
+        redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:chat_index",
+        ttl: Optional[int] = CHAT_INDEX_CACHE_TTL,
+    ):
+        self._redis = redis
+        self._redis_key_prefix = redis_key_prefix
+        self._ttl = ttl
+
+        # kind:user_id -> (expires_at, {entry_id: entry})
+        self._indexes: OrderedDict[str, tuple[float, dict[str, dict]]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, kind: str, user_id: str) -> str:
+        # The hash tag keeps an index and its version in the same cluster slot
+        return f"{self._redis_key_prefix}:{{{user_id}}}:{kind}"
+
+    def _version_key(self, user_id: str) -> str:
+        return f"{self._redis_key_prefix}:{{{user_id}}}:version"
+
+    def get(
+        self, kind: str, user_id: str, loader: Callable[[], list[dict]]
+    ) -> list[dict]:
+        """Return the user's index entries, building them with `loader` on a miss."""
+        if self._redis:
+            try:
+                return self._redis_get(kind, user_id, loader)
+            except Exception as e:
+                log.warning(f"Chat index unavailable, reading from database: {e}")
+                return loader()
+
+        key = self._key(kind, user_id)
+        with self._lock:
+            cached = self._indexes.get(key)
+            if cached and (self._ttl is None or cached[0] > time.monotonic()):
+                self._indexes.move_to_end(key)
+                return list(cached[1].values())
+            version = self._versions.get(user_id, 0)
+
+        entries = loader()
+
+        with self._lock:
+            if self._versions.get(user_id, 0) == version:
+                expires_at = time.monotonic() + self._ttl if self._ttl else 0
+                self._indexes[key] = (
+                    expires_at,
+                    {entry["id"]: entry for entry in entries},
+                )
+                self._indexes.move_to_end(key)
+                while len(self._indexes) > LOCAL_MAX_USERS:
+                    self._indexes.popitem(last=False)
+        return entries
+
+    def _redis_get(
+        self, kind: str, user_id: str, loader: Callable[[], list[dict]]
+    ) -> list[dict]:
+        key = self._key(kind, user_id)
+        version_key = self._version_key(user_id)
+
+        data = self._redis.hgetall(key)
+        if data.get(LOADED_FIELD):
+            return [json.loads(v) for k, v in data.items() if k != LOADED_FIELD]
+
+        version = self._redis.get(version_key)
+        entries = loader()
+
+        try:
+            with self._redis.pipeline() as pipe:
+                pipe.watch(version_key)
+                if pipe.get(version_key) == version:
+                    pipe.multi()
+                    pipe.delete(key)
+                    pipe.hset(
+                        key,
+                        mapping={
+                            LOADED_FIELD: "1",
+                            **{entry["id"]: json.dumps(entry) for entry in entries},
+                        },
+                    )
+                    if self._ttl:
+                        pipe.expire(key, self._ttl)
+                    pipe.execute()
+        except redis.WatchError:
+            # A write landed while rebuilding; the next read rebuilds again
+            pass
+        except Exception as e:
+            log.debug(f"Failed to store chat index for {user_id}: {e}")
+
+        return entries
+
+    def upsert(self, kind: str, user_id: str, entry: dict):
+        """Write an entry through to the user's index, if it is loaded."""
+        if self._redis:
+            try:
+                self._redis.incr(self._version_key(user_id))
+                key = self._key(kind, user_id)
+                if self._redis.hexists(key, LOADED_FIELD):
+                    self._redis.hset(key, entry["id"], json.dumps(entry))
+            except Exception as e:
+                log.warning(f"Failed to update chat index: {e}")
+                self.invalidate(user_id, kind)
+            return
+
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            cached = self._indexes.get(self._key(kind, user_id))
+            if cached:
+                cached[1][entry["id"]] = entry
+
+    def remove(self, kind: str, user_id: str, entry_ids: list[str]):
+        """Remove entries from the user's index."""
+        if not entry_ids:
+            return
+
+        if self._redis:
+            try:
+                self._redis.incr(self._version_key(user_id))
+                self._redis.hdel(self._key(kind, user_id), *entry_ids)
+            except Exception as e:
+                log.warning(f"Failed to update chat index: {e}")
+                self.invalidate(user_id, kind)
+            return
+
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            cached = self._indexes.get(self._key(kind, user_id))
+            if cached:
+                for entry_id in entry_ids:
+                    cached[1].pop(entry_id, None)
+
+    def invalidate(self, user_id: str, kind: Optional[str] = None):
+        """Drop the user's index (or only one kind of it) so it gets rebuilt."""
+        kinds = [kind] if kind else ["chats", "folders"]
+
+        if self._redis:
+            try:
+                self._redis.incr(self._version_key(user_id))
+                self._redis.delete(*[self._key(k, user_id) for k in kinds])
+            except Exception as e:
+                log.error(f"Failed to invalidate chat index for {user_id}: {e}")
+            return
+
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            for k in kinds:
+                self._indexes.pop(self._key(k, user_id), None)
+
+
+def get_chat_index() -> Optional[ChatIndex]:
+    if not ENABLE_CHAT_INDEX_CACHE:
+        return None
+
+    redis = get_redis_connection(
+        redis_url=REDIS_URL,
+        redis_sentinels=get_sentinels_from_env(
+            REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+        ),
+        redis_cluster=REDIS_CLUSTER,
+        decode_responses=True,
+    )
+
+    ttl = CHAT_INDEX_CACHE_TTL
+    if redis is None and UVICORN_WORKERS > 1:
+        # Writes on other workers do not reach this process's index
+        log.warning(
+            "Chat index cache enabled without Redis on several workers; sidebar "
+            f"listings may be up to {CHAT_INDEX_LOCAL_CACHE_TTL}s stale"
+        )
+        ttl = CHAT_INDEX_LOCAL_CACHE_TTL
+
+    return ChatIndex(redis=redis, ttl=ttl)
+
+
+CHAT_INDEX = get_chat_index()
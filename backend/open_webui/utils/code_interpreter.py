@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+import time
 import uuid
 from typing import Optional
 
@@ -8,7 +9,13 @@ import aiohttp
 import websockets
 from pydantic import BaseModel
 
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import (
+    CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT,
+    CODE_INTERPRETER_JUPYTER_KERNEL_POOL_MIN_IDLE,
+    CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE,
+    ENABLE_CODE_INTERPRETER_JUPYTER_CHAT_KERNELS,
+    SRC_LOG_LEVELS,
+)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(SRC_LOG_LEVELS["MAIN"])
@@ -24,7 +31,66 @@ class ResultModel(BaseModel):
     result: Optional[str] = ""
 
 
-class JupyterCodeExecuter:
+class JupyterClient:
+    """
+    HTTP session to a Jupyter server
+    """
+
+    def __init__(self, base_url: str, token: str = "", password: str = ""):
+        """
+        :param base_url: Jupyter server URL (e.g., "http://localhost:8888")
+        :param token: Jupyter authentication token (optional)
+        :param password: Jupyter password (optional)
+        """
+        self.base_url = base_url
+        self.token = token
+        self.password = password
+        if self.base_url[-1] != "/":
+            self.base_url += "/"
+        self.session = aiohttp.ClientSession(trust_env=True, base_url=self.base_url)
+        self.params = {}
+
+    async def sign_in(self) -> None:
+        # password authentication
+        if self.password and not self.token:
+            async with self.session.get("login") as response:
+                response.raise_for_status()
+                xsrf_token = response.cookies["_xsrf"].value
+                if not xsrf_token:
+                    raise ValueError("_xsrf token not found")
+                self.session.cookie_jar.update_cookies(response.cookies)
+                self.session.headers.update({"X-XSRFToken": xsrf_token})
+            async with self.session.post(
+                "login",
+                data={"_xsrf": xsrf_token, "password": self.password},
+                allow_redirects=False,
+            ) as response:
+                response.raise_for_status()
+                self.session.cookie_jar.update_cookies(response.cookies)
+
+        # token authentication
+        if self.token:
+            self.params.update({"token": self.token})
+
+    def init_ws(self, kernel_id: str) -> (str, dict):
+        ws_base = self.base_url.replace("http", "ws", 1)
+        ws_params = "?" + "&".join([f"{key}={val}" for key, val in self.params.items()])
+        websocket_url = f"{ws_base}api/kernels/{kernel_id}/channels{ws_params if len(ws_params) > 1 else ''}"
+        ws_headers = {}
+        if self.password and not self.token:
+            ws_headers = {
+                "Cookie": "; ".join(
+                    [
+                        f"{cookie.key}={cookie.value}"
+                        for cookie in self.session.cookie_jar
+                    ]
+                ),
+                **self.session.headers,
+            }
+        return websocket_url, ws_headers
+
+
+class JupyterCodeExecuter(JupyterClient):
     """
     Execute code in jupyter notebook
     """
@@ -44,16 +110,10 @@ class JupyterCodeExecuter:
         :param password: Jupyter password (optional)
         :param timeout: WebSocket timeout in seconds (default: 60s)
         """
-        self.base_url = base_url
+        super().__init__(base_url, token, password)
         self.code = code
-        self.token = token
-        self.password = password
         self.timeout = timeout
         self.kernel_id = ""
-        if self.base_url[-1] != "/":
-            self.base_url += "/"
-        self.session = aiohttp.ClientSession(trust_env=True, base_url=self.base_url)
-        self.params = {}
         self.result = ResultModel()
 
     async def __aenter__(self):
@@ -80,54 +140,15 @@ class JupyterCodeExecuter:
             self.result.stderr = f"Error: {err}"
         return self.result
 
-    async def sign_in(self) -> None:
-        # password authentication
-        if self.password and not self.token:
-            async with self.session.get("login") as response:
-                response.raise_for_status()
-                xsrf_token = response.cookies["_xsrf"].value
-                if not xsrf_token:
-                    raise ValueError("_xsrf token not found")
-                self.session.cookie_jar.update_cookies(response.cookies)
-                self.session.headers.update({"X-XSRFToken": xsrf_token})
-            async with self.session.post(
-                "login",
-                data={"_xsrf": xsrf_token, "password": self.password},
-                allow_redirects=False,
-            ) as response:
-                response.raise_for_status()
-                self.session.cookie_jar.update_cookies(response.cookies)
-
-        # token authentication
-        if self.token:
-            self.params.update({"token": self.token})
-
     async def init_kernel(self) -> None:
         async with self.session.post(url="api/kernels", params=self.params) as response:
             response.raise_for_status()
             kernel_data = await response.json()
             self.kernel_id = kernel_data["id"]
 
-    def init_ws(self) -> (str, dict):
-        ws_base = self.base_url.replace("http", "ws", 1)
-        ws_params = "?" + "&".join([f"{key}={val}" for key, val in self.params.items()])
-        websocket_url = f"{ws_base}api/kernels/{self.kernel_id}/channels{ws_params if len(ws_params) > 1 else ''}"
-        ws_headers = {}
-        if self.password and not self.token:
-            ws_headers = {
-                "Cookie": "; ".join(
-                    [
-                        f"{cookie.key}={cookie.value}"
-                        for cookie in self.session.cookie_jar
-                    ]
-                ),
-                **self.session.headers,
-            }
-        return websocket_url, ws_headers
-
     async def execute_code(self) -> None:
         # initialize ws
-        websocket_url, ws_headers = self.init_ws()
+        websocket_url, ws_headers = self.init_ws(self.kernel_id)
         # execute
         async with websockets.connect(
             websocket_url, additional_headers=ws_headers
@@ -135,74 +156,502 @@ class JupyterCodeExecuter:
             await self.execute_in_jupyter(ws)
 
     async def execute_in_jupyter(self, ws) -> None:
-        # send message
-        msg_id = uuid.uuid4().hex
-        await ws.send(
-            json.dumps(
-                {
-                    "header": {
-                        "msg_id": msg_id,
-                        "msg_type": "execute_request",
-                        "username": "user",
-                        "session": uuid.uuid4().hex,
-                        "date": "",
-                        "version": "5.3",
-                    },
-                    "parent_header": {},
-                    "metadata": {},
-                    "content": {
-                        "code": self.code,
-                        "silent": False,
-                        "store_history": True,
-                        "user_expressions": {},
-                        "allow_stdin": False,
-                        "stop_on_error": True,
-                    },
-                    "channel": "shell",
-                }
-            )
+        self.result, _ = await execute_in_kernel(ws, self.code, self.timeout)
+
+
+async def execute_in_kernel(ws, code: str, timeout: int) -> tuple[ResultModel, bool]:
+    """
+    Run `code` over an open kernel channels websocket, returning the result and
+    whether the execution timed out.
+    """
+    # send message
+    msg_id = uuid.uuid4().hex
+    await ws.send(
+        json.dumps(
+            {
+                "header": {
+                    "msg_id": msg_id,
+                    "msg_type": "execute_request",
+                    "username": "user",
+                    "session": uuid.uuid4().hex,
+                    "date": "",
+                    "version": "5.3",
+                },
+                "parent_header": {},
+                "metadata": {},
+                "content": {
+                    "code": code,
+                    "silent": False,
+                    "store_history": True,
+                    "user_expressions": {},
+                    "allow_stdin": False,
+                    "stop_on_error": True,
+                },
+                "channel": "shell",
+            }
         )
-        # parse message
-        stdout, stderr, result = "", "", []
+    )
+    # parse message
+    stdout, stderr, result = "", "", []
+    timed_out = False
+    while True:
+        try:
+            # wait for message
+            message = await asyncio.wait_for(ws.recv(), timeout)
+            message_data = json.loads(message)
+            # msg id not match, skip
+            if message_data.get("parent_header", {}).get("msg_id") != msg_id:
+                continue
+            # check message type
+            msg_type = message_data.get("msg_type")
+            match msg_type:
+                case "stream":
+                    if message_data["content"]["name"] == "stdout":
+                        stdout += message_data["content"]["text"]
+                    elif message_data["content"]["name"] == "stderr":
+                        stderr += message_data["content"]["text"]
+                case "execute_result" | "display_data":
+                    data = message_data["content"]["data"]
+                    if "image/png" in data:
+                        result.append(f"data:image/png;base64,{data['image/png']}")
+                    elif "text/plain" in data:
+                        result.append(data["text/plain"])
+                case "error":
+                    stderr += "\n".join(message_data["content"]["traceback"])
+                case "status":
+                    if message_data["content"]["execution_state"] == "idle":
+                        break
+
+        except asyncio.TimeoutError:
+            stderr += "\nExecution timed out."
+            timed_out = True
+            break
+
+    return (
+        ResultModel(
+            stdout=stdout.strip(),
+            stderr=stderr.strip(),
+            result="\n".join(result).strip() if result else "",
+        ),
+        timed_out,
+    )
+
+
+class JupyterKernel:
+    """
+    A kernel owned by a `JupyterKernelPool`
+    """
+
+    def __init__(self, kernel_id: str):
+        self.id = kernel_id
+        self.chat_id: Optional[str] = None
+        self.in_use = False
+        self.started_at = time.monotonic()
+        self.last_used_at = self.started_at
+
+
+class JupyterKernelPool(JupyterClient):
+    """
+    Kernels started ahead of time on one Jupyter server, so executions do not
+    wait for a kernel to start.
+
+    A kernel is restarted in the background when an execution returns it, so
+    no state leaks between executions. With chat kernels enabled, a chat keeps
+    its kernel between executions instead, so variables persist across turns.
+
+    A background task shuts down kernels unused for `idle_timeout` (keeping
+    `min_idle` ready), drops kernels the server no longer runs and tops the
+    ready kernels back up. A pool left unused for `idle_timeout` closes itself.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str = "",
+        password: str = "",
+        max_size: int = CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE,
+        min_idle: int = CODE_INTERPRETER_JUPYTER_KERNEL_POOL_MIN_IDLE,
+        idle_timeout: int = CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT,
+        chat_kernels: bool = ENABLE_CODE_INTERPRETER_JUPYTER_CHAT_KERNELS,
+    ):
+        super().__init__(base_url, token, password)
+        self.max_size = max(max_size, 1)
+        self.min_idle = min(min_idle, self.max_size)
+        self.idle_timeout = idle_timeout
+        self.chat_kernels = chat_kernels
+
+        self.closed = False
+        self.last_used_at = time.monotonic()
+
+        self._kernels: dict[str, JupyterKernel] = {}
+        self._idle: list[JupyterKernel] = []
+        self._chat_kernels: dict[str, JupyterKernel] = {}
+        # Chats whose first kernel is being handed out
+        self._pending_chats: set[str] = set()
+        # Kernels being started (counted against max_size), started for the
+        # ready set, and being restarted after an execution
+        self._starting = 0
+        self._warming = 0
+        self._resetting = 0
+
+        self._condition = asyncio.Condition()
+        self._signed_in = False
+        self._sign_in_lock = asyncio.Lock()
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _api(self, method: str, path: str):
+        for attempt in range(2):
+            if not self._signed_in:
+                async with self._sign_in_lock:
+                    if not self._signed_in:
+                        await self.sign_in()
+                        self._signed_in = True
+
+            async with self.session.request(
+                method, path, params=self.params
+            ) as response:
+                # An expired login session; sign in again once
+                if response.status == 403 and attempt == 0 and not self.token:
+                    self._signed_in = False
+                    continue
+                response.raise_for_status()
+                if response.content_type != "application/json":
+                    return None
+                return await response.json()
+
+    async def execute(
+        self, code: str, timeout: int = 60, chat_id: Optional[str] = None
+    ) -> ResultModel:
+        kernel = await self.acquire(chat_id)
+        try:
+            websocket_url, ws_headers = self.init_ws(kernel.id)
+            async with websockets.connect(
+                websocket_url, additional_headers=ws_headers
+            ) as ws:
+                result, timed_out = await execute_in_kernel(ws, code, timeout)
+        except BaseException:
+            # The kernel's state is unknown, so it is not handed out again
+            async with self._condition:
+                self._discard(kernel)
+            raise
+
+        await self.release(kernel, timed_out)
+        return result
+
+    async def acquire(self, chat_id: Optional[str] = None) -> JupyterKernel:
+        """Get a kernel for an execution; pair every call with `release`."""
+        if not self.chat_kernels:
+            chat_id = None
+
+        self.last_used_at = time.monotonic()
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap_loop())
+
         while True:
+            kernel = await self._checkout(chat_id)
             try:
-                # wait for message
-                message = await asyncio.wait_for(ws.recv(), self.timeout)
-                message_data = json.loads(message)
-                # msg id not match, skip
-                if message_data.get("parent_header", {}).get("msg_id") != msg_id:
+                if kernel is None:
+                    kernel = await self._start_kernel()
+                elif not await self._is_alive(kernel):
+                    async with self._condition:
+                        self._pending_chats.discard(chat_id)
+                        self._discard(kernel)
+                    continue
+            except BaseException:
+                async with self._condition:
+                    self._pending_chats.discard(chat_id)
+                    self._condition.notify_all()
+                raise
+
+            async with self._condition:
+                if chat_id and kernel.chat_id != chat_id:
+                    kernel.chat_id = chat_id
+                    self._chat_kernels[chat_id] = kernel
+                    self._pending_chats.discard(chat_id)
+                    self._condition.notify_all()
+
+            self._spawn(self._fill())
+            return kernel
+
+    async def _checkout(self, chat_id: Optional[str]) -> Optional[JupyterKernel]:
+        """
+        Take the chat's kernel or a ready one, or reserve room to start one
+        (returning None), waiting while the pool is full.
+        """
+        async with self._condition:
+            while True:
+                if self.closed:
+                    raise RuntimeError("Jupyter kernel pool is closed")
+
+                if chat_id:
+                    kernel = self._chat_kernels.get(chat_id)
+                    if kernel and not kernel.in_use:
+                        kernel.in_use = True
+                        return kernel
+                    if kernel or chat_id in self._pending_chats:
+                        # Executions in the same chat run one at a time
+                        await self._condition.wait()
+                        continue
+
+                if self._idle:
+                    kernel = self._idle.pop()
+                    kernel.in_use = True
+                    if chat_id:
+                        self._pending_chats.add(chat_id)
+                    return kernel
+
+                if len(self._kernels) + self._starting < self.max_size:
+                    self._starting += 1
+                    if chat_id:
+                        self._pending_chats.add(chat_id)
+                    return None
+
+                # Make room by shutting down the least recently used chat kernel
+                free = [k for k in self._chat_kernels.values() if not k.in_use]
+                if free:
+                    self._discard(min(free, key=lambda k: k.last_used_at))
                     continue
-                # check message type
-                msg_type = message_data.get("msg_type")
-                match msg_type:
-                    case "stream":
-                        if message_data["content"]["name"] == "stdout":
-                            stdout += message_data["content"]["text"]
-                        elif message_data["content"]["name"] == "stderr":
-                            stderr += message_data["content"]["text"]
-                    case "execute_result" | "display_data":
-                        data = message_data["content"]["data"]
-                        if "image/png" in data:
-                            result.append(f"data:image/png;base64,{data['image/png']}")
-                        elif "text/plain" in data:
-                            result.append(data["text/plain"])
-                    case "error":
-                        stderr += "\n".join(message_data["content"]["traceback"])
-                    case "status":
-                        if message_data["content"]["execution_state"] == "idle":
-                            break
-
-            except asyncio.TimeoutError:
-                stderr += "\nExecution timed out."
-                break
-        self.result.stdout = stdout.strip()
-        self.result.stderr = stderr.strip()
-        self.result.result = "\n".join(result).strip() if result else ""
+
+                await self._condition.wait()
+
+    async def _start_kernel(self) -> JupyterKernel:
+        try:
+            kernel_data = await self._api("POST", "api/kernels")
+        finally:
+            async with self._condition:
+                self._starting -= 1
+                self._condition.notify_all()
+
+        kernel = JupyterKernel(kernel_data["id"])
+        kernel.in_use = True
+        async with self._condition:
+            self._kernels[kernel.id] = kernel
+        return kernel
+
+    async def _is_alive(self, kernel: JupyterKernel) -> bool:
+        try:
+            kernel_data = await self._api("GET", f"api/kernels/{kernel.id}")
+            return kernel_data.get("execution_state") != "dead"
+        except Exception as err:
+            logger.debug("kernel %s health check failed, %s", kernel.id, err)
+            return False
+
+    async def release(self, kernel: JupyterKernel, timed_out: bool = False):
+        kernel.last_used_at = self.last_used_at = time.monotonic()
+        if kernel.id not in self._kernels:
+            # Discarded while in use
+            return
+
+        if not kernel.chat_id:
+            async with self._condition:
+                self._resetting += 1
+            self._spawn(self._reset(kernel))
+            return
+
+        if timed_out:
+            # Stop the runaway execution but keep the chat's variables
+            try:
+                await self._api("POST", f"api/kernels/{kernel.id}/interrupt")
+                # Requests sent while the interrupted cell unwinds get aborted
+                for _ in range(50):
+                    kernel_data = await self._api("GET", f"api/kernels/{kernel.id}")
+                    if kernel_data.get("execution_state") != "busy":
+                        break
+                    await asyncio.sleep(0.1)
+            except Exception as err:
+                logger.debug("interrupt kernel %s failed, %s", kernel.id, err)
+
+        async with self._condition:
+            kernel.in_use = False
+            self._condition.notify_all()
+
+    async def _reset(self, kernel: JupyterKernel):
+        try:
+            await self._api("POST", f"api/kernels/{kernel.id}/restart")
+        except Exception as err:
+            logger.debug("restart kernel %s failed, %s", kernel.id, err)
+            async with self._condition:
+                self._resetting -= 1
+                self._discard(kernel)
+            return
+
+        async with self._condition:
+            self._resetting -= 1
+            if kernel.id in self._kernels:
+                kernel.in_use = False
+                self._idle.append(kernel)
+                self._condition.notify_all()
+
+    async def _fill(self):
+        async with self._condition:
+            count = min(
+                self.min_idle - len(self._idle) - self._resetting - self._warming,
+                self.max_size - len(self._kernels) - self._starting,
+            )
+            if count <= 0 or self.closed:
+                return
+            self._starting += count
+            self._warming += count
+
+        results = await asyncio.gather(
+            *[self._api("POST", "api/kernels") for _ in range(count)],
+            return_exceptions=True,
+        )
+
+        async with self._condition:
+            self._starting -= count
+            self._warming -= count
+            for kernel_data in results:
+                if isinstance(kernel_data, BaseException):
+                    logger.debug("start kernel failed, %s", kernel_data)
+                    continue
+                kernel = JupyterKernel(kernel_data["id"])
+                self._kernels[kernel.id] = kernel
+                if self.closed:
+                    self._discard(kernel)
+                else:
+                    self._idle.append(kernel)
+            self._condition.notify_all()
+
+    def _discard(self, kernel: JupyterKernel):
+        """Forget a kernel and shut it down; call with the condition held."""
+        self._kernels.pop(kernel.id, None)
+        if kernel in self._idle:
+            self._idle.remove(kernel)
+        if kernel.chat_id and self._chat_kernels.get(kernel.chat_id) is kernel:
+            del self._chat_kernels[kernel.chat_id]
+        self._spawn(self._shutdown_kernel(kernel))
+        self._condition.notify_all()
+
+    async def _shutdown_kernel(self, kernel: JupyterKernel):
+        try:
+            await self._api("DELETE", f"api/kernels/{kernel.id}")
+        except Exception as err:
+            logger.debug("close kernel %s failed, %s", kernel.id, err)
+
+    async def _reap_loop(self):
+        interval = min(self.idle_timeout, 60) if self.idle_timeout > 0 else 60
+        while not self.closed:
+            await asyncio.sleep(max(interval, 1))
+            try:
+                await self.reap()
+            except Exception as err:
+                logger.warning("reaping jupyter kernels failed, %s", err)
+
+    async def reap(self):
+        now = time.monotonic()
+        idle_timeout = self.idle_timeout if self.idle_timeout > 0 else None
+
+        try:
+            running = {
+                kernel_data["id"]: kernel_data
+                for kernel_data in await self._api("GET", "api/kernels")
+            }
+        except Exception as err:
+            logger.debug("listing kernels failed, %s", err)
+            running = None
+
+        async with self._condition:
+            for kernel in list(self._kernels.values()):
+                if kernel.in_use:
+                    continue
+
+                if running is not None and kernel.started_at < now:
+                    kernel_data = running.get(kernel.id)
+                    if not kernel_data or kernel_data["execution_state"] == "dead":
+                        self._discard(kernel)
+                        continue
+
+                if (
+                    idle_timeout
+                    and kernel.chat_id
+                    and now - kernel.last_used_at > idle_timeout
+                ):
+                    self._discard(kernel)
+
+            # Oldest ready kernels first, keeping min_idle of them
+            self._idle.sort(key=lambda k: k.last_used_at)
+            for kernel in self._idle[: max(len(self._idle) - self.min_idle, 0)]:
+                if idle_timeout and now - kernel.last_used_at > idle_timeout:
+                    self._discard(kernel)
+
+            unused = (
+                idle_timeout
+                and now - self.last_used_at > idle_timeout
+                and not any(k.in_use for k in self._kernels.values())
+                and not self._starting
+            )
+
+        if unused:
+            await self.close()
+        else:
+            await self._fill()
+
+    async def close(self):
+        self.closed = True
+        if self._reaper_task and self._reaper_task is not asyncio.current_task():
+            self._reaper_task.cancel()
+
+        async with self._condition:
+            kernels = list(self._kernels.values())
+            self._kernels.clear()
+            self._idle.clear()
+            self._chat_kernels.clear()
+            self._condition.notify_all()
+
+        await asyncio.gather(*[self._shutdown_kernel(k) for k in kernels])
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.session.close()
+
+
+JUPYTER_KERNEL_POOLS: dict[tuple[str, str, str], JupyterKernelPool] = {}
+
+
+def get_jupyter_kernel_pool(
+    base_url: str, token: str = "", password: str = ""
+) -> JupyterKernelPool:
+    """Get the kernel pool for a Jupyter server and credentials."""
+    for key in [key for key, pool in JUPYTER_KERNEL_POOLS.items() if pool.closed]:
+        del JUPYTER_KERNEL_POOLS[key]
+
+    key = (base_url, token or "", password or "")
+    if key not in JUPYTER_KERNEL_POOLS:
+        JUPYTER_KERNEL_POOLS[key] = JupyterKernelPool(
+            base_url, token or "", password or ""
+        )
+    return JUPYTER_KERNEL_POOLS[key]
+
+
+async def close_jupyter_kernel_pools():
+    pools = list(JUPYTER_KERNEL_POOLS.values())
+    JUPYTER_KERNEL_POOLS.clear()
+    for pool in pools:
+        await pool.close()
 
 
 async def execute_code_jupyter(
-    base_url: str, code: str, token: str = "", password: str = "", timeout: int = 60
+    base_url: str,
+    code: str,
+    token: str = "",
+    password: str = "",
+    timeout: int = 60,
+    chat_id: Optional[str] = None,
 ) -> dict:
+    if CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE > 0:
+        try:
+            pool = get_jupyter_kernel_pool(base_url, token, password)
+            result = await pool.execute(code, timeout, chat_id)
+        except Exception as err:
+            logger.exception("execute code failed, %s", err)
+            result = ResultModel(stderr=f"Error: {err}")
+        return result.model_dump()
+
     async with JupyterCodeExecuter(
         base_url, code, token, password, timeout
     ) as executor:
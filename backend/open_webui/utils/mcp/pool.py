@@ -0,0 +1,334 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Optional
+
+import anyio
+import httpx
+from mcp import types
+from mcp.shared.exceptions import McpError
+
+from open_webui.env import (
+    ENABLE_MCP_CLIENT_POOL,
+    MCP_CLIENT_POOL_IDLE_TIMEOUT,
+    MCP_CLIENT_POOL_MAX_SIZE,
+    MCP_TOOL_SPECS_CACHE_TTL,
+    SRC_LOG_LEVELS,
+)
+from open_webui.utils.mcp.client import MCPClient
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+def is_connection_error(e: Exception) -> bool:
+    """Whether a request failed because the session is gone, not because of the tool."""
+    if isinstance(
+        e, (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream)
+    ):
+        return True
+    # Raised by the streamable HTTP transport when the server dropped the session
+    return isinstance(e, McpError) and e.error.message == "Session terminated"
+
+
+def is_rejected_request(e: Optional[BaseException]) -> bool:
+    """Whether the server refused a request (e.g. an unknown session) without running it."""
+    if isinstance(e, BaseExceptionGroup):
+        return any(is_rejected_request(exc) for exc in e.exceptions)
+    return isinstance(e, httpx.HTTPStatusError) and e.response.status_code in (
+        400,
+        404,
+    )
+
+
+class MCPSessionClosedError(Exception):
+    """The pooled session ended before the server answered a request."""
+
+    def __init__(self, url: str, rejected: bool = False):
+        super().__init__(f"MCP session to {url} closed before the server responded")
+        self.rejected = rejected
+
+
+class MCPConnection:
+    """
+    A long-lived MCP session shared by every request using the same server
+    and credentials.
+
+    The transport and session contexts are entered and exited by a dedicated
+    task, as their anyio task groups must be closed by the task that opened
+    them; requests from any task are then sent through the open session. The
+    session is reopened on connection errors, and the server's tool list is
+    cached until it expires or the server sends `tools/list_changed`.
+    """
+
+    def __init__(self, url: str, headers: Optional[dict] = None):
+        self.url = url
+        self.headers = headers
+
+        self.client: Optional[MCPClient] = None
+        self.in_use = 0
+        self.last_used_at = time.monotonic()
+
+        self._task: Optional[asyncio.Task] = None
+        self._close_event: Optional[asyncio.Event] = None
+        self._lock = asyncio.Lock()
+
+        self._tool_specs: Optional[list[dict]] = None
+        self._tool_specs_expires_at = 0.0
+
+    @property
+    def connected(self) -> bool:
+        return (
+            self._task is not None
+            and not self._task.done()
+            and self.client is not None
+            and self.client.session is not None
+        )
+
+    async def _run(
+        self, client: MCPClient, ready: asyncio.Future, close_event: asyncio.Event
+    ) -> Optional[Exception]:
+        try:
+            await client.connect(
+                url=self.url,
+                headers=self.headers,
+                message_handler=self._handle_message,
+            )
+        except asyncio.CancelledError:
+            ready.cancel()
+            raise
+        except Exception as e:
+            ready.set_exception(e)
+            return
+
+        ready.set_result(None)
+
+        error = None
+        try:
+            await close_event.wait()
+        except asyncio.CancelledError:
+            # The transport's task group cancels this task when the connection fails
+            pass
+        finally:
+            try:
+                await client.disconnect()
+            except Exception as e:
+                log.debug(f"MCP session for {self.url} closed with error: {e}")
+                error = e
+        return error
+
+    async def _handle_message(self, message):
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            log.debug(f"MCP tool list changed for {self.url}")
+            self.invalidate_tool_specs()
+        elif isinstance(message, Exception):
+            log.debug(f"MCP session error for {self.url}: {message}")
+
+    async def connect(self):
+        async with self._lock:
+            if not self.connected:
+                await self._open()
+
+    async def _open(self):
+        await self._close()
+
+        client = MCPClient()
+        ready = asyncio.get_running_loop().create_future()
+        self._close_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run(client, ready, self._close_event))
+
+        await ready
+        self.client = client
+        self.invalidate_tool_specs()
+
+    async def reconnect(self, client: Optional[MCPClient] = None):
+        """Reopen the session, unless another caller already replaced `client`."""
+        async with self._lock:
+            if client is None or self.client is client or not self.connected:
+                log.info(f"Reconnecting to MCP server {self.url}")
+                await self._open()
+
+    async def _close(self):
+        if self._close_event:
+            self._close_event.set()
+        if self._task:
+            # The session task logs its own errors; a failed or cancelled task is just gone
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self.client = None
+
+    async def close(self):
+        async with self._lock:
+            await self._close()
+
+    async def _request(self, method: str, *args):
+        """
+        Send a request through the open session. The transport does not fail
+        pending requests when its connection breaks, so the request is raced
+        against the session task.
+        """
+        await self.connect()
+        client, task = self.client, self._task
+
+        request = asyncio.ensure_future(getattr(client, method)(*args))
+        try:
+            await asyncio.wait([request, task], return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            request.cancel()
+            raise
+
+        if request.done():
+            return client, request.result()
+
+        request.cancel()
+        error = None if task.cancelled() else task.result()
+        raise MCPSessionClosedError(self.url, rejected=is_rejected_request(error))
+
+    def invalidate_tool_specs(self):
+        self._tool_specs = None
+        self._tool_specs_expires_at = 0.0
+
+    async def list_tool_specs(self) -> Optional[list[dict]]:
+        if (
+            self._tool_specs is not None
+            and time.monotonic() < self._tool_specs_expires_at
+        ):
+            return self._tool_specs
+
+        client = self.client
+        try:
+            client, tool_specs = await self._request("list_tool_specs")
+        except Exception as e:
+            # Listing tools is safe to retry on any failure
+            log.debug(f"Failed to list MCP tools for {self.url}: {e}")
+            await self.reconnect(client)
+            _, tool_specs = await self._request("list_tool_specs")
+
+        self._tool_specs = tool_specs
+        self._tool_specs_expires_at = time.monotonic() + MCP_TOOL_SPECS_CACHE_TTL
+        return tool_specs
+
+    async def call_tool(
+        self, function_name: str, function_args: dict
+    ) -> Optional[dict]:
+        client = self.client
+        try:
+            _, result = await self._request("call_tool", function_name, function_args)
+            return result
+        except Exception as e:
+            # Tool calls are only retried when the server never ran them
+            if not (
+                is_connection_error(e)
+                or (isinstance(e, MCPSessionClosedError) and e.rejected)
+            ):
+                raise
+            log.debug(f"Retrying MCP tool call on a new session for {self.url}: {e}")
+            await self.reconnect(client)
+            _, result = await self._request("call_tool", function_name, function_args)
+            return result
+
+
+class MCPClientPool:
+    """
+    Process-wide pool of MCP sessions keyed by server URL and request headers
+    (which carry the credentials), so chats stop paying a handshake and a
+    `tools/list` round trip on every message. Sessions left unused for
+    `idle_timeout` seconds are closed by `reap`, which the app runs in the
+    background.
+    """
+
+    def __init__(
+        self,
+        max_size: int = MCP_CLIENT_POOL_MAX_SIZE,
+        idle_timeout: int = MCP_CLIENT_POOL_IDLE_TIMEOUT,
+    ):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+
+        self._connections: dict[str, MCPConnection] = {}
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _key(url: str, headers: Optional[dict]) -> str:
+        return hashlib.sha256(
+            json.dumps([url, headers or {}], sort_keys=True).encode()
+        ).hexdigest()
+
+    async def acquire(self, url: str, headers: Optional[dict] = None) -> MCPConnection:
+        """Get a connected session for the server; pair every call with `release`."""
+        key = self._key(url, headers)
+
+        async with self._lock:
+            connection = self._connections.get(key)
+            if connection is None:
+                await self._evict()
+                connection = MCPConnection(url, headers)
+                self._connections[key] = connection
+
+            connection.in_use += 1
+            connection.last_used_at = time.monotonic()
+
+        try:
+            await connection.connect()
+        except Exception:
+            await self.release(connection)
+            raise
+
+        return connection
+
+    async def release(self, connection: MCPConnection):
+        connection.in_use = max(connection.in_use - 1, 0)
+        connection.last_used_at = time.monotonic()
+
+        if connection.in_use == 0 and not connection.connected:
+            async with self._lock:
+                key = self._key(connection.url, connection.headers)
+                if self._connections.get(key) is connection:
+                    del self._connections[key]
+
+    async def reap(self, interval: Optional[float] = None):
+        """Close sessions left idle for `idle_timeout`, until cancelled."""
+        while True:
+            await asyncio.sleep(interval or max(self.idle_timeout / 2, 1))
+            try:
+                async with self._lock:
+                    await self._evict(reserve=0)
+            except Exception as e:
+                log.error(f"Error closing idle MCP sessions: {e}")
+
+    async def _evict(self, reserve: int = 1):
+        # Close idle sessions, then the least recently used unused ones over the
+        # limit, leaving room for `reserve` new ones
+        now = time.monotonic()
+        unused = sorted(
+            (
+                (key, connection)
+                for key, connection in self._connections.items()
+                if connection.in_use == 0
+            ),
+            key=lambda item: item[1].last_used_at,
+        )
+
+        overflow = len(self._connections) - self.max_size + reserve
+        for key, connection in unused:
+            if overflow <= 0 and now - connection.last_used_at < self.idle_timeout:
+                break
+
+            del self._connections[key]
+            overflow -= 1
+            await connection.close()
+
+    async def close(self):
+        async with self._lock:
+            connections = list(self._connections.values())
+            self._connections = {}
+
+        for connection in connections:
+            await connection.close()
+
+
+MCP_CLIENT_POOL = MCPClientPool() if ENABLE_MCP_CLIENT_POOL else None
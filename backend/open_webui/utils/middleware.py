@@ -14,6 +14,7 @@ import html
 import inspect
 import re
 import ast
+import bisect
 
 from uuid import uuid4
 from concurrent.futures import ThreadPoolExecutor
@@ -41,7 +42,7 @@ from open_webui.routers.tasks import (
     generate_chat_tags,
 )
 from open_webui.routers.retrieval import (
-    process_web_search,
+    run_web_search,
     SearchForm,
 )
 from open_webui.routers.images import (
@@ -100,6 +101,7 @@ from open_webui.utils.filter import (
 from open_webui.utils.code_interpreter import execute_code_jupyter
 from open_webui.utils.payload import apply_system_prompt_to_body
 from open_webui.utils.mcp.client import MCPClient
+from open_webui.utils.mcp.pool import MCP_CLIENT_POOL
 
 
 from open_webui.config import (
@@ -115,6 +117,8 @@ from open_webui.env import (
     ENABLE_CHAT_RESPONSE_BASE64_IMAGE_URL_CONVERSION,
     CHAT_RESPONSE_STREAM_DELTA_CHUNK_SIZE,
     CHAT_RESPONSE_MAX_TOOL_CALL_RETRIES,
+    CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS,
+    CHAT_RESPONSE_TOOL_CALL_TIMEOUT,
     BYPASS_MODEL_ACCESS_CONTROL,
     ENABLE_REALTIME_CHAT_SAVE,
     ENABLE_QUERIES_CACHE,
@@ -140,6 +144,11 @@ DEFAULT_REASONING_TAGS = [
 DEFAULT_SOLUTION_TAGS = [("<|begin_of_solution|>", "<|end_of_solution|>")]
 DEFAULT_CODE_INTERPRETER_TAGS = [("<code_interpreter>", "</code_interpreter>")]
 
+# <details> blocks and markdown images, stripped from messages sent to background tasks
+DETAILS_AND_IMAGES_PATTERN = re.compile(
+    r"<details\b[^>]*>.*?<\/details>|!\[.*?\]\(.*?\)", flags=re.S | re.I
+)
+
 
 def process_tool_result(
     request,
@@ -284,6 +293,55 @@ def process_tool_result(
     return tool_result, tool_result_files, tool_result_embeds
 
 
+async def run_tool_calls(
+    tool_calls: list[dict],
+    execute_tool_call,
+    on_result,
+    concurrency: int = CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS,
+    timeout: Optional[float] = CHAT_RESPONSE_TOOL_CALL_TIMEOUT,
+):
+    """
+    Run the tool calls of one model turn concurrently, at most `concurrency`
+    at a time and each for at most `timeout` seconds.
+
+    `execute_tool_call(tool_call)` returns a
+    `(tool_call_id, tool_function_name, tool_result, tool_type, direct_tool)`
+    tuple, and `on_result(index, result)` is awaited with the index of each
+    call in `tool_calls` as soon as it finishes.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_tool_call(index: int, tool_call: dict):
+        async with semaphore:
+            try:
+                return index, await asyncio.wait_for(
+                    execute_tool_call(tool_call), timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                tool_function_name = tool_call.get("function", {}).get("name", "")
+                log.warning(
+                    f"Tool call {tool_function_name} timed out after {timeout}s"
+                )
+                return index, (
+                    tool_call.get("id", ""),
+                    tool_function_name,
+                    f"Tool call timed out after {timeout} seconds",
+                    None,
+                    False,
+                )
+
+    tasks = [
+        asyncio.create_task(run_tool_call(index, tool_call))
+        for index, tool_call in enumerate(tool_calls)
+    ]
+    try:
+        for task in asyncio.as_completed(tasks):
+            await on_result(*await task)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 async def chat_completion_tools_handler(
     request: Request, body: dict, extra_params: dict, user: UserModel, models, tools
 ) -> tuple[dict, dict]:
@@ -648,10 +706,11 @@ async def chat_web_search_handler(
     )
 
     try:
-        results = await process_web_search(
+        results = await run_web_search(
             request,
             SearchForm(queries=queries),
             user=user,
+            event_emitter=event_emitter,
         )
 
         if results:
@@ -1402,11 +1461,19 @@ async def process_chat_payload(request, form_data, user, metadata, model):
                         for key, value in connection_headers.items():
                             headers[key] = value
 
-                    mcp_clients[server_id] = MCPClient()
-                    await mcp_clients[server_id].connect(
-                        url=mcp_server_connection.get("url", ""),
-                        headers=headers if headers else None,
-                    )
+                    if MCP_CLIENT_POOL:
+                        # Pooled sessions stay open across requests and cache
+                        # their tool list; they are released when the response ends
+                        mcp_clients[server_id] = await MCP_CLIENT_POOL.acquire(
+                            url=mcp_server_connection.get("url", ""),
+                            headers=headers if headers else None,
+                        )
+                    else:
+                        mcp_clients[server_id] = MCPClient()
+                        await mcp_clients[server_id].connect(
+                            url=mcp_server_connection.get("url", ""),
+                            headers=headers if headers else None,
+                        )
 
                     tool_specs = await mcp_clients[server_id].list_tool_specs()
                     for tool_spec in tool_specs:
@@ -1584,13 +1651,14 @@ async def process_chat_response(
 
             message_list = get_message_list(messages_map, metadata["message_id"])
 
-            # Remove details tags and files from the messages.
-            # as get_message_list creates a new list, it does not affect
-            # the original messages outside of this handler
+            # Remove details tags and images from the messages.
+            # get_message_list returns the stored message dicts, so a message
+            # is only copied when its content or role actually needs rewriting
 
             messages = []
             for message in message_list:
-                content = message.get("content", "")
+                raw_content = message.get("content", "")
+                content = raw_content
                 if isinstance(content, list):
                     for item in content:
                         if item.get("type") == "text":
@@ -1598,22 +1666,22 @@ async def process_chat_response(
                             break
 
                 if isinstance(content, str):
-                    content = re.sub(
-                        r"<details\b[^>]*>.*?<\/details>|!\[.*?\]\(.*?\)",
-                        "",
-                        content,
-                        flags=re.S | re.I,
-                    ).strip()
-
-                messages.append(
-                    {
-                        **message,
-                        "role": message.get(
-                            "role", "assistant"
-                        ),  # Safe fallback for missing role
-                        "content": content,
-                    }
-                )
+                    if "<" in content or "![" in content:
+                        content = DETAILS_AND_IMAGES_PATTERN.sub("", content)
+                    content = content.strip()
+
+                if content == raw_content and "role" in message:
+                    messages.append(message)
+                else:
+                    messages.append(
+                        {
+                            **message,
+                            "role": message.get(
+                                "role", "assistant"
+                            ),  # Safe fallback for missing role
+                            "content": content,
+                        }
+                    )
         else:
             # Local temp chat, get the model and message from the form_data
             message = get_last_user_message_item(form_data.get("messages", []))
@@ -2830,9 +2898,7 @@ async def process_chat_response(
 
                     tools = metadata.get("tools", {})
 
-                    results = []
-
-                    for tool_call in response_tool_calls:
+                    async def execute_tool_call(tool_call):
                         tool_call_id = tool_call.get("id", "")
                         tool_function_name = tool_call.get("function", {}).get(
                             "name", ""
@@ -2924,6 +2990,30 @@ async def process_chat_response(
                             except Exception as e:
                                 tool_result = str(e)
 
+                        return (
+                            tool_call_id,
+                            tool_function_name,
+                            tool_result,
+                            tool_type,
+                            direct_tool,
+                        )
+
+                    # Independent tool calls of one turn run concurrently; each result
+                    # is streamed to the client as soon as its call finishes, kept in
+                    # the order of the model's tool calls
+                    results = []
+                    result_indexes = []
+                    content_blocks[-1]["results"] = results
+
+                    async def on_tool_call_result(index, result):
+                        (
+                            tool_call_id,
+                            tool_function_name,
+                            tool_result,
+                            tool_type,
+                            direct_tool,
+                        ) = result
+
                         tool_result, tool_result_files, tool_result_embeds = (
                             process_tool_result(
                                 request,
@@ -2936,7 +3026,10 @@ async def process_chat_response(
                             )
                         )
 
-                        results.append(
+                        position = bisect.bisect(result_indexes, index)
+                        result_indexes.insert(position, index)
+                        results.insert(
+                            position,
                             {
                                 "tool_call_id": tool_call_id,
                                 "content": tool_result or "",
@@ -2950,10 +3043,25 @@ async def process_chat_response(
                                     if tool_result_embeds
                                     else {}
                                 ),
-                            }
+                            },
                         )
 
-                    content_blocks[-1]["results"] = results
+                        if len(results) < len(response_tool_calls):
+                            await event_emitter(
+                                {
+                                    "type": "chat:completion",
+                                    "data": {
+                                        "content": serialize_content_blocks(
+                                            content_blocks
+                                        ),
+                                    },
+                                }
+                            )
+
+                    await run_tool_calls(
+                        response_tool_calls, execute_tool_call, on_tool_call_result
+                    )
+
                     content_blocks.append(
                         {
                             "type": "text",
@@ -3080,6 +3188,7 @@ async def process_chat_response(
                                             else None
                                         ),
                                         request.app.state.config.CODE_INTERPRETER_JUPYTER_TIMEOUT,
+                                        chat_id=metadata.get("chat_id"),
                                     )
                                 else:
                                     output = {
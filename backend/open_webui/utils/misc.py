@@ -46,16 +46,22 @@ def get_message_list(messages_map, message_id):
     if not current_message:
         return []  # Return empty list instead of None to prevent iteration errors
 
-    # Reconstruct the chain by following the parentId links
+    # Reconstruct the chain by following the parentId links. Messages are
+    # collected leaf-first and reversed once, keeping this O(depth); the
+    # message dicts themselves are returned as-is, not copied.
     message_list = []
 
     while current_message:
-        message_list.insert(
-            0, current_message
-        )  # Insert the message at the beginning of the list
+        message_list.append(current_message)
+        if len(message_list) > len(messages_map):
+            # parentId links form a cycle, stop rather than loop forever
+            log.warning(f"Cycle detected in message history at {message_id}")
+            break
+
         parent_id = current_message.get("parentId")  # Use .get() for safety
         current_message = messages_map.get(parent_id) if parent_id else None
 
+    message_list.reverse()
     return message_list
 
 
@@ -102,6 +102,24 @@ def _build_meter_provider(resource: Resource) -> MeterProvider:
         View(
             instrument_name="webui.users.active.today",
         ),
+        View(
+            instrument_name="webui.stt.latency",
+        ),
+        View(
+            instrument_name="webui.stt.batch.size",
+        ),
+        View(
+            instrument_name="webui.stt.queue.depth",
+        ),
+        View(
+            instrument_name="webui.rerank.latency",
+        ),
+        View(
+            instrument_name="webui.rerank.batch.size",
+        ),
+        View(
+            instrument_name="webui.rerank.queue.depth",
+        ),
     ]
 
     provider = MeterProvider(
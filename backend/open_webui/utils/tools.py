@@ -2,10 +2,12 @@ import inspect
 import logging
 import re
 import inspect
+import hashlib
 import aiohttp
 import asyncio
 import yaml
 import json
+import time
 
 from pydantic import BaseModel
 from pydantic.fields import FieldInfo
@@ -42,6 +44,8 @@ from open_webui.env import (
     AIOHTTP_CLIENT_TIMEOUT,
     AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA,
     AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+    TOOL_SERVER_SPEC_LOCAL_CACHE_TTL,
+    TOOL_SERVER_SPEC_REFRESH_INTERVAL,
 )
 
 import copy
@@ -131,12 +135,7 @@ async def get_tools(
 
                 if type == "openapi":
 
-                    tool_server_data = None
-                    for server in await get_tool_servers(request):
-                        if server["id"] == server_id:
-                            tool_server_data = server
-                            break
-
+                    tool_server_data = await get_tool_server_by_id(request, server_id)
                     if tool_server_data is None:
                         log.warning(f"Tool server data not found for {server_id}")
                         continue
@@ -545,32 +544,86 @@ def convert_openapi_to_tool_payload(openapi_spec):
     return tool_payload
 
 
-async def set_tool_servers(request: Request):
-    request.app.state.TOOL_SERVERS = await get_tool_servers_data(
-        request.app.state.config.TOOL_SERVER_CONNECTIONS
-    )
+def set_tool_servers_snapshot(app, tool_servers: list[dict], version: str):
+    app.state.TOOL_SERVERS = tool_servers
+    app.state.TOOL_SERVERS_BY_ID = {server["id"]: server for server in tool_servers}
+    app.state.TOOL_SERVERS_VERSION = version
+    app.state.TOOL_SERVERS_UPDATED_AT = time.monotonic()
 
-    if request.app.state.redis is not None:
-        await request.app.state.redis.set(
-            "tool_servers", json.dumps(request.app.state.TOOL_SERVERS)
-        )
 
-    return request.app.state.TOOL_SERVERS
+async def refresh_tool_servers(app) -> list[dict]:
+    """
+    Fetch every tool server spec and publish the converted snapshot. Workers
+    share the snapshot through Redis and only reload it when its content
+    hash changes; without Redis, each worker refetches a snapshot older than
+    TOOL_SERVER_SPEC_LOCAL_CACHE_TTL on its next request.
+    """
+    tool_servers = await get_tool_servers_data(app.state.config.TOOL_SERVER_CONNECTIONS)
+    data = json.dumps(tool_servers)
+    version = hashlib.sha256(data.encode()).hexdigest()
+
+    if app.state.redis is not None:
+        try:
+            if await app.state.redis.get("tool_servers:version") != version:
+                await app.state.redis.set("tool_servers", data)
+                await app.state.redis.set("tool_servers:version", version)
+        except Exception as e:
+            log.error(f"Error storing tool_servers in Redis: {e}")
+
+    set_tool_servers_snapshot(app, tool_servers, version)
+    return tool_servers
+
+
+async def set_tool_servers(request: Request):
+    return await refresh_tool_servers(request.app)
 
 
 async def get_tool_servers(request: Request):
-    tool_servers = []
-    if request.app.state.redis is not None:
+    app = request.app
+    if app.state.redis is not None:
         try:
-            tool_servers = json.loads(await request.app.state.redis.get("tool_servers"))
-            request.app.state.TOOL_SERVERS = tool_servers
+            version = await app.state.redis.get("tool_servers:version")
+            if version and version != getattr(app.state, "TOOL_SERVERS_VERSION", None):
+                tool_servers = json.loads(await app.state.redis.get("tool_servers"))
+                set_tool_servers_snapshot(app, tool_servers, version)
         except Exception as e:
             log.error(f"Error fetching tool_servers from Redis: {e}")
 
-    if not tool_servers:
-        tool_servers = await set_tool_servers(request)
+    updated_at = getattr(app.state, "TOOL_SERVERS_UPDATED_AT", None)
+    if updated_at is None or (
+        app.state.redis is None
+        and time.monotonic() - updated_at > TOOL_SERVER_SPEC_LOCAL_CACHE_TTL
+    ):
+        # Concurrent requests wait for the same refresh
+        task = getattr(app.state, "TOOL_SERVERS_REFRESH_TASK", None)
+        if task is None or task.done():
+            task = asyncio.create_task(refresh_tool_servers(app))
+            app.state.TOOL_SERVERS_REFRESH_TASK = task
+        await asyncio.shield(task)
+
+    return app.state.TOOL_SERVERS
 
-    return tool_servers
+
+async def get_tool_server_by_id(request: Request, server_id: str) -> Optional[dict]:
+    await get_tool_servers(request)
+    return request.app.state.TOOL_SERVERS_BY_ID.get(server_id)
+
+
+async def periodic_tool_servers_refresh(app):
+    """Keep tool server specs fresh in the background so requests never fetch them."""
+    while True:
+        await asyncio.sleep(TOOL_SERVER_SPEC_REFRESH_INTERVAL)
+        try:
+            await refresh_tool_servers(app)
+        except Exception as e:
+            log.error(f"Error refreshing tool servers: {e}")
+
+
+# (spec url, headers) -> {"etag", "last_modified", "data"} for conditional refetches
+TOOL_SERVER_SPEC_CACHE: dict[str, dict] = {}
+
+# Spec content hash -> converted tool payload
+TOOL_SERVER_PAYLOAD_CACHE: dict[str, list] = {}
 
 
 async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, Any]:
@@ -582,6 +635,14 @@ async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, A
     if headers:
         _headers.update(headers)
 
+    cache_key = json.dumps([url, headers or {}], sort_keys=True)
+    cached = TOOL_SERVER_SPEC_CACHE.get(cache_key)
+    if cached:
+        if cached.get("etag"):
+            _headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            _headers["If-Modified-Since"] = cached["last_modified"]
+
     error = None
     try:
         timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA)
@@ -589,6 +650,10 @@ async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, A
             async with session.get(
                 url, headers=_headers, ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL
             ) as response:
+                if response.status == 304 and cached:
+                    log.debug(f"Tool server spec not modified: {url}")
+                    return cached["data"]
+
                 if response.status != 200:
                     error_body = await response.json()
                     raise Exception(error_body)
@@ -610,6 +675,17 @@ async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, A
                     except Exception as e:
                         raise e
 
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if etag or last_modified:
+                    TOOL_SERVER_SPEC_CACHE[cache_key] = {
+                        "etag": etag,
+                        "last_modified": last_modified,
+                        "data": res,
+                    }
+                else:
+                    TOOL_SERVER_SPEC_CACHE.pop(cache_key, None)
+
     except Exception as err:
         log.exception(f"Could not fetch tool server spec from {url}")
         if isinstance(err, dict) and "detail" in err:
@@ -684,20 +760,32 @@ async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str,
 
     # Build final results with index and server metadata
     results = []
+    payload_cache = {}
     for (id, idx, server, url, info, _), response in zip(server_entries, responses):
         if isinstance(response, Exception):
             log.error(f"Failed to connect to {url} OpenAPI tool server")
             continue
 
+        # Resolving and converting a spec is costly, so unchanged specs reuse
+        # their previous payload
+        spec_hash = hashlib.sha256(
+            json.dumps(response, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        specs = TOOL_SERVER_PAYLOAD_CACHE.get(spec_hash)
+        if specs is None:
+            specs = convert_openapi_to_tool_payload(response)
+        payload_cache[spec_hash] = specs
+
         response = {
             "openapi": response,
             "info": response.get("info", {}),
-            "specs": convert_openapi_to_tool_payload(response),
+            "specs": specs,
         }
 
         openapi_data = response.get("openapi", {})
         if info and isinstance(openapi_data, dict):
-            openapi_data["info"] = openapi_data.get("info", {})
+            # Copy, as the fetched spec may be reused by the next refresh
+            openapi_data = {**openapi_data, "info": {**openapi_data.get("info", {})}}
 
             if "name" in info:
                 openapi_data["info"]["title"] = info.get("name", "Tool Server")
@@ -716,6 +804,10 @@ async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str,
             }
         )
 
+    # Only keep payloads of the specs currently configured
+    TOOL_SERVER_PAYLOAD_CACHE.clear()
+    TOOL_SERVER_PAYLOAD_CACHE.update(payload_cache)
+
     return results
 
 
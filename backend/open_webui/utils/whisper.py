@@ -0,0 +1,292 @@
+import bisect
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future
+from typing import Optional, Sequence
+
+import numpy as np
+from opentelemetry import metrics
+
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    WHISPER_BATCH_SIZE,
+    WHISPER_BATCH_WAIT_MS,
+    WHISPER_WORKERS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["AUDIO"])
+
+SAMPLE_RATE = 16000
+# Utterances fitting in a single Whisper window can be batched together
+BATCH_MAX_SECONDS = 30
+
+
+meter = metrics.get_meter(__name__)
+
+latency_histogram = meter.create_histogram(
+    name="webui.stt.latency",
+    description="Time from queueing a local transcription to its result",
+    unit="ms",
+)
+batch_size_histogram = meter.create_histogram(
+    name="webui.stt.batch.size",
+    description="Utterances transcribed per local model call",
+    unit="1",
+)
+
+
+class WhisperJob:
+    def __init__(self, audio: np.ndarray, language: Optional[str], vad_filter: bool):
+        self.audio = audio
+        self.language = language
+        self.vad_filter = vad_filter
+        self.future: Future = Future()
+        self.queued_at = time.monotonic()
+
+    @property
+    def batchable(self) -> bool:
+        # Batched clips are transcribed as given, without the VAD filter
+        return (
+            not self.vad_filter and len(self.audio) <= BATCH_MAX_SECONDS * SAMPLE_RATE
+        )
+
+
+class WhisperWorker:
+    """
+    Serves every local transcription from one faster-whisper model.
+
+    Requests are queued and picked up by `workers` threads, which the model
+    runs concurrently (CTranslate2 releases the GIL and runs one transcription
+    per model worker). Short utterances that arrive within `batch_wait` seconds
+    of each other are transcribed together in a single batched model call.
+    """
+
+    def __init__(
+        self,
+        model,
+        workers: int = WHISPER_WORKERS,
+        batch_size: int = WHISPER_BATCH_SIZE,
+        batch_wait: float = WHISPER_BATCH_WAIT_MS / 1000,
+    ):
+        self.model = model
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+
+        self.queue: queue.Queue = queue.Queue()
+        self.busy = 0
+        self.completed = 0
+        self.batches = 0
+        self.batched = 0
+        self.latencies: deque = deque(maxlen=1000)
+        self._lock = threading.Lock()
+
+        self.threads = [
+            threading.Thread(target=self._run, name=f"whisper-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(
+        self, audio: np.ndarray, language: Optional[str] = None, vad_filter=False
+    ) -> Future:
+        """Queue 16 kHz mono samples for transcription."""
+        job = WhisperJob(audio, language, vad_filter)
+        if len(audio) == 0:
+            job.future.set_result("")
+        else:
+            self.queue.put(job)
+        return job.future
+
+    def transcribe(
+        self, file_path: str, language: Optional[str] = None, vad_filter=False
+    ) -> str:
+        """Decode an audio file and wait for its transcript."""
+        from faster_whisper import decode_audio
+
+        audio = decode_audio(file_path, sampling_rate=SAMPLE_RATE)
+        return self.submit(audio, language, vad_filter).result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self.latencies)
+            stats = {
+                "workers": len(self.threads),
+                "busy": self.busy,
+                "queue_depth": self.queue.qsize(),
+                "completed": self.completed,
+                "batches": self.batches,
+                "avg_batch_size": (
+                    round(self.batched / self.batches, 2) if self.batches else None
+                ),
+            }
+
+        if latencies:
+            stats["latency_ms"] = {
+                "avg": round(sum(latencies) / len(latencies) * 1000, 1),
+                "p50": round(latencies[len(latencies) // 2] * 1000, 1),
+                "p95": round(latencies[int(len(latencies) * 0.95)] * 1000, 1),
+            }
+        return stats
+
+    def close(self):
+        for _ in self.threads:
+            self.queue.put(None)
+
+    def _run(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+
+            with self._lock:
+                self.busy += 1
+            try:
+                batch, jobs = [], [job]
+                if job.batchable and self.batch_size > 1:
+                    batch, jobs = self._collect_batch(job)
+
+                if len(batch) > 1:
+                    self._transcribe_batch(batch)
+                else:
+                    jobs = batch + jobs
+
+                for job in jobs:
+                    self._transcribe(job)
+            finally:
+                with self._lock:
+                    self.busy -= 1
+
+    def _collect_batch(self, job: WhisperJob) -> tuple[list, list]:
+        """
+        Gather the batchable jobs queued within the batch window; jobs that
+        cannot be batched are returned separately to run after the batch.
+        """
+        batch, jobs = [job], []
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            try:
+                job = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+
+            if job is None:
+                # Leave the stop signal for after this batch
+                self.queue.put(None)
+                break
+            (batch if job.batchable else jobs).append(job)
+        return batch, jobs
+
+    def _transcribe(self, job: WhisperJob):
+        try:
+            segments, info = self.model.transcribe(
+                job.audio,
+                beam_size=5,
+                vad_filter=job.vad_filter,
+                language=job.language,
+            )
+            log.info(
+                "Detected language '%s' with probability %f"
+                % (info.language, info.language_probability)
+            )
+            transcript = "".join([segment.text for segment in list(segments)])
+        except Exception as e:
+            job.future.set_exception(e)
+            return
+
+        self._record(1)
+        self._resolve(job, transcript)
+
+    def _transcribe_batch(self, batch: Sequence[WhisperJob]):
+        from faster_whisper import BatchedInferencePipeline
+
+        # Clips of one call share a language, unless it is detected per clip
+        groups = defaultdict(list)
+        for job in batch:
+            groups[job.language].append(job)
+
+        for language, jobs in groups.items():
+            offsets = np.cumsum([0] + [len(job.audio) for job in jobs])
+            clips = [
+                {"start": int(start), "end": int(end)}
+                for start, end in zip(offsets[:-1], offsets[1:])
+            ]
+            # Segments are timed from the start of the whole batch, in seconds
+            # rounded like the segment times, so each starts within its clip
+            starts = [round(clip["start"] / SAMPLE_RATE, 3) for clip in clips]
+
+            try:
+                segments, _ = BatchedInferencePipeline(self.model).transcribe(
+                    np.concatenate([job.audio for job in jobs]),
+                    language=language,
+                    multilingual=language is None,
+                    clip_timestamps=clips,
+                    batch_size=len(jobs),
+                    beam_size=5,
+                )
+
+                transcripts = [[] for _ in jobs]
+                for segment in segments:
+                    index = max(bisect.bisect_right(starts, segment.start) - 1, 0)
+                    transcripts[index].append(segment.text)
+            except Exception as e:
+                for job in jobs:
+                    job.future.set_exception(e)
+                continue
+
+            self._record(len(jobs))
+            for job, texts in zip(jobs, transcripts):
+                self._resolve(job, "".join(texts))
+
+    def _record(self, size: int):
+        batch_size_histogram.record(size)
+        with self._lock:
+            self.batches += 1
+            self.batched += size
+
+    def _resolve(self, job: WhisperJob, transcript: str):
+        latency = time.monotonic() - job.queued_at
+        latency_histogram.record(latency * 1000)
+        with self._lock:
+            self.completed += 1
+            self.latencies.append(latency)
+        job.future.set_result(transcript.strip())
+
+
+WHISPER_WORKER: Optional[WhisperWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_whisper_worker(model) -> WhisperWorker:
+    """The worker serving `model`, replacing the worker of a previous model."""
+    global WHISPER_WORKER
+    with _worker_lock:
+        if WHISPER_WORKER is None or WHISPER_WORKER.model is not model:
+            if WHISPER_WORKER is not None:
+                WHISPER_WORKER.close()
+            WHISPER_WORKER = WhisperWorker(model)
+        return WHISPER_WORKER
+
+
+def get_whisper_stats() -> Optional[dict]:
+    return WHISPER_WORKER.stats() if WHISPER_WORKER is not None else None
+
+
+def observe_queue_depth(
+    options: metrics.CallbackOptions,
+) -> Sequence[metrics.Observation]:
+    if WHISPER_WORKER is None:
+        return []
+    return [metrics.Observation(value=WHISPER_WORKER.queue.qsize())]
+
+
+meter.create_observable_gauge(
+    name="webui.stt.queue.depth",
+    description="Local transcriptions waiting for a whisper worker",
+    unit="1",
+    callbacks=[observe_queue_depth],
+)
@@ -72,6 +72,12 @@ fi
 PYTHON_CMD=$(command -v python3 || command -v python)
 UVICORN_WORKERS="${UVICORN_WORKERS:-1}"
 
+if [[ "${USE_EMBEDDING_SERVER,,}" == "true" ]]; then
+    echo "USE_EMBEDDING_SERVER is set to true, starting the embedding server."
+    "$PYTHON_CMD" -m open_webui.retrieval.embedding_server &
+    export RAG_EMBEDDING_SERVER_URL="${RAG_EMBEDDING_SERVER_URL:-http://127.0.0.1:${EMBEDDING_SERVER_PORT:-8090}}"
+fi
+
 # If script is called with arguments, use them; otherwise use default workers
 if [ "$#" -gt 0 ]; then
     ARGS=("$@")